@@ -0,0 +1,219 @@
+"""Caché en memoria y en disco para resultados costosos.
+
+Dibujar un grafo con Graphviz o analizar una gramática en BNF tarda
+mucho más que buscar el resultado ya calculado. `CacheDeDosNiveles`
+guarda los resultados por una llave (normalmente un hash de la
+entrada): en memoria, desechando el usado hace más tiempo, y
+opcionalmente en un directorio, para que otros procesos empiecen con
+ellos. Cada caché indica cómo convertir sus valores en bytes y de
+vuelta, el sufijo de sus archivos y cuántos bytes pueden ocupar.
+
+Clases
+------
+CacheDeDosNiveles
+    Caché de valores por llave, en memoria y opcionalmente en disco.
+"""
+
+import collections
+import os
+import pathlib
+import tempfile
+import threading
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class CacheDeDosNiveles(Generic[T]):  # pylint: disable=too-many-instance-attributes
+    """Caché de valores por llave, en memoria y opcionalmente en disco.
+
+    Los valores se guardan en memoria, desechando el usado hace más
+    tiempo cuando se supera la capacidad. Si hay un directorio, también
+    se guardan en disco, en un archivo cuyo nombre es la llave seguida
+    del sufijo; cuando los archivos superan `limite_disco` bytes, se
+    borran los usados hace más tiempo (según su fecha de modificación,
+    que se actualiza al leerlos). Se puede usar desde varios hilos.
+
+    Parámetros
+    ----------
+    serializar : Callable[[T], bytes]
+        Convierte un valor en el contenido de su archivo.
+    deserializar : Callable[[bytes], T]
+        Reconstruye un valor desde el contenido de su archivo. Levanta
+        ValueError si el contenido está dañado.
+    sufijo : str
+        El sufijo de los archivos, como ".svg".
+    capacidad : int
+        Número máximo de valores en memoria.
+    directorio : str | os.PathLike[str] | None, opcional
+        Directorio de la caché en disco, o None (por defecto) para no
+        usar el disco.
+    limite_disco : int | None, opcional
+        Número máximo de bytes en el directorio, o None (por defecto)
+        para no limitarlo.
+
+    Atributos
+    ---------
+    capacidad : int
+        Número máximo de valores en memoria.
+    directorio : pathlib.Path | None
+        Directorio de la caché en disco, o None para no usar el disco.
+    limite_disco : int | None
+        Número máximo de bytes en el directorio, o None para no limitarlo.
+    aciertos : int
+        Número de consultas que encontraron el valor.
+    fallos : int
+        Número de consultas que no lo encontraron.
+
+    Métodos
+    -------
+    consultar(llave)
+        Busca el valor de una llave en memoria y en disco.
+    registrar(llave, valor)
+        Guarda el valor de una llave en memoria y en disco.
+    limpiar()
+        Vacía la caché en memoria y reinicia las estadísticas.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        serializar: Callable[[T], bytes],
+        deserializar: Callable[[bytes], T],
+        sufijo: str,
+        capacidad: int,
+        *,
+        directorio: str | os.PathLike[str] | None = None,
+        limite_disco: int | None = None,
+    ) -> None:
+        self.capacidad = capacidad
+        self.directorio = None if directorio is None else pathlib.Path(directorio)
+        self.limite_disco = limite_disco
+        self.aciertos = 0
+        self.fallos = 0
+        self._serializar = serializar
+        self._deserializar = deserializar
+        self._sufijo = sufijo
+        self._memoria: collections.OrderedDict[str, T] = collections.OrderedDict()
+        self._bytes_en_disco: int | None = None  # Se calcula al primer uso.
+        self._candado = threading.RLock()
+
+    def consultar(self, llave: str) -> T | None:
+        """Busca el valor de una llave en memoria y en disco.
+
+        Cuenta un acierto si lo encuentra y un fallo si no; en ese caso,
+        quien lo calcule debe guardarlo con `registrar`.
+
+        Parámetros
+        ----------
+        llave : str
+            La llave del valor.
+
+        Devuelve
+        --------
+        T | None
+            El valor guardado, o None si no está en la caché.
+        """
+        with self._candado:
+            valor = self._memoria.get(llave)
+            if valor is not None:
+                self._memoria.move_to_end(llave)
+                self.aciertos += 1
+                return valor
+        valor = self._leer(llave)
+        with self._candado:
+            if valor is None:
+                self.fallos += 1
+                return None
+            self.aciertos += 1
+            self._recordar(llave, valor)
+        return valor
+
+    def registrar(self, llave: str, valor: T) -> None:
+        """Guarda el valor de una llave en memoria y en disco."""
+        with self._candado:
+            self._recordar(llave, valor)
+            self._escribir(llave, valor)
+
+    def limpiar(self) -> None:
+        """Vacía la caché en memoria y reinicia las estadísticas.
+
+        Los archivos del directorio, si lo hay, no se borran.
+        """
+        with self._candado:
+            self._memoria.clear()
+            self.aciertos = self.fallos = 0
+
+    def _recordar(self, llave: str, valor: T) -> None:
+        """Guarda un valor en memoria, desechando el usado hace más tiempo."""
+        self._memoria[llave] = valor
+        self._memoria.move_to_end(llave)
+        if len(self._memoria) > self.capacidad:
+            self._memoria.popitem(last=False)
+
+    def _archivo(self, llave: str) -> pathlib.Path | None:
+        """Devuelve la ruta del archivo de una llave en la caché en disco."""
+        if self.directorio is None:
+            return None
+        return self.directorio / f"{llave}{self._sufijo}"
+
+    def _leer(self, llave: str) -> T | None:
+        """Lee un valor de la caché en disco, si está ahí."""
+        archivo = self._archivo(llave)
+        if archivo is None:
+            return None
+        try:
+            valor = self._deserializar(archivo.read_bytes())
+            os.utime(archivo)  # Marcarlo como usado recientemente.
+        except (OSError, ValueError):
+            return None  # Un archivo ausente o dañado equivale a un fallo.
+        return valor
+
+    def _escribir(self, llave: str, valor: T) -> None:
+        """Guarda un valor en la caché en disco, si la hay."""
+        archivo = self._archivo(llave)
+        if archivo is None:
+            return
+        contenido = self._serializar(valor)
+        try:
+            archivo.parent.mkdir(parents=True, exist_ok=True)
+            if self._bytes_en_disco is None:
+                self._bytes_en_disco = sum(
+                    ruta.stat().st_size
+                    for ruta in archivo.parent.glob(f"*{self._sufijo}")
+                )
+            # Escribir en un archivo temporal y renombrarlo, para que
+            # otro proceso nunca lea un archivo a medias.
+            with tempfile.NamedTemporaryFile(
+                "wb", dir=archivo.parent, suffix=".tmp", delete=False
+            ) as salida:
+                salida.write(contenido)
+            os.replace(salida.name, archivo)
+            self._bytes_en_disco += len(contenido)
+            if self.limite_disco is not None:
+                if self._bytes_en_disco > self.limite_disco:
+                    self._recortar(archivo.parent)
+        except OSError:
+            pass  # La caché en disco es sólo una optimización.
+
+    def _recortar(self, directorio: pathlib.Path) -> None:
+        """Borra los archivos usados hace más tiempo hasta respetar el límite."""
+        assert self.limite_disco is not None
+        archivos = []
+        for ruta in directorio.glob(f"*{self._sufijo}"):
+            try:
+                estado = ruta.stat()
+            except OSError:
+                continue  # Otro proceso lo borró.
+            archivos.append((estado.st_mtime, estado.st_size, ruta))
+        archivos.sort()
+        total = sum(tamanno for _, tamanno, _ in archivos)
+        for _, tamanno, ruta in archivos:
+            if total <= self.limite_disco:
+                break
+            try:
+                ruta.unlink()
+            except OSError:
+                continue
+            total -= tamanno
+        self._bytes_en_disco = total
@@ -0,0 +1,396 @@
+"""Autómatas finitos deterministas para gramáticas regulares.
+
+Una gramática es lineal por la derecha si cada regla tiene a lo más una
+variable y ésta va al final (`<A> ::= "ab" <B> | "c"`), y lineal por la
+izquierda si la variable va al principio (`<A> ::= <B> "ab" | "c"`). En
+ambos casos su lenguaje es regular y lo reconoce un autómata finito.
+
+`AutomataFinito.desde_gramatica` construye primero un autómata no
+determinista con un estado por variable, lo vuelve determinista con la
+construcción de subconjuntos y lo minimiza con el refinamiento de
+particiones de Moore. La tabla de transiciones es un arreglo denso de
+NumPy con una fila por estado y una columna por carácter del alfabeto,
+más una última columna para los caracteres que no están en él. Así,
+decidir si un texto pertenece al lenguaje toma un paso por carácter, y
+muchos textos de la misma longitud se deciden a la vez avanzando todos
+sus estados con una sola indexación por posición.
+
+Clases
+------
+AutomataFinito
+    Autómata finito determinista con tabla de transiciones densa.
+
+Funciones
+---------
+linealidad(reglas)
+    Decide si las reglas son lineales por la derecha o por la izquierda.
+"""
+
+import collections
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Literal, Self
+
+import numpy as np
+import numpy.typing as npt
+
+from .estructuras import Regla, Terminal, Variable
+
+
+def linealidad(reglas: Iterable[Regla]) -> Literal["derecha", "izquierda"] | None:
+    """Decide si las reglas son lineales por la derecha o por la izquierda.
+
+    Devuelve "derecha" si en cada regla la única variable, si la hay, es
+    el último símbolo; "izquierda" si es el primero, y None si ninguna
+    de las dos. Si las reglas son lineales de las dos formas (por
+    ejemplo, si ninguna tiene variables), devuelve "derecha".
+    """
+    derecha = izquierda = True
+    for _, simbolos in reglas:
+        posiciones = [
+            i for i, simbolo in enumerate(simbolos) if isinstance(simbolo, Variable)
+        ]
+        if len(posiciones) > 1:
+            return None
+        if posiciones:
+            derecha = derecha and posiciones[0] == len(simbolos) - 1
+            izquierda = izquierda and posiciones[0] == 0
+    if derecha:
+        return "derecha"
+    return "izquierda" if izquierda else None
+
+
+def _amplitud(transiciones: npt.NDArray[np.intp], inicio: int) -> npt.NDArray[np.intp]:
+    """Devuelve los estados en el orden de una búsqueda en amplitud."""
+    filas: list[list[int]] = transiciones.tolist()
+    orden = {inicio: None}
+    cola = collections.deque([inicio])
+    while cola:
+        for siguiente in filas[cola.popleft()]:
+            if siguiente not in orden:
+                orden[siguiente] = None
+                cola.append(siguiente)
+    return np.array(list(orden), dtype=np.intp)
+
+
+class _NoDeterminista:
+    """Autómata finito no determinista con transiciones ε."""
+
+    def __init__(self) -> None:
+        self.transiciones: list[dict[str, set[int]]] = []
+        self.vacias: list[set[int]] = []
+
+    def nuevo(self) -> int:
+        """Agrega un estado y devuelve su número."""
+        self.transiciones.append({})
+        self.vacias.append(set())
+        return len(self.vacias) - 1
+
+    def camino(self, origen: int, texto: str, destino: int) -> None:
+        """Agrega un camino de `origen` a `destino` que lee `texto`."""
+        if not texto:
+            self.vacias[origen].add(destino)
+            return
+        for caracter in texto[:-1]:
+            siguiente = self.nuevo()
+            self.transiciones[origen].setdefault(caracter, set()).add(siguiente)
+            origen = siguiente
+        self.transiciones[origen].setdefault(texto[-1], set()).add(destino)
+
+    def cerradura(self, estados: Iterable[int]) -> frozenset[int]:
+        """Devuelve los estados alcanzables con transiciones ε."""
+        resultado = set(estados)
+        pendientes = list(resultado)
+        while pendientes:
+            for siguiente in self.vacias[pendientes.pop()]:
+                if siguiente not in resultado:
+                    resultado.add(siguiente)
+                    pendientes.append(siguiente)
+        return frozenset(resultado)
+
+
+class AutomataFinito:
+    """Autómata finito determinista con tabla de transiciones densa.
+
+    El estado inicial es el 0. La tabla es completa: los textos que no
+    pueden llegar a aceptarse terminan en un estado de rechazo, del que
+    no se sale.
+
+    Parámetros
+    ----------
+    alfabeto : Sequence[str]
+        Los caracteres del alfabeto, en orden.
+    transiciones : npt.NDArray[np.int32]
+        Arreglo de forma (estados, len(alfabeto) + 1). La fila `q` y la
+        columna `i` dan el estado al que se pasa desde `q` al leer
+        `alfabeto[i]`; la última columna, al leer cualquier otro
+        carácter.
+    aceptacion : npt.NDArray[np.bool_]
+        Qué estados son de aceptación.
+
+    Atributos
+    ---------
+    alfabeto : tuple[str, ...]
+        Los caracteres del alfabeto, en orden.
+    transiciones : npt.NDArray[np.int32]
+        La tabla de transiciones.
+    aceptacion : npt.NDArray[np.bool_]
+        Qué estados son de aceptación.
+
+    Métodos
+    -------
+    desde_gramatica(reglas, inicial)
+        Construye el autómata mínimo de una gramática lineal.
+    minimizar()
+        Devuelve el autómata mínimo equivalente.
+    aceptar(texto)
+        Decide si el autómata acepta un texto.
+    aceptar_varios(textos)
+        Decide a la vez si acepta varios textos de la misma longitud.
+    contar(longitud)
+        Número de palabras aceptadas de una longitud.
+    palabras(longitud)
+        Enumera en orden alfabético las palabras aceptadas de una longitud.
+    """
+
+    def __init__(
+        self,
+        alfabeto: Sequence[str],
+        transiciones: npt.NDArray[np.int32],
+        aceptacion: npt.NDArray[np.bool_],
+    ) -> None:
+        if list(alfabeto) != sorted(set(alfabeto)):
+            raise ValueError("El alfabeto debe estar ordenado y sin repeticiones")
+        if transiciones.shape != (len(aceptacion), len(alfabeto) + 1):
+            raise ValueError("La tabla no corresponde al alfabeto y los estados")
+        self.alfabeto = tuple(alfabeto)
+        self.transiciones = transiciones
+        self.aceptacion = aceptacion
+        # Copias para el recorrido carácter por carácter, que con listas
+        # de Python es más rápido que indexando el arreglo.
+        self._columnas = {caracter: i for i, caracter in enumerate(self.alfabeto)}
+        self._filas: list[list[int]] = transiciones.tolist()
+        self._codigos = np.array([ord(c) for c in self.alfabeto], dtype=np.uint32)
+        self._muertos = set(np.flatnonzero(~self._utiles()).tolist())
+
+    def __len__(self) -> int:
+        """Devuelve el número de estados."""
+        return len(self.aceptacion)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} con {len(self)} estados>"
+
+    @classmethod
+    def desde_gramatica(cls, reglas: Sequence[Regla], inicial: Variable) -> Self:
+        """Construye el autómata mínimo de una gramática lineal.
+
+        Parámetros
+        ----------
+        reglas : Sequence[Regla]
+            Las reglas de producción de la gramática.
+        inicial : Variable
+            La variable inicial.
+
+        Levanta
+        -------
+        ValueError
+            Si la gramática no es lineal por la derecha ni por la
+            izquierda (ver `linealidad`).
+        """
+        tipo = linealidad(reglas)
+        if tipo is None:
+            raise ValueError("La gramática no es lineal")
+        automata = _NoDeterminista()
+        variables = {inicial: automata.nuevo()}
+        for izquierda, simbolos in reglas:
+            for simbolo in (izquierda, *simbolos):
+                if isinstance(simbolo, Variable) and simbolo not in variables:
+                    variables[simbolo] = automata.nuevo()
+        extremo = automata.nuevo()
+        for izquierda, simbolos in reglas:
+            texto = "".join(s.valor for s in simbolos if isinstance(s, Terminal))
+            variable = next((s for s in simbolos if isinstance(s, Variable)), None)
+            otro = extremo if variable is None else variables[variable]
+            if tipo == "derecha":
+                # A → w B: de A se pasa a B leyendo w; A → w acaba en el
+                # extremo, que es el único estado de aceptación.
+                automata.camino(variables[izquierda], texto, otro)
+            else:
+                # A → B w: lo que produce A es lo que produce B seguido
+                # de w; el extremo es el estado inicial.
+                automata.camino(otro, texto, variables[izquierda])
+        if tipo == "derecha":
+            inicio, final = variables[inicial], extremo
+        else:
+            inicio, final = extremo, variables[inicial]
+        return cls._determinizar(automata, inicio, final).minimizar()
+
+    @classmethod
+    def _determinizar(cls, automata: _NoDeterminista, inicio: int, final: int) -> Self:
+        """Construcción de subconjuntos, con un estado de rechazo."""
+        alfabeto = sorted({c for salidas in automata.transiciones for c in salidas})
+        vacio: frozenset[int] = frozenset()
+        numeros = {automata.cerradura([inicio]): 0}
+        conjuntos = list(numeros)
+        filas: list[list[int]] = []
+        while len(filas) < len(conjuntos):
+            actual = conjuntos[len(filas)]
+            fila = []
+            for caracter in [*alfabeto, None]:
+                siguiente = vacio
+                if caracter is not None:
+                    siguiente = automata.cerradura(
+                        destino
+                        for estado in actual
+                        for destino in automata.transiciones[estado].get(caracter, ())
+                    )
+                if siguiente not in numeros:
+                    numeros[siguiente] = len(conjuntos)
+                    conjuntos.append(siguiente)
+                fila.append(numeros[siguiente])
+            filas.append(fila)
+        return cls(
+            alfabeto,
+            np.array(filas, dtype=np.int32).reshape(len(filas), len(alfabeto) + 1),
+            np.array([final in conjunto for conjunto in conjuntos], dtype=np.bool_),
+        )
+
+    def minimizar(self) -> Self:
+        """Devuelve el autómata mínimo equivalente.
+
+        Quita los estados inalcanzables y junta los equivalentes. Las
+        clases de estados se refinan con el algoritmo de Moore: dos
+        estados siguen juntos mientras sus clases y las clases de sus
+        sucesores coincidan. Cada ronda es una sola llamada a
+        `np.unique` sobre la tabla de firmas. Los estados del resultado
+        se numeran en el orden en que los encuentra una búsqueda en
+        amplitud desde el inicial.
+        """
+        alcanzables = self._alcanzables()
+        transiciones = np.searchsorted(alcanzables, self.transiciones[alcanzables])
+        clases = self.aceptacion[alcanzables].astype(np.intp)
+        numero = len(np.unique(clases))
+        while True:
+            firmas = np.column_stack([clases, clases[transiciones]])
+            _, nuevas = np.unique(firmas, axis=0, return_inverse=True)
+            nuevas = nuevas.reshape(-1)
+            if len(np.unique(nuevas)) == numero:
+                break
+            clases, numero = nuevas, len(np.unique(nuevas))
+        representantes = np.unique(clases, return_index=True)[1]
+        orden = _amplitud(clases[transiciones[representantes]], int(clases[0]))
+        nuevos = np.empty(len(orden), dtype=np.int32)
+        nuevos[orden] = np.arange(len(orden), dtype=np.int32)
+        return type(self)(
+            self.alfabeto,
+            nuevos[clases[transiciones[representantes[orden]]]],
+            self.aceptacion[alcanzables[representantes[orden]]],
+        )
+
+    def _alcanzables(self) -> npt.NDArray[np.intp]:
+        """Devuelve, en orden, los estados alcanzables desde el inicial."""
+        vistos = {0}
+        pendientes = [0]
+        while pendientes:
+            for siguiente in self._filas[pendientes.pop()]:
+                if siguiente not in vistos:
+                    vistos.add(siguiente)
+                    pendientes.append(siguiente)
+        return np.array(sorted(vistos), dtype=np.intp)
+
+    def aceptar(self, texto: str) -> bool:
+        """Decide si el autómata acepta un texto.
+
+        Recorre el texto una vez y se detiene al llegar a un estado
+        desde el que no se puede aceptar.
+        """
+        filas, columnas, otro = self._filas, self._columnas, len(self.alfabeto)
+        estado = 0
+        for caracter in texto:
+            estado = filas[estado][columnas.get(caracter, otro)]
+            if estado in self._muertos:
+                return False
+        return bool(self.aceptacion[estado])
+
+    def aceptar_varios(self, textos: Sequence[str]) -> npt.NDArray[np.bool_]:
+        """Decide a la vez si el autómata acepta varios textos.
+
+        Todos los textos deben tener la misma longitud. En cada posición
+        se avanzan los estados de todos los textos con una sola
+        indexación de la tabla.
+
+        Levanta
+        -------
+        ValueError
+            Si los textos no tienen la misma longitud.
+        """
+        if not textos:
+            return np.zeros(0, dtype=np.bool_)
+        longitud = len(textos[0])
+        if any(len(texto) != longitud for texto in textos):
+            raise ValueError("Los textos deben tener la misma longitud")
+        codigos = np.frombuffer(
+            "".join(textos).encode("utf-32-le"), dtype=np.dtype("<u4")
+        ).reshape(len(textos), longitud)
+        posiciones = np.searchsorted(self._codigos, codigos)
+        acotadas = np.minimum(posiciones, max(len(self.alfabeto) - 1, 0))
+        if self.alfabeto:
+            conocidos = self._codigos[acotadas] == codigos
+        else:
+            conocidos = np.zeros(codigos.shape, dtype=np.bool_)
+        columnas = np.where(conocidos, posiciones, len(self.alfabeto))
+        estados: npt.NDArray[np.int32] = np.zeros(len(textos), dtype=np.int32)
+        for posicion in range(longitud):
+            estados = self.transiciones[estados, columnas[:, posicion]]
+        return self.aceptacion[estados]
+
+    def contar(self, longitud: int) -> int:
+        """Devuelve el número de palabras aceptadas de una longitud.
+
+        Lleva, para cada estado, el número de palabras de cada longitud
+        con las que se llega desde él a la aceptación. Los números son
+        enteros de Python, así que no se desbordan.
+        """
+        numeros = self.aceptacion.astype(object)
+        letras = self.transiciones[:, : len(self.alfabeto)]
+        for _ in range(longitud):
+            numeros = numeros[letras].sum(axis=1, initial=0)
+        return int(numeros[0])
+
+    def palabras(self, longitud: int) -> Iterator[str]:
+        """Enumera en orden alfabético las palabras aceptadas de una longitud.
+
+        Sólo visita prefijos que pueden completarse a una palabra
+        aceptada, así que cada palabra cuesta O(longitud).
+        """
+        vivos = self._vivos(longitud)
+        if not vivos[longitud][0]:
+            return
+        pendientes = [(0, "")]
+        while pendientes:
+            estado, prefijo = pendientes.pop()
+            restantes = longitud - len(prefijo)
+            if not restantes:
+                yield prefijo
+                continue
+            for columna in reversed(range(len(self.alfabeto))):
+                siguiente = self._filas[estado][columna]
+                if vivos[restantes - 1][siguiente]:
+                    pendientes.append((siguiente, prefijo + self.alfabeto[columna]))
+
+    def _vivos(self, longitud: int) -> list[npt.NDArray[np.bool_]]:
+        """Qué estados aceptan alguna palabra de cada longitud hasta una."""
+        letras = self.transiciones[:, : len(self.alfabeto)]
+        vivos = [self.aceptacion]
+        for _ in range(longitud):
+            vivos.append(np.asarray(vivos[-1][letras].any(axis=1)))
+        return vivos
+
+    def _utiles(self) -> npt.NDArray[np.bool_]:
+        """Qué estados aceptan alguna palabra, de cualquier longitud."""
+        letras = self.transiciones[:, : len(self.alfabeto)]
+        utiles = self.aceptacion.copy()
+        while True:
+            nuevos = utiles | utiles[letras].any(axis=1)
+            if (nuevos == utiles).all():
+                return utiles
+            utiles = nuevos
@@ -2,19 +2,34 @@
 
 Este módulo contiene la clase ParserBNFLibreContexto, que permite
 analizar gramáticas en notación BNF. La gramática debe ser libre de
-contexto.
+contexto. Los errores de sintaxis se reúnen en una sola excepción,
+ErroresDeSintaxisBNF. La función expresion_de_tokens construye la
+expresión regular del analizador léxico a partir de las
+especificaciones de los tokens, para que otras notaciones (como la de
+`ebnf`) puedan extender la de BNF.
+
+También contiene CacheDeGramaticas, que guarda las gramáticas ya
+analizadas, en memoria y opcionalmente en disco, con una llave que
+depende del texto y de `VERSION_PARSER`. La instancia `cache` es la que
+usa `GramaticaLibreContexto.desde_bnf`; si la variable de entorno
+MATERIALES_CACHE_BNF indica un directorio, también guarda ahí las
+gramáticas para que los núcleos de libretas nuevos empiecen con ellas.
 """
 
+import functools
+import hashlib
 import json
+import os
+import pickle
 import re
-from collections import deque
-from typing import Iterator, NamedTuple
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import NamedTuple, TextIO
 
+from ..cache import CacheDeDosNiveles
 from .estructuras import (
     Cadena,
     GramaticaLibreContextoDict,
     GramaticaLibreContextoMap,
-    MultiRegla,
     Simbolo,
     Terminal,
     UnionCadenas,
@@ -43,134 +58,285 @@ class Token(NamedTuple):
     columna: int
 
 
+# Tipos de token que forman las cadenas de la derecha de una producción.
+_SIMBOLOS = frozenset({"TERMINAL", "NO_TERMINAL"})
+_FINES_DE_LINEA = frozenset({"NUEVA_LINEA", "FIN"})
+
+
+class ErroresDeSintaxisBNF(SyntaxError):
+    """Errores de sintaxis de una gramática en BNF.
+
+    El mensaje reúne los mensajes de todos los errores, y `lineno` y
+    `offset` son los del primero.
+
+    Atributos
+    ---------
+    errores : tuple[SyntaxError, ...]
+        Cada error encontrado, en el orden del texto.
+    """
+
+    def __init__(self, errores: Sequence[SyntaxError]) -> None:
+        if len(errores) == 1:
+            mensaje = str(errores[0])
+        else:
+            mensaje = "\n".join(
+                [f"{len(errores)} errores de sintaxis:", *map(str, errores)]
+            )
+        super().__init__(mensaje)
+        self.errores = tuple(errores)
+        self.lineno = errores[0].lineno
+        self.offset = errores[0].offset
+
+
+def expresion_de_tokens(
+    spec_tokens: Mapping[str, str], spec_ignorados: Mapping[str, str]
+) -> str:
+    """Construye la expresión regular de un analizador léxico.
+
+    Lo ignorado no tiene grupo propio: cada coincidencia lo consume
+    junto con el token siguiente, que queda en el grupo con el nombre de
+    su tipo. Después de lo ignorado siempre debe coincidir algún token
+    (por ejemplo, un tipo ERROR que acepte cualquier carácter), para que
+    el cuantificador nunca retroceda.
+
+    Parámetros
+    ----------
+    spec_tokens : Mapping[str, str]
+        Expresión regular de cada tipo de token, en orden de prioridad.
+    spec_ignorados : Mapping[str, str]
+        Expresiones regulares de lo que se ignora entre tokens.
+
+    Devuelve
+    --------
+    str
+        La expresión regular, lista para compilarse.
+    """
+    return (
+        f"(?:{'|'.join(spec_ignorados.values())})*(?:"
+        + "|".join(f"(?P<{tipo}>{regex})" for tipo, regex in spec_tokens.items())
+        + ")"
+    )
+
+
+def _error(mensaje: str, token: Token) -> SyntaxError:
+    """Crea un error de sintaxis en la posición de un token."""
+    # Los tokens NUEVA_LINEA llevan el número de la línea que empiezan.
+    linea = token.linea - 1 if token.tipo == "NUEVA_LINEA" else token.linea
+    error = SyntaxError(f"{mensaje} en línea {linea}, columna {token.columna}")
+    error.lineno, error.offset = linea, token.columna
+    return error
+
+
+@functools.lru_cache(maxsize=4096)
+def _simbolo(valor: str) -> Simbolo:
+    """Convierte el texto de un token TERMINAL o NO_TERMINAL en un símbolo."""
+    if valor[0] == "<":
+        return Variable(valor[1:-1])
+    if "\\" in valor:
+        return Terminal(json.loads(valor))
+    return Terminal(valor[1:-1])
+
+
 class ParserBNFLibreContexto:
-    """Analizador sintáctico para gramáticas en notación BNF."""
+    """Analizador sintáctico para gramáticas en notación BNF.
+
+    Atributos
+    ---------
+    spec_tokens : dict[str, str]
+        Expresión regular de cada tipo de token, en orden de prioridad.
+    spec_ignorados : dict[str, str]
+        Expresiones regulares de lo que se ignora entre tokens.
+    patron : re.Pattern[str]
+        Expresión regular compilada que reconoce lo ignorado y el
+        siguiente token en una sola coincidencia.
+    inicios_largos : frozenset[str]
+        Caracteres con los que empiezan los tokens de más de un carácter.
+    tamanno_bloque : int
+        Número de caracteres que `tokenizar_archivo` lee a la vez.
+    """
 
     spec_tokens = {
         "NO_TERMINAL": r"<[\w\-\.]+?>",  # No terminales van entre corchetes angulares
-        "TERMINAL": r'"(\\.|[^"\\])*"',  # Los terminales están entre comillas dobles
+        "TERMINAL": r'"(?:\\.|[^"\\])*"',  # Los terminales están entre comillas dobles
         "UNION": r"\|",  # La unión es el símbolo |
         "PRODUCCION": r"::=",  # La producción se simboliza con ::=
         "NUEVA_LINEA": r"\n",  # Salto de línea
-        "COMENTARIO": r"\#[^\n]*",  # Los comentarios comienzan con #
-        "ESPACIO": r"\s+?",  # Cualquier espacio en blanco
         "FIN": r"$",  # Fin de la cadena
         "ERROR": r".",  # Cualquier otro carácter
     }
-    tok_regex = "|".join(f"(?P<{tipo}>{regex})" for tipo, regex in spec_tokens.items())
+    spec_ignorados = {
+        "ESPACIO": r"[^\S\n]+",  # Espacios en blanco, salvo el salto de línea
+        "COMENTARIO": r"\#[^\n]*",  # Los comentarios comienzan con #
+    }
+    tok_regex = expresion_de_tokens(spec_tokens, spec_ignorados)
+    patron = re.compile(tok_regex)
+    inicios_largos = frozenset('<":')
+    tamanno_bloque = 1 << 16
 
     def tokenizar(self, texto: str) -> Iterator[Token]:
-        """Convierte un texto en una secuencia de tokens."""
-        linea = 1
-        inicio_de_linea = 0
-        for coincidencia in re.finditer(self.tok_regex, texto):
-            tipo = coincidencia.lastgroup
-            if tipo is None:
-                continue
-            valor = coincidencia.group(tipo)
-            columna = coincidencia.start() - inicio_de_linea + 1
-            match tipo:
-                case "ESPACIO" | "COMENTARIO":
-                    continue  # Ignora espacios y comentarios
-                case "NUEVA_LINEA":
+        """Convierte un texto en una secuencia de tokens.
+
+        Parámetros
+        ----------
+        texto : str
+            El texto en notación BNF.
+
+        Devuelve
+        --------
+        Iterator[Token]
+            Los tokens del texto, sin espacios ni comentarios, y
+            terminados por un token FIN.
+
+        Levanta
+        -------
+        SyntaxError
+            Si el texto contiene un carácter ilegal.
+        """
+        return self._escanear((texto,))
+
+    def tokenizar_archivo(self, archivo: TextIO) -> Iterator[Token]:
+        """Convierte el contenido de un archivo en una secuencia de tokens.
+
+        El archivo se lee en bloques de `tamanno_bloque` caracteres
+        conforme se consumen los tokens, sin cargarlo completo en
+        memoria. Los tokens son los mismos que devolvería `tokenizar`
+        con el contenido completo.
+
+        Parámetros
+        ----------
+        archivo : TextIO
+            Archivo de texto abierto para lectura.
+
+        Devuelve
+        --------
+        Iterator[Token]
+            Los tokens del archivo, terminados por un token FIN.
+
+        Levanta
+        -------
+        SyntaxError
+            Si el archivo contiene un carácter ilegal.
+        """
+        return self._escanear(iter(lambda: archivo.read(self.tamanno_bloque), ""))
+
+    def _escanear(
+        self, bloques: Iterable[str], ilegales: bool = False
+    ) -> Iterator[Token]:
+        """Convierte una sucesión de bloques de texto en tokens.
+
+        Un token que llega al final del texto leído puede continuar en
+        el siguiente bloque, y un carácter ilegal como `<` puede ser el
+        inicio de un token incompleto; en ambos casos se lee otro bloque
+        antes de decidir. Si `ilegales` es True, los caracteres ilegales
+        se devuelven como tokens ERROR en vez de levantar SyntaxError.
+        """
+        bloques = iter(bloques)
+        texto, posicion = "", 0
+        # inicio_de_linea es relativo al inicio de `texto`, así que
+        # puede ser negativo cuando la línea empezó en un bloque anterior.
+        linea, inicio_de_linea = 1, 0
+        agotado = False
+        while True:
+            for coincidencia in self.patron.finditer(texto, posicion):
+                tipo = coincidencia.lastgroup
+                assert tipo is not None  # FIN y ERROR cubren todo caso.
+                valor = coincidencia[tipo]
+                final = coincidencia.end()
+                if not agotado and (
+                    final == len(texto)
+                    or (tipo == "ERROR" and valor in self.inicios_largos)
+                ):
+                    posicion = coincidencia.start()
+                    break
+                columna = coincidencia.start(tipo) - inicio_de_linea + 1
+                if tipo == "NUEVA_LINEA":
                     linea += 1
-                    inicio_de_linea = coincidencia.end()
-                case "ERROR":
+                    inicio_de_linea = final
+                elif tipo == "ERROR" and not ilegales:
                     raise SyntaxError(
                         f"Carácter ilegal '{valor}' en línea {linea}, columna {columna}"
                     )
-            yield Token(tipo, valor, linea, columna)
-
-    def _consumir_no_terminal(self, tokens: deque[Token]) -> Variable:
-        """Consume un símbolo no terminal."""
-        token = tokens.popleft()
-        if token.tipo != "NO_TERMINAL":
-            raise SyntaxError(
-                "Se esperaba un símbolo no terminal en línea "
-                f"{token.linea}, columna {token.columna}"
-            )
-        return Variable(token.valor[1:-1])
-
-    def _consumir_signo_de_produccion(self, tokens: deque[Token]) -> None:
-        """Consume el signo de producción de una producción."""
-        token = tokens.popleft()
-        if token.tipo != "PRODUCCION":
-            raise SyntaxError(
-                "Se esperaba un signo de producción en línea "
-                f"{token.linea}, columna {token.columna}"
-            )
+                yield Token(tipo, valor, linea, columna)
+                if tipo == "FIN":
+                    return
+            bloque = next(bloques, None)
+            if bloque is None:
+                agotado = True
+            else:
+                inicio_de_linea -= posicion
+                texto, posicion = texto[posicion:] + bloque, 0
 
-    def _consumir_simbolo(self, tokens: deque[Token]) -> Simbolo:
-        """Consume un símbolo terminal o no terminal."""
-        token = tokens.popleft()
-        match token.tipo:
-            case "TERMINAL":
-                return Terminal(json.loads(token.valor))
-            case "NO_TERMINAL":
-                return Variable(token.valor[1:-1])
-        raise SyntaxError(
-            "Se esperaba un símbolo terminal o no terminal en línea "
-            f"{token.linea}, columna {token.columna}"
-        )
+    def _regla(
+        self, linea: Sequence[Token], fin: Token
+    ) -> tuple[Variable, list[Cadena]]:
+        """Analiza los tokens de una línea con una producción.
 
-    def _consumir_cadena(self, tokens: deque[Token]) -> Cadena:
-        """Consume una cadena de símbolos terminales y no terminales."""
-        cadena: list[Simbolo] = []
-        assert tokens
-        if tokens[0].tipo not in ("TERMINAL", "NO_TERMINAL"):
-            raise SyntaxError(
-                "Se esperaba un símbolo terminal o no terminal en línea "
-                f"{tokens[0].linea}, columna {tokens[0].columna}"
-            )
-        while tokens and tokens[0].tipo in ("TERMINAL", "NO_TERMINAL"):
-            cadena.append(self._consumir_simbolo(tokens))
-        return Cadena(cadena)
-
-    def _consumir_fin_de_linea(self, tokens: deque[Token]) -> bool:
-        """Consume un salto de línea."""
-        consumido = False
-        while tokens:
-            token = tokens[0]
-            if token.tipo in ("NUEVA_LINEA", "FIN"):
-                tokens.popleft()
-                consumido = True
+        `fin` es el token NUEVA_LINEA o FIN que termina la línea.
+        """
+        if linea[0].tipo != "NO_TERMINAL":
+            raise _error("Se esperaba un símbolo no terminal", linea[0])
+        if len(linea) < 2 or linea[1].tipo != "PRODUCCION":
+            token = linea[1] if len(linea) > 1 else fin
+            raise _error("Se esperaba un signo de producción", token)
+        return Variable(linea[0].valor[1:-1]), self._derecha(linea[2:], fin)
+
+    def _derecha(self, linea: Sequence[Token], fin: Token) -> list[Cadena]:
+        """Analiza los tokens a la derecha del signo de producción."""
+        cadenas: list[Cadena] = []
+        simbolos: list[Simbolo] = []
+        for token in linea:
+            if token.tipo in _SIMBOLOS:
+                simbolos.append(_simbolo(token.valor))
+            elif not simbolos:
+                raise _error("Se esperaba un símbolo terminal o no terminal", token)
+            elif token.tipo == "UNION":
+                cadenas.append(Cadena(simbolos))
+                simbolos = []
             else:
-                break
-        return consumido
-
-    def _consumir_derecha(self, tokens: deque[Token]) -> UnionCadenas:
-        """Consume la parte derecha de una producción."""
-        derecha: list[Cadena] = []
-        derecha.append(self._consumir_cadena(tokens))
-        while tokens and tokens[0].tipo == "UNION":
-            tokens.popleft()
-            derecha.append(self._consumir_cadena(tokens))
-        return UnionCadenas(derecha)
-
-    def _consumir_produccion(self, tokens: deque[Token]) -> MultiRegla:
-        """Consume una producción."""
-        izq = self._consumir_no_terminal(tokens)
-        self._consumir_signo_de_produccion(tokens)
-        der = self._consumir_derecha(tokens)
-        return MultiRegla(izq, der)
-
-    def _consumir_gramatica(self, tokens: deque[Token]) -> GramaticaLibreContextoMap:
-        """Consume una gramática."""
+                raise _error("Se esperaba '|' o el fin de la línea", token)
+        if not simbolos:
+            raise _error("Se esperaba un símbolo terminal o no terminal", fin)
+        cadenas.append(Cadena(simbolos))
+        return cadenas
+
+    def _diseccionar(self, tokens: Iterable[Token]) -> GramaticaLibreContextoMap:
+        """Convierte una sucesión de tokens en una gramática.
+
+        Cada producción ocupa una línea. Cuando una línea tiene un error
+        se registra y el análisis continúa en la línea siguiente, de
+        modo que se informan todos los errores a la vez.
+        """
         gramatica: GramaticaLibreContextoDict = {}
-        self._consumir_fin_de_linea(tokens)
-        while tokens:
-            izq, der = self._consumir_produccion(tokens)
-            gramatica.setdefault(izq, []).extend(der)
-            self._consumir_fin_de_linea(tokens)
-        resultado = {izq: UnionCadenas(der) for izq, der in gramatica.items() if der}
-        return resultado
+        errores: list[SyntaxError] = []
+        linea: list[Token] = []
+        valida = True
+        for token in tokens:
+            tipo = token.tipo
+            if tipo in _FINES_DE_LINEA:
+                if linea and valida:
+                    try:
+                        izq, der = self._regla(linea, token)
+                    except SyntaxError as error:
+                        errores.append(error)
+                    else:
+                        gramatica.setdefault(izq, []).extend(der)
+                linea, valida = [], True
+            elif tipo == "ERROR":
+                errores.append(_error(f"Carácter ilegal '{token.valor}'", token))
+                valida = False
+            else:
+                linea.append(token)
+        if errores:
+            raise ErroresDeSintaxisBNF(errores)
+        return {izq: UnionCadenas(der) for izq, der in gramatica.items()}
 
     def diseccionar(self, texto: str) -> GramaticaLibreContextoMap:
         """
         Convierte un texto en BNF a una estructura de gramática.
 
         El texto debe estar en notación BNF y la gramática debe ser
-        libre de contexto.
+        libre de contexto. Cada producción ocupa una línea; las
+        producciones de una misma variable se unen.
 
         Parámetros
         ----------
@@ -183,12 +349,124 @@ class ParserBNFLibreContexto:
             Un diccionario que representa la gramática. Las llaves son
             los símbolos no terminales y los valores son listas de
             sucesiones de símbolos terminales y no terminales.
+
+        Levanta
+        -------
+        ErroresDeSintaxisBNF
+            Si el texto tiene errores de sintaxis. La excepción reúne
+            todos los errores encontrados.
         """
-        tokens = deque(self.tokenizar(texto))
-        gramatica = self._consumir_gramatica(tokens)
-        if tokens:
-            raise SyntaxError(
-                "Se esperaba el fin de la cadena en línea "
-                f"{tokens[0].linea}, columna {tokens[0].columna}"
-            )
-        return gramatica
+        return self._diseccionar(self._escanear((texto,), ilegales=True))
+
+    def diseccionar_archivo(self, archivo: TextIO) -> GramaticaLibreContextoMap:
+        """Convierte el contenido de un archivo en BNF a una gramática.
+
+        El archivo se lee por bloques, como en `tokenizar_archivo`.
+
+        Parámetros
+        ----------
+        archivo : TextIO
+            Archivo de texto abierto para lectura.
+
+        Devuelve
+        --------
+        GramLibreContextoBNF
+            La gramática, como en `diseccionar`.
+
+        Levanta
+        -------
+        ErroresDeSintaxisBNF
+            Si el archivo tiene errores de sintaxis.
+        """
+        bloques = iter(lambda: archivo.read(self.tamanno_bloque), "")
+        return self._diseccionar(self._escanear(bloques, ilegales=True))
+
+
+VERSION_PARSER = "2"
+"""Versión del formato de las gramáticas que produce el parser.
+
+Forma parte de la llave de la caché, así que debe cambiar cuando cambie
+el resultado de `ParserBNFLibreContexto.diseccionar`.
+"""
+
+
+class CacheDeGramaticas(CacheDeDosNiveles[GramaticaLibreContextoMap]):
+    """Caché de gramáticas analizadas, indexada por el texto en BNF.
+
+    Guarda las gramáticas por la llave de su texto, en memoria y
+    opcionalmente en disco con `pickle`, en archivos `.pickle`; ver
+    `materiales.cache.CacheDeDosNiveles`. Sólo debe usarse un
+    directorio en el que se confíe, porque cargar un archivo de
+    `pickle` puede ejecutar código.
+
+    Atributos
+    ---------
+    capacidad : int
+        Número máximo de gramáticas en memoria.
+    directorio : pathlib.Path | None
+        Directorio de la caché en disco, o None para no usar el disco.
+    aciertos : int
+        Número de consultas resueltas sin analizar el texto.
+    fallos : int
+        Número de consultas que analizaron el texto.
+    """
+
+    def __init__(
+        self, capacidad: int = 128, directorio: str | os.PathLike[str] | None = None
+    ) -> None:
+        super().__init__(
+            _a_pickle, _desde_pickle, ".pickle", capacidad, directorio=directorio
+        )
+
+    @staticmethod
+    def llave(texto: str) -> str:
+        """Devuelve la llave de un texto: el hash del texto y la versión."""
+        contenido = f"{VERSION_PARSER}\0{texto}".encode()
+        return hashlib.sha256(contenido).hexdigest()
+
+    def diseccionar(self, texto: str) -> dict[Variable, UnionCadenas]:
+        """Devuelve la gramática de un texto en BNF, analizándolo si hace falta.
+
+        Parámetros
+        ----------
+        texto : str
+            El texto en notación BNF.
+
+        Devuelve
+        --------
+        dict[Variable, UnionCadenas]
+            Una copia de la gramática guardada, como la que devuelve
+            `ParserBNFLibreContexto.diseccionar`.
+
+        Levanta
+        -------
+        ErroresDeSintaxisBNF
+            Si el texto tiene errores de sintaxis. Los errores no se
+            guardan en la caché.
+        """
+        llave = self.llave(texto)
+        gramatica = self.consultar(llave)
+        if gramatica is None:
+            gramatica = ParserBNFLibreContexto().diseccionar(texto)
+            self.registrar(llave, gramatica)
+        return dict(gramatica)
+
+
+def _a_pickle(gramatica: GramaticaLibreContextoMap) -> bytes:
+    """Convierte una gramática en el contenido de su archivo."""
+    return pickle.dumps(dict(gramatica))
+
+
+def _desde_pickle(contenido: bytes) -> GramaticaLibreContextoMap:
+    """Reconstruye una gramática desde el contenido de su archivo."""
+    try:
+        gramatica = pickle.loads(contenido)
+    except (pickle.UnpicklingError, EOFError, AttributeError) as error:
+        raise ValueError("El archivo no contiene una gramática.") from error
+    if not isinstance(gramatica, dict):
+        raise ValueError("El archivo no contiene una gramática.")
+    return gramatica
+
+
+cache = CacheDeGramaticas(directorio=os.environ.get("MATERIALES_CACHE_BNF") or None)
+"""Caché que usa `GramaticaLibreContexto.desde_bnf`."""
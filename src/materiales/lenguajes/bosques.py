@@ -0,0 +1,498 @@
+"""Bosques de análisis compartidos y empacados, y detección de ambigüedad.
+
+Un bosque de análisis compartido y empacado (SPPF, por sus siglas en
+inglés) representa todos los árboles de análisis de un texto en espacio
+O(n³), aunque sean exponencialmente muchos. Se construye a partir de la
+tabla completa de Earley (ver `earley.ParserEarley.analizar`) y tiene
+dos clases de nodos:
+
+- `Tramo(simbolo, inicio, fin)`: el símbolo produce `texto[inicio:fin]`.
+  Sus alternativas son las reglas del símbolo que producen el tramo.
+- `Prefijo(n_regla, punto, inicio, fin)`: los primeros `punto` símbolos
+  de la derecha de una regla producen `texto[inicio:fin]`. Cada
+  división es un par (prefijo de un símbolo menos, tramo del último
+  símbolo); así el bosque es binario y su tamaño no depende de la
+  longitud de las reglas.
+
+El número de árboles de cada nodo se calcula una sola vez. Si la
+gramática tiene ciclos (como `<A> ::= <A> | "a"`), un tramo puede tener
+una infinidad de árboles, y su número es `math.inf`. Con los números,
+el árbol con índice `i` se obtiene sin enumerar los anteriores, lo que
+permite extraer los primeros árboles o árboles al azar con distribución
+uniforme.
+
+`buscar_ambiguedad` decide si alguna cadena de longitud acotada tiene
+más de un árbol. Para cada variable y longitud cuenta los árboles y las
+cadenas distintas con tablas de programación dinámica; sólo en las
+longitudes en que los números no coinciden analiza cadenas para dar un
+testigo. Los árboles se cuentan sin enumerarlos, pero las cadenas
+distintas se enumeran una por una (con `cadenas_por_longitud`), así que
+el costo es exponencial en la longitud máxima.
+
+Clases
+------
+Bosque
+    Bosque de análisis compartido y empacado de un texto.
+Prefijo
+    Los primeros símbolos de una regla y el tramo del texto que producen.
+Ambiguedad
+    Una cadena con más de un árbol de análisis.
+
+Funciones
+---------
+cadenas_por_longitud(reglas, longitud_maxima)
+    Devuelve las cadenas de cada longitud que produce cada variable.
+buscar_ambiguedad(parser, longitud_maxima)
+    Busca la cadena ambigua más corta hasta cierta longitud.
+"""
+
+import math
+import random
+from collections.abc import Iterable, Iterator, Sequence
+from typing import NamedTuple
+
+from .earley import Analisis, ParserEarley, Tramo
+from .estructuras import Regla, Simbolo, Variable
+
+# Número de árboles: un entero, o math.inf si hay una infinidad.
+Numero = int | float
+
+
+class Prefijo(NamedTuple):
+    """Los primeros `punto` símbolos de una regla producen el tramo."""
+
+    n_regla: int
+    punto: int
+    inicio: int
+    fin: int
+
+
+_Nodo = Tramo | Prefijo
+
+
+class Ambiguedad(NamedTuple):
+    """Una cadena con más de un árbol de análisis."""
+
+    cadena: str
+    arboles: Numero
+
+
+class Bosque:
+    """Bosque de análisis compartido y empacado de un texto.
+
+    Parámetros
+    ----------
+    analisis : earley.Analisis
+        Un análisis completo del texto, es decir, hecho con
+        `ParserEarley.analizar(texto, completo=True)`.
+
+    Atributos
+    ---------
+    raiz : Tramo
+        El nodo de la variable inicial y todo el texto.
+
+    Métodos
+    -------
+    alternativas(tramo)
+        Un nodo `Prefijo` por cada regla que produce el tramo.
+    divisiones(prefijo)
+        Los pares (prefijo, tramo) en que se divide un prefijo.
+    contar(nodo=None)
+        Número de árboles de un nodo.
+    derivacion(indice)
+        Reglas de la derivación por la izquierda de un árbol.
+    primeras(k)
+        Derivaciones de los primeros `k` árboles.
+    aleatorias(k, semilla=None)
+        Derivaciones de `k` árboles al azar.
+    """
+
+    def __init__(self, analisis: Analisis) -> None:
+        if not analisis.completo:
+            raise ValueError(
+                "El bosque requiere un análisis completo; usa "
+                "ParserEarley.analizar(texto, completo=True)"
+            )
+        self.raiz = Tramo(analisis.inicial, 0, len(analisis.texto))
+        self._reglas = analisis.reglas
+        self._alternativas: dict[Tramo, list[Prefijo]] = {}
+        self._divisiones: dict[Prefijo, list[tuple[Prefijo, Tramo]]] = {}
+        self._numeros: dict[_Nodo, Numero] = {}
+        self._construir(analisis)
+
+    def __len__(self) -> int:
+        """Devuelve el número de nodos del bosque."""
+        return len(self._alternativas) + len(self._divisiones)
+
+    def _construir(self, analisis: Analisis) -> None:
+        """Agrega los nodos que se alcanzan desde la raíz."""
+        pendientes: list[_Nodo] = [self.raiz]
+        while pendientes:
+            nodo = pendientes.pop()
+            if isinstance(nodo, Prefijo):
+                if nodo in self._divisiones:
+                    continue
+                divisiones = self._divisiones[nodo] = []
+                if nodo.punto == 0:
+                    continue
+                simbolo = self._reglas[nodo.n_regla].derecha[nodo.punto - 1]
+                for k in analisis.anteriores(*nodo):
+                    division = (
+                        Prefijo(nodo.n_regla, nodo.punto - 1, nodo.inicio, k),
+                        Tramo(simbolo, k, nodo.fin),
+                    )
+                    divisiones.append(division)
+                    pendientes.extend(division)
+                continue
+            variable, inicio, fin = nodo
+            if isinstance(variable, Variable) and nodo not in self._alternativas:
+                alternativas = self._alternativas[nodo] = [
+                    Prefijo(n_regla, len(self._reglas[n_regla].derecha), inicio, fin)
+                    for n_regla in analisis.reglas_completas(variable, inicio, fin)
+                ]
+                pendientes.extend(alternativas)
+
+    def alternativas(self, tramo: Tramo) -> Sequence[Prefijo]:
+        """Devuelve un nodo `Prefijo` por cada regla que produce el tramo."""
+        return self._alternativas.get(tramo, ())
+
+    def divisiones(self, prefijo: Prefijo) -> Sequence[tuple[Prefijo, Tramo]]:
+        """Devuelve los pares (prefijo, tramo) en que se divide un prefijo."""
+        return self._divisiones[prefijo]
+
+    def _hijos(self, nodo: _Nodo) -> Iterator[_Nodo]:
+        """Recorre los nodos de los que depende el número de un nodo."""
+        if isinstance(nodo, Prefijo):
+            for division in self._divisiones[nodo]:
+                yield from division
+        else:
+            yield from self.alternativas(nodo)
+
+    def contar(self, nodo: _Nodo | None = None) -> Numero:
+        """Devuelve el número de árboles de un nodo.
+
+        Parámetros
+        ----------
+        nodo : Tramo o Prefijo, opcional
+            El nodo. Por defecto, la raíz, así que el resultado es el
+            número de árboles de análisis del texto.
+
+        Devuelve
+        --------
+        int o float
+            El número de árboles, o `math.inf` si hay una infinidad.
+        """
+        if nodo is None:
+            nodo = self.raiz
+        if nodo not in self._numeros:
+            self._contar_desde(nodo)
+        return self._numeros[nodo]
+
+    def _contar_desde(self, nodo: _Nodo) -> None:
+        """Calcula los números de árboles de los nodos que alcanza `nodo`.
+
+        Es un recorrido en profundidad con una pila explícita. Si llega a
+        un nodo que está en la pila hay un ciclo, y todos los nodos de la
+        pila tienen una infinidad de árboles.
+        """
+        en_pila: set[_Nodo] = set()
+        infinitos: set[_Nodo] = set()
+        pila: list[tuple[_Nodo, Iterator[_Nodo]]] = [(nodo, self._hijos(nodo))]
+        en_pila.add(nodo)
+        while pila:
+            actual, hijos = pila[-1]
+            for hijo in hijos:
+                if hijo in en_pila:
+                    infinitos.update(en_pila)
+                elif hijo not in self._numeros:
+                    pila.append((hijo, self._hijos(hijo)))
+                    en_pila.add(hijo)
+                    break
+            else:
+                pila.pop()
+                en_pila.discard(actual)
+                if actual in infinitos:
+                    self._numeros[actual] = math.inf
+                else:
+                    self._numeros[actual] = self._numero(actual)
+
+    def _numero(self, nodo: _Nodo) -> Numero:
+        """Calcula el número de árboles de un nodo a partir de sus hijos."""
+        if isinstance(nodo, Prefijo):
+            if nodo.punto == 0:
+                return 1
+            return sum(
+                self._numeros[prefijo] * self._numeros[tramo]
+                for prefijo, tramo in self._divisiones[nodo]
+            )
+        if not isinstance(nodo.simbolo, Variable):
+            return 1
+        return sum(self._numeros[prefijo] for prefijo in self.alternativas(nodo))
+
+    def derivacion(self, indice: int) -> list[int]:
+        """Devuelve las reglas de la derivación por la izquierda de un árbol.
+
+        Los árboles se numeran desde 0: primero por la regla de la raíz,
+        en el orden de la gramática, y luego, de izquierda a derecha, por
+        dónde empieza cada hijo.
+
+        Parámetros
+        ----------
+        indice : int
+            El número del árbol, de 0 a `contar() - 1`.
+
+        Devuelve
+        --------
+        list[int]
+            Los números (desde 0) de las reglas en el orden en que se
+            aplican, siempre a la variable más a la izquierda.
+
+        Levanta
+        -------
+        ValueError
+            Si el texto tiene una infinidad de árboles.
+        IndexError
+            Si no hay árbol con ese número.
+        """
+        total = self.contar()
+        if math.isinf(total):
+            raise ValueError("El texto tiene una infinidad de árboles")
+        if not 0 <= indice < total:
+            raise IndexError(f"El texto sólo tiene {total} árboles")
+        reglas: list[int] = []
+        pila: list[tuple[Tramo, int]] = [(self.raiz, indice)]
+        while pila:
+            tramo, resto = pila.pop()
+            if not isinstance(tramo.simbolo, Variable):
+                continue
+            alternativas = self.alternativas(tramo)
+            i, resto = _elegir(map(self.contar, alternativas), resto)
+            prefijo = alternativas[i]
+            reglas.append(prefijo.n_regla)
+            # Los hijos se apilan de derecha a izquierda, para expandir
+            # primero el de la izquierda.
+            while prefijo.punto:
+                divisiones = self._divisiones[prefijo]
+                i, resto = _elegir(
+                    (
+                        self.contar(anterior) * self.contar(hijo)
+                        for anterior, hijo in divisiones
+                    ),
+                    resto,
+                )
+                prefijo, hijo = divisiones[i]
+                resto, resto_hijo = divmod(resto, int(self.contar(hijo)))
+                pila.append((hijo, resto_hijo))
+        return reglas
+
+    def primeras(self, k: int) -> list[list[int]]:
+        """Devuelve las derivaciones de los primeros `k` árboles.
+
+        Si hay menos de `k` árboles, devuelve todas.
+        """
+        total = self.contar()
+        if math.isinf(total):
+            raise ValueError("El texto tiene una infinidad de árboles")
+        return [self.derivacion(i) for i in range(min(k, int(total)))]
+
+    def aleatorias(self, k: int, semilla: int | None = None) -> list[list[int]]:
+        """Devuelve las derivaciones de `k` árboles elegidos al azar.
+
+        Cada árbol se elige con la misma probabilidad, con reemplazo.
+        """
+        total = self.contar()
+        if math.isinf(total):
+            raise ValueError("El texto tiene una infinidad de árboles")
+        azar = random.Random(semilla)
+        return [self.derivacion(azar.randrange(int(total))) for _ in range(k)]
+
+
+def _elegir(numeros: Iterable[Numero], indice: int) -> tuple[int, int]:
+    """Elige la opción que contiene el árbol `indice`.
+
+    Las opciones tienen `numeros` árboles cada una. Devuelve la posición
+    de la opción y el número del árbol dentro de ella.
+    """
+    for opcion, numero in enumerate(numeros):
+        if indice < numero:
+            return opcion, indice
+        indice -= int(numero)
+    raise IndexError("No hay árbol con ese número")
+
+
+def _producto(a: Numero, b: Numero) -> Numero:
+    """Multiplica números de árboles, con 0 · ∞ = 0."""
+    return 0 if not a or not b else a * b
+
+
+def _por_longitud(
+    reglas: Sequence[Regla], longitud_maxima: int
+) -> dict[Variable, list[Numero]]:
+    """Cuenta los árboles por variable y longitud de su producto.
+
+    Las longitudes se llenan en orden; dentro de una longitud, las
+    reglas cuyos demás símbolos producen ε hacen que una variable
+    dependa de otras de la misma longitud, así que se itera hasta un
+    punto fijo. Si un número sigue creciendo después de tantas rondas
+    como variables, está en un ciclo y es infinito.
+    """
+    variables = list(dict.fromkeys(regla.izquierda for regla in reglas))
+    arboles: dict[Variable, list[Numero]] = {var: [] for var in variables}
+    for longitud in range(longitud_maxima + 1):
+        for variable in variables:
+            arboles[variable].append(0)
+        rondas = 0
+        while True:
+            nuevos: dict[Variable, Numero] = dict.fromkeys(variables, 0)
+            for izquierda, derecha in reglas:
+                nuevos[izquierda] += _arboles_derecha(derecha, longitud, arboles)
+            crecieron = []
+            for variable in variables:
+                if math.isinf(arboles[variable][longitud]):
+                    continue  # Ya se sabe que es infinito.
+                if nuevos[variable] != arboles[variable][longitud]:
+                    crecieron.append(variable)
+                    arboles[variable][longitud] = nuevos[variable]
+            if not crecieron:
+                break
+            rondas += 1
+            if rondas > len(variables):
+                for variable in crecieron:
+                    arboles[variable][longitud] = math.inf
+                rondas = 0
+    return arboles
+
+
+def _arboles_derecha(
+    derecha: Sequence[Simbolo], longitud: int, arboles: dict[Variable, list[Numero]]
+) -> Numero:
+    """Cuenta los árboles de una derecha cuyo producto tiene una longitud."""
+    # Por cada longitud del prefijo leído, sus árboles.
+    parciales: dict[int, Numero] = {0: 1}
+    for simbolo in derecha:
+        if isinstance(simbolo, Variable):
+            opciones = list(enumerate(arboles.get(simbolo, [])))
+        else:
+            opciones = [(len(simbolo.valor), 1)]
+        siguientes: dict[int, Numero] = {}
+        for inicio, numero in parciales.items():
+            for tamanno, n_simbolo in opciones:
+                if inicio + tamanno <= longitud and n_simbolo:
+                    siguientes[inicio + tamanno] = siguientes.get(
+                        inicio + tamanno, 0
+                    ) + _producto(numero, n_simbolo)
+        parciales = siguientes
+    return parciales.get(longitud, 0)
+
+
+def cadenas_por_longitud(
+    reglas: Sequence[Regla], longitud_maxima: int
+) -> dict[Variable, list[set[str]]]:
+    """Devuelve las cadenas de cada longitud que produce cada variable.
+
+    Llena, en orden de longitud, las cadenas que produce cada variable.
+    Dentro de una longitud, las reglas cuyos demás símbolos producen ε
+    hacen que una variable dependa de otras de la misma longitud, así
+    que se repite hasta que ningún conjunto crece.
+
+    Las cadenas se guardan una por una, así que el tiempo y la memoria
+    crecen con su número, que en general es exponencial en la longitud:
+    con `<S> ::= "a" <S> | "b" <S> | ""` hay 2ⁿ cadenas de longitud n.
+    Sirve sólo para longitudes pequeñas.
+
+    Parámetros
+    ----------
+    reglas : Sequence[Regla]
+        Las reglas de producción de la gramática.
+    longitud_maxima : int
+        La longitud máxima, en caracteres, de las cadenas.
+
+    Devuelve
+    --------
+    dict[Variable, list[set[str]]]
+        Para cada variable del lado izquierdo de alguna regla, una lista
+        con las cadenas que produce de cada longitud, de 0 a
+        `longitud_maxima`.
+    """
+    tablas: dict[Variable, list[set[str]]] = {regla.izquierda: [] for regla in reglas}
+    for longitud in range(longitud_maxima + 1):
+        for tabla in tablas.values():
+            tabla.append(set())
+        cambio = True
+        while cambio:
+            cambio = False
+            for izquierda, derecha in reglas:
+                producidas = _cadenas_derecha(derecha, longitud, tablas)
+                if not producidas <= tablas[izquierda][longitud]:
+                    tablas[izquierda][longitud] |= producidas
+                    cambio = True
+    return tablas
+
+
+def _cadenas_derecha(
+    derecha: Sequence[Simbolo], longitud: int, tablas: dict[Variable, list[set[str]]]
+) -> set[str]:
+    """Devuelve las cadenas de una longitud que produce una derecha."""
+    # Por cada longitud del prefijo leído, las cadenas que produce.
+    parciales: dict[int, set[str]] = {0: {""}}
+    for simbolo in derecha:
+        if isinstance(simbolo, Variable):
+            opciones = [
+                (tamanno, producidas)
+                for tamanno, producidas in enumerate(tablas.get(simbolo, []))
+                if producidas
+            ]
+        else:
+            opciones = [(len(simbolo.valor), {simbolo.valor})]
+        siguientes: dict[int, set[str]] = {}
+        for inicio, prefijos in parciales.items():
+            for tamanno, sufijos in opciones:
+                if inicio + tamanno <= longitud:
+                    siguientes.setdefault(inicio + tamanno, set()).update(
+                        prefijo + sufijo for prefijo in prefijos for sufijo in sufijos
+                    )
+        parciales = siguientes
+    return parciales.get(longitud, set())
+
+
+def buscar_ambiguedad(parser: ParserEarley, longitud_maxima: int) -> Ambiguedad | None:
+    """Busca la cadena ambigua más corta hasta cierta longitud.
+
+    Para cada longitud compara el número de árboles de la variable
+    inicial con el número de cadenas distintas que produce; si son
+    iguales, ninguna cadena de esa longitud es ambigua. Si no, analiza
+    las cadenas de esa longitud, en orden, hasta encontrar una con más
+    de un árbol.
+
+    Contar los árboles toma un tiempo polinomial, pero las cadenas
+    distintas se enumeran con `cadenas_por_longitud`, así que el tiempo
+    y la memoria son exponenciales en `longitud_maxima` para la mayoría
+    de las gramáticas.
+
+    Parámetros
+    ----------
+    parser : earley.ParserEarley
+        El analizador de la gramática.
+    longitud_maxima : int
+        La longitud máxima, en caracteres, de las cadenas.
+
+    Devuelve
+    --------
+    Ambiguedad o None
+        La cadena más corta (y, entre las de su longitud, la primera en
+        orden alfabético) con más de un árbol, y su número de árboles; o
+        None si no hay.
+    """
+    arboles = _por_longitud(parser.reglas, longitud_maxima)
+    cadenas = cadenas_por_longitud(parser.reglas, longitud_maxima)
+    if parser.inicial not in arboles:
+        return None
+    for longitud in range(longitud_maxima + 1):
+        producidas = cadenas[parser.inicial][longitud]
+        if arboles[parser.inicial][longitud] <= len(producidas):
+            continue
+        for cadena in sorted(producidas):
+            numero = Bosque(parser.analizar(cadena, completo=True)).contar()
+            if numero > 1:
+                return Ambiguedad(cadena, numero)
+    return None
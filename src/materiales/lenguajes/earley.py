@@ -0,0 +1,469 @@
+"""Análisis de cadenas con el algoritmo de Earley.
+
+El algoritmo de Earley decide si una cadena pertenece al lenguaje de
+cualquier gramática libre de contexto en tiempo O(n³), O(n²) si la
+gramática no es ambigua. Funciona con reglas recursivas por la
+izquierda y con producciones vacías. Con la optimización de Leo, las
+reglas recursivas por la derecha (como `<L> ::= "a" <L> | ""`) también
+se analizan en tiempo lineal: cuando una variable completa una cadena
+de items que sólo esperan su último símbolo, se agrega sólo el item de
+arriba de la cadena, sin completar uno por uno los de en medio.
+
+Los símbolos terminales pueden tener varios caracteres; se reconocen
+comparando el texto a partir de la posición actual.
+
+El resultado, `Analisis`, es un bosque de análisis implícito: para cada
+variable y cada tramo del texto que la variable produce guarda la
+primera regla con la que se completó, y para cada regla, dónde empieza
+cada símbolo de su derecha. Como una variable sólo se completa con
+hijos que ya estaban completos, seguir esas referencias nunca entra en
+un ciclo, así que un árbol de análisis (y con él las derivaciones por la
+izquierda y por la derecha) se obtiene en tiempo lineal en su tamaño,
+sin búsqueda con retroceso. Los items que se saltó la optimización de
+Leo se reconstruyen sólo cuando el árbol pasa por ellos.
+
+Clases
+------
+ParserEarley
+    Analizador de cadenas para una gramática libre de contexto.
+Analisis
+    Tabla de Earley de una cadena aceptada.
+Tramo
+    Un símbolo y el tramo del texto que produce.
+
+Excepciones
+-----------
+CadenaRechazada
+    La cadena no pertenece al lenguaje de la gramática.
+"""
+
+import collections
+import dataclasses
+from collections.abc import Iterator, Sequence
+from typing import NamedTuple
+
+from .estructuras import Regla, Simbolo, Variable
+
+# Un item es (número de regla, posición del punto, origen).
+_Item = tuple[int, int, int]
+
+
+class CadenaRechazada(ValueError):
+    """La cadena no pertenece al lenguaje de la gramática.
+
+    Atributos
+    ---------
+    posicion : int
+        Longitud del prefijo más largo del texto que todavía se puede
+        completar a una cadena del lenguaje.
+    """
+
+    def __init__(self, mensaje: str, posicion: int) -> None:
+        super().__init__(mensaje)
+        self.posicion = posicion
+
+
+class Tramo(NamedTuple):
+    """Un símbolo y el tramo `texto[inicio:fin]` que produce."""
+
+    simbolo: Simbolo
+    inicio: int
+    fin: int
+
+
+@dataclasses.dataclass
+class _Tabla:
+    """Los conjuntos de Earley de un texto, uno por posición, y sus índices.
+
+    Atributos
+    ---------
+    conjuntos : list[dict[_Item, int]]
+        Los items que terminan en cada posición y, para cada item, la
+        posición donde empieza el último símbolo antes del punto.
+    completados : list[dict[tuple[Variable, int], int]]
+        La primera regla con la que se completó cada variable, por el
+        origen de su tramo.
+    esperando : list[dict[Variable, list[_Item]]]
+        Los items de cada posición con el punto antes de cada variable.
+    enlaces : list[dict[Variable, tuple[int, int] | None]]
+        El único item (regla y origen) que espera a la variable como
+        último símbolo, si lo hay.
+    cimas : list[dict[Variable, tuple[int, int, int] | None]]
+        El item de arriba de la cadena de enlaces (regla, origen y
+        posición donde espera su último símbolo).
+    saltos : list[dict[_Item, tuple[Variable, int]]]
+        Para cada item agregado con la optimización de Leo, la variable
+        y el origen que completaron la cadena de enlaces.
+    leo : bool
+        Si se usa la optimización de Leo.
+    """
+
+    conjuntos: list[dict[_Item, int]]
+    completados: list[dict[tuple[Variable, int], int]]
+    esperando: list[dict[Variable, list[_Item]]]
+    enlaces: list[dict[Variable, tuple[int, int] | None]]
+    cimas: list[dict[Variable, tuple[int, int, int] | None]]
+    saltos: list[dict[_Item, tuple[Variable, int]]]
+    leo: bool
+
+    @classmethod
+    def vacia(cls, longitud: int, leo: bool) -> "_Tabla":
+        """Crea una tabla con `longitud + 1` conjuntos vacíos."""
+        posiciones = range(longitud + 1)
+        return cls(
+            conjuntos=[{} for _ in posiciones],
+            completados=[{} for _ in posiciones],
+            esperando=[{} for _ in posiciones],
+            enlaces=[{} for _ in posiciones],
+            cimas=[{} for _ in posiciones],
+            saltos=[{} for _ in posiciones],
+            leo=leo,
+        )
+
+
+class Analisis:
+    """Tabla de Earley de una cadena aceptada.
+
+    Parámetros
+    ----------
+    reglas : Sequence[Regla]
+        Las reglas de la gramática, en el orden en que se numeran.
+    inicial : Variable
+        La variable inicial.
+    texto : str
+        El texto analizado.
+
+    Atributos
+    ---------
+    completo : bool
+        Si la tabla tiene todos los items, porque se analizó sin la
+        optimización de Leo.
+
+    Métodos
+    -------
+    regla(variable, inicio, fin)
+        Número de la regla con la que se analiza un tramo.
+    hijos(n_regla, inicio, fin)
+        Los tramos de los símbolos de la derecha de una regla.
+    pasos(derecha=False)
+        Los pasos de la derivación por la izquierda o por la derecha.
+    reglas_completas(variable, inicio, fin)
+        Todas las reglas con las que se analiza un tramo.
+    anteriores(n_regla, punto, inicio, fin)
+        Todas las posiciones donde puede empezar un símbolo de una regla.
+    """
+
+    def __init__(
+        self, reglas: Sequence[Regla], inicial: Variable, texto: str, tabla: _Tabla
+    ) -> None:
+        self.reglas = reglas
+        self.inicial = inicial
+        self.texto = texto
+        self.completo = not tabla.leo
+        self._tabla = tabla
+        self._origenes: dict[tuple[int, Variable], list[int]] = {}
+
+    def regla(self, variable: Variable, inicio: int, fin: int) -> int:
+        """Devuelve el número (desde 0) de la regla que produce el tramo.
+
+        El tramo debe ser el de todo el texto o uno que haya devuelto
+        `hijos`.
+
+        Levanta
+        -------
+        KeyError
+            Si la variable no produce `texto[inicio:fin]`.
+        """
+        return self._tabla.completados[fin][variable, inicio]
+
+    def hijos(self, n_regla: int, inicio: int, fin: int) -> list[Tramo]:
+        """Devuelve los tramos de la derecha de una regla completada.
+
+        Parámetros
+        ----------
+        n_regla : int
+            El número (desde 0) de la regla.
+        inicio, fin : int
+            El tramo del texto que produce la regla.
+        """
+        derecha = self.reglas[n_regla].derecha
+        if (n_regla, len(derecha), inicio) in self._tabla.saltos[fin]:
+            self._reconstruir(fin, (n_regla, len(derecha), inicio))
+        tramos: list[Tramo] = []
+        for punto in range(len(derecha), 0, -1):
+            anterior = self._tabla.conjuntos[fin][n_regla, punto, inicio]
+            tramos.append(Tramo(derecha[punto - 1], anterior, fin))
+            fin = anterior
+        tramos.reverse()
+        return tramos
+
+    def reglas_completas(self, variable: Variable, inicio: int, fin: int) -> list[int]:
+        """Devuelve todas las reglas de `variable` que producen el tramo.
+
+        Requiere una tabla completa.
+        """
+        conjunto = self._tabla.conjuntos[fin]
+        return [
+            n_regla
+            for n_regla, (izquierda, derecha) in enumerate(self.reglas)
+            if izquierda == variable and (n_regla, len(derecha), inicio) in conjunto
+        ]
+
+    def anteriores(self, n_regla: int, punto: int, inicio: int, fin: int) -> list[int]:
+        """Devuelve dónde puede empezar el símbolo antes del punto.
+
+        Son las posiciones `k` tales que los primeros `punto - 1`
+        símbolos de la regla producen `texto[inicio:k]` y el siguiente
+        produce `texto[k:fin]`. Requiere una tabla completa.
+
+        Parámetros
+        ----------
+        n_regla : int
+            El número (desde 0) de la regla.
+        punto : int
+            Cuántos símbolos de la derecha de la regla se han leído; debe
+            ser al menos 1.
+        inicio, fin : int
+            El tramo del texto que producen esos símbolos.
+        """
+        simbolo = self.reglas[n_regla].derecha[punto - 1]
+        item = (n_regla, punto - 1, inicio)
+        if isinstance(simbolo, Variable):
+            llave = (fin, simbolo)
+            if llave not in self._origenes:
+                self._origenes[llave] = [
+                    origen
+                    for variable, origen in self._tabla.completados[fin]
+                    if variable == simbolo
+                ]
+            candidatos = self._origenes[llave]
+        else:
+            candidatos = [fin - len(simbolo.valor)]
+            if not self.texto.startswith(simbolo.valor, candidatos[0]):
+                return []
+        return [
+            k for k in candidatos if inicio <= k and item in self._tabla.conjuntos[k]
+        ]
+
+    def _reconstruir(self, fin: int, cima: _Item) -> None:
+        """Completa los items que se saltó la optimización de Leo."""
+        variable, inicio = self._tabla.saltos[fin].pop(cima)
+        while True:
+            enlace = self._tabla.enlaces[inicio][variable]
+            assert enlace is not None
+            n_regla, origen = enlace
+            item = (n_regla, len(self.reglas[n_regla].derecha), origen)
+            self._tabla.conjuntos[fin].setdefault(item, inicio)
+            if item == cima:
+                return
+            variable = self.reglas[n_regla].izquierda
+            self._tabla.completados[fin].setdefault((variable, origen), n_regla)
+            inicio = origen
+
+    def pasos(self, derecha: bool = False) -> Iterator[tuple[int, int]]:
+        """Recorre los pasos de una derivación del texto.
+
+        Parámetros
+        ----------
+        derecha : bool, opcional
+            Si es True, la derivación reemplaza siempre la variable más a
+            la derecha; si no (por defecto), la más a la izquierda.
+
+        Devuelve
+        --------
+        Iterator[tuple[int, int]]
+            El número (desde 0) de la regla y la aparición de su
+            variable que se reemplaza, como en `Derivacion.aplicar_regla`.
+        """
+        pila = [Tramo(self.inicial, 0, len(self.texto))]
+        apariciones: collections.Counter[Simbolo] = collections.Counter([self.inicial])
+        while pila:
+            variable, inicio, fin = pila.pop()
+            assert isinstance(variable, Variable)
+            n_regla = self.regla(variable, inicio, fin)
+            hijos = [
+                tramo
+                for tramo in self.hijos(n_regla, inicio, fin)
+                if isinstance(tramo.simbolo, Variable)
+            ]
+            # La pila tiene las variables de la forma sentencial de
+            # izquierda a derecha, o al revés si se deriva por la izquierda.
+            apariciones[variable] -= 1
+            if derecha:
+                yield n_regla, apariciones[variable]
+                pila.extend(hijos)
+            else:
+                yield n_regla, 0
+                pila.extend(reversed(hijos))
+            apariciones.update(tramo.simbolo for tramo in hijos)
+
+
+class ParserEarley:
+    """Analizador de cadenas para una gramática libre de contexto.
+
+    Parámetros
+    ----------
+    reglas : Sequence[Regla]
+        Las reglas de la gramática. Los números de regla de `Analisis`
+        son sus índices.
+    inicial : Variable
+        La variable inicial.
+
+    Métodos
+    -------
+    analizar(texto)
+        Analiza un texto y devuelve su tabla de Earley.
+    reconocer(texto)
+        Decide si un texto pertenece al lenguaje de la gramática.
+    """
+
+    def __init__(self, reglas: Sequence[Regla], inicial: Variable) -> None:
+        self.reglas = reglas
+        self.inicial = inicial
+        self._por_variable: dict[Variable, list[int]] = {}
+        for n_regla, regla in enumerate(reglas):
+            self._por_variable.setdefault(regla.izquierda, []).append(n_regla)
+
+    def analizar(self, texto: str, completo: bool = False) -> Analisis:
+        """Analiza un texto y devuelve su tabla de Earley.
+
+        Parámetros
+        ----------
+        texto : str
+            El texto a analizar.
+        completo : bool, opcional
+            Si es True, no usa la optimización de Leo, de modo que la
+            tabla tiene todos los items y sirve para construir el bosque
+            de todos los árboles (ver `bosques`). Por defecto es False.
+
+        Levanta
+        -------
+        CadenaRechazada
+            Si el texto no pertenece al lenguaje de la gramática.
+        """
+        tabla = _Tabla.vacia(len(texto), leo=not completo)
+        for n_regla in self._por_variable.get(self.inicial, ()):
+            tabla.conjuntos[0][n_regla, 0, 0] = 0
+        alcanzado = 0
+        for posicion, conjunto in enumerate(tabla.conjuntos):
+            if conjunto:
+                alcanzado = posicion
+                self._cerrar(tabla, texto, posicion)
+        if (self.inicial, 0) not in tabla.completados[-1]:
+            raise CadenaRechazada(
+                "La cadena no pertenece al lenguaje de la gramática; el "
+                f"análisis se detuvo en la posición {alcanzado}",
+                alcanzado,
+            )
+        return Analisis(self.reglas, self.inicial, texto, tabla)
+
+    def reconocer(self, texto: str) -> bool:
+        """Decide si un texto pertenece al lenguaje de la gramática."""
+        try:
+            self.analizar(texto)
+        except CadenaRechazada:
+            return False
+        return True
+
+    def _cerrar(  # pylint: disable=too-many-locals
+        self, tabla: _Tabla, texto: str, posicion: int
+    ) -> None:
+        """Predice, completa y lee los items del conjunto de una posición."""
+        conjunto = tabla.conjuntos[posicion]
+        completados = tabla.completados[posicion]
+        pendientes = list(conjunto)
+
+        def agregar(item: _Item, anterior: int) -> None:
+            if item not in conjunto:
+                conjunto[item] = anterior
+                pendientes.append(item)
+
+        for n_regla, punto, origen in pendientes:
+            izquierda, derecha = self.reglas[n_regla]
+            if punto == len(derecha):  # Completar.
+                if (izquierda, origen) in completados:
+                    continue
+                completados[izquierda, origen] = n_regla
+                for item, anterior in self._completar(
+                    tabla, posicion, izquierda, origen
+                ):
+                    agregar(item, anterior)
+                continue
+            simbolo = derecha[punto]
+            if isinstance(simbolo, Variable):  # Predecir.
+                espera = tabla.esperando[posicion].setdefault(simbolo, [])
+                espera.append((n_regla, punto, origen))
+                if len(espera) == 1:
+                    for n_nueva in self._por_variable.get(simbolo, ()):
+                        agregar((n_nueva, 0, posicion), posicion)
+                if (simbolo, posicion) in completados:
+                    agregar((n_regla, punto + 1, origen), posicion)
+            elif texto.startswith(simbolo.valor, posicion):  # Leer.
+                siguiente = tabla.conjuntos[posicion + len(simbolo.valor)]
+                siguiente.setdefault((n_regla, punto + 1, origen), posicion)
+
+    def _completar(
+        self, tabla: _Tabla, posicion: int, variable: Variable, origen: int
+    ) -> list[tuple[_Item, int]]:
+        """Devuelve los items que avanzan al completar `variable` en `posicion`.
+
+        Cada item va con la posición donde empieza `variable`.
+        """
+        # Optimización de Leo, sólo con conjuntos ya cerrados.
+        cima = None
+        if tabla.leo and origen < posicion:
+            cima = self._cima(tabla, origen, variable)
+        if cima is not None:
+            item = (cima[0], len(self.reglas[cima[0]].derecha), cima[1])
+            if item not in tabla.conjuntos[posicion]:
+                tabla.saltos[posicion][item] = (variable, origen)
+            return [(item, cima[2])]
+        return [
+            ((n_regla, punto + 1, inicio), origen)
+            for n_regla, punto, inicio in tabla.esperando[origen].get(variable, ())
+        ]
+
+    def _enlace(
+        self, tabla: _Tabla, posicion: int, variable: Variable
+    ) -> tuple[int, int] | None:
+        """Devuelve el único item que espera a `variable` como último símbolo.
+
+        El item debe empezar antes de `posicion`, para que las cadenas de
+        enlaces no tengan ciclos.
+        """
+        enlaces = tabla.enlaces[posicion]
+        if variable not in enlaces:
+            enlaces[variable] = None
+            espera = tabla.esperando[posicion].get(variable, ())
+            if len(espera) == 1:
+                n_regla, punto, origen = espera[0]
+                ultimo = punto + 1 == len(self.reglas[n_regla].derecha)
+                if ultimo and origen < posicion:
+                    enlaces[variable] = (n_regla, origen)
+        return enlaces[variable]
+
+    def _cima(
+        self, tabla: _Tabla, posicion: int, variable: Variable
+    ) -> tuple[int, int, int] | None:
+        """Devuelve el item de arriba de la cadena de enlaces de `variable`.
+
+        Las cimas se guardan en la tabla, así que cada enlace se recorre
+        una sola vez en todo el análisis.
+        """
+        recorrido: list[tuple[int, Variable]] = []
+        inicio, actual = posicion, variable
+        while actual not in tabla.cimas[inicio]:
+            enlace = self._enlace(tabla, inicio, actual)
+            if enlace is None:
+                tabla.cimas[inicio][actual] = None
+                break
+            recorrido.append((inicio, actual))
+            inicio, actual = enlace[1], self.reglas[enlace[0]].izquierda
+        cima = tabla.cimas[inicio][actual]
+        for inicio, actual in reversed(recorrido):
+            enlace = tabla.enlaces[inicio][actual]
+            assert enlace is not None
+            if cima is None:
+                cima = (enlace[0], enlace[1], inicio)
+            tabla.cimas[inicio][actual] = cima
+        return cima
@@ -0,0 +1,315 @@
+"""Módulo para analizar gramáticas en notación BNF extendida (EBNF).
+
+La notación extiende la de `bnf` con:
+
+- Repetición de cero o más veces: `{ x }` o `x*`.
+- Repetición de una o más veces: `x+`.
+- Opcionales: `[ x ]` o `x?`.
+- Agrupación: `( x | y )`.
+- Rangos de caracteres: `"a".."z"`, que equivale a `("a" | ... | "z")`.
+
+Cada producción sigue ocupando una línea. El resultado es una gramática
+en BNF, como la de `ParserBNFLibreContexto.diseccionar`, en la que se
+introduce el menor número de variables nuevas (auxiliares):
+
+- Los grupos, los rangos y los opcionales se distribuyen sobre la
+  cadena que los contiene, de modo que `<A> ::= "a" ["b"]` produce
+  `<A> ::= "a" "b" | "a"` sin variables nuevas, mientras el número de
+  alternativas de la cadena no pase de `maximo_de_alternativas`.
+- Cada repetición necesita una variable auxiliar recursiva por la
+  derecha: `{x}` produce `<{x}> ::= x <{x}> | ε`. Como `x+` equivale a
+  `x {x}`, comparte la variable con `{x}` y con `x*`.
+
+El nombre de cada variable auxiliar es el texto de su subexpresión, así
+que no puede coincidir con el de una variable del texto (los nombres de
+éstas no llevan llaves, corchetes, paréntesis ni comillas) y las
+subexpresiones iguales comparten una sola variable en toda la
+gramática.
+
+Clases
+------
+ParserEBNF
+    Analizador sintáctico para gramáticas en notación EBNF.
+"""
+
+import dataclasses
+import re
+from collections.abc import Iterable, Sequence
+
+from .bnf import (
+    ParserBNFLibreContexto,
+    Token,
+    _error,
+    _simbolo,
+    expresion_de_tokens,
+)
+from .estructuras import (
+    Cadena,
+    GramaticaLibreContextoMap,
+    Simbolo,
+    Terminal,
+    UnionCadenas,
+    Variable,
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class _Grupo:
+    """Alternativas entre paréntesis, cada una una sucesión de nodos."""
+
+    alternativas: tuple[tuple["_Nodo", ...], ...]
+
+
+@dataclasses.dataclass(frozen=True)
+class _Repeticion:
+    """Cero o más repeticiones de un nodo."""
+
+    cuerpo: "_Nodo"
+
+
+@dataclasses.dataclass(frozen=True)
+class _Opcional:
+    """Un nodo que puede omitirse."""
+
+    cuerpo: "_Nodo"
+
+
+@dataclasses.dataclass(frozen=True)
+class _Rango:
+    """Los caracteres de `inicio` a `fin`, inclusive."""
+
+    inicio: str
+    fin: str
+
+
+_Nodo = Simbolo | _Grupo | _Repeticion | _Opcional | _Rango
+
+# Tipos de token con los que empieza un factor, y el que lo cierra.
+_APERTURAS = {
+    "ABRE_GRUPO": "CIERRA_GRUPO",
+    "ABRE_REPETICION": "CIERRA_REPETICION",
+    "ABRE_OPCIONAL": "CIERRA_OPCIONAL",
+}
+_INICIOS_DE_FACTOR = frozenset({"TERMINAL", "NO_TERMINAL", *_APERTURAS})
+_SUFIJOS = frozenset({"ESTRELLA", "MAS", "INTERROGACION"})
+
+
+def _agrupar(alternativas: Sequence[tuple[_Nodo, ...]]) -> _Nodo:
+    """Construye un grupo, o devuelve su único nodo si no hace falta.
+
+    Así `("a")`, `{"a"}` y `"a"*` producen los mismos nodos y comparten
+    variables auxiliares.
+    """
+    if len(alternativas) == 1 and len(alternativas[0]) == 1:
+        return alternativas[0][0]
+    return _Grupo(tuple(alternativas))
+
+
+def _texto(nodo: _Nodo, parentesis: bool = True) -> str:
+    """Escribe un nodo en notación EBNF, para nombrar su variable auxiliar."""
+    match nodo:
+        case _Grupo(alternativas):
+            texto = " | ".join(
+                " ".join(map(_texto, secuencia)) for secuencia in alternativas
+            )
+            return f"({texto})" if parentesis else texto
+        case _Repeticion(cuerpo):
+            return f"{{{_texto(cuerpo, False)}}}"
+        case _Opcional(cuerpo):
+            return f"[{_texto(cuerpo, False)}]"
+        case _Rango(inicio, fin):
+            return f'"{inicio}".."{fin}"'
+    return str(nodo)
+
+
+class _Lector:
+    """Analizador descendente recursivo de la derecha de una producción."""
+
+    def __init__(self, tokens: Sequence[Token], fin: Token) -> None:
+        self.tokens = tokens
+        self.fin = fin
+        self.indice = 0
+
+    def actual(self) -> Token:
+        """Devuelve el token actual sin consumirlo."""
+        if self.indice < len(self.tokens):
+            return self.tokens[self.indice]
+        return self.fin
+
+    def siguiente(self) -> Token:
+        """Consume y devuelve el token actual."""
+        token = self.actual()
+        self.indice += 1
+        return token
+
+    def expresion(self) -> tuple[tuple[_Nodo, ...], ...]:
+        """Lee alternativas separadas por `|`."""
+        alternativas = [self.secuencia()]
+        while self.actual().tipo == "UNION":
+            self.indice += 1
+            alternativas.append(self.secuencia())
+        return tuple(alternativas)
+
+    def secuencia(self) -> tuple[_Nodo, ...]:
+        """Lee una sucesión de factores."""
+        nodos: list[_Nodo] = []
+        while self.actual().tipo in _INICIOS_DE_FACTOR:
+            nodos.append(self.factor())
+        if not nodos:
+            raise _error(
+                "Se esperaba un símbolo, un grupo o una repetición", self.actual()
+            )
+        return tuple(nodos)
+
+    def factor(self) -> _Nodo:
+        """Lee un factor con sus sufijos `*`, `+` y `?`."""
+        nodo = self.primario()
+        while self.actual().tipo in _SUFIJOS:
+            match self.siguiente().tipo:
+                case "ESTRELLA":
+                    nodo = _Repeticion(nodo)
+                case "MAS":
+                    nodo = _agrupar([(nodo, _Repeticion(nodo))])
+                case _:
+                    nodo = _Opcional(nodo)
+        return nodo
+
+    def primario(self) -> _Nodo:
+        """Lee un símbolo, un rango o una expresión entre delimitadores."""
+        token = self.siguiente()
+        if token.tipo in _APERTURAS:
+            nodo = _agrupar(self.expresion())
+            cierre = self.siguiente()
+            if cierre.tipo != _APERTURAS[token.tipo]:
+                raise _error(f"Falta cerrar el '{token.valor}'", cierre)
+            if token.tipo == "ABRE_REPETICION":
+                return _Repeticion(nodo)
+            if token.tipo == "ABRE_OPCIONAL":
+                return _Opcional(nodo)
+            return nodo
+        simbolo = _simbolo(token.valor)
+        if self.actual().tipo != "RANGO":
+            return simbolo
+        self.indice += 1
+        final = self.siguiente()
+        if final.tipo != "TERMINAL":
+            raise _error("Se esperaba un símbolo terminal", final)
+        inicio, fin = simbolo.valor, _simbolo(final.valor).valor
+        if not isinstance(simbolo, Terminal) or len(inicio) != 1 or len(fin) != 1:
+            raise _error("Los extremos de un rango deben ser un carácter", token)
+        if inicio > fin:
+            raise _error(f"El rango de '{inicio}' a '{fin}' está vacío", token)
+        return _Rango(inicio, fin)
+
+
+class ParserEBNF(ParserBNFLibreContexto):
+    """Analizador sintáctico para gramáticas en notación EBNF.
+
+    Atributos
+    ---------
+    maximo_de_alternativas : int
+        Número máximo de alternativas en que se puede distribuir una
+        cadena con grupos, rangos u opcionales. Lo que no cabe usa una
+        variable auxiliar.
+    """
+
+    spec_tokens = {
+        "NO_TERMINAL": ParserBNFLibreContexto.spec_tokens["NO_TERMINAL"],
+        "TERMINAL": ParserBNFLibreContexto.spec_tokens["TERMINAL"],
+        "UNION": r"\|",
+        "PRODUCCION": r"::=",
+        "RANGO": r"\.\.",  # Entre los extremos de un rango de caracteres
+        "ABRE_GRUPO": r"\(",
+        "CIERRA_GRUPO": r"\)",
+        "ABRE_REPETICION": r"\{",
+        "CIERRA_REPETICION": r"\}",
+        "ABRE_OPCIONAL": r"\[",
+        "CIERRA_OPCIONAL": r"\]",
+        "ESTRELLA": r"\*",
+        "MAS": r"\+",
+        "INTERROGACION": r"\?",
+        "NUEVA_LINEA": r"\n",
+        "FIN": r"$",
+        "ERROR": r".",
+    }
+    tok_regex = expresion_de_tokens(spec_tokens, ParserBNFLibreContexto.spec_ignorados)
+    patron = re.compile(tok_regex)
+    inicios_largos = frozenset('<":.')
+    maximo_de_alternativas = 8
+
+    def __init__(self) -> None:
+        self._auxiliares: dict[_Nodo, Variable] = {}
+        self._reglas_auxiliares: dict[Variable, list[Cadena]] = {}
+
+    def _derecha(self, linea: Sequence[Token], fin: Token) -> list[Cadena]:
+        lector = _Lector(linea, fin)
+        alternativas = lector.expresion()
+        if lector.indice < len(linea):
+            raise _error("Se esperaba '|' o el fin de la línea", lector.actual())
+        cadenas = (
+            Cadena(simbolos)
+            for secuencia in alternativas
+            for simbolos in self._expandir_secuencia(secuencia)
+        )
+        return list(dict.fromkeys(cadenas))
+
+    def _diseccionar(self, tokens: Iterable[Token]) -> GramaticaLibreContextoMap:
+        self._auxiliares.clear()
+        self._reglas_auxiliares.clear()
+        gramatica = dict(super()._diseccionar(tokens))
+        for variable, cadenas in self._reglas_auxiliares.items():
+            gramatica[variable] = UnionCadenas(cadenas)
+        return gramatica
+
+    def _expandir(self, nodo: _Nodo) -> list[list[Simbolo]]:
+        """Devuelve las alternativas en BNF de un nodo."""
+        match nodo:
+            case _Grupo(alternativas):
+                return [
+                    simbolos
+                    for secuencia in alternativas
+                    for simbolos in self._expandir_secuencia(secuencia)
+                ]
+            case _Rango(inicio, fin):
+                return [
+                    [Terminal(chr(codigo))]
+                    for codigo in range(ord(inicio), ord(fin) + 1)
+                ]
+            case _Opcional(cuerpo):
+                return [*self._expandir(cuerpo), []]
+            case _Repeticion():
+                return [[self._auxiliar(nodo)]]
+        return [[nodo]]
+
+    def _expandir_secuencia(self, secuencia: Sequence[_Nodo]) -> list[list[Simbolo]]:
+        """Distribuye los nodos de una sucesión en alternativas en BNF."""
+        parciales: list[list[Simbolo]] = [[]]
+        for nodo in secuencia:
+            opciones = self._expandir(nodo)
+            if len(opciones) > 1 and len(secuencia) > 1:
+                if len(parciales) * len(opciones) > self.maximo_de_alternativas:
+                    opciones = [[self._auxiliar(nodo)]]
+            parciales = [
+                parcial + opcion for parcial in parciales for opcion in opciones
+            ]
+        return parciales
+
+    def _auxiliar(self, nodo: _Nodo) -> Variable:
+        """Devuelve la variable auxiliar de un nodo, creándola si hace falta."""
+        variable = self._auxiliares.get(nodo)
+        if variable is not None:
+            return variable
+        variable = self._auxiliares[nodo] = Variable(_texto(nodo))
+        if isinstance(nodo, _Repeticion):
+            # Las alternativas vacías del cuerpo darían la regla cíclica
+            # `A → A`; la alternativa ε de la repetición ya las cubre.
+            cadenas = [
+                Cadena([*cuerpo, variable])
+                for cuerpo in map(Cadena, self._expandir(nodo.cuerpo))
+                if cuerpo
+            ]
+            cadenas.append(Cadena([]))
+        else:
+            cadenas = [Cadena(simbolos) for simbolos in self._expandir(nodo)]
+        self._reglas_auxiliares[variable] = list(dict.fromkeys(cadenas))
+        return variable
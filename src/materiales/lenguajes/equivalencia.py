@@ -0,0 +1,236 @@
+"""Comparación acotada de los lenguajes de dos gramáticas.
+
+Decidir si dos gramáticas libres de contexto generan el mismo lenguaje
+es imposible en general, pero al transformar una gramática (por
+ejemplo, al eliminar la recursión por la izquierda) basta con revisar
+que las palabras cortas no cambiaron. `comparar` lo hace para todas las
+palabras de hasta cierta longitud.
+
+Para cada gramática, un proceso llena una sola vez las tablas de
+palabras de todas las longitudes (con `bosques.cadenas_por_longitud`) y
+devuelve, por cada longitud, sólo un resumen: cuántas palabras hay, una
+huella que no depende de su orden y algunas palabras elegidas al azar
+como testigos. Si los números o las huellas de las dos gramáticas no
+coinciden, o si la otra gramática no reconoce alguno de los testigos
+(con el analizador de Earley), los lenguajes difieren en esa longitud.
+Sólo entonces, y sólo para la primera longitud en la que difieren, se
+calculan las palabras de ambas para dar el contraejemplo más corto.
+
+Clases
+------
+Resumen
+    Número, huella y testigos de las palabras de una longitud.
+Contraejemplo
+    Una palabra que genera sólo una de las dos gramáticas.
+
+Funciones
+---------
+palabras(reglas, inicial, longitud)
+    Devuelve las palabras de una longitud que genera una gramática.
+resumir(reglas, inicial, longitud, muestras=8, semilla=0)
+    Resume las palabras de una longitud que genera una gramática.
+comparar(primera, segunda, longitud_maxima)
+    Compara los lenguajes de dos gramáticas hasta cierta longitud.
+"""
+
+import concurrent.futures
+import hashlib
+import random
+from collections.abc import Iterable, Sequence
+from typing import NamedTuple
+
+from . import bosques
+from .estructuras import Regla, Variable
+from .gramaticas import GramaticaLibreContexto
+
+_MODULO_HUELLA = 1 << 64
+
+
+class Resumen(NamedTuple):
+    """Número, huella y testigos de las palabras de una longitud."""
+
+    palabras: int
+    huella: int
+    testigos: tuple[str, ...]
+
+
+class Contraejemplo(NamedTuple):
+    """Una palabra que genera sólo una de las dos gramáticas.
+
+    `en_primera` es True si la genera la primera gramática y no la
+    segunda, y False si es al revés.
+    """
+
+    cadena: str
+    en_primera: bool
+
+
+def palabras(reglas: Sequence[Regla], inicial: Variable, longitud: int) -> set[str]:
+    """Devuelve las palabras de una longitud que genera una gramática.
+
+    Ver `bosques.cadenas_por_longitud`, que calcula las de todas las
+    longitudes hasta `longitud` y cuyo costo es exponencial en ella.
+
+    Parámetros
+    ----------
+    reglas : Sequence[Regla]
+        Las reglas de producción de la gramática.
+    inicial : Variable
+        La variable inicial.
+    longitud : int
+        La longitud, en caracteres, de las palabras.
+    """
+    tablas = bosques.cadenas_por_longitud(reglas, longitud)
+    return tablas[inicial][longitud] if inicial in tablas else set()
+
+
+def _huella(cadenas: Iterable[str]) -> int:
+    """Suma, módulo 2⁶⁴, de un hash de cada cadena.
+
+    No depende del orden de las cadenas. Se usa BLAKE2 y no `hash`
+    porque el hash de las cadenas cambia de un proceso a otro.
+    """
+    total = 0
+    for cadena in cadenas:
+        digesto = hashlib.blake2b(cadena.encode(), digest_size=8).digest()
+        total += int.from_bytes(digesto)
+    return total % _MODULO_HUELLA
+
+
+def resumir(
+    reglas: Sequence[Regla],
+    inicial: Variable,
+    longitud: int,
+    muestras: int = 8,
+    semilla: int = 0,
+) -> Resumen:
+    """Resume las palabras de una longitud que genera una gramática.
+
+    Devuelve su número, su huella y hasta `muestras` de ellas elegidas
+    al azar. Los testigos dependen sólo de las palabras, la longitud y
+    la semilla.
+    """
+    return _resumen(palabras(reglas, inicial, longitud), longitud, muestras, semilla)
+
+
+def _resumir_hasta(
+    reglas: Sequence[Regla],
+    inicial: Variable,
+    longitud_maxima: int,
+    muestras: int,
+    semilla: int,
+) -> list[Resumen]:
+    """Resume las palabras de cada longitud, llenando las tablas una vez."""
+    tablas = bosques.cadenas_por_longitud(reglas, longitud_maxima)
+    vacias: list[set[str]] = [set()] * (longitud_maxima + 1)
+    return [
+        _resumen(producidas, longitud, muestras, semilla)
+        for longitud, producidas in enumerate(tablas.get(inicial, vacias))
+    ]
+
+
+def _resumen(
+    producidas: Iterable[str], longitud: int, muestras: int, semilla: int
+) -> Resumen:
+    """Número, huella y testigos de unas palabras de la misma longitud."""
+    ordenadas = sorted(producidas)
+    azar = random.Random(f"{semilla}:{longitud}")
+    testigos = azar.sample(ordenadas, min(muestras, len(ordenadas)))
+    return Resumen(len(ordenadas), _huella(ordenadas), tuple(testigos))
+
+
+def comparar(  # pylint: disable=too-many-arguments
+    primera: GramaticaLibreContexto,
+    segunda: GramaticaLibreContexto,
+    longitud_maxima: int,
+    *,
+    muestras: int = 8,
+    semilla: int = 0,
+    trabajadores: int | None = None,
+    procesos: bool = True,
+) -> Contraejemplo | None:
+    """Compara los lenguajes de dos gramáticas hasta cierta longitud.
+
+    Parámetros
+    ----------
+    primera, segunda : GramaticaLibreContexto
+        Las gramáticas a comparar.
+    longitud_maxima : int
+        La longitud máxima, en caracteres, de las palabras.
+    muestras : int, opcional
+        Cuántos testigos de cada longitud se buscan en la otra gramática.
+        Por defecto, 8.
+    semilla : int, opcional
+        Semilla para elegir los testigos.
+    trabajadores : int | None, opcional
+        Número de gramáticas que se resumen a la vez, como mucho 2 (el
+        valor por defecto).
+    procesos : bool, opcional
+        True (por defecto) para calcular los resúmenes en un grupo de
+        procesos, False para usar hilos.
+
+    Devuelve
+    --------
+    Contraejemplo o None
+        La palabra más corta (y, entre las de su longitud, la primera en
+        orden alfabético) que genera sólo una de las gramáticas; o None
+        si generan las mismas palabras hasta `longitud_maxima`.
+    """
+    gramaticas = (primera, segunda)
+    if trabajadores is None or trabajadores > len(gramaticas):
+        trabajadores = len(gramaticas)
+    ejecutor: concurrent.futures.Executor
+    if procesos:
+        ejecutor = concurrent.futures.ProcessPoolExecutor(trabajadores)
+    else:
+        ejecutor = concurrent.futures.ThreadPoolExecutor(trabajadores)
+    try:
+        futuros = [
+            ejecutor.submit(
+                _resumir_hasta,
+                list(gramatica.reglas),
+                gramatica.variable_inicial,
+                longitud_maxima,
+                muestras,
+                semilla,
+            )
+            for gramatica in gramaticas
+        ]
+        resumenes = [futuro.result() for futuro in futuros]
+    finally:
+        # Si falla un trabajo, no se espera a que termine el otro.
+        ejecutor.shutdown(wait=False, cancel_futures=True)
+    for longitud, (resumen_primera, resumen_segunda) in enumerate(zip(*resumenes)):
+        if not _coinciden(resumen_primera, resumen_segunda, gramaticas):
+            # Los resúmenes sólo difieren si las palabras difieren, así que
+            # la primera longitud distinta tiene el contraejemplo.
+            return _contraejemplo(primera, segunda, longitud)
+    return None
+
+
+def _coinciden(
+    primero: Resumen,
+    segundo: Resumen,
+    gramaticas: tuple[GramaticaLibreContexto, GramaticaLibreContexto],
+) -> bool:
+    """Decide si dos resúmenes de la misma longitud son consistentes."""
+    if primero.palabras != segundo.palabras or primero.huella != segundo.huella:
+        return False
+    return all(
+        gramaticas[1].parser_earley.reconocer(testigo) for testigo in primero.testigos
+    ) and all(
+        gramaticas[0].parser_earley.reconocer(testigo) for testigo in segundo.testigos
+    )
+
+
+def _contraejemplo(
+    primera: GramaticaLibreContexto, segunda: GramaticaLibreContexto, longitud: int
+) -> Contraejemplo | None:
+    """Devuelve la primera palabra de una longitud que sólo genera una."""
+    de_primera = palabras(primera.reglas, primera.variable_inicial, longitud)
+    de_segunda = palabras(segunda.reglas, segunda.variable_inicial, longitud)
+    diferencia = de_primera ^ de_segunda
+    if not diferencia:
+        return None
+    cadena = min(diferencia)
+    return Contraejemplo(cadena, cadena in de_primera)
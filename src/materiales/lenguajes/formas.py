@@ -0,0 +1,312 @@
+"""Formas sentenciales indexadas para derivaciones largas.
+
+Una derivación reemplaza, en cada paso, la n-ésima aparición de una
+variable por la derecha de una regla. Buscar esa aparición recorriendo
+la forma sentencial y copiarla en una tupla nueva cuesta O(n) por paso,
+así que una derivación de miles de pasos tarda un tiempo cuadrático.
+
+`FormaSentencial` guarda la forma en bloques de tamaño parecido y lleva,
+para cada variable, un árbol de Fenwick con el número de sus apariciones
+en cada bloque. Encontrar la n-ésima aparición toma O(log n) para
+llegar al bloque más un recorrido del bloque, y el reemplazo sólo
+modifica ese bloque. Cuando un bloque crece demasiado se parte en dos,
+y cuando hay demasiados bloques, la forma se vuelve a repartir en
+bloques de tamaño proporcional a la raíz de su longitud.
+
+La estructura general, `SucesionIndexada`, busca los elementos por una
+clave cualquiera; el árbol de derivación la usa para sus hojas sin
+expandir.
+
+Clases
+------
+ArbolFenwick
+    Sumas de prefijos de una sucesión de enteros, con actualizaciones.
+SucesionIndexada
+    Sucesión que se puede reescribir por posición y buscar por clave.
+FormaSentencial
+    Sucesión de símbolos que se puede reescribir por aparición.
+"""
+
+import itertools
+import math
+from collections import Counter
+from collections.abc import Callable, Hashable, Iterable, Iterator, Sequence
+from typing import TypeVar, overload
+
+from .estructuras import Cadena, Simbolo, Variable
+
+T = TypeVar("T")
+
+
+class ArbolFenwick:
+    """Sumas de prefijos de una sucesión de enteros, con actualizaciones.
+
+    Parámetros
+    ----------
+    valores : Iterable[int]
+        Los valores iniciales de la sucesión.
+
+    Métodos
+    -------
+    sumar(indice, cantidad)
+        Suma una cantidad al valor de una posición.
+    prefijo(indice)
+        Suma de los valores anteriores a una posición.
+    buscar(cantidad)
+        Primera posición en la que la suma acumulada pasa de una cantidad.
+    valores()
+        Devuelve la sucesión.
+    """
+
+    def __init__(self, valores: Iterable[int] = ()) -> None:
+        # El arreglo empieza en 1; cada posición i acumula los valores de
+        # i - (i & -i) + 1 a i. Se construye en tiempo lineal.
+        self._arbol = [0, *valores]
+        for i in range(1, len(self._arbol)):
+            j = i + (i & -i)
+            if j < len(self._arbol):
+                self._arbol[j] += self._arbol[i]
+
+    def __len__(self) -> int:
+        """Devuelve la longitud de la sucesión."""
+        return len(self._arbol) - 1
+
+    def sumar(self, indice: int, cantidad: int) -> None:
+        """Suma `cantidad` al valor en la posición `indice`."""
+        i = indice + 1
+        while i < len(self._arbol):
+            self._arbol[i] += cantidad
+            i += i & -i
+
+    def prefijo(self, indice: int) -> int:
+        """Devuelve la suma de los valores en las posiciones `0..indice-1`."""
+        total, i = 0, indice
+        while i > 0:
+            total += self._arbol[i]
+            i -= i & -i
+        return total
+
+    def valores(self) -> list[int]:
+        """Devuelve la sucesión, deshaciendo la construcción en tiempo lineal."""
+        valores = self._arbol[:]
+        for i in range(len(valores) - 1, 0, -1):
+            j = i + (i & -i)
+            if j < len(valores):
+                valores[j] -= valores[i]
+        return valores[1:]
+
+    def buscar(self, cantidad: int) -> int:
+        """Devuelve la primera posición en la que la suma pasa de `cantidad`.
+
+        Los valores deben ser no negativos. Si la suma de toda la
+        sucesión no pasa de `cantidad`, devuelve la longitud.
+        """
+        posicion, paso = 0, 1 << len(self).bit_length()
+        while paso:
+            siguiente = posicion + paso
+            if siguiente < len(self._arbol) and self._arbol[siguiente] <= cantidad:
+                posicion = siguiente
+                cantidad -= self._arbol[siguiente]
+            paso >>= 1
+        return posicion
+
+
+class SucesionIndexada(Sequence[T]):
+    """Sucesión que se puede reescribir por posición y buscar por clave.
+
+    Cada elemento tiene una clave, que puede ser None. La sucesión lleva,
+    para cada clave, un árbol de Fenwick con el número de elementos de
+    esa clave en cada bloque.
+
+    Parámetros
+    ----------
+    elementos : Iterable[T]
+        Los elementos iniciales.
+    clave : Callable[[T], Hashable | None]
+        Devuelve la clave de un elemento, o None si no se busca por ella.
+
+    Atributos
+    ---------
+    tamanno_minimo : int
+        Tamaño mínimo de los bloques al repartir la sucesión.
+
+    Métodos
+    -------
+    contar(clave)
+        Número de elementos con una clave.
+    posicion(clave, n_salto=0)
+        Posición del n-ésimo elemento con una clave.
+    reemplazar(posicion, elementos)
+        Reemplaza el elemento de una posición por una sucesión.
+    """
+
+    tamanno_minimo = 64
+
+    def __init__(
+        self, elementos: Iterable[T], clave: Callable[[T], Hashable | None]
+    ) -> None:
+        self._clave = clave
+        self._bloques: list[list[T]] = []
+        self._longitudes = ArbolFenwick()
+        self._conteos: dict[Hashable, ArbolFenwick] = {}
+        self._tamanno = self.tamanno_minimo
+        self._repartir(list(elementos))
+
+    def __len__(self) -> int:
+        """Devuelve el número de elementos."""
+        return self._longitudes.prefijo(len(self._longitudes))
+
+    def __iter__(self) -> Iterator[T]:
+        """Recorre los elementos de izquierda a derecha."""
+        return itertools.chain.from_iterable(self._bloques)
+
+    @overload
+    def __getitem__(self, indice: int) -> T: ...
+
+    @overload
+    def __getitem__(self, indice: slice) -> Sequence[T]: ...
+
+    def __getitem__(self, indice: int | slice) -> T | Sequence[T]:
+        """Devuelve un elemento o una rebanada."""
+        if isinstance(indice, slice):
+            return list(self)[indice]
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("Índice fuera de la sucesión")
+        bloque = self._longitudes.buscar(indice)
+        return self._bloques[bloque][indice - self._longitudes.prefijo(bloque)]
+
+    def contar(self, clave: Hashable) -> int:
+        """Devuelve el número de elementos con clave `clave`."""
+        conteo = self._conteos.get(clave)
+        return 0 if conteo is None else conteo.prefijo(len(conteo))
+
+    def posicion(self, clave: Hashable, n_salto: int = 0) -> int:
+        """Devuelve la posición del elemento `n_salto` con clave `clave`.
+
+        Parámetros
+        ----------
+        clave : Hashable
+            La clave que se busca.
+        n_salto : int, opcional
+            Cuántos elementos con esa clave se saltan, contando desde la
+            izquierda. Por defecto, se busca el primero.
+
+        Levanta
+        -------
+        IndexError
+            Si no hay tantos elementos con esa clave.
+        """
+        conteo = self._conteos.get(clave)
+        if conteo is None or not 0 <= n_salto < self.contar(clave):
+            raise IndexError(f"{clave} no aparece {n_salto + 1} veces")
+        bloque = conteo.buscar(n_salto)
+        restantes = n_salto - conteo.prefijo(bloque)
+        for desplazamiento, elemento in enumerate(self._bloques[bloque]):
+            if self._clave(elemento) == clave:
+                if not restantes:
+                    return self._longitudes.prefijo(bloque) + desplazamiento
+                restantes -= 1
+        raise AssertionError("Conteo inconsistente")  # pragma: no cover
+
+    def reemplazar(self, posicion: int, elementos: Sequence[T]) -> T:
+        """Reemplaza el elemento en `posicion` por `elementos`.
+
+        Devuelve el elemento reemplazado.
+        """
+        bloque = self._longitudes.buscar(posicion)
+        if bloque == len(self._bloques):
+            raise IndexError("Índice fuera de la sucesión")
+        inicio = posicion - self._longitudes.prefijo(bloque)
+        elementos_bloque = self._bloques[bloque]
+        anterior = elementos_bloque[inicio]
+        elementos_bloque[inicio : inicio + 1] = elementos
+        self._longitudes.sumar(bloque, len(elementos) - 1)
+        clave = self._clave(anterior)
+        if clave is not None:
+            self._conteos[clave].sumar(bloque, -1)
+        for elemento in elementos:
+            clave = self._clave(elemento)
+            if clave is not None:
+                if clave not in self._conteos:
+                    self._conteos[clave] = ArbolFenwick([0] * len(self._bloques))
+                self._conteos[clave].sumar(bloque, 1)
+        if len(elementos_bloque) > 2 * self._tamanno:
+            if len(self._bloques) < 2 * self._tamanno:
+                self._partir(bloque)
+            else:
+                self._repartir(list(self))
+        return anterior
+
+    def _partir(self, bloque: int) -> None:
+        """Parte un bloque en dos mitades y actualiza los índices."""
+        izquierda = self._bloques[bloque]
+        derecha = izquierda[len(izquierda) // 2 :]
+        del izquierda[len(izquierda) // 2 :]
+        self._bloques.insert(bloque + 1, derecha)
+        self._longitudes = _partir_valor(self._longitudes, bloque, len(derecha))
+        movidos = Counter(map(self._clave, derecha))
+        for clave, conteo in self._conteos.items():
+            self._conteos[clave] = _partir_valor(conteo, bloque, movidos[clave])
+
+    def _repartir(self, elementos: list[T]) -> None:
+        """Reparte los elementos en bloques y reconstruye los índices."""
+        self._tamanno = max(self.tamanno_minimo, math.isqrt(len(elementos)))
+        self._bloques = [
+            elementos[i : i + self._tamanno]
+            for i in range(0, len(elementos), self._tamanno)
+        ] or [[]]
+        self._longitudes = ArbolFenwick(map(len, self._bloques))
+        conteos: dict[Hashable, list[int]] = {}
+        for i, bloque in enumerate(self._bloques):
+            for elemento in bloque:
+                clave = self._clave(elemento)
+                if clave is not None:
+                    conteos.setdefault(clave, [0] * len(self._bloques))[i] += 1
+        self._conteos = {
+            clave: ArbolFenwick(conteo) for clave, conteo in conteos.items()
+        }
+
+
+def _partir_valor(arbol: ArbolFenwick, indice: int, derecha: int) -> ArbolFenwick:
+    """Parte el valor de una posición en dos, dejando `derecha` en la segunda."""
+    valores = arbol.valores()
+    valores[indice : indice + 1] = [valores[indice] - derecha, derecha]
+    return ArbolFenwick(valores)
+
+
+def _variable(simbolo: Simbolo) -> Variable | None:
+    """Clave de un símbolo en una forma sentencial."""
+    return simbolo if isinstance(simbolo, Variable) else None
+
+
+class FormaSentencial(SucesionIndexada[Simbolo]):
+    """Sucesión de símbolos que se puede reescribir por aparición.
+
+    Es una `SucesionIndexada` en la que la clave de cada variable es la
+    variable misma, y los terminales no tienen clave.
+
+    Parámetros
+    ----------
+    simbolos : Iterable[Simbolo]
+        Los símbolos iniciales de la forma.
+
+    Métodos
+    -------
+    contar(variable)
+        Número de apariciones de una variable.
+    posicion(variable, n_salto=0)
+        Posición de la n-ésima aparición de una variable.
+    reemplazar(posicion, simbolos)
+        Reemplaza el símbolo de una posición por una sucesión.
+    cadena()
+        Devuelve la forma como `Cadena`.
+    """
+
+    def __init__(self, simbolos: Iterable[Simbolo] = ()) -> None:
+        super().__init__(simbolos, _variable)
+
+    def cadena(self) -> Cadena:
+        """Devuelve la forma como `Cadena`."""
+        return Cadena(self)
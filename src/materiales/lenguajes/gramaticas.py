@@ -1,21 +1,26 @@
 """Módulo de gramáticas libres de contexto."""
 
+# pylint: disable=too-many-lines
+
+import array
 import collections
 import dataclasses
 import html
+import io
 import itertools
 from collections import Counter
 from collections.abc import Collection, Iterator, Mapping, Sequence
 from functools import cached_property
-from typing import NamedTuple, Self
+from typing import NamedTuple, Self, TextIO, overload
 
 import pygraphviz  # type: ignore[import-untyped]
 
 import materiales.lenguajes.latex
 
 from .. import notacion
-from ..visualizaciones.utils import dibujar_svg
-from . import bnf
+from ..visualizaciones import arboles
+from ..visualizaciones import utils as utils_graphviz
+from . import automatas, bnf, bosques, earley, ebnf, formas, transformaciones
 from .estructuras import (
     Cadena,
     DerivacionDict,
@@ -24,13 +29,21 @@ from .estructuras import (
     Regla,
     Simbolo,
     Terminal,
+    UnionCadenas,
     Variable,
 )
 
 _latex = materiales.lenguajes.latex.obtener_latex
 
 
-class GramaticaLibreContexto(Mapping[Variable, Sequence[Cadena]]):
+def _visible(texto: str) -> str:
+    """Reemplaza los espacios en blanco por espacios visibles."""
+    return texto.replace(" ", "␣").replace("\t", "␉").replace("\n", "␤")
+
+
+class GramaticaLibreContexto(  # pylint: disable=too-many-public-methods
+    Mapping[Variable, Sequence[Cadena]]
+):
     """Representa una gramática libre de contexto."""
 
     def __init__(self, gramatica: GramaticaLibreContextoMap) -> None:
@@ -67,7 +80,7 @@ class GramaticaLibreContexto(Mapping[Variable, Sequence[Cadena]]):
                         )
 
     @classmethod
-    def desde_bnf(cls, texto: str) -> Self:
+    def desde_bnf(cls, texto: str, usar_cache: bool = True) -> Self:
         """
         Construye una gramática a partir de una cadena de texto.
 
@@ -75,14 +88,41 @@ class GramaticaLibreContexto(Mapping[Variable, Sequence[Cadena]]):
         ----------
         texto : str
             La cadena de texto en notación BNF.
+        usar_cache : bool, opcional
+            Si es True (por defecto), busca el texto en `bnf.cache` antes
+            de analizarlo, de modo que construir otra vez la misma
+            gramática no vuelve a analizar el texto.
 
         Devuelve
         --------
         GramaticaLibreContexto
             La gramática construida.
         """
+        if usar_cache:
+            return cls(bnf.cache.diseccionar(texto))
         return cls(bnf.ParserBNFLibreContexto().diseccionar(texto))
 
+    @classmethod
+    def desde_ebnf(cls, texto: str) -> Self:
+        """
+        Construye una gramática a partir de un texto en notación EBNF.
+
+        Las repeticiones, los opcionales, los grupos y los rangos se
+        traducen a producciones en BNF como se explica en `ebnf`.
+
+        Parámetros
+        ----------
+        texto : str
+            La cadena de texto en notación EBNF.
+
+        Devuelve
+        --------
+        GramaticaLibreContexto
+            La gramática construida. Su variable inicial es la de la
+            primera producción del texto.
+        """
+        return cls(ebnf.ParserEBNF().diseccionar(texto))
+
     @cached_property
     def variables(self) -> Collection[Variable]:
         """Devuelve las variables de la gramática."""
@@ -173,6 +213,190 @@ class GramaticaLibreContexto(Mapping[Variable, Sequence[Cadena]]):
         """Inicia una derivación de la gramática."""
         return Derivacion(self)
 
+    @cached_property
+    def parser_earley(self) -> earley.ParserEarley:
+        """Devuelve el analizador de Earley de la gramática."""
+        return earley.ParserEarley(self.reglas, self.variable_inicial)
+
+    @cached_property
+    def es_regular(self) -> bool:
+        """Indica si la gramática es lineal por la derecha o por la izquierda.
+
+        Si lo es, su lenguaje es regular y lo reconoce `automata`. Una
+        gramática que no es lineal puede tener un lenguaje regular, pero
+        eso no se puede decidir en general.
+        """
+        return automatas.linealidad(self.reglas) is not None
+
+    @cached_property
+    def automata(self) -> automatas.AutomataFinito:
+        """Devuelve el autómata finito mínimo de una gramática regular.
+
+        Levanta
+        -------
+        ValueError
+            Si la gramática no es lineal (ver `es_regular`).
+        """
+        return automatas.AutomataFinito.desde_gramatica(
+            self.reglas, self.variable_inicial
+        )
+
+    def reconocer(self, texto: str) -> bool:
+        """Decide si un texto pertenece al lenguaje de la gramática.
+
+        Usa el autómata de la gramática si es regular, y el analizador
+        de Earley si no.
+        """
+        if self.es_regular:
+            return self.automata.aceptar(texto)
+        return self.parser_earley.reconocer(texto)
+
+    def analizar(self, texto: str) -> earley.Analisis:
+        """Analiza un texto con el algoritmo de Earley.
+
+        Levanta
+        -------
+        earley.CadenaRechazada
+            Si el texto no pertenece al lenguaje de la gramática.
+        """
+        return self.parser_earley.analizar(texto)
+
+    def derivacion_izquierda(self, texto: str) -> "Derivacion":
+        """Devuelve una derivación por la izquierda de un texto.
+
+        La derivación se obtiene de un árbol de análisis de Earley, en
+        tiempo polinomial y sin búsqueda con retroceso. Si la gramática
+        es ambigua, es la del primer árbol que encuentra el analizador.
+
+        Levanta
+        -------
+        earley.CadenaRechazada
+            Si el texto no pertenece al lenguaje de la gramática.
+        """
+        return self._derivar(texto, derecha=False)
+
+    def derivacion_derecha(self, texto: str) -> "Derivacion":
+        """Devuelve una derivación por la derecha de un texto.
+
+        Tiene el mismo árbol que `derivacion_izquierda`.
+
+        Levanta
+        -------
+        earley.CadenaRechazada
+            Si el texto no pertenece al lenguaje de la gramática.
+        """
+        return self._derivar(texto, derecha=True)
+
+    def bosque(self, texto: str) -> bosques.Bosque:
+        """Devuelve el bosque de todos los árboles de análisis de un texto.
+
+        Levanta
+        -------
+        earley.CadenaRechazada
+            Si el texto no pertenece al lenguaje de la gramática.
+        """
+        return bosques.Bosque(self.parser_earley.analizar(texto, completo=True))
+
+    def contar_arboles(self, texto: str) -> bosques.Numero:
+        """Devuelve el número de árboles de análisis de un texto.
+
+        Es 0 si el texto no pertenece al lenguaje y `math.inf` si la
+        gramática tiene ciclos que le dan una infinidad de árboles.
+        """
+        try:
+            return self.bosque(texto).contar()
+        except earley.CadenaRechazada:
+            return 0
+
+    def arboles(
+        self,
+        texto: str,
+        k: int = 1,
+        *,
+        aleatorios: bool = False,
+        semilla: int | None = None,
+    ) -> list["ArbolDeDerivacion"]:
+        """Devuelve árboles de análisis de un texto.
+
+        Parámetros
+        ----------
+        texto : str
+            El texto a analizar.
+        k : int, opcional
+            Cuántos árboles devolver. Por defecto, uno.
+        aleatorios : bool, opcional
+            Si es True, elige los árboles al azar, cada uno con la misma
+            probabilidad y con reemplazo. Si no (por defecto), devuelve
+            los primeros `k` en el orden de `bosques.Bosque.derivacion`.
+        semilla : int, opcional
+            Semilla para elegir los árboles al azar.
+
+        Levanta
+        -------
+        earley.CadenaRechazada
+            Si el texto no pertenece al lenguaje de la gramática.
+        ValueError
+            Si el texto tiene una infinidad de árboles.
+        """
+        bosque = self.bosque(texto)
+        if aleatorios:
+            derivaciones = bosque.aleatorias(k, semilla)
+        else:
+            derivaciones = bosque.primeras(k)
+        resultado = []
+        for reglas in derivaciones:
+            derivacion = self.hacer_derivacion()
+            for n_regla in reglas:
+                derivacion.aplicar_regla(n_regla + 1)
+            resultado.append(derivacion.arbol())
+        return resultado
+
+    def buscar_ambiguedad(self, longitud_maxima: int) -> bosques.Ambiguedad | None:
+        """Busca la cadena ambigua más corta hasta cierta longitud.
+
+        Ver `bosques.buscar_ambiguedad`.
+        """
+        return bosques.buscar_ambiguedad(self.parser_earley, longitud_maxima)
+
+    def sin_recursion_izquierda(self) -> "GramaticaTransformada":
+        """Devuelve una gramática equivalente sin recursión por la izquierda.
+
+        Ver `transformaciones.eliminar_recursion_izquierda`.
+
+        Levanta
+        -------
+        ValueError
+            Si la recursión está oculta detrás de variables que producen ε.
+        """
+        return self._transformar(
+            transformaciones.eliminar_recursion_izquierda(self.reglas)
+        )
+
+    def factorizar_izquierda(self) -> "GramaticaTransformada":
+        """Devuelve una gramática equivalente factorizada por la izquierda.
+
+        Ver `transformaciones.factorizar_izquierda`.
+        """
+        return self._transformar(transformaciones.factorizar_izquierda(self.reglas))
+
+    def _transformar(
+        self, transformacion: transformaciones.Transformacion
+    ) -> "GramaticaTransformada":
+        # La variable inicial va primero aunque se haya quedado sin reglas.
+        datos: dict[Variable, list[Cadena]] = {self.variable_inicial: []}
+        for izquierda, derecha in transformacion.reglas:
+            datos.setdefault(izquierda, []).append(derecha)
+        gramatica = type(self)(
+            {variable: UnionCadenas(cadenas) for variable, cadenas in datos.items()}
+        )
+        return GramaticaTransformada(gramatica, tuple(transformacion.origenes))
+
+    def _derivar(self, texto: str, derecha: bool) -> "Derivacion":
+        derivacion = self.hacer_derivacion()
+        for n_regla, n_salto in self.analizar(texto).pasos(derecha):
+            derivacion.aplicar_regla(n_regla + 1, n_salto)
+        return derivacion
+
     def __repr__(self) -> str:
         """Devuelve una representación de la gramática."""
         return f"{self.__class__.__name__}({self._datos!r})"
@@ -210,36 +434,75 @@ class GramaticaLibreContexto(Mapping[Variable, Sequence[Cadena]]):
         return len(self._datos)
 
 
-class Derivacion:
+class GramaticaTransformada(NamedTuple):
+    """Una gramática transformada y el origen de cada una de sus reglas.
+
+    `origenes[i]` son los números (desde 0) de las reglas de la gramática
+    original de las que proviene la regla `i` de la nueva (ver
+    `transformaciones.Transformacion`).
+    """
+
+    gramatica: GramaticaLibreContexto
+    origenes: tuple[tuple[int, ...], ...]
+
+
+class Derivacion:  # pylint: disable=too-many-instance-attributes
     """Representa una derivación de una cadena.
 
+    El historial guarda, por cada paso, sólo la regla, la aparición y la
+    posición de la variable reemplazada. Las formas sentenciales
+    intermedias se reconstruyen cuando se piden, a partir de copias
+    guardadas cada `intervalo_de_puntos` pasos.
+
     Atributos
     ---------
     cadena : Cadena
         La cadena actual.
     historial : Sequence[DerivacionDict]
         El historial de la derivación.
+    intervalo_de_puntos : int
+        Cada cuántos pasos se guarda una copia de la forma sentencial.
 
     Métodos
     -------
     aplicar(n_regla, n_salto=0)
         Aplica una regla de producción a la cadena.
+    pasos()
+        Recorre los pasos de la derivación sin sus cadenas.
+    posiciones()
+        Recorre las posiciones de las variables reemplazadas.
+    forma(paso)
+        Devuelve la forma sentencial antes de un paso.
+    formas()
+        Recorre las formas sentenciales de la derivación.
     """
 
+    intervalo_de_puntos = 256
+
     def __init__(self, gramatica: GramaticaLibreContexto) -> None:
         self._gramatica = gramatica
-        self._cadena = Cadena([gramatica.variable_inicial])
-        self._historial: list[DerivacionDict] = []
+        inicial = Cadena([gramatica.variable_inicial])
+        self._forma = formas.FormaSentencial(inicial)
+        self._cadena: Cadena | None = inicial
+        self._reglas = array.array("i")
+        self._saltos = array.array("i")
+        self._posiciones = array.array("i")
+        # Forma antes del paso k * intervalo_de_puntos.
+        self._puntos: list[Cadena] = [inicial]
+        # Última forma reconstruida, con el número de su paso.
+        self._reconstruida: tuple[int, list[Simbolo]] | None = None
 
     @property
     def cadena(self) -> Cadena:
         """Devuelve la cadena actual."""
-        return Cadena(self._cadena)
+        if self._cadena is None:
+            self._cadena = self._forma.cadena()
+        return self._cadena
 
     @property
     def historial(self) -> Sequence[DerivacionDict]:
         """Devuelve el historial de la derivación."""
-        return tuple(self._historial)
+        return _Historial(self)
 
     def aplicar_regla(self, n_regla: int, n_salto: int = 0) -> Self:
         """Aplica una regla de producción a la cadena.
@@ -253,37 +516,94 @@ class Derivacion:
             parámetro indica cuál aparición se debe reemplazar. Por
             defecto, se reemplaza la aparición 0 (la más a la
             izquierda).
+
+        Levanta
+        -------
+        IndexError
+            Si la regla no existe o si su variable no aparece en la
+            cadena tantas veces. En ese caso la derivación no cambia.
         """
-        derivacion = DerivacionDict(
-            cadena=self._cadena, n_regla=n_regla - 1, n_salto=n_salto
-        )
-        self._historial.append(derivacion)
         regla = self._gramatica.reglas[n_regla - 1]
-        self._cadena = regla.aplicar(self._cadena, n_salto)
+        posicion = self._forma.posicion(regla.izquierda, n_salto)
+        paso = len(self._reglas)
+        if paso and paso % self.intervalo_de_puntos == 0:
+            self._puntos.append(self.cadena)
+        self._forma.reemplazar(posicion, regla.derecha)
+        self._cadena = None
+        self._reglas.append(n_regla - 1)
+        self._saltos.append(n_salto)
+        self._posiciones.append(posicion)
         return self
 
+    def pasos(self) -> Iterator[DerivacionDict]:
+        """Recorre los pasos de la derivación sin sus cadenas."""
+        for n_regla, n_salto in zip(self._reglas, self._saltos):
+            yield DerivacionDict(n_regla=n_regla, n_salto=n_salto)
+
+    def posiciones(self) -> Iterator[int]:
+        """Recorre la posición de la variable que reemplaza cada paso."""
+        return iter(self._posiciones)
+
+    def forma(self, paso: int) -> Cadena:
+        """Devuelve la forma sentencial antes del paso `paso`.
+
+        La forma después del último paso es `cadena`. Se reconstruye
+        desde la copia guardada más cercana, o desde la última forma
+        pedida si está más cerca, así que pedir las formas en orden
+        cuesta lo mismo que recorrerlas con `formas`.
+
+        Levanta
+        -------
+        IndexError
+            Si el paso no está entre 0 y el número de pasos.
+        """
+        if not 0 <= paso <= len(self._reglas):
+            raise IndexError("La derivación no tiene ese paso")
+        if paso == len(self._reglas):
+            return self.cadena
+        inicio = paso - paso % self.intervalo_de_puntos
+        if self._reconstruida is not None and inicio <= self._reconstruida[0] <= paso:
+            inicio, simbolos = self._reconstruida
+        else:
+            simbolos = list(self._puntos[inicio // self.intervalo_de_puntos])
+        self._avanzar(simbolos, inicio, paso)
+        self._reconstruida = (paso, simbolos)
+        return Cadena(simbolos)
+
+    def formas(self) -> Iterator[Cadena]:
+        """Recorre las formas sentenciales, de la inicial a la actual."""
+        simbolos = list(self._puntos[0])
+        for paso in range(len(self._reglas)):
+            yield Cadena(simbolos)
+            self._avanzar(simbolos, paso, paso + 1)
+        yield Cadena(simbolos)
+
+    def _avanzar(self, simbolos: list[Simbolo], inicio: int, fin: int) -> None:
+        """Aplica a `simbolos` los pasos de `inicio` a `fin - 1`."""
+        reglas = self._gramatica.reglas
+        for paso in range(inicio, fin):
+            posicion = self._posiciones[paso]
+            simbolos[posicion : posicion + 1] = reglas[self._reglas[paso]].derecha
+
     def arbol(self) -> "ArbolDeDerivacion":
         """Devuelve el árbol de derivación."""
         return ArbolDeDerivacion(self, self._gramatica)
 
     def _repr_latex_(self) -> str:
         """Devuelve una representación LaTeX de la derivación."""
-        # pylint: disable=protected-access
         comentario_fmt = r"\text{{(por regla {})}}"
-        if not self._historial:
-            return f"${_latex(self._cadena)}$"
-        if len(self._historial) == 1:
-            n_regla = self._historial[0]["n_regla"] + 1
+        if not self._reglas:
+            return f"${_latex(self.cadena)}$"
+        cadenas = self.formas()
+        reglas = (n_regla + 1 for n_regla in self._reglas)
+        if len(self._reglas) == 1:
             return (
-                f"${_latex(self._historial[0]['cadena'])} "
+                f"${_latex(next(cadenas))} "
                 r"\Rightarrow "
-                rf"{_latex(self._cadena)} \qquad {comentario_fmt.format(n_regla)}$"
+                rf"{_latex(next(cadenas))} \qquad "
+                f"{comentario_fmt.format(next(reglas))}$"
             )
         lineas = [r"\begin{align*}"]  # Lista de líneas de LaTeX.
-        cadenas: Iterator[Cadena]
-        cadenas = (derivacion["cadena"] for derivacion in self._historial)
-        cadenas = itertools.chain(cadenas, (self._cadena,))  # Agregar la cadena final.
-        reglas = (derivacion["n_regla"] + 1 for derivacion in self._historial)
         cad_inicial = next(cadenas)
         cadena, n_regla = next(cadenas), next(reglas)
         comentario = comentario_fmt.format(n_regla)
@@ -297,6 +617,43 @@ class Derivacion:
         return "$${}$$".format("\n".join(lineas))
 
 
+class _Historial(Sequence[DerivacionDict]):
+    """Vista del historial de una derivación que reconstruye sus cadenas."""
+
+    # pylint: disable=protected-access
+
+    def __init__(self, derivacion: Derivacion) -> None:
+        self._derivacion = derivacion
+
+    def __len__(self) -> int:
+        return len(self._derivacion._reglas)
+
+    @overload
+    def __getitem__(self, indice: int) -> DerivacionDict: ...
+
+    @overload
+    def __getitem__(self, indice: slice) -> Sequence[DerivacionDict]: ...
+
+    def __getitem__(
+        self, indice: int | slice
+    ) -> DerivacionDict | Sequence[DerivacionDict]:
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("La derivación no tiene ese paso")
+        return DerivacionDict(
+            cadena=self._derivacion.forma(indice),
+            n_regla=self._derivacion._reglas[indice],
+            n_salto=self._derivacion._saltos[indice],
+        )
+
+    def __iter__(self) -> Iterator[DerivacionDict]:
+        for cadena, paso in zip(self._derivacion.formas(), self._derivacion.pasos()):
+            yield DerivacionDict(cadena=cadena, **paso)
+
+
 class Nodo(NamedTuple):
     """Representa un nodo del árbol de derivación.
 
@@ -362,28 +719,73 @@ class AtributosArbol:
     )
 
 
-class ArbolDeDerivacion:
+class ArbolDeDerivacion:  # pylint: disable=too-many-instance-attributes
     """Representa un árbol de derivación.
 
+    El árbol se guarda en arreglos de enteros indexados por nodo: el
+    padre, el primer hijo y el siguiente hermano de cada nodo, y el
+    índice de su símbolo en una tabla de símbolos. La raíz es el nodo 0
+    y los nodos se numeran en el orden en que los crea la derivación.
+    Las hojas de la forma sentencial actual se guardan en orden en una
+    `formas.SucesionIndexada`, con su variable como clave: cada paso
+    encuentra su hoja por la posición que registró la derivación, y
+    `ocurrencia` encuentra la aparición `n_salto` de una variable con un
+    árbol de Fenwick, sin recorrer las hojas. Construir el árbol cuesta,
+    por paso, un tiempo proporcional al tamaño de un bloque de hojas, y
+    el grafo de Graphviz se construye sólo cuando se pide con
+    `a_graphviz` o `a_svg`.
+
+    Los árboles de más de `maximo_graphviz` nodos se muestran en Jupyter
+    con el acomodo de `visualizaciones.arboles`, que no usa Graphviz, y
+    recortados a `maximo_de_nodos` nodos.
+
     Atributos
     ---------
-    attrs_nodos : dict[str, str]
-        Atributos de los nodos.
-    attrs_variables : dict[str, str]
-        Atributos de los nodos asociados con variables.
-    attrs_terminales : dict[str, str]
-        Atributos de los nodos asociados con terminales.
-    fmt_variable : str
-        Formato de los nodos asociados con variables.
-    fmt_terminal : str
-        Formato de los nodos asociados con terminales.
+    atributos : AtributosArbol
+        Atributos del grafo, los nodos y las aristas en Graphviz.
+    maximo_graphviz : int
+        Número máximo de nodos que se acomodan con Graphviz.
+    maximo_de_nodos : int
+        Número máximo de nodos que se muestran sin Graphviz.
+    estilo_svg : str
+        Hoja de estilo CSS de los SVG que se dibujan sin Graphviz.
 
     Métodos
     -------
     a_graphviz()
         Devuelve el árbol de derivación en formato Graphviz.
+    a_svg()
+        Devuelve una representación SVG del árbol de derivación.
+    a_plano()
+        Devuelve el árbol listo para acomodarse sin Graphviz.
+    escribir_svg(salida, profundidad_maxima=None, maximo_de_nodos=None)
+        Escribe el SVG del árbol, acomodado sin Graphviz.
+    simbolo(nodo)
+        Devuelve el símbolo de un nodo.
+    padre(nodo)
+        Devuelve el padre de un nodo.
+    hijos(nodo)
+        Devuelve los hijos de un nodo, de izquierda a derecha.
+    recorrer(nodo=0)
+        Recorre en preorden el subárbol de un nodo.
+    hojas(nodo=0)
+        Devuelve las hojas de un subárbol, de izquierda a derecha.
+    producto(nodo=0)
+        Devuelve la cadena que forman las hojas de un subárbol.
+    profundidad()
+        Devuelve la profundidad del árbol.
+    ocurrencia(variable, n_salto=0)
+        Devuelve la hoja con la aparición `n_salto` de una variable.
     """
 
+    maximo_graphviz = 500
+    maximo_de_nodos = 5000
+    estilo_svg = arboles.ESTILO_DEFECTO + (
+        ".variable { fill: firebrick; font-style: italic; }\n"
+        ".terminal { font-family: monospace; }\n"
+        ".epsilon { fill: slategray; font-style: italic; }\n"
+    )
+
     def __init__(
         self,
         derivacion: Derivacion,
@@ -393,19 +795,28 @@ class ArbolDeDerivacion:
     ) -> None:
         self._derivacion = derivacion
         self._gramatica = gramatica
-        self._arbol: pygraphviz.AGraph
+        self._arbol: pygraphviz.AGraph | None = None
         self._cuenta_etiquetas: Counter[str] = Counter()
         self._atributos = atributos if atributos is not None else AtributosArbol()
+        # Tabla de símbolos y arreglos del árbol; -1 indica que no hay nodo.
+        self._simbolos: list[Simbolo] = []
+        self._indices: dict[Simbolo, int] = {}
+        self._simbolo = array.array("i")
+        self._padre = array.array("i")
+        self._primer_hijo = array.array("i")
+        self._siguiente_hermano = array.array("i")
+        # Hojas de la forma sentencial, de izquierda a derecha.
+        self._hojas = formas.SucesionIndexada[int]([], self._clave_de_hoja)
 
         self.reconstruir_arbol()
 
     def a_graphviz(self) -> str:
         """Devuelve el árbol de derivación en formato Graphviz."""
-        return str(self._arbol)
+        return str(self._grafo())
 
     def a_svg(self) -> str:
         """Devuelve una representación SVG del árbol de derivación."""
-        return dibujar_svg(self._arbol)
+        return utils_graphviz.cache.dibujar(self._grafo())
 
     @property
     def atributos(self) -> AtributosArbol:
@@ -414,7 +825,140 @@ class ArbolDeDerivacion:
 
     def _repr_svg_(self) -> str:
         """Devuelve una representación SVG del árbol de derivación."""
-        return self.a_svg()
+        if len(self) <= self.maximo_graphviz:
+            return self.a_svg()
+        salida = io.StringIO()
+        self.escribir_svg(salida, maximo_de_nodos=self.maximo_de_nodos)
+        return salida.getvalue()
+
+    def a_plano(self) -> arboles.ArbolPlano:
+        """Devuelve el árbol listo para acomodarse sin Graphviz.
+
+        Los nodos conservan su número, y su clase CSS es "variable",
+        "terminal" o "epsilon".
+        """
+        etiquetas, clases = [], []
+        for indice in self._simbolo:
+            simbolo = self._simbolos[indice]
+            if isinstance(simbolo, Variable):
+                etiquetas.append(simbolo.valor)
+                clases.append("variable")
+            elif simbolo.valor:
+                etiquetas.append(_visible(simbolo.valor))
+                clases.append("terminal")
+            else:
+                etiquetas.append("ε")
+                clases.append("epsilon")
+        hijos = [list(self.hijos(nodo)) for nodo in range(len(self))]
+        return arboles.ArbolPlano(etiquetas, hijos, clases, estilo=self.estilo_svg)
+
+    def escribir_svg(
+        self,
+        salida: TextIO,
+        *,
+        profundidad_maxima: int | None = None,
+        maximo_de_nodos: int | None = None,
+    ) -> None:
+        """Escribe el SVG del árbol, acomodado sin Graphviz.
+
+        El árbol se acomoda con el algoritmo de Reingold y Tilford de
+        `visualizaciones.arboles`, en tiempo lineal, y el SVG se escribe
+        por partes, así que sirve para árboles de miles de nodos.
+
+        Parámetros
+        ----------
+        salida : TextIO
+            Archivo de texto abierto para escritura.
+        profundidad_maxima : int | None, opcional
+            Profundidad a partir de la cual los subárboles se resumen
+            en un solo nodo. Por defecto, no hay límite.
+        maximo_de_nodos : int | None, opcional
+            Número de nodos a partir del cual los subárboles se resumen
+            en un solo nodo. Por defecto, no hay límite.
+        """
+        plano = self.a_plano()
+        if profundidad_maxima is not None or maximo_de_nodos is not None:
+            plano = plano.recortar(profundidad_maxima, maximo_de_nodos)
+        plano.escribir_svg(salida)
+
+    def __len__(self) -> int:
+        """Devuelve el número de nodos del árbol."""
+        return len(self._simbolo)
+
+    def simbolo(self, nodo: int) -> Simbolo:
+        """Devuelve el símbolo de un nodo."""
+        return self._simbolos[self._simbolo[nodo]]
+
+    def padre(self, nodo: int) -> int:
+        """Devuelve el padre de un nodo, o -1 si es la raíz."""
+        return self._padre[nodo]
+
+    def hijos(self, nodo: int) -> Iterator[int]:
+        """Devuelve los hijos de un nodo, de izquierda a derecha."""
+        hijo = self._primer_hijo[nodo]
+        while hijo != -1:
+            yield hijo
+            hijo = self._siguiente_hermano[hijo]
+
+    def recorrer(self, nodo: int = 0) -> Iterator[int]:
+        """Recorre en preorden el subárbol de un nodo.
+
+        Parámetros
+        ----------
+        nodo : int, opcional
+            La raíz del subárbol. Por defecto, la raíz del árbol.
+
+        Devuelve
+        --------
+        Iterator[int]
+            Los nodos del subárbol, cada padre antes que sus hijos y los
+            hermanos de izquierda a derecha.
+        """
+        pendientes = [nodo]
+        while pendientes:
+            actual = pendientes.pop()
+            yield actual
+            pendientes.extend(reversed(list(self.hijos(actual))))
+
+    def hojas(self, nodo: int = 0) -> Iterator[int]:
+        """Devuelve las hojas del subárbol de un nodo, de izquierda a derecha."""
+        return (hoja for hoja in self.recorrer(nodo) if self._primer_hijo[hoja] == -1)
+
+    def producto(self, nodo: int = 0) -> Cadena:
+        """Devuelve la cadena que forman las hojas del subárbol de un nodo.
+
+        Para la raíz, es la cadena actual de la derivación.
+        """
+        return Cadena(self.simbolo(hoja) for hoja in self.hojas(nodo))
+
+    def profundidad(self) -> int:
+        """Devuelve la profundidad del árbol: 0 si sólo tiene la raíz."""
+        # Los padres se crean antes que sus hijos.
+        profundidades = [0] * len(self)
+        for nodo in range(1, len(self)):
+            profundidades[nodo] = profundidades[self._padre[nodo]] + 1
+        return max(profundidades)
+
+    def ocurrencia(self, variable: Variable, n_salto: int = 0) -> int:
+        """Devuelve la hoja sin expandir con una aparición de una variable.
+
+        Parámetros
+        ----------
+        variable : Variable
+            La variable buscada.
+        n_salto : int, opcional
+            Cuál aparición, contando desde 0 de izquierda a derecha,
+            como en `Derivacion.aplicar_regla`.
+
+        Devuelve
+        --------
+        int
+            El nodo, o -1 si no hay tal aparición.
+        """
+        indice = self._indices.get(variable)
+        if indice is None or not 0 <= n_salto < self._hojas.contar(indice):
+            return -1
+        return self._hojas[self._hojas.posicion(indice, n_salto)]
 
     def etiquetar_variable(self, simbolo: Variable) -> str:
         """Devuelve la etiqueta asociada con una variable.
@@ -446,8 +990,7 @@ class ArbolDeDerivacion:
         """
         if not simbolo.valor:  # ¿Es la cadena vacía?
             return "<<i>ε</i>>"
-        # Reemplazar espacios en blanco por espacios visibles:
-        return simbolo.valor.replace(" ", "␣").replace("\t", "␉").replace("\n", "␤")
+        return _visible(simbolo.valor)
 
     def nombrar(self, simbolo: Simbolo) -> str:
         """Devuelve un id único para un nodo asociado con un símbolo.
@@ -468,7 +1011,7 @@ class ArbolDeDerivacion:
         return f"{etiqueta}{self._cuenta_etiquetas[etiqueta]}"
 
     def crear_nodo(self, simbolo: Simbolo) -> Nodo:
-        """Crea un nodo asociado con un símbolo."""
+        """Crea en el grafo de Graphviz un nodo asociado con un símbolo."""
         assert self._arbol is not None
         nombre = self.nombrar(simbolo)
         if isinstance(simbolo, Variable):
@@ -489,38 +1032,86 @@ class ArbolDeDerivacion:
         indices = (i for i, nodo in enumerate(nodos) if nodo.simbolo == simbolo)
         return next(itertools.islice(indices, n_salto, None), -1)
 
+    def _indice(self, simbolo: Simbolo) -> int:
+        """Devuelve el índice de un símbolo en la tabla, agregándolo si falta."""
+        indice = self._indices.get(simbolo)
+        if indice is None:
+            indice = self._indices[simbolo] = len(self._simbolos)
+            self._simbolos.append(simbolo)
+        return indice
+
+    def _clave_de_hoja(self, nodo: int) -> int | None:
+        """Índice del símbolo de una hoja, o None si no es una variable."""
+        indice = self._simbolo[nodo]
+        return indice if isinstance(self._simbolos[indice], Variable) else None
+
+    def _agregar(self, simbolo: Simbolo, padre: int) -> int:
+        """Agrega un nodo como último hijo de `padre` y devuelve su número."""
+        nodo = len(self._simbolo)
+        self._simbolo.append(self._indice(simbolo))
+        self._padre.append(padre)
+        self._primer_hijo.append(-1)
+        self._siguiente_hermano.append(-1)
+        return nodo
+
     def reconstruir_arbol(self) -> Self:
-        """Construye el árbol de derivación."""
-        producciones = self._gramatica.reglas
+        """Construye el árbol de derivación.
 
-        # Crear el árbol de derivación.
-        arbol = self._arbol = pygraphviz.AGraph(directed=True, strict=True)
-        arbol.graph_attr.update(self.atributos.grafo)
-        arbol.node_attr.update(self.atributos.nodos)
-        arbol.edge_attr.update(self.atributos.aristas)
+        Vuelve a leer el historial de la derivación, así que incluye los
+        pasos aplicados después de crear el árbol.
+        """
+        producciones = self._gramatica.reglas
+        for arreglo in (
+            self._simbolo,
+            self._padre,
+            self._primer_hijo,
+            self._siguiente_hermano,
+        ):
+            del arreglo[:]
+        self._simbolos.clear()
+        self._indices.clear()
+        self._arbol = None
 
         # Crear la raíz, que a su vez es la primera hoja.
-        raiz = self.crear_nodo(self._gramatica.variable_inicial)
-        hojas: list[Nodo] = [raiz]  # Hojas que contienen variables.
+        raiz = self._agregar(self._gramatica.variable_inicial, -1)
+        self._hojas = formas.SucesionIndexada([raiz], self._clave_de_hoja)
 
         # Iterar sobre historial de reemplazos.
-        for derivacion in self._derivacion.historial:
-            # Obtener la producción que se aplicó.
-            izq, der = producciones[derivacion["n_regla"]]
-
-            # Encontrar índice del nodo a expandir.
-            i = self.encontrar_nodo(izq, hojas, derivacion["n_salto"])
-            if i == -1:
-                continue  # No hay nada que hacer.
-            nodo = hojas[i]
-
-            # Crear nodos hijos y conectarlos.
-            hijos = [self.crear_nodo(simbolo) for simbolo in der]
-            if not hijos:  # ¿La producción es vacía?
-                hijos = [self.crear_nodo(Terminal(""))]
-            for hijo in hijos:
-                self._arbol.add_edge(nodo.nombre, hijo.nombre)
-
-            # Reemplazar nodo por hijos en las hojas
-            hojas[i : i + 1] = (v for v in hijos if isinstance(v.simbolo, Variable))
+        for derivacion, posicion in zip(
+            self._derivacion.pasos(), self._derivacion.posiciones()
+        ):
+            der = producciones[derivacion["n_regla"]].derecha
+            hijos = self._expandir(self._hojas[posicion], der or (Terminal(""),))
+            # La hoja de ε no forma parte de la forma sentencial.
+            self._hojas.reemplazar(posicion, hijos if der else [])
         return self
+
+    def _expandir(self, nodo: int, der: Sequence[Simbolo]) -> list[int]:
+        """Crea los hijos de una hoja y los devuelve de izquierda a derecha."""
+        hijos: list[int] = []
+        for simbolo in der:
+            hijo = self._agregar(simbolo, nodo)
+            if hijos:
+                self._siguiente_hermano[hijos[-1]] = hijo
+            else:
+                self._primer_hijo[nodo] = hijo
+            hijos.append(hijo)
+        return hijos
+
+    def _grafo(self) -> pygraphviz.AGraph:
+        """Devuelve el grafo de Graphviz del árbol, construyéndolo si hace falta."""
+        if self._arbol is not None:
+            return self._arbol
+        arbol = self._arbol = pygraphviz.AGraph(directed=True, strict=True)
+        arbol.graph_attr.update(self.atributos.grafo)
+        arbol.node_attr.update(self.atributos.nodos)
+        arbol.edge_attr.update(self.atributos.aristas)
+        self._cuenta_etiquetas.clear()
+        # Los nodos se crean en el orden de la derivación, así que los
+        # padres ya tienen nombre cuando se crean sus hijos.
+        nombres = [
+            self.crear_nodo(self.simbolo(nodo)).nombre for nodo in range(len(self))
+        ]
+        for nodo in range(1, len(self)):
+            arbol.add_edge(nombres[self._padre[nodo]], nombres[nodo])
+        return arbol
@@ -0,0 +1,285 @@
+"""Eliminación de la recursión por la izquierda y factorización.
+
+Un analizador descendente no puede usar una regla como
+`<E> ::= <E> "+" <T> | <T>`: para expandir `<E>` tendría que expandir
+primero `<E>` otra vez. Tampoco puede elegir entre dos reglas que
+empiezan igual, como `<S> ::= "if" <E> "then" <S> | "if" <E> "then" <S>
+"else" <S>`, viendo sólo el siguiente símbolo. Las dos transformaciones
+de este módulo producen una gramática con el mismo lenguaje sin esos
+problemas:
+
+- `eliminar_recursion_izquierda` ordena las variables y, para cada una,
+  sustituye las reglas que empiezan con una variable anterior por las
+  reglas de ésta (el algoritmo de Paull). Después, cambia la recursión
+  directa `A → A α | β` por `A → β A'` y `A' → α A' | ε`.
+- `factorizar_izquierda` cambia las reglas `A → α β₁ | α β₂` que
+  comparten el prefijo más largo `α` por `A → α A'` y `A' → β₁ | β₂`,
+  hasta que no haya dos reglas de una variable que empiecen con el
+  mismo símbolo.
+
+Ambas devuelven, además de las reglas nuevas, de qué reglas originales
+proviene cada una, para poder traducir los análisis de la gramática
+nueva a la original.
+
+Clases
+------
+Transformacion
+    Reglas transformadas y las reglas originales de las que provienen.
+
+Funciones
+---------
+recursivas_por_la_izquierda(reglas)
+    Devuelve las variables recursivas por la izquierda.
+eliminar_recursion_izquierda(reglas)
+    Elimina la recursión por la izquierda directa e indirecta.
+factorizar_izquierda(reglas)
+    Factoriza los prefijos comunes de las reglas de cada variable.
+"""
+
+import itertools
+from collections.abc import Iterable, Sequence
+from typing import NamedTuple
+
+from .estructuras import Cadena, Regla, Simbolo, Variable
+
+# Las reglas de cada variable, con las reglas originales de las que
+# proviene cada una.
+_Producciones = dict[Variable, list[tuple[Cadena, tuple[int, ...]]]]
+
+
+class Transformacion(NamedTuple):
+    """Reglas transformadas y las reglas originales de las que provienen.
+
+    `origenes[i]` son los números (desde 0) de las reglas originales
+    cuyos símbolos forman `reglas[i]`. Está vacío para las reglas
+    `A' → ε` que introduce la transformación.
+    """
+
+    reglas: list[Regla]
+    origenes: list[tuple[int, ...]]
+
+
+def recursivas_por_la_izquierda(reglas: Sequence[Regla]) -> list[Variable]:
+    """Devuelve las variables recursivas por la izquierda.
+
+    Una variable `A` es recursiva por la izquierda si deriva una forma
+    que empieza con `A`, quizá después de variables que producen ε
+    (como en `<A> ::= <B> <A> "a"` con `<B> ::= ""`). Se devuelven en
+    el orden en que aparecen en las reglas.
+    """
+    anulables = _anulables(reglas)
+    esquinas: dict[Variable, set[Variable]] = {}
+    for izquierda, derecha in reglas:
+        for simbolo in derecha:
+            if isinstance(simbolo, Variable):
+                esquinas.setdefault(izquierda, set()).add(simbolo)
+            if simbolo not in anulables:
+                break
+    resultado = []
+    for variable in dict.fromkeys(regla.izquierda for regla in reglas):
+        vistas: set[Variable] = set()
+        pendientes = list(esquinas.get(variable, ()))
+        while pendientes and variable not in vistas:
+            actual = pendientes.pop()
+            if actual not in vistas:
+                vistas.add(actual)
+                pendientes.extend(esquinas.get(actual, ()))
+        if variable in vistas:
+            resultado.append(variable)
+    return resultado
+
+
+def _anulables(reglas: Sequence[Regla]) -> set[Simbolo]:
+    """Devuelve las variables que producen ε."""
+    anulables: set[Simbolo] = set()
+    cambio = True
+    while cambio:
+        cambio = False
+        for izquierda, derecha in reglas:
+            if izquierda not in anulables and all(s in anulables for s in derecha):
+                anulables.add(izquierda)
+                cambio = True
+    return anulables
+
+
+def eliminar_recursion_izquierda(reglas: Sequence[Regla]) -> Transformacion:
+    """Elimina la recursión por la izquierda directa e indirecta.
+
+    Las variables se procesan en el orden en que aparecen. Las reglas
+    `A → A`, que no cambian el lenguaje, se descartan. Cada variable
+    nueva `A'` se nombra con apóstrofos y produce ε.
+
+    Parámetros
+    ----------
+    reglas : Sequence[Regla]
+        Las reglas de la gramática. La variable inicial es la izquierda
+        de la primera.
+
+    Devuelve
+    --------
+    Transformacion
+        Las reglas sin recursión por la izquierda y sus orígenes.
+
+    Levanta
+    -------
+    ValueError
+        Si queda recursión por la izquierda oculta detrás de variables
+        que producen ε (por ejemplo, `<A> ::= <B> <A> "a"` con
+        `<B> ::= ""`), que el algoritmo no elimina.
+    """
+    producciones = _producciones(reglas)
+    orden = list(producciones)
+    nombres = _nombres(reglas)
+    for i, variable in enumerate(orden):
+        for anterior in orden[:i]:
+            sustituidas = []
+            for derecha, origen in producciones[variable]:
+                if derecha[:1] != (anterior,):
+                    sustituidas.append((derecha, origen))
+                    continue
+                for otra, otro_origen in producciones[anterior]:
+                    sustituidas.append(
+                        (Cadena([*otra, *derecha[1:]]), origen + otro_origen)
+                    )
+            producciones[variable] = _sin_repetir(sustituidas)
+        _eliminar_directa(producciones, variable, nombres)
+    resultado = _transformacion(producciones)
+    if recursivas := recursivas_por_la_izquierda(resultado.reglas):
+        lista = ", ".join(str(variable) for variable in recursivas)
+        raise ValueError(
+            f"Queda recursión por la izquierda en {lista}, oculta detrás de "
+            "variables que producen ε"
+        )
+    return resultado
+
+
+def _eliminar_directa(
+    producciones: _Producciones, variable: Variable, nombres: set[str]
+) -> None:
+    """Cambia `A → A α | β` por `A → β A'` y `A' → α A' | ε`."""
+    recursivas: list[tuple[Cadena, tuple[int, ...]]] = []
+    demas: list[tuple[Cadena, tuple[int, ...]]] = []
+    for derecha, origen in producciones[variable]:
+        if derecha[:1] != (variable,):
+            demas.append((derecha, origen))
+        elif len(derecha) > 1:  # Las reglas A → A se descartan.
+            recursivas.append((Cadena(derecha[1:]), origen))
+    if not recursivas:
+        producciones[variable] = demas
+        return
+    nueva = _nueva_variable(variable, nombres)
+    producciones[variable] = [
+        (Cadena([*derecha, nueva]), origen) for derecha, origen in demas
+    ]
+    producciones[nueva] = [
+        (Cadena([*derecha, nueva]), origen) for derecha, origen in recursivas
+    ]
+    producciones[nueva].append((Cadena([]), ()))
+
+
+def factorizar_izquierda(reglas: Sequence[Regla]) -> Transformacion:
+    """Factoriza los prefijos comunes de las reglas de cada variable.
+
+    Se factoriza por símbolos: los terminales `"ab"` y `"ac"` no
+    comparten prefijo. Las reglas repetidas se juntan en una.
+
+    Parámetros
+    ----------
+    reglas : Sequence[Regla]
+        Las reglas de la gramática. La variable inicial es la izquierda
+        de la primera.
+
+    Devuelve
+    --------
+    Transformacion
+        Las reglas factorizadas y sus orígenes. La regla `A → α A'` que
+        sustituye a varias proviene de todas ellas.
+    """
+    producciones = _producciones(reglas)
+    nombres = _nombres(reglas)
+    pendientes = list(producciones)
+    while pendientes:
+        variable = pendientes.pop(0)
+        grupos: dict[Simbolo | None, list[tuple[Cadena, tuple[int, ...]]]] = {}
+        for derecha, origen in _sin_repetir(producciones[variable]):
+            grupos.setdefault(derecha[0] if derecha else None, []).append(
+                (derecha, origen)
+            )
+        factorizadas = []
+        for primero, grupo in grupos.items():
+            if primero is None or len(grupo) == 1:
+                factorizadas.extend(grupo)
+                continue
+            prefijo = _prefijo_comun(derecha for derecha, _ in grupo)
+            nueva = _nueva_variable(variable, nombres)
+            origenes = tuple(itertools.chain.from_iterable(o for _, o in grupo))
+            factorizadas.append((Cadena([*prefijo, nueva]), origenes))
+            producciones[nueva] = [
+                (Cadena(derecha[len(prefijo) :]), origen) for derecha, origen in grupo
+            ]
+            pendientes.append(nueva)
+        producciones[variable] = factorizadas
+    return _transformacion(producciones)
+
+
+def _prefijo_comun(cadenas: Iterable[Cadena]) -> tuple[Simbolo, ...]:
+    """Devuelve el prefijo común más largo de varias cadenas."""
+    prefijo: tuple[Simbolo, ...] | None = None
+    for cadena in cadenas:
+        if prefijo is None:
+            prefijo = tuple(cadena)
+            continue
+        comun = 0
+        while comun < min(len(prefijo), len(cadena)) and (
+            prefijo[comun] == cadena[comun]
+        ):
+            comun += 1
+        prefijo = prefijo[:comun]
+    return prefijo or ()
+
+
+def _producciones(reglas: Sequence[Regla]) -> _Producciones:
+    """Agrupa las reglas por variable, cada una con su número."""
+    producciones: _Producciones = {}
+    for n_regla, (izquierda, derecha) in enumerate(reglas):
+        producciones.setdefault(izquierda, []).append((derecha, (n_regla,)))
+    return producciones
+
+
+def _nombres(reglas: Sequence[Regla]) -> set[str]:
+    """Devuelve los nombres de las variables de las reglas."""
+    return {
+        simbolo.valor
+        for regla in reglas
+        for simbolo in (regla.izquierda, *regla.derecha)
+        if isinstance(simbolo, Variable)
+    }
+
+
+def _nueva_variable(variable: Variable, nombres: set[str]) -> Variable:
+    """Devuelve una variable `A'`, `A''`, ... que no se use todavía."""
+    nombre = variable.valor + "'"
+    while nombre in nombres:
+        nombre += "'"
+    nombres.add(nombre)
+    return Variable(nombre)
+
+
+def _sin_repetir(
+    producciones: Iterable[tuple[Cadena, tuple[int, ...]]],
+) -> list[tuple[Cadena, tuple[int, ...]]]:
+    """Quita las reglas repetidas y conserva el origen de la primera."""
+    unicas: dict[Cadena, tuple[int, ...]] = {}
+    for derecha, origen in producciones:
+        unicas.setdefault(derecha, origen)
+    return list(unicas.items())
+
+
+def _transformacion(producciones: _Producciones) -> Transformacion:
+    """Aplana las producciones en reglas numeradas."""
+    reglas, origenes = [], []
+    for izquierda, derechas in producciones.items():
+        for derecha, origen in derechas:
+            reglas.append(Regla(izquierda, derecha))
+            origenes.append(origen)
+    return Transformacion(reglas, origenes)
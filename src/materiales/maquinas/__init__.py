@@ -1,4 +1,5 @@
 """Máquinas abstractas."""
 
+from .bytecode import Codigo, Programa, ensamblar
 from .hombre import ComputadoraHombrePequenno
 from .pila import MaquinaDePila
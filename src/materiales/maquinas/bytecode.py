@@ -0,0 +1,954 @@
+"""Código de bytes de la máquina de pila.
+
+Este módulo define la representación de los programas de la máquina de
+pila: una sucesión de códigos de operación, cada uno acompañado de un
+argumento (la literal a apilar, el nombre de una variable, la posición
+de destino de un salto, o None para los operadores). También incluye un
+ensamblador que traduce texto en notación posfija, como `"3 4 suma
+cargar:x multiplicacion"`, a un programa, y un traductor de los
+programas sin saltos a funciones de Python.
+
+Además de los operadores, el código de bytes tiene saltos
+condicionales e incondicionales, instrucciones para reordenar la pila,
+variables locales y llamadas a subrutinas. Cada llamada crea un marco
+con sus propias variables locales; los argumentos pasan de la pila a
+las primeras variables locales del marco, y la subrutina regresa
+exactamente un valor en la pila.
+
+Clases
+------
+Codigo
+    Códigos de operación de la máquina de pila.
+Programa
+    Programa en código de bytes de la máquina de pila.
+
+Funciones
+---------
+construir_tabla
+    Construye una tabla densa de operadores indexada por código.
+plegar
+    Evalúa un operador sobre literales, si es seguro hacerlo.
+ensamblar
+    Traduce un programa en notación posfija a código de bytes.
+
+Excepciones
+-----------
+ErrorDeVerificacion
+    El programa no pasa la verificación.
+"""
+
+import ast
+import dataclasses
+import enum
+import operator
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from typing import Any
+
+
+class Codigo(enum.IntEnum):
+    """Códigos de operación de la máquina de pila.
+
+    El nombre en minúsculas de cada código es su mnemónico en el
+    ensamblador y, salvo para las variables locales y el control de
+    flujo, coincide con el método de `MaquinaDePila` que realiza la
+    misma operación. APILAR apila la literal que la acompaña; CARGAR y
+    GUARDAR reciben el nombre de una variable; CARGAR_LOCAL y
+    GUARDAR_LOCAL, el número de una variable local; los saltos, la
+    posición de destino; y LLAMAR, el par (destino, aridad).
+    """
+
+    APILAR = 0
+    # Variables
+    CARGAR = enum.auto()
+    GUARDAR = enum.auto()
+    CARGAR_LOCAL = enum.auto()
+    GUARDAR_LOCAL = enum.auto()
+    # Manipulación de la pila
+    DUPLICAR = enum.auto()
+    DESCARTAR = enum.auto()
+    INTERCAMBIAR = enum.auto()
+    COPIAR_SEGUNDO = enum.auto()
+    ROTAR = enum.auto()
+    # Control de flujo
+    SALTAR = enum.auto()
+    SALTAR_SI_FALSO = enum.auto()
+    SALTAR_SI_VERDADERO = enum.auto()
+    LLAMAR = enum.auto()
+    REGRESAR = enum.auto()
+    # Operadores aritméticos +, -, -, *, /, //, %, **
+    SUMA = enum.auto()
+    RESTA = enum.auto()
+    INVERTIR_SIGNO = enum.auto()
+    MULTIPLICACION = enum.auto()
+    DIVISION = enum.auto()
+    DIVISION_ENTERA = enum.auto()
+    MODULO = enum.auto()
+    POTENCIA = enum.auto()
+    # Operadores de comparación <, <=, ==, !=, >=, >
+    MENOR_QUE = enum.auto()
+    MENOR_O_IGUAL_QUE = enum.auto()
+    IGUAL_QUE = enum.auto()
+    DIFERENTE_QUE = enum.auto()
+    MAYOR_O_IGUAL_QUE = enum.auto()
+    MAYOR_QUE = enum.auto()
+    # Operadores lógicos and, or, not
+    Y_LOGICO = enum.auto()
+    O_LOGICO = enum.auto()
+    NEGACION = enum.auto()
+    # Operadores de bits &, |, ^, ~, <<, >>
+    Y_BIT_A_BIT = enum.auto()
+    O_BIT_A_BIT = enum.auto()
+    XOR = enum.auto()
+    NEGACION_BIT_A_BIT = enum.auto()
+    CORRIMIENTO_IZQUIERDA = enum.auto()
+    CORRIMIENTO_DERECHA = enum.auto()
+
+    @property
+    def mnemonico(self) -> str:
+        """Devuelve el mnemónico del código en el ensamblador."""
+        return self.name.lower()
+
+
+def _y_logico(a: Any, b: Any) -> Any:
+    return a and b
+
+
+def _o_logico(a: Any, b: Any) -> Any:
+    return a or b
+
+
+UNARIOS: dict[Codigo, Callable[[Any], Any]] = {
+    Codigo.INVERTIR_SIGNO: operator.neg,
+    Codigo.NEGACION: operator.not_,
+    Codigo.NEGACION_BIT_A_BIT: operator.invert,
+}
+"""Operadores que desapilan a y apilan f(a)."""
+
+BINARIOS: dict[Codigo, Callable[[Any, Any], Any]] = {
+    Codigo.SUMA: operator.add,
+    Codigo.RESTA: operator.sub,
+    Codigo.MULTIPLICACION: operator.mul,
+    Codigo.DIVISION: operator.truediv,
+    Codigo.DIVISION_ENTERA: operator.floordiv,
+    Codigo.MODULO: operator.mod,
+    Codigo.POTENCIA: operator.pow,
+    Codigo.MENOR_QUE: operator.lt,
+    Codigo.MENOR_O_IGUAL_QUE: operator.le,
+    Codigo.IGUAL_QUE: operator.eq,
+    Codigo.DIFERENTE_QUE: operator.ne,
+    Codigo.MAYOR_O_IGUAL_QUE: operator.ge,
+    Codigo.MAYOR_QUE: operator.gt,
+    Codigo.Y_LOGICO: _y_logico,
+    Codigo.O_LOGICO: _o_logico,
+    Codigo.Y_BIT_A_BIT: operator.and_,
+    Codigo.O_BIT_A_BIT: operator.or_,
+    Codigo.XOR: operator.xor,
+    Codigo.CORRIMIENTO_IZQUIERDA: operator.lshift,
+    Codigo.CORRIMIENTO_DERECHA: operator.rshift,
+}
+"""Operadores que desapilan b y a, y apilan f(a, b)."""
+
+SALTOS = frozenset({Codigo.SALTAR, Codigo.SALTAR_SI_FALSO, Codigo.SALTAR_SI_VERDADERO})
+"""Códigos cuyo argumento es la posición de destino."""
+
+LOCALES = frozenset({Codigo.CARGAR_LOCAL, Codigo.GUARDAR_LOCAL})
+"""Códigos cuyo argumento es el número de una variable local."""
+
+PILA = frozenset(
+    {
+        Codigo.DUPLICAR,
+        Codigo.DESCARTAR,
+        Codigo.INTERCAMBIAR,
+        Codigo.COPIAR_SEGUNDO,
+        Codigo.ROTAR,
+    }
+)
+"""Códigos que reordenan o copian los elementos de la pila."""
+
+CONTROL = SALTOS | LOCALES | {Codigo.LLAMAR, Codigo.REGRESAR}
+"""Códigos que sólo tienen sentido dentro del ciclo de ejecución."""
+
+CON_ARGUMENTO = frozenset(
+    {Codigo.APILAR, Codigo.CARGAR, Codigo.GUARDAR, Codigo.LLAMAR} | SALTOS | LOCALES
+)
+"""Códigos cuyo argumento forma parte de la instrucción."""
+
+# Tipos de instrucción en una tabla de operadores y en un plan.
+# BINARIO_LITERAL es una superinstrucción del plan: APILAR seguido de un
+# operador binario, con el par (función, literal) como valor.
+(
+    LITERAL,
+    UNARIO,
+    BINARIO,
+    CARGA,
+    GUARDADO,
+    DUPLICADO,
+    BINARIO_LITERAL,
+    CARGA_LOCAL,
+    GUARDADO_LOCAL,
+    DESCARTE,
+    INTERCAMBIO,
+    COPIA_SEGUNDO,
+    ROTACION,
+    SALTO,
+    SALTO_SI_FALSO,
+    SALTO_SI_VERDADERO,
+    LLAMADA,
+    RETORNO,
+) = range(18)
+
+_TIPOS_FIJOS = {
+    Codigo.APILAR: LITERAL,
+    Codigo.CARGAR: CARGA,
+    Codigo.GUARDAR: GUARDADO,
+    Codigo.CARGAR_LOCAL: CARGA_LOCAL,
+    Codigo.GUARDAR_LOCAL: GUARDADO_LOCAL,
+    Codigo.DUPLICAR: DUPLICADO,
+    Codigo.DESCARTAR: DESCARTE,
+    Codigo.INTERCAMBIAR: INTERCAMBIO,
+    Codigo.COPIAR_SEGUNDO: COPIA_SEGUNDO,
+    Codigo.ROTAR: ROTACION,
+    Codigo.SALTAR: SALTO,
+    Codigo.SALTAR_SI_FALSO: SALTO_SI_FALSO,
+    Codigo.SALTAR_SI_VERDADERO: SALTO_SI_VERDADERO,
+    Codigo.LLAMAR: LLAMADA,
+    Codigo.REGRESAR: RETORNO,
+}
+
+REQUERIDOS = {
+    LITERAL: 0,
+    UNARIO: 1,
+    BINARIO: 2,
+    CARGA: 0,
+    GUARDADO: 1,
+    DUPLICADO: 1,
+    BINARIO_LITERAL: 1,
+    CARGA_LOCAL: 0,
+    GUARDADO_LOCAL: 1,
+    DESCARTE: 1,
+    INTERCAMBIO: 2,
+    COPIA_SEGUNDO: 2,
+    ROTACION: 3,
+    SALTO: 0,
+    SALTO_SI_FALSO: 1,
+    SALTO_SI_VERDADERO: 1,
+    LLAMADA: 0,
+    RETORNO: 0,
+}
+"""Elementos que cada tipo de instrucción necesita en la pila. Una
+llamada necesita además tantos elementos como su aridad."""
+
+EFECTOS = {
+    LITERAL: 1,
+    UNARIO: 0,
+    BINARIO: -1,
+    CARGA: 1,
+    GUARDADO: -1,
+    DUPLICADO: 1,
+    BINARIO_LITERAL: 0,
+    CARGA_LOCAL: 1,
+    GUARDADO_LOCAL: -1,
+    DESCARTE: -1,
+    INTERCAMBIO: 0,
+    COPIA_SEGUNDO: 1,
+    ROTACION: 0,
+    SALTO: 0,
+    SALTO_SI_FALSO: -1,
+    SALTO_SI_VERDADERO: -1,
+    LLAMADA: 1,
+    RETORNO: 0,
+}
+"""Cambio en el tamaño de la pila por cada tipo de instrucción. Una
+llamada desapila además sus argumentos."""
+
+TablaOperadores = Sequence[tuple[int, Any]]
+"""Tabla indexada por código de operación con pares (tipo, función)."""
+
+Plan = tuple[tuple[int, Any], ...]
+"""Plan de ejecución: un par (tipo, valor) por instrucción. El valor es
+la función de los operadores y el argumento de las demás
+instrucciones. Una literal seguida de un operador binario se funde en
+un solo par (BINARIO_LITERAL, (función, literal)), y los destinos de
+los saltos y las llamadas son posiciones del plan."""
+
+Traduccion = Callable[[list[Any], dict[str, Any], Mapping[str, Any] | None], None]
+"""Función de Python que ejecuta un programa lineal. Recibe la pila, las
+variables y los valores que se asignan a las variables antes de
+ejecutar (o None)."""
+
+# Exponentes y corrimientos mayores no se pliegan, para no construir
+# enteros enormes al compilar u optimizar.
+MAXIMO_PLEGABLE = 64
+
+# Tamaño máximo de un resultado plegado: bits de un entero y longitud
+# de una cadena o de bytes. Los mayores se calculan al ejecutar.
+MAXIMO_BITS_PLEGADOS = 4096
+MAXIMA_LONGITUD_PLEGADA = 4096
+
+
+def _repeticion_larga(secuencia: Any, veces: Any) -> bool:
+    """Indica si `secuencia * veces` sería una cadena o bytes demasiado largos.
+
+    Se decide antes de construirla: `"ab" * 10**9` ocuparía 2 GB.
+    """
+    return (
+        isinstance(secuencia, (str, bytes))
+        and isinstance(veces, int)
+        and len(secuencia) * veces > MAXIMA_LONGITUD_PLEGADA
+    )
+
+
+def plegar(codigo: Codigo, valores: Sequence[Any]) -> tuple[bool, Any]:
+    """Evalúa un operador sobre literales, si es seguro hacerlo.
+
+    No se pliegan los exponentes y corrimientos mayores que
+    `MAXIMO_PLEGABLE`, las repeticiones de cadenas o bytes más largas
+    que `MAXIMA_LONGITUD_PLEGADA`, los enteros de más de
+    `MAXIMO_BITS_PLEGADOS` bits ni las operaciones que levantan una
+    excepción.
+
+    Parámetros
+    ----------
+    codigo : Codigo
+        Un operador de `UNARIOS` o de `BINARIOS`.
+    valores : Sequence[Any]
+        Los operandos, uno o dos según el operador.
+
+    Devuelve
+    --------
+    tuple[bool, Any]
+        True y el resultado si se plegó; False y None si no.
+    """
+    try:
+        if len(valores) == 1:
+            valor = UNARIOS[codigo](valores[0])
+        else:
+            izquierdo, derecho = valores
+            if codigo in (Codigo.POTENCIA, Codigo.CORRIMIENTO_IZQUIERDA):
+                if abs(derecho) > MAXIMO_PLEGABLE:
+                    return False, None
+            if codigo == Codigo.MULTIPLICACION and (
+                _repeticion_larga(izquierdo, derecho)
+                or _repeticion_larga(derecho, izquierdo)
+            ):
+                return False, None
+            valor = BINARIOS[codigo](izquierdo, derecho)
+    except (ArithmeticError, TypeError, ValueError):
+        return False, None  # El error, si lo hay, ocurrirá al ejecutar.
+    if isinstance(valor, int) and valor.bit_length() > MAXIMO_BITS_PLEGADOS:
+        return False, None
+    if isinstance(valor, (str, bytes)) and len(valor) > MAXIMA_LONGITUD_PLEGADA:
+        return False, None
+    return True, valor
+
+
+def construir_tabla(
+    unarios: Mapping[Codigo, Callable[[Any], Any]],
+    binarios: Mapping[Codigo, Callable[[Any, Any], Any]],
+) -> TablaOperadores:
+    """Construye una tabla densa de operadores indexada por código.
+
+    Parámetros
+    ----------
+    unarios : Mapping[Codigo, Callable[[Any], Any]]
+        Funciones de los operadores unarios.
+    binarios : Mapping[Codigo, Callable[[Any, Any], Any]]
+        Funciones de los operadores binarios.
+
+    Devuelve
+    --------
+    TablaOperadores
+        Tabla con el par (tipo, función) de cada código.
+    """
+    tabla: list[tuple[int, Any]] = [(LITERAL, None)] * len(Codigo)
+    for codigo, tipo in _TIPOS_FIJOS.items():
+        tabla[codigo] = (tipo, None)
+    for codigo, unario in unarios.items():
+        tabla[codigo] = (UNARIO, unario)
+    for codigo, binario in binarios.items():
+        tabla[codigo] = (BINARIO, binario)
+    return tuple(tabla)
+
+
+TABLA_ESCALAR = construir_tabla(UNARIOS, BINARIOS)
+"""Tabla de operadores sobre escalares de Python."""
+
+_SINTAXIS: dict[Callable[..., Any], str] = {
+    operator.neg: "-{}",
+    operator.not_: "not {}",
+    operator.invert: "~{}",
+    operator.add: "{} + {}",
+    operator.sub: "{} - {}",
+    operator.mul: "{} * {}",
+    operator.truediv: "{} / {}",
+    operator.floordiv: "{} // {}",
+    operator.mod: "{} % {}",
+    operator.pow: "{} ** {}",
+    operator.lt: "{} < {}",
+    operator.le: "{} <= {}",
+    operator.eq: "{} == {}",
+    operator.ne: "{} != {}",
+    operator.ge: "{} >= {}",
+    operator.gt: "{} > {}",
+    _y_logico: "{} and {}",
+    _o_logico: "{} or {}",
+    operator.and_: "{} & {}",
+    operator.or_: "{} | {}",
+    operator.xor: "{} ^ {}",
+    operator.lshift: "{} << {}",
+    operator.rshift: "{} >> {}",
+}
+"""Expresión de Python equivalente a cada función de `TABLA_ESCALAR`.
+Las demás funciones se llaman por su nombre."""
+
+
+def _reordenar(tipo: int, pila: list[str]) -> None:
+    """Aplica una instrucción que reordena la pila a una pila simulada."""
+    if tipo == DUPLICADO:
+        pila.append(pila[-1])
+    elif tipo == INTERCAMBIO:
+        pila[-2], pila[-1] = pila[-1], pila[-2]
+    elif tipo == COPIA_SEGUNDO:
+        pila.append(pila[-2])
+    elif tipo == ROTACION:
+        pila.append(pila.pop(-3))
+    else:  # DESCARTE
+        pila.pop()
+
+
+def _traducir(plan: Plan, requeridos: int) -> Traduccion:
+    """Traduce el plan de un programa lineal a una función de Python.
+
+    La pila se simula con nombres de variables de Python: las literales
+    y las instrucciones que reordenan la pila sólo cambian qué nombre
+    ocupa cada lugar, y cada operador, carga o guardado se vuelve una
+    asignación, en el mismo orden que en el programa. La función toma
+    de la pila los `requeridos` elementos que usa al empezar y los
+    reemplaza por los que deja al terminar.
+    """
+    globales: dict[str, Any] = {}
+    nombres: dict[int, str] = {}
+
+    def constante(valor: Any) -> str:
+        """Devuelve el nombre global de una literal, variable o función."""
+        if id(valor) not in nombres:
+            nombres[id(valor)] = f"_k{len(nombres)}"
+            globales[nombres[id(valor)]] = valor
+        return nombres[id(valor)]
+
+    def llamada(funcion: Any, operandos: list[str]) -> str:
+        """Devuelve la expresión que aplica un operador a sus operandos."""
+        sintaxis = _SINTAXIS.get(funcion)
+        if sintaxis is None:
+            return f"{constante(funcion)}({', '.join(operandos)})"
+        return sintaxis.format(*operandos)
+
+    lineas = ["def _programa(pila, entorno, variables):"]
+    if requeridos:
+        lineas += [
+            f"    if len(pila) < {requeridos}:",
+            "        raise IndexError(",
+            f'            f"El programa necesita {requeridos} elementos en la pila, "',
+            '            f"hay {len(pila)}."',
+            "        )",
+        ]
+    lineas += ["    if variables is not None:", "        entorno.update(variables)"]
+    pila = [f"e{i}" for i in range(requeridos)]
+    if pila:
+        lineas.append(f"    {', '.join(pila)}, = pila[-{requeridos}:]")
+    for tipo, valor in plan:
+        if tipo == LITERAL:
+            pila.append(constante(valor))
+        elif tipo == GUARDADO:
+            lineas.append(f"    entorno[{constante(valor)}] = {pila.pop()}")
+        elif tipo in (CARGA, UNARIO, BINARIO, BINARIO_LITERAL):
+            if tipo == CARGA:
+                expresion = f"entorno[{constante(valor)}]"
+            elif tipo == BINARIO_LITERAL:
+                expresion = llamada(valor[0], [pila.pop(), constante(valor[1])])
+            else:
+                operandos = (
+                    [pila.pop(-2), pila.pop()] if tipo == BINARIO else [pila.pop()]
+                )
+                expresion = llamada(valor, operandos)
+            pila.append(f"t{len(lineas)}")
+            lineas.append(f"    {pila[-1]} = {expresion}")
+        else:
+            _reordenar(tipo, pila)
+    if requeridos:
+        lineas.append(f"    pila[-{requeridos}:] = ({''.join(f'{e}, ' for e in pila)})")
+    elif pila:
+        lineas.append(f"    pila.extend(({''.join(f'{e}, ' for e in pila)}))")
+    exec(  # pylint: disable=exec-used
+        compile("\n".join(lineas), "<programa>", "exec"), globales
+    )
+    traduccion: Traduccion = globales["_programa"]
+    return traduccion
+
+
+class ErrorDeVerificacion(ValueError):
+    """El programa no pasa la verificación.
+
+    Atributos
+    ---------
+    posicion : int
+        Posición de la instrucción que falla.
+    """
+
+    def __init__(self, mensaje: str, posicion: int) -> None:
+        super().__init__(mensaje)
+        self.posicion = posicion
+
+
+@dataclasses.dataclass(frozen=True)
+class Programa:
+    """Programa en código de bytes de la máquina de pila.
+
+    Atributos
+    ---------
+    codigos : tuple[Codigo, ...]
+        Códigos de operación, en orden de ejecución.
+    argumentos : tuple[Any, ...]
+        Argumento de cada instrucción: la literal para APILAR, el nombre
+        de la variable para CARGAR y GUARDAR, el número de la variable
+        local para CARGAR_LOCAL y GUARDAR_LOCAL, la posición de destino
+        para los saltos, el par (destino, aridad) para LLAMAR, y None
+        para las demás instrucciones.
+    """
+
+    codigos: tuple[Codigo, ...]
+    argumentos: tuple[Any, ...]
+    _cache: dict[object, Any] = dataclasses.field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _traducciones: dict[int, tuple[TablaOperadores, Traduccion | None]] = (
+        dataclasses.field(default_factory=dict, init=False, repr=False, compare=False)
+    )
+
+    def __post_init__(self) -> None:
+        if len(self.codigos) != len(self.argumentos):
+            raise ValueError(
+                "Se esperaba un argumento por código, se recibieron "
+                f"{len(self.codigos)} códigos y {len(self.argumentos)} argumentos."
+            )
+        for posicion, (codigo, argumento) in enumerate(self):
+            if codigo in CONTROL and not self._argumento_valido(codigo, argumento):
+                raise ValueError(
+                    f"Argumento inválido {argumento!r} para '{codigo.mnemonico}' "
+                    f"en la posición {posicion}."
+                )
+
+    def _argumento_valido(self, codigo: Codigo, argumento: Any) -> bool:
+        """Indica si el argumento de una instrucción de control es válido."""
+        if codigo == Codigo.REGRESAR:
+            return argumento is None
+        if codigo == Codigo.LLAMAR:
+            if not isinstance(argumento, tuple) or len(argumento) != 2:
+                return False
+            argumento, aridad = argumento
+            if not isinstance(aridad, int) or aridad < 0:
+                return False
+        limite = len(self) if codigo not in LOCALES else None
+        return (
+            isinstance(argumento, int)
+            and argumento >= 0
+            and (limite is None or argumento <= limite)
+        )
+
+    @classmethod
+    def desde_instrucciones(
+        cls, instrucciones: Iterable[tuple[Codigo, Any]]
+    ) -> "Programa":
+        """Construye un programa a partir de pares (código, argumento)."""
+        pares = list(instrucciones)
+        return cls(
+            tuple(Codigo(codigo) for codigo, _ in pares),
+            tuple(argumento for _, argumento in pares),
+        )
+
+    @property
+    def es_lineal(self) -> bool:
+        """Indica si el programa no tiene saltos, llamadas ni locales."""
+        lineal = self._cache.get("lineal")
+        if lineal is None:
+            lineal = self._cache["lineal"] = CONTROL.isdisjoint(self.codigos)
+        return bool(lineal)
+
+    def destinos(self) -> frozenset[int]:
+        """Devuelve las posiciones a las que salta o llama el programa."""
+        return frozenset(
+            argumento[0] if codigo == Codigo.LLAMAR else argumento
+            for codigo, argumento in self
+            if codigo in SALTOS or codigo == Codigo.LLAMAR
+        )
+
+    def subrutinas(self) -> dict[int, int]:
+        """Devuelve la aridad de cada subrutina, indexada por su posición.
+
+        Levanta
+        -------
+        ErrorDeVerificacion
+            Si dos llamadas a la misma posición tienen aridades
+            distintas.
+        """
+        aridades: dict[int, int] = {}
+        for posicion, (codigo, argumento) in enumerate(self):
+            if codigo == Codigo.LLAMAR:
+                destino, aridad = argumento
+                if aridades.setdefault(destino, aridad) != aridad:
+                    raise ErrorDeVerificacion(
+                        f"La llamada en la posición {posicion} pasa {aridad} "
+                        f"argumentos a una subrutina de aridad {aridades[destino]}.",
+                        posicion,
+                    )
+        return aridades
+
+    def sucesores(self, posicion: int) -> tuple[int, ...]:
+        """Devuelve las posiciones que pueden ejecutarse después de otra.
+
+        La posición `len(self)` representa el final del programa. Una
+        llamada continúa en la instrucción siguiente, y REGRESAR no
+        tiene sucesores.
+        """
+        codigo, argumento = self.codigos[posicion], self.argumentos[posicion]
+        if codigo == Codigo.SALTAR:
+            return (argumento,)
+        if codigo in SALTOS:
+            return (posicion + 1, argumento)
+        if codigo == Codigo.REGRESAR:
+            return ()
+        return (posicion + 1,)
+
+    def numero_de_locales(self) -> int:
+        """Devuelve cuántas variables locales necesita cada marco."""
+        numero = self._cache.get("locales")
+        if numero is None:
+            numero = max(
+                [argumento + 1 for codigo, argumento in self if codigo in LOCALES]
+                + list(self.subrutinas().values())
+                + [0]
+            )
+            self._cache["locales"] = numero
+        return int(numero)
+
+    def planear(self, tabla: TablaOperadores) -> Plan:
+        """Devuelve el plan de ejecución del programa.
+
+        El plan resuelve de antemano la función de cada instrucción
+        para que el ciclo de ejecución no consulte la tabla, y funde
+        cada literal seguida de un operador binario en una
+        superinstrucción, que no pasa la literal por la pila (salvo si
+        algún salto llega al operador). Se guarda en caché junto con
+        la tabla misma, y sólo se reutiliza si se pide con el mismo
+        objeto: guardar la tabla impide que otra tabla reciba su `id`
+        mientras el plan esté en la caché.
+
+        Parámetros
+        ----------
+        tabla : TablaOperadores
+            Tabla de operadores de la máquina que ejecutará el programa.
+
+        Devuelve
+        --------
+        Plan
+            Un par (tipo, valor) por instrucción o superinstrucción.
+        """
+        guardado = self._cache.get(id(tabla))
+        if guardado is not None and guardado[0] is tabla:
+            return guardado[1]  # type: ignore[no-any-return]
+        destinos = self.destinos()
+        pares: list[tuple[int, Any]] = []
+        # Posición en el plan de cada instrucción, y del final.
+        posiciones: list[int] = []
+        for posicion, (codigo, argumento) in enumerate(self):
+            tipo, funcion = tabla[codigo]
+            if (
+                tipo == BINARIO
+                and pares
+                and pares[-1][0] == LITERAL
+                and posicion not in destinos
+            ):
+                posiciones.append(len(pares) - 1)
+                pares[-1] = (BINARIO_LITERAL, (funcion, pares[-1][1]))
+                continue
+            posiciones.append(len(pares))
+            if codigo in CON_ARGUMENTO:
+                pares.append((tipo, argumento))
+            else:
+                pares.append((tipo, funcion))
+        posiciones.append(len(pares))
+        if destinos:
+            pares = [
+                (
+                    (tipo, posiciones[valor])
+                    if tipo in (SALTO, SALTO_SI_FALSO, SALTO_SI_VERDADERO)
+                    else (
+                        (tipo, (posiciones[valor[0]], valor[1]))
+                        if tipo == LLAMADA
+                        else (tipo, valor)
+                    )
+                )
+                for tipo, valor in pares
+            ]
+        plan = tuple(pares)
+        self._cache[id(tabla)] = (tabla, plan)
+        return plan
+
+    def traduccion(self, tabla: TablaOperadores) -> Traduccion | None:
+        """Devuelve la traducción del programa a una función de Python.
+
+        La función ejecuta el programa sin un ciclo de ejecución: cada
+        operador es una expresión de Python, y las literales y las
+        instrucciones que reordenan la pila no cuestan nada. Traducir
+        cuesta unas diez veces más que planear, así que sólo se
+        traducen los programas lineales, y a partir de la segunda vez
+        que se pide la traducción con la misma tabla; la primera vez se
+        devuelve None y el programa se ejecuta con su plan. Como el
+        plan, la traducción se guarda en caché junto con la tabla.
+
+        Parámetros
+        ----------
+        tabla : TablaOperadores
+            Tabla de operadores de la máquina que ejecutará el programa.
+
+        Devuelve
+        --------
+        Traduccion | None
+            La función, o None si el programa no tiene traducción
+            todavía o no es lineal.
+        """
+        guardado = self._traducciones.get(id(tabla))
+        if guardado is None or guardado[0] is not tabla:
+            self._traducciones[id(tabla)] = (tabla, None)
+            return None
+        if guardado[1] is None and self.es_lineal:
+            traduccion = _traducir(self.planear(tabla), -self.alcance_de_pila()[0])
+            self._traducciones[id(tabla)] = (tabla, traduccion)
+            return traduccion
+        return guardado[1]
+
+    def profundidades(self) -> tuple[int | None, ...]:
+        """Calcula el tamaño de la pila antes de cada instrucción.
+
+        El tamaño es relativo al tamaño de la pila al empezar el
+        programa o, dentro de una subrutina, al entrar en ella (después
+        de pasar los argumentos a las variables locales). Como en el
+        verificador de la JVM, todos los caminos que llegan a una
+        instrucción deben llegar con el mismo tamaño.
+
+        Devuelve
+        --------
+        tuple[int | None, ...]
+            El tamaño antes de cada instrucción, o None si la
+            instrucción es inalcanzable.
+
+        Levanta
+        -------
+        ErrorDeVerificacion
+            Si dos caminos llegan a una instrucción con tamaños
+            distintos, si una subrutina desapila más de lo que apiló o
+            si no regresa exactamente un valor, o si dos llamadas a la
+            misma subrutina tienen aridades distintas.
+        """
+        return self._analizar_pila()[0]
+
+    def alcance_de_pila(self) -> tuple[int, int]:
+        """Calcula cuánto baja y cuánto sube la pila al ejecutar.
+
+        Sólo se cuenta el programa principal: la pila que usan las
+        subrutinas depende de la profundidad de las llamadas.
+
+        Devuelve
+        --------
+        tuple[int, int]
+            El mínimo (cero o negativo) y el máximo del tamaño de la
+            pila relativo a su tamaño inicial. El programa necesita al
+            menos `-minimo` elementos al empezar y `maximo` posiciones
+            libres.
+
+        Levanta
+        -------
+        ErrorDeVerificacion
+            Si el programa no tiene una profundidad bien definida en
+            cada instrucción (ver `profundidades`).
+        """
+        _, minimo, maximo = self._analizar_pila()
+        return minimo, maximo
+
+    def _analizar_pila(self) -> tuple[tuple[int | None, ...], int, int]:
+        """Recorre el grafo de flujo y calcula los tamaños de la pila."""
+        analisis = self._cache.get("alcance")
+        if analisis is not None:
+            return analisis  # type: ignore[no-any-return]
+        profundidades: list[int | None] = [None] * len(self)
+        pendientes = [(0, 0, False)]
+        pendientes.extend((destino, 0, True) for destino in self.subrutinas())
+        visitados: set[tuple[int, bool]] = set()
+        minimo = maximo = 0
+        while pendientes:
+            posicion, profundidad, en_subrutina = pendientes.pop()
+            if posicion == len(self):
+                continue
+            if profundidades[posicion] not in (None, profundidad):
+                raise ErrorDeVerificacion(
+                    f"La pila llega con tamaños {profundidades[posicion]} y "
+                    f"{profundidad} a la posición {posicion}.",
+                    posicion,
+                )
+            if (posicion, en_subrutina) in visitados:
+                continue
+            visitados.add((posicion, en_subrutina))
+            profundidades[posicion] = profundidad
+            requeridos, efecto = self.efecto(posicion)
+            if en_subrutina:
+                if profundidad < requeridos:
+                    raise ErrorDeVerificacion(
+                        f"La subrutina desapila de más en la posición {posicion}.",
+                        posicion,
+                    )
+                if self.codigos[posicion] == Codigo.REGRESAR and profundidad != 1:
+                    raise ErrorDeVerificacion(
+                        f"La subrutina regresa {profundidad} valores en la "
+                        f"posición {posicion}; debe regresar exactamente uno.",
+                        posicion,
+                    )
+            else:
+                minimo = min(minimo, profundidad - requeridos)
+                maximo = max(maximo, profundidad + efecto)
+            for siguiente in self.sucesores(posicion):
+                pendientes.append((siguiente, profundidad + efecto, en_subrutina))
+        analisis = self._cache["alcance"] = (tuple(profundidades), minimo, maximo)
+        return analisis
+
+    def efecto(self, posicion: int) -> tuple[int, int]:
+        """Devuelve los elementos que requiere una instrucción y su efecto.
+
+        El efecto es cuánto cambia el tamaño de la pila. Los argumentos
+        de LLAMAR cuentan entre los elementos requeridos.
+        """
+        tipo = TABLA_ESCALAR[self.codigos[posicion]][0]
+        if tipo == LLAMADA:
+            aridad = self.argumentos[posicion][1]
+            return aridad, EFECTOS[tipo] - aridad
+        return REQUERIDOS[tipo], EFECTOS[tipo]
+
+    def __len__(self) -> int:
+        return len(self.codigos)
+
+    def __iter__(self) -> Iterator[tuple[Codigo, Any]]:
+        return zip(self.codigos, self.argumentos)
+
+    def __str__(self) -> str:
+        """Devuelve el programa en notación posfija."""
+        return " ".join(_palabra(codigo, argumento) for codigo, argumento in self)
+
+
+def _palabra(codigo: Codigo, argumento: Any) -> str:
+    """Devuelve la palabra del ensamblador para una instrucción."""
+    if codigo == Codigo.APILAR:
+        return repr(argumento)
+    if codigo == Codigo.LLAMAR:
+        return f"{codigo.mnemonico}:{argumento[0]}/{argumento[1]}"
+    if codigo in CON_ARGUMENTO:
+        return f"{codigo.mnemonico}:{argumento}"
+    return codigo.mnemonico
+
+
+def _argumento(codigo: Codigo, texto: str, posicion: int) -> Any:
+    """Interpreta el argumento de una instrucción en el ensamblador.
+
+    Los destinos que no son números son etiquetas, que se devuelven como
+    texto para resolverlas al final.
+    """
+    if codigo in (Codigo.CARGAR, Codigo.GUARDAR):
+        return texto
+    destino, diagonal, aridad = texto.partition("/")
+    if codigo in LOCALES and destino.isdigit() and not diagonal:
+        return int(destino)
+    if codigo in SALTOS and not diagonal and destino:
+        return int(destino) if destino.isdigit() else destino
+    if codigo == Codigo.LLAMAR and destino and aridad.isdigit() == bool(diagonal):
+        return (
+            int(destino) if destino.isdigit() else destino,
+            int(aridad) if diagonal else 0,
+        )
+    raise SyntaxError(
+        f"Argumento inválido '{texto}' para '{codigo.mnemonico}' en la posición "
+        f"{posicion}."
+    )
+
+
+def ensamblar(texto: str) -> Programa:
+    """Traduce un programa en notación posfija a código de bytes.
+
+    Cada palabra del texto es un mnemónico (el nombre de un método de
+    `MaquinaDePila`, como `suma`) o una literal de Python sin espacios
+    (como `3`, `2.5` o `True`), que se traduce a APILAR. Las
+    instrucciones con argumento se escriben `mnemonico:argumento`, como
+    `cargar:x`, `cargar_local:0` o `saltar:fin`; las llamadas indican
+    también su aridad, como `llamar:factorial/1`. Una palabra de la
+    forma `etiqueta:` marca la posición de la instrucción siguiente,
+    que los saltos y las llamadas pueden usar como destino en lugar de
+    un número.
+
+    Parámetros
+    ----------
+    texto : str
+        Programa en notación posfija, con palabras separadas por
+        espacios en blanco.
+
+    Devuelve
+    --------
+    Programa
+        El programa en código de bytes.
+
+    Levanta
+    -------
+    SyntaxError
+        Si una palabra no es un mnemónico, una literal ni una etiqueta,
+        o si una etiqueta está repetida o no está definida.
+    """
+    codigos: list[Codigo] = []
+    argumentos: list[Any] = []
+    etiquetas: dict[str, int] = {}
+    for i, palabra in enumerate(texto.split()):
+        mnemonico, dos_puntos, argumento = palabra.partition(":")
+        codigo = Codigo.__members__.get(mnemonico.upper())
+        if codigo is None and dos_puntos and not argumento and mnemonico.isidentifier():
+            if mnemonico in etiquetas:
+                raise SyntaxError(
+                    f"Etiqueta repetida '{mnemonico}' en la posición {i}."
+                )
+            etiquetas[mnemonico] = len(codigos)
+            continue
+        if codigo is not None and codigo != Codigo.APILAR:
+            if (codigo in CON_ARGUMENTO) != bool(dos_puntos):
+                raise SyntaxError(
+                    f"Argumento inesperado o faltante en '{palabra}' en la "
+                    f"posición {i}."
+                )
+            codigos.append(codigo)
+            argumentos.append(_argumento(codigo, argumento, i) if dos_puntos else None)
+            continue
+        try:
+            literal = ast.literal_eval(palabra)
+        except (ValueError, SyntaxError) as exc:
+            raise SyntaxError(
+                f"Palabra desconocida '{palabra}' en la posición {i}."
+            ) from exc
+        codigos.append(Codigo.APILAR)
+        argumentos.append(literal)
+    for posicion, (codigo, argumento) in enumerate(zip(codigos, argumentos)):
+        if codigo in SALTOS or codigo == Codigo.LLAMAR:
+            destino = argumento[0] if codigo == Codigo.LLAMAR else argumento
+            if isinstance(destino, str):
+                if destino not in etiquetas:
+                    raise SyntaxError(
+                        f"Etiqueta desconocida '{destino}' en la instrucción "
+                        f"{posicion}."
+                    )
+                destino = etiquetas[destino]
+                if codigo == Codigo.LLAMAR:
+                    destino = (destino, argumento[1])
+                argumentos[posicion] = destino
+    return Programa(tuple(codigos), tuple(argumentos))
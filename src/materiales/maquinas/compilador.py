@@ -0,0 +1,305 @@
+"""Compilador de expresiones de Python a código de la máquina de pila.
+
+Este módulo traduce un árbol `ast.Expression` (el mismo que dibuja
+`visualizaciones.diagramasast.DiagramaAST`) a un `Programa` de la
+máquina de pila. Antes de generar código, pliega las subexpresiones
+constantes y detecta las subexpresiones comunes, que se calculan una
+sola vez y se guardan en variables temporales.
+
+Clases
+------
+CompiladorPila
+    Compilador de expresiones de Python a código de la máquina de pila.
+
+Funciones
+---------
+compilar
+    Compila una expresión de Python a un programa de la máquina de pila.
+evaluar_muchos
+    Evalúa una expresión para muchas asignaciones de variables.
+"""
+
+import ast
+import collections
+import copy
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from . import optimizador
+from .bytecode import Codigo, Programa, plegar
+from .pila import MaquinaDePila
+
+OPERADORES_BINARIOS: dict[type[ast.AST], Codigo] = {
+    ast.Add: Codigo.SUMA,
+    ast.Sub: Codigo.RESTA,
+    ast.Mult: Codigo.MULTIPLICACION,
+    ast.Div: Codigo.DIVISION,
+    ast.FloorDiv: Codigo.DIVISION_ENTERA,
+    ast.Mod: Codigo.MODULO,
+    ast.Pow: Codigo.POTENCIA,
+    ast.BitAnd: Codigo.Y_BIT_A_BIT,
+    ast.BitOr: Codigo.O_BIT_A_BIT,
+    ast.BitXor: Codigo.XOR,
+    ast.LShift: Codigo.CORRIMIENTO_IZQUIERDA,
+    ast.RShift: Codigo.CORRIMIENTO_DERECHA,
+    ast.Lt: Codigo.MENOR_QUE,
+    ast.LtE: Codigo.MENOR_O_IGUAL_QUE,
+    ast.Eq: Codigo.IGUAL_QUE,
+    ast.NotEq: Codigo.DIFERENTE_QUE,
+    ast.GtE: Codigo.MAYOR_O_IGUAL_QUE,
+    ast.Gt: Codigo.MAYOR_QUE,
+    ast.And: Codigo.Y_LOGICO,
+    ast.Or: Codigo.O_LOGICO,
+}
+"""Código de la máquina para cada operador binario, de comparación o lógico."""
+
+OPERADORES_UNARIOS: dict[type[ast.AST], Codigo] = {
+    ast.USub: Codigo.INVERTIR_SIGNO,
+    ast.Not: Codigo.NEGACION,
+    ast.Invert: Codigo.NEGACION_BIT_A_BIT,
+}
+"""Código de la máquina para cada operador unario (`+a` no genera código)."""
+
+
+class _Plegador(ast.NodeTransformer):
+    """Reescribe las subexpresiones constantes como `ast.Constant`."""
+
+    # pylint: disable=invalid-name
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.expr:
+        """Pliega `a op b` cuando a y b son constantes."""
+        self.generic_visit(node)
+        return self._plegar(node, type(node.op), [node.left, node.right])
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.expr:
+        """Pliega `op a` cuando a es constante."""
+        self.generic_visit(node)
+        if isinstance(node.op, ast.UAdd):
+            return node.operand
+        return self._plegar(node, type(node.op), [node.operand])
+
+    def visit_BoolOp(self, node: ast.BoolOp) -> ast.expr:
+        """Pliega `a and b and ...` cuando todos los operandos son constantes."""
+        self.generic_visit(node)
+        return self._plegar(node, type(node.op), node.values)
+
+    def visit_Compare(self, node: ast.Compare) -> ast.expr:
+        """Convierte `a < b < c` en `a < b and b < c` y pliega constantes."""
+        self.generic_visit(node)
+        operandos = [node.left, *node.comparators]
+        pares: list[ast.expr] = []
+        for operador, izq, der in zip(node.ops, operandos, operandos[1:]):
+            par = ast.Compare(left=izq, ops=[operador], comparators=[der])
+            pares.append(self._plegar(par, type(operador), [izq, der]))
+        if len(pares) == 1:
+            return pares[0]
+        return self.visit_BoolOp(ast.BoolOp(op=ast.And(), values=pares))
+
+    def _plegar(
+        self, node: ast.expr, operador: type[ast.AST], operandos: list[ast.expr]
+    ) -> ast.expr:
+        """Evalúa el nodo si todos sus operandos son constantes."""
+        if not all(isinstance(op, ast.Constant) for op in operandos):
+            return node
+        valores = [op.value for op in operandos]  # type: ignore[attr-defined]
+        tabla = OPERADORES_UNARIOS if len(valores) == 1 else OPERADORES_BINARIOS
+        if operador not in tabla:
+            return node
+        # `a and b and c` se pliega de izquierda a derecha.
+        plegado, valor = plegar(tabla[operador], valores[:2])
+        for siguiente in valores[2:]:
+            if plegado:
+                plegado, valor = plegar(tabla[operador], [valor, siguiente])
+        if not plegado:
+            return node  # El error, si lo hay, ocurrirá al ejecutar.
+        return ast.copy_location(ast.Constant(value=valor), node)
+
+
+class CompiladorPila:  # pylint: disable=too-few-public-methods
+    """Compilador de expresiones de Python a código de la máquina de pila.
+
+    Admite constantes, nombres de variables, operadores aritméticos y de
+    bits (`ast.BinOp`), unarios (`ast.UnaryOp`), comparaciones
+    (`ast.Compare`, también encadenadas) y operadores lógicos
+    (`ast.BoolOp`). Los operadores lógicos evalúan todos sus operandos,
+    sin cortocircuito, como los operadores de la máquina.
+
+    Atributos
+    ---------
+    plegar_constantes : bool
+        Si se evalúan al compilar las subexpresiones constantes.
+    eliminar_comunes : bool
+        Si las subexpresiones repetidas se calculan una sola vez.
+    optimizar : bool
+        Si se aplica el optimizador de mirilla al código generado.
+    """
+
+    prefijo_temporal = "%"
+
+    def __init__(
+        self,
+        *,
+        plegar_constantes: bool = True,
+        eliminar_comunes: bool = True,
+        optimizar: bool = False,
+    ) -> None:
+        self.plegar_constantes = plegar_constantes
+        self.eliminar_comunes = eliminar_comunes
+        self.optimizar = optimizar
+        self._codigo: list[tuple[Codigo, Any]] = []
+        self._repetidas: set[str] = set()
+        self._temporales: dict[str, str] = {}
+
+    def compilar(self, expresion: ast.Expression | str) -> Programa:
+        """Compila una expresión a un programa de la máquina de pila.
+
+        Parámetros
+        ----------
+        expresion : ast.Expression | str
+            Árbol de la expresión, o su código fuente en Python.
+
+        Devuelve
+        --------
+        Programa
+            Programa que deja el valor de la expresión en la cima de la
+            pila. Las variables libres se leen con CARGAR.
+
+        Levanta
+        -------
+        ValueError
+            Si la expresión contiene construcciones no admitidas.
+        """
+        if isinstance(expresion, str):
+            expresion = ast.parse(expresion, mode="eval")
+        cuerpo = expresion.body
+        if self.plegar_constantes:
+            # Se copia el árbol para que el plegado no modifique el original.
+            cuerpo = _Plegador().visit(copy.deepcopy(cuerpo))
+        self._codigo = []
+        self._temporales = {}
+        self._repetidas = self._contar_repetidas(cuerpo)
+        self._visitar(cuerpo)
+        programa = Programa.desde_instrucciones(self._codigo)
+        if self.optimizar:
+            programa = optimizador.optimizar(programa).programa
+        return programa
+
+    def _contar_repetidas(self, cuerpo: ast.expr) -> set[str]:
+        """Devuelve las llaves de las subexpresiones que se repiten."""
+        if not self.eliminar_comunes:
+            return set()
+        cuenta = collections.Counter(
+            ast.dump(nodo)
+            for nodo in ast.walk(cuerpo)
+            if isinstance(nodo, ast.expr)
+            and not isinstance(nodo, (ast.Constant, ast.Name))
+        )
+        return {llave for llave, veces in cuenta.items() if veces > 1}
+
+    def _visitar(self, nodo: ast.expr) -> None:
+        """Genera el código que apila el valor de un nodo."""
+        llave = ast.dump(nodo) if self._repetidas else ""
+        if llave in self._temporales:
+            self._codigo.append((Codigo.CARGAR, self._temporales[llave]))
+            return
+        self._generar(nodo)
+        if llave in self._repetidas:
+            temporal = f"{self.prefijo_temporal}{len(self._temporales)}"
+            self._temporales[llave] = temporal
+            self._codigo.append((Codigo.GUARDAR, temporal))
+            self._codigo.append((Codigo.CARGAR, temporal))
+
+    def _generar(self, nodo: ast.expr) -> None:
+        """Genera el código de un nodo sin buscar subexpresiones comunes."""
+        match nodo:
+            case ast.Constant(value=valor):
+                self._codigo.append((Codigo.APILAR, valor))
+            case ast.Name(id=nombre, ctx=ast.Load()):
+                self._codigo.append((Codigo.CARGAR, nombre))
+            case ast.BinOp(left=izq, op=op, right=der):
+                self._generar_operacion(op, [izq, der])
+            case ast.UnaryOp(op=ast.UAdd(), operand=operando):
+                self._visitar(operando)
+            case ast.UnaryOp(op=op, operand=operando):
+                self._generar_operacion(op, [operando])
+            case ast.BoolOp(op=op, values=valores):
+                self._generar_operacion(op, valores)
+            case ast.Compare(left=izq, ops=[op], comparators=[der]):
+                self._generar_operacion(op, [izq, der])
+            case ast.Compare(left=izq, ops=ops, comparators=ders):
+                operandos = [izq, *ders]
+                pares: list[ast.expr] = [
+                    ast.Compare(left=a, ops=[op], comparators=[b])
+                    for op, a, b in zip(ops, operandos, operandos[1:])
+                ]
+                self._generar_operacion(ast.And(), pares)
+            case _:
+                raise ValueError(f"No se puede compilar el nodo {type(nodo).__name__}.")
+
+    def _generar_operacion(self, operador: ast.AST, operandos: list[ast.expr]) -> None:
+        """Genera los operandos seguidos del código del operador."""
+        tabla = OPERADORES_UNARIOS if len(operandos) == 1 else OPERADORES_BINARIOS
+        try:
+            codigo = tabla[type(operador)]
+        except KeyError as exc:
+            raise ValueError(
+                f"No se puede compilar el operador {type(operador).__name__}."
+            ) from exc
+        self._visitar(operandos[0])
+        for operando in operandos[1:]:
+            self._visitar(operando)
+            self._codigo.append((codigo, None))
+        if len(operandos) == 1:
+            self._codigo.append((codigo, None))
+
+
+def compilar(expresion: ast.Expression | str) -> Programa:
+    """Compila una expresión de Python a un programa de la máquina de pila.
+
+    Parámetros
+    ----------
+    expresion : ast.Expression | str
+        Árbol de la expresión, o su código fuente en Python.
+
+    Devuelve
+    --------
+    Programa
+        Programa que deja el valor de la expresión en la cima de la pila.
+    """
+    return CompiladorPila().compilar(expresion)
+
+
+def evaluar_muchos(
+    expresion: ast.Expression | str | Programa, filas: Iterable[Mapping[str, Any]]
+) -> list[Any]:
+    """Evalúa una expresión para muchas asignaciones de variables.
+
+    La expresión se compila una sola vez y el mismo programa se ejecuta
+    para cada fila, sin volver a recorrer el árbol.
+
+    Parámetros
+    ----------
+    expresion : ast.Expression | str | Programa
+        Expresión a evaluar, o un programa ya compilado.
+    filas : Iterable[Mapping[str, Any]]
+        Valores de las variables libres de la expresión, una asignación
+        por fila.
+
+    Devuelve
+    --------
+    list[Any]
+        El valor de la expresión en cada fila.
+    """
+    if isinstance(expresion, Programa):
+        programa = expresion
+    else:
+        programa = compilar(expresion)
+    maquina = MaquinaDePila()
+    entorno, pila = maquina.variables, maquina.pila
+    resultados = []
+    for fila in filas:
+        entorno.clear()
+        entorno.update(fila)
+        maquina.ejecutar(programa)
+        resultados.append(pila.pop())
+    return resultados
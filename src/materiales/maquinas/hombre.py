@@ -3,6 +3,8 @@
 Este módulo contiene la implementación de la computadora del Hombre
 Pequeño, una computadora de arquitectura de Von Neumann con 100
 posiciones de memoria, un acumulador, una entrada y una salida.
+El tamaño de la memoria y el número de dígitos de cada palabra y de
+cada dirección son configurables para ejecutar programas más grandes.
 
 Más información:
 https://es.wikipedia.org/wiki/Little_man_computer
@@ -11,18 +13,33 @@ Clases
 ------
 ComputadoraHombrePequenno
     Computadora del Hombre Pequeño.
+Evento
+    Eventos a los que se pueden suscribir observadores.
+
+Funciones
+---------
+avisar_detencion
+    Observador que imprime un aviso cuando la computadora se detiene.
 
 Excepciones
 -----------
 ComputadoraDetenida
     Excepción que se levanta cuando la computadora se detiene.
+EntradaAgotada
+    Excepción que se levanta cuando no hay entrada disponible.
 """
 
+import array
+import asyncio
 import collections
 import enum
-from collections.abc import Iterable, Sequence
+import inspect
+import itertools
+from collections.abc import Callable, Iterable, Iterator, MutableSequence, Sequence
 
 Memoria = Sequence[int]
+Sumidero = Callable[[int], object]
+Observador = Callable[..., object]
 
 
 class Operador(enum.IntEnum):
@@ -77,36 +94,93 @@ class Estado(enum.IntEnum):
         La computadora está detenida.
     ACTIVADA : int
         La computadora está activada.
+    ESPERANDO : int
+        La computadora está suspendida esperando una entrada.
     """
 
     DETENIDA = enum.auto()
     ACTIVADA = enum.auto()
+    ESPERANDO = enum.auto()
+
+
+class Evento(enum.Enum):
+    """Eventos observables de la computadora Hombre Pequenno.
+
+    Cada observador recibe la computadora como primer argumento,
+    seguida de los datos propios del evento.
+
+    Atributos
+    ---------
+    DETENER : str
+        La computadora se detuvo. Sin datos adicionales.
+    PASO : str
+        Terminó un ciclo de instrucción. Sin datos adicionales.
+    SALIDA : str
+        La instrucción OUT produjo un valor. Recibe el valor.
+    ESCRITURA : str
+        La instrucción STA escribió en memoria. Recibe la posición y el
+        valor escrito.
+    """
+
+    DETENER = "detener"
+    PASO = "paso"
+    SALIDA = "salida"
+    ESCRITURA = "escritura"
+
+
+def avisar_detencion(computadora: "ComputadoraHombrePequenno") -> None:
+    """Imprime un aviso cuando la computadora se detiene.
+
+    Pensado para el uso interactivo en libretas:
+    `computadora.suscribir(Evento.DETENER, avisar_detencion)`.
+    """
+    del computadora  # No se usa.
+    print("La computadora se detuvo.")
 
 
 class ComputadoraDetenida(Exception):
     """Excepción que se levanta cuando la computadora se detiene."""
 
 
-class ComputadoraHombrePequenno:
+class EntradaAgotada(IndexError):
+    """Excepción que se levanta cuando INP no encuentra una entrada."""
+
+
+class _SalidaPendiente(Exception):
+    """OUT debe esperar a que `ejecutar_async` entregue el valor."""
+
+
+class ComputadoraHombrePequenno:  # pylint: disable=too-many-instance-attributes
     """Computadora del Hombre Pequenno.
 
     Atributos
     ---------
     memoria : MutableSequence[int]
-        Memoria de la computadora.
+        Memoria de la computadora, un `array.array("i")`. Para cargar
+        muchas posiciones desde una lista, usar `cargar_programa`.
     contador : int
         Contador de programa.
     acumulador : int
         Acumulador de la computadora.
     entrada : deque[int]
-        Entrada de la computadora.
+        Entrada de la computadora. Cuando se agota, la instrucción INP
+        toma valores de la fuente conectada con `conectar_entrada`.
     salida : deque[int]
-        Salida de la computadora.
+        Salida de la computadora. Si se conecta un sumidero con
+        `conectar_salida`, la instrucción OUT le envía los valores y no
+        se guardan aquí.
     estado : Estado
         Estado de la computadora.
+    tamanno_memoria : int
+        Número de posiciones de memoria.
+    digitos : int
+        Número de dígitos decimales de cada palabra.
+    digitos_direccion : int
+        Número de dígitos decimales de cada dirección de memoria.
     """
 
     marcador_pos = "▶"
+    celdas_por_pagina = 100
 
     def __init__(  # pylint: disable=too-many-arguments
         self,
@@ -116,13 +190,37 @@ class ComputadoraHombrePequenno:
         acumulador: int = 0,
         entrada: Iterable[int] = (),
         salida: Iterable[int] = (),
+        tamanno_memoria: int = 100,
+        digitos: int = 3,
+        digitos_direccion: int = 2,
     ):
-        self.memoria: list[int]
+        if not 1 <= digitos_direccion < digitos <= 9:
+            raise ValueError(
+                "Se esperaba 1 <= digitos_direccion < digitos <= 9, se recibió "
+                f"digitos_direccion={digitos_direccion} y digitos={digitos}."
+            )
+        if not 0 < tamanno_memoria <= 10**digitos_direccion:
+            raise ValueError(
+                "Se esperaba un tamaño de memoria entre 1 y "
+                f"{10**digitos_direccion}, se recibió {tamanno_memoria}."
+            )
+        self.tamanno_memoria = int(tamanno_memoria)
+        self.digitos = int(digitos)
+        self.digitos_direccion = int(digitos_direccion)
+        self._limite = 10**digitos - 1
+        self._base_direccion = 10**digitos_direccion
+
+        self.memoria: MutableSequence[int]
         self.contador: int
         self.acumulador: int
         self.entrada: collections.deque[int]
         self.salida: collections.deque[int]
         self.estado: Estado
+        self._fuente: Iterator[int] | None = None
+        self._sumidero: Sumidero | None = None
+        # La salida de `ejecutar_async`, que OUT deja pendiente.
+        self._escritor: Callable[[int], object] | None = None
+        self._observadores: dict[Evento, list[Observador]] = {}
         self.reiniciar()
 
         self.cargar_programa(programa)
@@ -133,7 +231,8 @@ class ComputadoraHombrePequenno:
 
     def reiniciar(self) -> "ComputadoraHombrePequenno":
         """Reinicia la computadora."""
-        self.memoria = [0] * 100
+        n_bytes = self.tamanno_memoria * array.array("i").itemsize
+        self.memoria = array.array("i", bytes(n_bytes))
         self.contador = 0
         self.acumulador = 0
         self.entrada = collections.deque()
@@ -145,31 +244,36 @@ class ComputadoraHombrePequenno:
         """Verifica que el estado de la computadora sea válido."""
         if self.estado == Estado.DETENIDA:
             return
-        if not -999 <= self.acumulador <= 999:
+        lim = self._limite
+        if not -lim <= self.acumulador <= lim:
             raise ValueError(
-                "Se esperaba un acumulador entre -999 y 999, se recibió "
+                f"Se esperaba un acumulador entre {-lim} y {lim}, se recibió "
                 f"{self.acumulador}"
             )
-        if not 0 <= self.contador <= 100:
+        n_memoria = len(self.memoria)
+        if not 0 <= self.contador <= n_memoria:
             raise ValueError(
-                f"Se esperaba un contador entre 0 y 100, se recibió {self.contador}"
+                f"Se esperaba un contador entre 0 y {n_memoria}, se recibió "
+                f"{self.contador}"
             )
-        for i, instruccion in enumerate(self.memoria):
-            if not -999 <= instruccion <= 999:
-                raise ValueError(
-                    f"Se esperaba una instrucción entre -999 y 999, se recibió "
-                    f"{instruccion} en la posición {i}."
-                )
+        # Recorrer en Python sólo si min y max delatan un valor inválido.
+        if self.memoria and not -lim <= min(self.memoria) <= max(self.memoria) <= lim:
+            for i, instruccion in enumerate(self.memoria):
+                if not -lim <= instruccion <= lim:
+                    raise ValueError(
+                        f"Se esperaba una instrucción entre {-lim} y {lim}, se "
+                        f"recibió {instruccion} en la posición {i}."
+                    )
         for i, entrada in enumerate(self.entrada):
-            if not -999 <= entrada <= 999:
+            if not -lim <= entrada <= lim:
                 raise ValueError(
-                    "Se esperaba una entrada entre -999 y 999, se recibió "
+                    f"Se esperaba una entrada entre {-lim} y {lim}, se recibió "
                     f"{entrada} en la posición {i}."
                 )
         for i, salida in enumerate(self.salida):
-            if not -999 <= salida <= 999:
+            if not -lim <= salida <= lim:
                 raise ValueError(
-                    "Se esperaba una salida entre -999 y 999, se recibió "
+                    f"Se esperaba una salida entre {-lim} y {lim}, se recibió "
                     f"{salida} en la posición {i}."
                 )
 
@@ -189,8 +293,8 @@ class ComputadoraHombrePequenno:
         n_memoria, n_programa = len(self.memoria), len(programa)
         if n_programa > n_memoria:
             raise ValueError("El programa no cabe en la memoria")
-        self.memoria[:n_programa] = programa
-        self.memoria[n_programa:] = [0] * (n_memoria - n_programa)
+        self.memoria[:n_programa] = array.array("i", programa)
+        self.memoria[n_programa:] = array.array("i", [0]) * (n_memoria - n_programa)
         return self
 
     def cargar_entrada(self, entrada: Iterable[int]) -> "ComputadoraHombrePequenno":
@@ -204,6 +308,86 @@ class ComputadoraHombrePequenno:
         self.entrada = collections.deque(entrada)
         return self
 
+    def conectar_entrada(
+        self, fuente: Iterable[int] | None
+    ) -> "ComputadoraHombrePequenno":
+        """Conecta una fuente de entrada a la computadora.
+
+        La instrucción INP consume primero los valores de `entrada` y,
+        cuando se agotan, los pide a la fuente. Si la fuente también se
+        agota, la computadora se suspende en el estado
+        `Estado.ESPERANDO` y la instrucción INP se repite al reanudar.
+
+        Parámetros
+        ----------
+        fuente : Iterable[int] | None
+            Fuente de valores de entrada, o None para desconectarla.
+        """
+        self._fuente = None if fuente is None else iter(fuente)
+        return self
+
+    def conectar_salida(self, sumidero: Sumidero | None) -> "ComputadoraHombrePequenno":
+        """Conecta un sumidero de salida a la computadora.
+
+        Mientras haya un sumidero conectado, la instrucción OUT lo
+        llama con el valor del acumulador en vez de agregarlo a
+        `salida`, de modo que no se conserva el historial.
+
+        Parámetros
+        ----------
+        sumidero : Callable[[int], object] | None
+            Función que recibe cada valor de salida, o None para volver
+            a guardar la salida en `salida`.
+        """
+        self._sumidero = sumidero
+        return self
+
+    def suscribir(
+        self, evento: Evento, observador: Observador
+    ) -> "ComputadoraHombrePequenno":
+        """Suscribe un observador a un evento de la computadora.
+
+        Parámetros
+        ----------
+        evento : Evento
+            Evento a observar.
+        observador : Callable[..., object]
+            Función que se llama con la computadora y los datos del
+            evento cada vez que este ocurre.
+        """
+        self._observadores.setdefault(evento, []).append(observador)
+        return self
+
+    def desuscribir(
+        self, evento: Evento, observador: Observador
+    ) -> "ComputadoraHombrePequenno":
+        """Cancela la suscripción de un observador a un evento.
+
+        Parámetros
+        ----------
+        evento : Evento
+            Evento observado.
+        observador : Callable[..., object]
+            Función suscrita previamente con `suscribir`.
+
+        Levanta
+        -------
+        ValueError
+            Si el observador no está suscrito al evento.
+        """
+        observadores = self._observadores.get(evento, [])
+        observadores.remove(observador)
+        if not observadores:
+            # Sin observadores no debe quedar la llave, para que el
+            # ciclo de instrucción no pague por notificar.
+            del self._observadores[evento]
+        return self
+
+    def _notificar(self, evento: Evento, *datos: int) -> None:
+        """Llama a los observadores suscritos a un evento."""
+        for observador in self._observadores.get(evento, ()):
+            observador(self, *datos)
+
     def transicion(self, ignorar_detener: bool = True) -> "ComputadoraHombrePequenno":
         """Realiza un ciclo de instrucción de la computadora.
 
@@ -218,25 +402,36 @@ class ComputadoraHombrePequenno:
             Si la instrucción no es válida.
         """
         self._verificar_estado()
+        self._reanudar()
         try:
             self._transicion()
+        except EntradaAgotada:
+            pass
         except ComputadoraDetenida:
-            if ignorar_detener:
-                self.detener()
-            else:
+            if not ignorar_detener:
                 raise
+            if self.estado != Estado.DETENIDA:
+                self.detener()
         return self
 
+    def _reanudar(self) -> None:
+        """Reactiva la computadora si estaba esperando una entrada."""
+        if self.estado == Estado.ESPERANDO:
+            self.estado = Estado.ACTIVADA
+
     def _transicion(self) -> None:
         """Realiza un ciclo de instrucción de la computadora."""
         instruccion = self._traer_instruccion()
         operador, operando = self._decodificar_instruccion(instruccion)
         self._ejecutar_instruccion(operador, operando)
+        if self._observadores:
+            self._notificar(Evento.PASO)
 
     def detener(self) -> "ComputadoraHombrePequenno":
         """Detiene la computadora."""
         self.estado = Estado.DETENIDA
-        print("La computadora se detuvo.")
+        if self._observadores:
+            self._notificar(Evento.DETENER)
         return self
 
     def _traer_instruccion(self) -> int:
@@ -259,6 +454,31 @@ class ComputadoraHombrePequenno:
         self.contador += 1
         return instruccion
 
+    def _leer_entrada(self) -> int:
+        """Obtiene el siguiente valor de entrada.
+
+        Retorna
+        -------
+        int
+            Valor leído.
+
+        Levanta
+        -------
+        EntradaAgotada
+            Si no hay entrada disponible. La computadora queda en el
+            estado `Estado.ESPERANDO` y el contador apunta de nuevo a
+            la instrucción INP.
+        """
+        if self.entrada:
+            return self.entrada.popleft()
+        if self._fuente is not None:
+            valor = next(self._fuente, None)
+            if valor is not None:
+                return int(valor)
+        self.contador -= 1
+        self.estado = Estado.ESPERANDO
+        raise EntradaAgotada("No hay entrada disponible.")
+
     def _decodificar_instruccion(self, instuccion: int) -> tuple[Operador, int]:
         """Decodifica una instruccion de la computadora.
 
@@ -277,12 +497,15 @@ class ComputadoraHombrePequenno:
         ValueError
             Si la instrucción no es válida.
         """
-        operador, operando = divmod(instuccion, 100)
+        operador, operando = divmod(instuccion, self._base_direccion)
         if operador == 9:
-            operador, operando = instuccion, 0
+            # INP y OUT se distinguen por el operando: 9...01 y 9...02.
+            operador, operando = 900 + operando, 0
         return Operador(operador), operando
 
-    def _ejecutar_instruccion(self, operador: Operador, operando: int) -> None:
+    def _ejecutar_instruccion(  # pylint: disable=too-many-branches
+        self, operador: Operador, operando: int
+    ) -> None:
         """Ejecuta una instrucción de la computadora.
 
         Parámetros
@@ -304,6 +527,8 @@ class ComputadoraHombrePequenno:
                 self._asignar_acumulador(self.acumulador - self.memoria[operando])
             case Operador.STA:
                 self.memoria[operando] = self.acumulador
+                if self._observadores:
+                    self._notificar(Evento.ESCRITURA, operando, self.acumulador)
             case Operador.LDA:
                 self.acumulador = self.memoria[operando]
             case Operador.BRA:
@@ -315,28 +540,122 @@ class ComputadoraHombrePequenno:
                 if self.acumulador > 0:
                     self.contador = operando
             case Operador.INP:
-                self.acumulador = self.entrada.popleft()
+                self.acumulador = self._leer_entrada()
             case Operador.OUT:
-                self.salida.append(self.acumulador)
+                if self._escritor is not None:
+                    self.contador -= 1  # Se repite si la escritura falla.
+                    raise _SalidaPendiente()
+                if self._sumidero is None:
+                    self.salida.append(self.acumulador)
+                else:
+                    self._sumidero(self.acumulador)
+                if self._observadores:
+                    self._notificar(Evento.SALIDA, self.acumulador)
             case Operador.HLT:
                 self.contador = len(self.memoria)
                 self.detener()
                 raise ComputadoraDetenida()
 
     def _asignar_acumulador(self, valor: int) -> None:
-        if -999 <= valor <= 999:
+        if -self._limite <= valor <= self._limite:
             self.acumulador = valor
         else:
             raise OverflowError()
 
-    def ejecutar(self) -> None:
-        """Ejecuta el programa cargado en la computadora."""
+    def ejecutar(self, max_pasos: int | None = None) -> None:
+        """Ejecuta el programa cargado en la computadora.
+
+        La ejecución termina cuando la computadora se detiene, cuando
+        se suspende por falta de entrada o cuando se realizan
+        `max_pasos` ciclos de instrucción.
+
+        Parámetros
+        ----------
+        max_pasos : int | None, opcional
+            Número máximo de ciclos de instrucción. Por defecto, no hay
+            límite.
+        """
         self._verificar_estado()
+        self._ejecutar_pasos(max_pasos)
+
+    def _ejecutar_pasos(self, max_pasos: int | None) -> None:
+        """Ejecuta hasta `max_pasos` ciclos sin verificar el estado."""
+        self._reanudar()
+        pasos = itertools.count() if max_pasos is None else range(max_pasos)
         try:
-            while True:
+            for _ in pasos:
                 self._transicion()
-        except ComputadoraDetenida:
+        except EntradaAgotada:
             pass
+        except ComputadoraDetenida:
+            if self.estado != Estado.DETENIDA:
+                self.detener()
+
+    async def ejecutar_async(
+        self,
+        entrada: "asyncio.Queue[int] | None" = None,
+        salida: "asyncio.Queue[int] | Sumidero | None" = None,
+        *,
+        pasos_por_turno: int = 100,
+    ) -> None:
+        """Ejecuta el programa cediendo el control al ciclo de eventos.
+
+        Cada `pasos_por_turno` ciclos de instrucción la corrutina cede
+        el control, de modo que varias computadoras pueden ejecutarse
+        concurrentemente en el mismo ciclo de eventos. Cuando la
+        computadora se suspende por falta de entrada, espera el
+        siguiente valor de la cola `entrada`.
+
+        Parámetros
+        ----------
+        entrada : asyncio.Queue[int] | None, opcional
+            Cola de la que se leen las entradas faltantes. Si es None,
+            la corrutina termina cuando la computadora se suspende.
+        salida : asyncio.Queue[int] | Callable[[int], object] | None
+            Cola o función que recibe los valores de salida. La
+            instrucción OUT espera a que la cola tenga lugar o, si la
+            función devuelve un objeto esperable, a que termine; sólo
+            entonces avanza el contador, así que una escritura que
+            falla o se cancela se repite al reanudar. Si es None, OUT
+            usa el sumidero conectado o `salida`, sin esperar.
+        pasos_por_turno : int, opcional
+            Ciclos de instrucción entre cada cesión del control.
+            Por defecto, 100.
+        """
+        if isinstance(salida, asyncio.Queue):
+            salida = salida.put
+        # El estado se verifica una sola vez: verificarlo en cada turno
+        # recorrería también toda la salida acumulada.
+        self._verificar_estado()
+        self._escritor = salida
+        try:
+            while True:
+                try:
+                    self._ejecutar_pasos(pasos_por_turno)
+                except _SalidaPendiente:
+                    await self._entregar_salida(salida)
+                    continue
+                if self.estado == Estado.DETENIDA:
+                    return
+                if self.estado == Estado.ESPERANDO:
+                    if entrada is None:
+                        return
+                    self.entrada.append(await entrada.get())
+                else:
+                    await asyncio.sleep(0)
+        finally:
+            self._escritor = None
+
+    async def _entregar_salida(self, escritor: Sumidero | None) -> None:
+        """Termina la instrucción OUT que `ejecutar_async` dejó pendiente."""
+        assert escritor is not None
+        resultado = escritor(self.acumulador)
+        if inspect.isawaitable(resultado):
+            await resultado
+        self.contador += 1
+        if self._observadores:
+            self._notificar(Evento.SALIDA, self.acumulador)
+            self._notificar(Evento.PASO)
 
     def __repr__(self) -> str:
         """Representa la computadora como una cadena de texto."""
@@ -346,7 +665,7 @@ class ComputadoraHombrePequenno:
         for i, instruccion in enumerate(programa):
             if instruccion != 0:
                 i_final = i
-        programa = programa[: i_final + 1]
+        programa = list(programa[: i_final + 1])
         return (
             f"{self.__class__.__name__}("
             f"programa={programa}, "
@@ -356,31 +675,96 @@ class ComputadoraHombrePequenno:
             f"salida={self.salida})"
         )
 
-    def __str__(self) -> str:
-        """Convierte la computadora en una cadena de texto legible."""
+    @property
+    def n_paginas(self) -> int:
+        """Número de páginas en que se muestra la memoria."""
+        return -(-len(self.memoria) // self.celdas_por_pagina)
+
+    def _filas_pagina(self, pagina: int | None) -> range:
+        """Devuelve los números de fila de diez celdas de una página.
+
+        Si `pagina` es None, se usa la página donde está el contador.
+        """
+        if pagina is None:
+            pagina = min(self.contador // self.celdas_por_pagina, self.n_paginas - 1)
+        if not 0 <= pagina < self.n_paginas:
+            raise IndexError(
+                f"Se esperaba una página entre 0 y {self.n_paginas - 1}, se "
+                f"recibió {pagina}."
+            )
+        inicio = pagina * self.celdas_por_pagina
+        fin = min(inicio + self.celdas_por_pagina, len(self.memoria))
+        return range(inicio // 10, -(-fin // 10))
+
+    def a_texto(self, pagina: int | None = None) -> str:
+        """Convierte una página de la memoria en texto legible.
+
+        Parámetros
+        ----------
+        pagina : int | None, opcional
+            Número de página a mostrar, comenzando en 0 (el encabezado
+            las numera desde 1). Por defecto, la página donde está el
+            contador.
+
+        Retorna
+        -------
+        str
+            Tabla de texto con el acumulador y la página de memoria.
+        """
 
         def ind(i: int) -> str:
             if i == self.contador:
                 return "→"
             return " "
 
+        d = self.digitos
+        filas = self._filas_pagina(pagina)
+        ancho = max(d, len(f"{filas[-1]}X") + 1)
         lineas = []
+        if self.n_paginas > 1:
+            n_pagina = filas[0] * 10 // self.celdas_por_pagina
+            lineas.append(f"Página {n_pagina + 1} de {self.n_paginas}")
         lineas.append(
-            f"{self.acumulador:03d} │ " + " ".join(f" X{j}" for j in range(10))
+            f"{self.acumulador:0{d}d}".rjust(ancho)
+            + " │ "
+            + " ".join(f"X{j}".rjust(d) for j in range(10))
         )
-        lineas.append("────┼─" + "─" * 39)
+        lineas.append("─" * (ancho + 1) + "┼─" + "─" * (10 * (d + 1) - 1))
         mem = self.memoria
-        for i in range(10):
-            rango = range(i * 10, i * 10 + 10)
-            lineas.append(f" {i}X │" + "".join(f"{ind(i)}{mem[i]:03d}" for i in rango))
+        for fila in filas:
+            rango = range(fila * 10, min(fila * 10 + 10, len(mem)))
+            lineas.append(
+                f"{fila}X".rjust(ancho)
+                + " │"
+                + "".join(f"{ind(i)}{mem[i]:0{d}d}" for i in rango)
+            )
         return "\n".join(lineas)
 
-    def _repr_html_(self) -> str:
-        """Representa la computadora como una tabla HTML."""
+    def __str__(self) -> str:
+        """Convierte la computadora en una cadena de texto legible."""
+        return self.a_texto()
+
+    def a_html(self, pagina: int | None = None) -> str:
+        """Representa una página de la memoria como una tabla HTML.
+
+        Parámetros
+        ----------
+        pagina : int | None, opcional
+            Número de página a mostrar, comenzando en 0 (el encabezado
+            las numera desde 1). Por defecto, la página donde está el
+            contador.
+
+        Retorna
+        -------
+        str
+            Tabla HTML con la entrada, el acumulador, la página de
+            memoria y la salida.
+        """
+        d = self.digitos
 
         def cola(elementos: Iterable[int]) -> str:
             """Crea una cola de elementos HTML."""
-            return f"[{', '.join(f'<code>{i:03d}</code>' for i in elementos)}]"
+            return f"[{', '.join(f'<code>{i:0{d}d}</code>' for i in elementos)}]"
 
         def td_(contenido: str, hombrecito: bool = False) -> str:
             """Crea una celda de una tabla HTML."""
@@ -393,22 +777,28 @@ class ComputadoraHombrePequenno:
             """Crea una celda de encabezado de una tabla HTML."""
             return f"<th><strong>{contenido}</strong></th>"
 
+        filas = self._filas_pagina(pagina)
         lineas = []
         lineas.append(f"↓{cola(self.entrada)}")
         lineas.append("<table>")
+        if self.n_paginas > 1:
+            n_pagina = filas[0] * 10 // self.celdas_por_pagina
+            lineas.append(
+                f"<caption>Página {n_pagina + 1} de {self.n_paginas}</caption>"
+            )
         lineas.append(
             "<tr>"
-            + td_(f"{self.acumulador:03d}")
+            + td_(f"{self.acumulador:0{d}d}")
             + "".join(th_(f"X{j}") for j in range(10))
             + "</tr>"
         )
-        for i in range(10):
-            rango = range(i * 10, i * 10 + 10)
+        for fila in filas:
+            rango = range(fila * 10, min(fila * 10 + 10, len(self.memoria)))
             lineas.append(
                 "<tr>"
-                + th_(f"{i}X")
+                + th_(f"{fila}X")
                 + "".join(
-                    td_(f"{self.memoria[i]:03d}", hombrecito=i == self.contador)
+                    td_(f"{self.memoria[i]:0{d}d}", hombrecito=i == self.contador)
                     for i in rango
                 )
                 + "</tr>"
@@ -416,3 +806,7 @@ class ComputadoraHombrePequenno:
         lineas.append("</table>")
         lineas.append(f"↓{cola(self.salida)}")
         return "\n".join(lineas)
+
+    def _repr_html_(self) -> str:
+        """Representa la computadora como una tabla HTML."""
+        return self.a_html()
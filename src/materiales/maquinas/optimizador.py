@@ -0,0 +1,242 @@
+"""Optimizador de mirilla para programas de la máquina de pila.
+
+Este módulo recorre el código de bytes de un programa con una ventana
+de dos o tres instrucciones (una «mirilla») y reescribe los patrones
+redundantes que suele dejar el código generado:
+
+- Plegado de constantes: `3 4 suma` se convierte en `7`, y `5
+  invertir_signo` en `-5`.
+- Pares muertos: `invertir_signo invertir_signo`, `negacion negacion` y
+  `negacion_bit_a_bit negacion_bit_a_bit` desaparecen cuando el tipo
+  del operando garantiza que el resultado es el mismo valor.
+- Reducción de fuerza: `2 potencia` se convierte en `duplicar
+  multiplicacion`, y multiplicar un entero por 2**k en `k
+  corrimiento_izquierda`.
+- `guardar:x cargar:x` se convierte en `duplicar guardar:x`.
+
+Ninguna regla mira hacia atrás más allá del destino de un salto, y los
+destinos se ajustan a las nuevas posiciones. Las reglas que dependen
+del tipo de un operando consultan al verificador, así que se aplican
+más reglas cuando se conocen los tipos de la pila y de las variables.
+Las superinstrucciones (una literal fundida con el operador que la
+sigue) no son parte del código de bytes: las construye
+`Programa.planear` para el ciclo de ejecución.
+
+Clases
+------
+Optimizacion
+    Resultado de optimizar un programa.
+
+Funciones
+---------
+optimizar
+    Aplica el optimizador de mirilla a un programa.
+"""
+
+import collections
+import dataclasses
+from collections.abc import Mapping, Sequence
+from typing import Any, NamedTuple
+
+from .bytecode import (
+    BINARIOS,
+    SALTOS,
+    TABLA_ESCALAR,
+    UNARIOS,
+    Codigo,
+    Programa,
+    ensamblar,
+    plegar,
+)
+from .verificador import ErrorDeVerificacion, verificar
+
+# Tipos del operando con los que cada par de operadores se anula.
+_PARES_MUERTOS: dict[Codigo, frozenset[type]] = {
+    Codigo.INVERTIR_SIGNO: frozenset({int, float}),
+    Codigo.NEGACION: frozenset({bool}),
+    Codigo.NEGACION_BIT_A_BIT: frozenset({int}),
+}
+
+
+class _Instruccion(NamedTuple):
+    """Instrucción con el tipo de la cima antes de ejecutarla."""
+
+    codigo: Codigo
+    argumento: Any
+    cima: type | None
+
+
+@dataclasses.dataclass(frozen=True)
+class Optimizacion:
+    """Resultado de optimizar un programa.
+
+    Atributos
+    ---------
+    programa : Programa
+        Programa optimizado.
+    antes : int
+        Número de instrucciones del programa original.
+    despues : int
+        Número de instrucciones del programa optimizado.
+    despachos : int
+        Número de pasos del ciclo de ejecución del programa optimizado,
+        una vez fundidas las superinstrucciones.
+    reescrituras : dict[str, int]
+        Número de veces que se aplicó cada regla.
+    """
+
+    programa: Programa
+    antes: int
+    despues: int
+    despachos: int
+    reescrituras: dict[str, int]
+
+    def __str__(self) -> str:
+        return (
+            f"{self.antes} → {self.despues} instrucciones "
+            f"({self.despachos} despachos)"
+        )
+
+
+def _es_entero(valor: Any) -> bool:
+    """Indica si un valor es un int que no es bool."""
+    return type(valor) is int  # pylint: disable=unidiomatic-typecheck
+
+
+def _reescribir(  # pylint: disable=too-many-return-statements,too-many-branches
+    salida: list[_Instruccion], actual: _Instruccion, frontera: int
+) -> str | None:
+    """Aplica una regla al final de la salida y la instrucción actual.
+
+    Las reglas sólo pueden modificar `salida[frontera:]`. Devuelve el
+    nombre de la regla aplicada, o None si ninguna aplica; en ese caso,
+    la salida no se modifica.
+    """
+    codigo, argumento, _ = actual
+    if len(salida) == frontera:
+        return None
+    ultima = salida[-1]
+    literales = 0
+    for anterior in reversed(salida[max(frontera, len(salida) - 2) :]):
+        if anterior.codigo != Codigo.APILAR:
+            break
+        literales += 1
+    aridad = 1 if codigo in UNARIOS else 2 if codigo in BINARIOS else 0
+    if aridad and literales >= aridad:
+        operandos = salida[-aridad:]
+        plegado, valor = plegar(codigo, [op.argumento for op in operandos])
+        if plegado:
+            del salida[-aridad:]
+            salida.append(_Instruccion(Codigo.APILAR, valor, operandos[0].cima))
+            return "plegado de constantes"
+    if codigo == ultima.codigo and ultima.cima in _PARES_MUERTOS.get(codigo, ()):
+        salida.pop()
+        return "par muerto"
+    if ultima.codigo != Codigo.APILAR:
+        if (ultima.codigo, codigo) == (Codigo.GUARDAR, Codigo.CARGAR):
+            if ultima.argumento == argumento:
+                salida[-1] = _Instruccion(Codigo.DUPLICAR, None, ultima.cima)
+                salida.append(ultima)
+                return "guardar y cargar"
+        return None
+    if codigo == Codigo.POTENCIA and _es_entero(ultima.argumento):
+        if ultima.argumento == 2:
+            salida[-1] = _Instruccion(Codigo.DUPLICAR, None, ultima.cima)
+            salida.append(_Instruccion(Codigo.MULTIPLICACION, None, ultima.cima))
+            return "reducción de fuerza"
+    if codigo == Codigo.MULTIPLICACION and _es_entero(ultima.argumento):
+        k = ultima.argumento.bit_length() - 1
+        if k > 0 and ultima.argumento == 1 << k and ultima.cima in (int, bool):
+            salida[-1] = ultima._replace(argumento=k)
+            salida.append(_Instruccion(Codigo.CORRIMIENTO_IZQUIERDA, None, ultima.cima))
+            return "reducción de fuerza"
+    return None
+
+
+def _pasada(
+    instrucciones: Sequence[tuple[Codigo, Any]],
+    pila: Sequence[type],
+    variables: Mapping[str, type] | None,
+    reescrituras: collections.Counter[str],
+) -> list[tuple[Codigo, Any]]:
+    """Recorre el programa una vez y aplica las reglas de la mirilla."""
+    programa = Programa.desde_instrucciones(instrucciones)
+    try:
+        cimas: Sequence[type | None] = verificar(programa, pila, variables).cimas
+    except ErrorDeVerificacion:
+        cimas = [None] * len(programa)
+    destinos = programa.destinos()
+    salida: list[_Instruccion] = []
+    # Nueva posición de cada instrucción que es destino de un salto.
+    posiciones: dict[int, int] = {}
+    frontera = 0
+    instrucciones_con_cima = map(
+        _Instruccion, programa.codigos, programa.argumentos, cimas
+    )
+    for posicion, actual in enumerate(instrucciones_con_cima):
+        if posicion in destinos:
+            frontera = posiciones[posicion] = len(salida)
+        regla = _reescribir(salida, actual, frontera)
+        if regla is None:
+            salida.append(actual)
+        else:
+            reescrituras[regla] += 1
+    posiciones[len(programa)] = len(salida)
+    return [
+        (codigo, _reubicar(codigo, argumento, posiciones))
+        for codigo, argumento, _ in salida
+    ]
+
+
+def _reubicar(codigo: Codigo, argumento: Any, posiciones: Mapping[int, int]) -> Any:
+    """Ajusta el destino de un salto o una llamada a su nueva posición."""
+    if codigo in SALTOS:
+        return posiciones[argumento]
+    if codigo == Codigo.LLAMAR:
+        return (posiciones[argumento[0]], argumento[1])
+    return argumento
+
+
+def optimizar(
+    programa: Programa | str,
+    pila: Sequence[type] = (),
+    variables: Mapping[str, type] | None = None,
+) -> Optimizacion:
+    """Aplica el optimizador de mirilla a un programa.
+
+    Las pasadas se repiten hasta que ninguna regla aplica. Si el
+    programa no pasa la verificación, sólo se aplican las reglas que no
+    dependen de los tipos.
+
+    Parámetros
+    ----------
+    programa : Programa | str
+        Programa en código de bytes, o texto en notación posfija.
+    pila : Sequence[type], opcional
+        Tipos de la pila al empezar, como en `verificador.verificar`.
+    variables : Mapping[str, type] | None, opcional
+        Tipos de las variables, como en `verificador.verificar`.
+
+    Devuelve
+    --------
+    Optimizacion
+        El programa optimizado y el conteo de instrucciones antes y
+        después.
+    """
+    if isinstance(programa, str):
+        programa = ensamblar(programa)
+    reescrituras: collections.Counter[str] = collections.Counter()
+    instrucciones = list(programa)
+    while True:
+        aplicadas = reescrituras.total()
+        instrucciones = _pasada(instrucciones, pila, variables, reescrituras)
+        if reescrituras.total() == aplicadas:
+            break
+    optimizado = Programa.desde_instrucciones(instrucciones)
+    return Optimizacion(
+        optimizado,
+        len(programa),
+        len(optimizado),
+        len(optimizado.planear(TABLA_ESCALAR)),
+        dict(reescrituras),
+    )
@@ -4,8 +4,34 @@ Este módulo implementa una máquina abstracta basada en una pila
 de datos con múltiples operadores para manipularla.
 """
 
+from collections.abc import Mapping
 from typing import Any, Self
 
+from .bytecode import (
+    BINARIO,
+    BINARIO_LITERAL,
+    CARGA,
+    CARGA_LOCAL,
+    COPIA_SEGUNDO,
+    DESCARTE,
+    DUPLICADO,
+    GUARDADO,
+    GUARDADO_LOCAL,
+    INTERCAMBIO,
+    LITERAL,
+    LLAMADA,
+    ROTACION,
+    SALTO,
+    SALTO_SI_FALSO,
+    SALTO_SI_VERDADERO,
+    TABLA_ESCALAR,
+    UNARIO,
+    Plan,
+    Programa,
+    ensamblar,
+)
+from .verificador import Verificacion, tipo_de, verificar
+
 
 class MaquinaDePila:  # pylint: disable=too-many-public-methods
     """Clase que implementa una máquina de pila.
@@ -19,6 +45,10 @@ class MaquinaDePila:  # pylint: disable=too-many-public-methods
     ---------
     pila : list[Any]
         Pila de datos.
+    variables : dict[str, Any]
+        Variables con nombre que leen y escriben `cargar` y `guardar`.
+    limite_de_llamadas : int
+        Número máximo de llamadas anidadas al ejecutar un programa.
 
     Métodos
     -------
@@ -30,6 +60,20 @@ class MaquinaDePila:  # pylint: disable=too-many-public-methods
         Indica si la pila está vacía.
     ver_cima() -> Any
         Retorna el elemento en la cima de la pila.
+    cargar(nombre: str) -> None
+        Apila el valor de la variable nombre.
+    guardar(nombre: str) -> None
+        Desapila a y lo guarda en la variable nombre.
+    duplicar() -> None
+        Apila otra vez el elemento de la cima.
+    descartar() -> None
+        Desapila el elemento de la cima.
+    intercambiar() -> None
+        Desapila b y a, y apila b y a.
+    copiar_segundo() -> None
+        Apila una copia del elemento debajo de la cima.
+    rotar() -> None
+        Desapila c, b y a, y apila b, c y a.
     suma() -> None
         Desapila b y a, y apila a + b.
     resta() -> None
@@ -76,10 +120,18 @@ class MaquinaDePila:  # pylint: disable=too-many-public-methods
         Desapila b y a, y apila a << b.
     corrimiento_derecha() -> None
         Desapila b y a, y apila a >> b.
+    verificar(programa: Programa | str, variables: Mapping | None) -> Verificacion
+        Verifica un programa contra el estado actual de la máquina.
+    ejecutar(programa: Programa | str, variables: Mapping | None) -> None
+        Ejecuta un programa en código de bytes o en notación posfija.
     """
 
+    tabla_operadores = TABLA_ESCALAR
+    limite_de_llamadas = 1000
+
     def __init__(self) -> None:
         self.pila: list[Any] = []
+        self.variables: dict[str, Any] = {}
 
     def _repr_markdown_(self) -> str:
         """Retorna una representación en Markdown de la pila."""
@@ -134,6 +186,52 @@ class MaquinaDePila:  # pylint: disable=too-many-public-methods
         self.pila.clear()
         return self
 
+    # Variables
+    def cargar(self, nombre: str) -> Self:
+        """Apila el valor de la variable nombre.
+
+        Levanta
+        -------
+        KeyError
+            Si la variable no tiene valor.
+        """
+        self.apilar(self.variables[nombre])
+        return self
+
+    def guardar(self, nombre: str) -> Self:
+        """Desapila a y lo guarda en la variable nombre."""
+        self.variables[nombre] = self.desapilar()
+        return self
+
+    # Manipulación de la pila
+    def duplicar(self) -> Self:
+        """Apila otra vez el elemento de la cima."""
+        self.apilar(self.ver_cima())
+        return self
+
+    def descartar(self) -> Self:
+        """Desapila el elemento de la cima."""
+        self.desapilar()
+        return self
+
+    def intercambiar(self) -> Self:
+        """Desapila b y a, y apila b y a."""
+        b, a = self.desapilar(), self.desapilar()
+        self.apilar(b).apilar(a)
+        return self
+
+    def copiar_segundo(self) -> Self:
+        """Apila una copia del elemento debajo de la cima."""
+        b, a = self.desapilar(), self.desapilar()
+        self.apilar(a).apilar(b).apilar(a)
+        return self
+
+    def rotar(self) -> Self:
+        """Desapila c, b y a, y apila b, c y a."""
+        c, b, a = self.desapilar(), self.desapilar(), self.desapilar()
+        self.apilar(b).apilar(c).apilar(a)
+        return self
+
     # Operadores aritméticos +, -, -, *, /, //, %, **
     def suma(self) -> Self:
         """Desapila b y a, y apila a + b."""
@@ -275,3 +373,197 @@ class MaquinaDePila:  # pylint: disable=too-many-public-methods
         b, a = self.desapilar(), self.desapilar()
         self.apilar(a >> b)
         return self
+
+    def verificar(
+        self, programa: Programa | str, variables: Mapping[str, Any] | None = None
+    ) -> Verificacion:
+        """Verifica un programa contra el estado actual de la máquina.
+
+        Los tipos de la pila y de las variables se toman de sus valores
+        actuales, como si el programa se ejecutara a continuación.
+
+        Parámetros
+        ----------
+        programa : Programa | str
+            Programa en código de bytes, o texto en notación posfija.
+        variables : Mapping[str, Any] | None, opcional
+            Valores que se asignarían a `variables` antes de ejecutar.
+
+        Devuelve
+        --------
+        Verificacion
+            Profundidades y tipos calculados por `verificador.verificar`.
+
+        Levanta
+        -------
+        ErrorDeVerificacion
+            Si el programa no pasa la verificación.
+        """
+        entorno = {**self.variables, **(variables or {})}
+        return verificar(
+            programa,
+            [tipo_de(elemento) for elemento in self.pila],
+            {nombre: tipo_de(valor) for nombre, valor in entorno.items()},
+        )
+
+    def ejecutar(
+        self, programa: Programa | str, variables: Mapping[str, Any] | None = None
+    ) -> Self:
+        """Ejecuta un programa sobre la pila.
+
+        El ciclo de ejecución opera directamente sobre la lista de la
+        pila, sin pasar por los métodos de cada operador. Antes de
+        empezar se compara el alcance de pila del programa con el tamaño
+        de la pila, de modo que un programa que la vaciaría de más falla
+        sin haber hecho ningún cambio. Los saltos, las variables locales
+        y las llamadas se ejecutan dentro del mismo ciclo, sin volver a
+        Python en cada iteración de un bucle. Un programa lineal que se
+        ejecuta más de una vez usa su traducción a Python (ver
+        `Programa.traduccion`), que no tiene ciclo de ejecución. Si una
+        instrucción levanta una excepción, la pila puede quedar con el
+        estado que tenía antes de ejecutar o con parte de los cambios.
+
+        Parámetros
+        ----------
+        programa : Programa | str
+            Programa en código de bytes, o texto en notación posfija
+            que se ensambla antes de ejecutarse.
+        variables : Mapping[str, Any] | None, opcional
+            Valores que se asignan a `variables` antes de ejecutar.
+
+        Levanta
+        -------
+        IndexError
+            Si el programa desapila más elementos de los que hay.
+        ValueError
+            Si el tamaño de la pila no está bien definido en cada
+            instrucción (ver `Programa.profundidades`).
+        RecursionError
+            Si hay más de `limite_de_llamadas` llamadas anidadas.
+        """
+        if isinstance(programa, str):
+            programa = ensamblar(programa)
+        traduccion = programa.traduccion(self.tabla_operadores)
+        if traduccion is not None:
+            traduccion(self.pila, self.variables, variables)
+            return self
+        minimo = programa.alcance_de_pila()[0]
+        if len(self.pila) + minimo < 0:
+            raise IndexError(
+                f"El programa necesita {-minimo} elementos en la pila, "
+                f"hay {len(self.pila)}."
+            )
+        if variables is not None:
+            self.variables.update(variables)
+        plan = programa.planear(self.tabla_operadores)
+        if programa.es_lineal:
+            self._ejecutar_lineal(plan)
+        else:
+            self._ejecutar_con_control(plan, programa.numero_de_locales())
+        return self
+
+    def _ejecutar_lineal(self, plan: Plan) -> None:
+        """Ciclo de ejecución de un plan sin saltos, llamadas ni locales."""
+        pila, entorno = self.pila, self.variables
+        apilar, desapilar = pila.append, pila.pop
+        for tipo, valor in plan:
+            if tipo == BINARIO:
+                b = desapilar()
+                pila[-1] = valor(pila[-1], b)
+            elif tipo == BINARIO_LITERAL:
+                funcion, b = valor
+                pila[-1] = funcion(pila[-1], b)
+            elif tipo == LITERAL:
+                apilar(valor)
+            elif tipo == UNARIO:
+                pila[-1] = valor(pila[-1])
+            elif tipo == CARGA:
+                apilar(entorno[valor])
+            elif tipo == GUARDADO:
+                entorno[valor] = desapilar()
+            elif tipo == DUPLICADO:
+                apilar(pila[-1])
+            elif tipo == INTERCAMBIO:
+                pila[-2], pila[-1] = pila[-1], pila[-2]
+            elif tipo == COPIA_SEGUNDO:
+                apilar(pila[-2])
+            elif tipo == ROTACION:
+                apilar(pila.pop(-3))
+            else:  # DESCARTE
+                desapilar()
+
+    def _ejecutar_con_control(  # pylint: disable=too-many-branches,too-many-statements,too-many-locals
+        self, plan: Plan, n_locales: int
+    ) -> None:
+        """Ciclo de ejecución con saltos, variables locales y llamadas.
+
+        Cada marco guarda la posición de regreso y las variables
+        locales de quien llama. REGRESAR en el programa principal
+        termina la ejecución.
+
+        Levanta
+        -------
+        RecursionError
+            Si hay más de `limite_de_llamadas` llamadas anidadas.
+        """
+        pila, entorno = self.pila, self.variables
+        apilar, desapilar = pila.append, pila.pop
+        locales: list[Any] = [None] * n_locales
+        marcos: list[tuple[int, list[Any]]] = []
+        limite = self.limite_de_llamadas
+        final = len(plan)
+        posicion = 0
+        while posicion < final:
+            tipo, valor = plan[posicion]
+            posicion += 1
+            if tipo == BINARIO:
+                b = desapilar()
+                pila[-1] = valor(pila[-1], b)
+            elif tipo == BINARIO_LITERAL:
+                funcion, b = valor
+                pila[-1] = funcion(pila[-1], b)
+            elif tipo == LITERAL:
+                apilar(valor)
+            elif tipo == CARGA_LOCAL:
+                apilar(locales[valor])
+            elif tipo == GUARDADO_LOCAL:
+                locales[valor] = desapilar()
+            elif tipo == SALTO_SI_FALSO:
+                if not desapilar():
+                    posicion = valor
+            elif tipo == SALTO_SI_VERDADERO:
+                if desapilar():
+                    posicion = valor
+            elif tipo == SALTO:
+                posicion = valor
+            elif tipo == UNARIO:
+                pila[-1] = valor(pila[-1])
+            elif tipo == DUPLICADO:
+                apilar(pila[-1])
+            elif tipo == INTERCAMBIO:
+                pila[-2], pila[-1] = pila[-1], pila[-2]
+            elif tipo == COPIA_SEGUNDO:
+                apilar(pila[-2])
+            elif tipo == ROTACION:
+                apilar(pila.pop(-3))
+            elif tipo == DESCARTE:
+                desapilar()
+            elif tipo == LLAMADA:
+                if len(marcos) == limite:
+                    raise RecursionError(
+                        f"Se superó el límite de {limite} llamadas anidadas."
+                    )
+                marcos.append((posicion, locales))
+                posicion, aridad = valor
+                locales = [None] * n_locales
+                if aridad:
+                    locales[:aridad] = pila[-aridad:]
+                    del pila[-aridad:]
+            elif tipo == CARGA:
+                apilar(entorno[valor])
+            elif tipo == GUARDADO:
+                entorno[valor] = desapilar()
+            elif marcos:  # RETORNO
+                posicion, locales = marcos.pop()
+            else:
+                break
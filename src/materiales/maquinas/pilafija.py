@@ -0,0 +1,339 @@
+"""Máquina de pila con una pila tipada de capacidad fija.
+
+Este módulo implementa una pila respaldada por un arreglo tipado que se
+reserva una sola vez, con un apuntador entero a la cima, y una máquina
+de pila que la usa. Antes de ejecutar un programa, la máquina compara
+su alcance de pila con la capacidad y el tamaño actual, y verifica con
+`verificador.verificar` que cada valor que apila quepa en el tipo de la
+pila, de modo que el ciclo de ejecución no revisa desbordamientos ni
+tipos en cada instrucción.
+
+Clases
+------
+PilaFija
+    Pila de capacidad fija sobre un arreglo tipado.
+MaquinaDePilaFija
+    Máquina de pila que usa una `PilaFija`.
+"""
+
+import array
+from collections.abc import Iterator, Mapping
+from typing import Any, Self
+
+from .bytecode import (
+    BINARIO,
+    BINARIO_LITERAL,
+    CARGA,
+    COPIA_SEGUNDO,
+    DUPLICADO,
+    GUARDADO,
+    INTERCAMBIO,
+    LITERAL,
+    ROTACION,
+    UNARIO,
+    Codigo,
+    Programa,
+    ensamblar,
+)
+from .pila import MaquinaDePila
+from .verificador import ErrorDeVerificacion, tipo_de, verificar
+
+TIPOS = {"int64": "q", "float64": "d", "bool": "B"}
+"""Código de `array.array` para cada tipo de dato admitido."""
+
+_ELEMENTOS = {"int64": int, "float64": float, "bool": bool}
+_ADMITIDOS = {
+    "int64": frozenset({bool, int, object}),
+    "float64": frozenset({bool, int, float, object}),
+    "bool": frozenset({bool, object}),
+}
+
+
+def _cabe(valor: Any, tipo: str) -> bool:
+    """Indica si una constante se puede guardar en una pila de un tipo."""
+    try:
+        array.array(TIPOS[tipo], [valor])
+    except (TypeError, OverflowError):
+        return False
+    return tipo != "bool" or valor in (0, 1)
+
+
+class PilaFija:
+    """Pila de capacidad fija sobre un arreglo tipado.
+
+    Ofrece las operaciones de lista que usa `MaquinaDePila` (`append`,
+    `pop`, `clear` y acceso por índice a la cima). Los valores lógicos
+    de una pila de tipo "bool" se guardan como 0 y 1.
+
+    Atributos
+    ---------
+    datos : array.array
+        Arreglo donde se guardan los elementos. Sólo las primeras
+        `tope` posiciones forman parte de la pila.
+    tope : int
+        Número de elementos en la pila.
+    tipo : str
+        Tipo de los elementos: "int64", "float64" o "bool".
+    """
+
+    def __init__(self, capacidad: int, tipo: str = "int64") -> None:
+        """Reserva el arreglo de la pila.
+
+        Parámetros
+        ----------
+        capacidad : int
+            Número máximo de elementos.
+        tipo : str, opcional
+            Tipo de los elementos: "int64", "float64" o "bool".
+            Por defecto, "int64".
+
+        Levanta
+        -------
+        ValueError
+            Si el tipo no es válido o la capacidad es negativa.
+        """
+        if tipo not in TIPOS:
+            raise ValueError(f"Se esperaba un tipo en {list(TIPOS)}, no {tipo!r}.")
+        if capacidad < 0:
+            raise ValueError(f"Se esperaba una capacidad no negativa, no {capacidad}.")
+        self.tipo = tipo
+        codigo = TIPOS[tipo]
+        self.datos = array.array(
+            codigo, bytes(capacidad * array.array(codigo).itemsize)
+        )
+        self.tope = 0
+
+    @property
+    def capacidad(self) -> int:
+        """Número máximo de elementos."""
+        return len(self.datos)
+
+    def append(self, elemento: Any) -> None:
+        """Apila un elemento.
+
+        Levanta
+        -------
+        OverflowError
+            Si la pila está llena.
+        """
+        if self.tope == len(self.datos):
+            raise OverflowError("Desbordamiento de la pila.")
+        self.datos[self.tope] = elemento
+        self.tope += 1
+
+    def pop(self) -> Any:
+        """Desapila y devuelve el elemento de la cima.
+
+        Levanta
+        -------
+        IndexError
+            Si la pila está vacía.
+        """
+        if self.tope == 0:
+            raise IndexError("La pila está vacía.")
+        self.tope -= 1
+        return self.datos[self.tope]
+
+    def clear(self) -> None:
+        """Vacía la pila sin liberar el arreglo."""
+        self.tope = 0
+
+    def _indice(self, indice: int) -> int:
+        """Convierte un índice, posiblemente negativo, en una posición."""
+        posicion = indice + self.tope if indice < 0 else indice
+        if not 0 <= posicion < self.tope:
+            raise IndexError("Índice fuera de la pila.")
+        return posicion
+
+    def __getitem__(self, indice: int) -> Any:
+        return self.datos[self._indice(indice)]
+
+    def __setitem__(self, indice: int, elemento: Any) -> None:
+        self.datos[self._indice(indice)] = elemento
+
+    def __len__(self) -> int:
+        return self.tope
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.datos[: self.tope])
+
+    def __reversed__(self) -> Iterator[Any]:
+        return reversed(self.datos[: self.tope])
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.datos[: self.tope].tolist()!r})"
+
+
+class MaquinaDePilaFija(MaquinaDePila):
+    """Máquina de pila que usa una `PilaFija`.
+
+    Todos los métodos de `MaquinaDePila` funcionan igual. El método
+    `ejecutar` verifica de antemano que el programa quepa en la pila,
+    que no la vacíe de más y que sus valores sean del tipo de la pila,
+    y después trabaja directamente sobre el arreglo con un apuntador
+    entero, sin revisar cada instrucción. Por eso sólo admite programas
+    lineales: con llamadas, el tamaño de la pila depende de la
+    profundidad de la recursión.
+
+    Atributos
+    ---------
+    pila : PilaFija
+        Pila de datos.
+    """
+
+    def __init__(self, capacidad: int, tipo: str = "int64") -> None:
+        super().__init__()
+        self.pila: PilaFija = PilaFija(capacidad, tipo)  # type: ignore[assignment]
+
+    @classmethod
+    def para_programa(cls, programa: Programa | str, tipo: str = "int64") -> Self:
+        """Crea una máquina con la capacidad justa para un programa.
+
+        Parámetros
+        ----------
+        programa : Programa | str
+            Programa que se ejecutará con la pila vacía.
+        tipo : str, opcional
+            Tipo de los elementos de la pila. Por defecto, "int64".
+        """
+        if isinstance(programa, str):
+            programa = ensamblar(programa)
+        return cls(programa.alcance_de_pila()[1], tipo)
+
+    def ejecutar(  # pylint: disable=too-many-branches
+        self, programa: Programa | str, variables: Mapping[str, Any] | None = None
+    ) -> Self:
+        """Ejecuta un programa sobre la pila fija.
+
+        Los valores cuyo tipo no se conoce sin ejecutar el programa (como
+        el resultado de `2 ** n`) se revisan al guardarlos en el arreglo.
+        Si alguno no cabe, o si una operación falla, la pila vuelve a
+        quedar como estaba antes de ejecutar; las variables que el
+        programa ya guardó conservan su valor nuevo.
+
+        Parámetros
+        ----------
+        programa : Programa | str
+            Programa en código de bytes, o texto en notación posfija.
+        variables : Mapping[str, Any] | None, opcional
+            Valores que se asignan a `variables` antes de ejecutar.
+
+        Levanta
+        -------
+        IndexError
+            Si el programa desapila más elementos de los que hay.
+        OverflowError
+            Si el programa no cabe en la capacidad restante.
+        ErrorDeVerificacion
+            Si el programa no pasa la verificación, carga una variable
+            que no existe o apila un valor que no cabe en el tipo de la
+            pila.
+        ValueError
+            Si el programa tiene saltos, llamadas o variables locales.
+        """
+        if isinstance(programa, str):
+            programa = ensamblar(programa)
+        minimo = self._verificar(programa, variables or {})
+        if variables is not None:
+            self.variables.update(variables)
+        pila = self.pila
+        tope = pila.tope
+        datos, entorno = pila.datos, self.variables
+        inicio, respaldo = tope, datos[tope + minimo : tope]
+        try:
+            for tipo, valor in programa.planear(self.tabla_operadores):
+                if tipo == BINARIO:
+                    tope -= 1
+                    datos[tope - 1] = valor(datos[tope - 1], datos[tope])
+                elif tipo == BINARIO_LITERAL:
+                    funcion, b = valor
+                    datos[tope - 1] = funcion(datos[tope - 1], b)
+                elif tipo == LITERAL:
+                    datos[tope] = valor
+                    tope += 1
+                elif tipo == UNARIO:
+                    datos[tope - 1] = valor(datos[tope - 1])
+                elif tipo == CARGA:
+                    datos[tope] = entorno[valor]
+                    tope += 1
+                elif tipo == GUARDADO:
+                    tope -= 1
+                    entorno[valor] = datos[tope]
+                elif tipo == DUPLICADO:
+                    datos[tope] = datos[tope - 1]
+                    tope += 1
+                elif tipo == INTERCAMBIO:
+                    datos[tope - 2], datos[tope - 1] = datos[tope - 1], datos[tope - 2]
+                elif tipo == COPIA_SEGUNDO:
+                    datos[tope] = datos[tope - 2]
+                    tope += 1
+                elif tipo == ROTACION:
+                    datos[tope - 3], datos[tope - 2], datos[tope - 1] = (
+                        datos[tope - 2],
+                        datos[tope - 1],
+                        datos[tope - 3],
+                    )
+                else:  # DESCARTE
+                    tope -= 1
+        except BaseException:
+            # Las instrucciones ya ejecutadas pudieron sobrescribir los
+            # elementos que el programa desapila.
+            datos[inicio + minimo : inicio] = respaldo
+            tope = inicio
+            raise
+        finally:
+            pila.tope = tope
+        return self
+
+    def _verificar(self, programa: Programa, variables: Mapping[str, Any]) -> int:
+        """Revisa un programa antes de ejecutarlo sobre la pila fija.
+
+        `variables` son los valores que se asignarán antes de ejecutar.
+        Devuelve el mínimo del tamaño de la pila relativo a su tamaño
+        inicial, y levanta las excepciones que documenta `ejecutar`.
+        """
+        if not programa.es_lineal:
+            raise ValueError(
+                "La pila fija sólo ejecuta programas sin saltos, llamadas ni "
+                "variables locales."
+            )
+        minimo, maximo = programa.alcance_de_pila()
+        pila = self.pila
+        if pila.tope + minimo < 0:
+            raise IndexError(
+                f"El programa necesita {-minimo} elementos en la pila, hay "
+                f"{pila.tope}."
+            )
+        if pila.tope + maximo > pila.capacidad:
+            raise OverflowError(
+                f"El programa necesita {maximo} posiciones libres, hay "
+                f"{pila.capacidad - pila.tope}."
+            )
+        tipo = pila.tipo
+        verificacion = verificar(
+            programa,
+            (_ELEMENTOS[tipo],) * pila.tope,
+            {
+                nombre: tipo_de(valor)
+                for nombre, valor in {**self.variables, **variables}.items()
+            },
+        )
+        admitidos = _ADMITIDOS[tipo]
+        for posicion, ((codigo, argumento), resultado) in enumerate(
+            zip(programa, verificacion.resultados)
+        ):
+            if codigo == Codigo.APILAR:
+                if not _cabe(argumento, tipo):
+                    raise ErrorDeVerificacion(
+                        f"La constante {argumento!r} en la posición {posicion} "
+                        f"no cabe en una pila {tipo}.",
+                        posicion,
+                    )
+            elif resultado is not None and resultado not in admitidos:
+                raise ErrorDeVerificacion(
+                    f"La instrucción '{codigo.mnemonico}' en la posición "
+                    f"{posicion} apila un {resultado.__name__}, que no cabe en "
+                    f"una pila {tipo}.",
+                    posicion,
+                )
+        return minimo
@@ -0,0 +1,560 @@
+"""Traductor del código de bytes de la máquina de pila a la computadora
+del Hombre Pequeño.
+
+Este módulo traduce programas enteros de `MaquinaDePila` a imágenes de
+memoria para `ComputadoraHombrePequenno`. Se admiten las literales
+enteras y lógicas, las variables y las variables locales, las
+instrucciones de manipulación de la pila, los saltos, la suma, la
+resta, el cambio de signo, las comparaciones y la negación lógica.
+
+La computadora del Hombre Pequeño no tiene direccionamiento indirecto,
+así que la pila no puede tener un apuntador. En cambio, como el tamaño
+de la pila antes de cada instrucción es el mismo en todos los caminos
+(`Programa.profundidades`), cada nivel de la pila ocupa una celda fija
+de una región reservada de la memoria. Las literales, las variables y
+las locales ocupan celdas después del código.
+
+Con la asignación de registros, la cima de la pila se mantiene en el
+acumulador dentro de cada bloque básico y sólo se guarda en su celda
+cuando otra instrucción la necesita en memoria o al llegar a un
+destino de salto, donde todos los caminos deben coincidir. Sin ella,
+cada instrucción carga sus operandos y guarda su resultado.
+
+Al terminar, la computadora envía a la salida el contenido de la pila,
+del fondo a la cima, y se detiene. Como en la computadora, los valores
+deben caber en una palabra; una suma, una resta o una comparación
+cuya diferencia no cabe levanta OverflowError al ejecutar.
+
+Clases
+------
+ImagenHombre
+    Imagen de memoria de un programa traducido.
+MedicionDePasos
+    Pasos de un programa traducido con y sin asignación de registros.
+
+Funciones
+---------
+traducir
+    Traduce un programa de la máquina de pila a una imagen de memoria.
+medir_asignacion
+    Compara los pasos con y sin asignación de registros.
+"""
+
+import dataclasses
+from collections.abc import Mapping
+from typing import Any
+
+from .bytecode import Codigo, Programa, ensamblar
+from .hombre import ComputadoraHombrePequenno, Estado, Evento, Operador
+
+# Para cada comparación: si se calcula b - a en vez de a - b, el salto
+# que la decide y el resultado cuando salta. BRP salta si es positivo.
+_COMPARACIONES: dict[Codigo, tuple[bool, Operador, bool]] = {
+    Codigo.MENOR_QUE: (True, Operador.BRP, True),
+    Codigo.MENOR_O_IGUAL_QUE: (False, Operador.BRP, False),
+    Codigo.IGUAL_QUE: (True, Operador.BRZ, True),
+    Codigo.DIFERENTE_QUE: (True, Operador.BRZ, False),
+    Codigo.MAYOR_O_IGUAL_QUE: (True, Operador.BRP, False),
+    Codigo.MAYOR_QUE: (False, Operador.BRP, True),
+}
+
+# Operandos simbólicos: ("codigo", etiqueta), ("constante", valor),
+# ("variable", nombre), ("local", numero), ("pila", nivel) o
+# ("temporal", 0). Se resuelven a direcciones al acomodar la memoria.
+_Simbolo = tuple[str, Any]
+
+
+@dataclasses.dataclass(frozen=True)
+class ImagenHombre:
+    """Imagen de memoria de un programa traducido.
+
+    Atributos
+    ---------
+    memoria : tuple[int, ...]
+        Contenido inicial de la memoria: el código, seguido de las
+        celdas de datos.
+    instrucciones : int
+        Número de celdas que ocupa el código.
+    variables : dict[str, int]
+        Dirección de cada variable.
+    pila : range
+        Direcciones de la región reservada para la pila, del fondo a la
+        cima.
+    digitos : int
+        Número de dígitos decimales de cada palabra.
+    digitos_direccion : int
+        Número de dígitos decimales de cada dirección.
+    """
+
+    memoria: tuple[int, ...]
+    instrucciones: int
+    variables: dict[str, int]
+    pila: range
+    digitos: int = 3
+    digitos_direccion: int = 2
+
+    def computadora(self) -> ComputadoraHombrePequenno:
+        """Crea una computadora con la imagen cargada en su memoria."""
+        return ComputadoraHombrePequenno(
+            programa=self.memoria,
+            tamanno_memoria=len(self.memoria),
+            digitos=self.digitos,
+            digitos_direccion=self.digitos_direccion,
+        )
+
+    def ejecutar(self, max_pasos: int | None = None) -> tuple[list[int], int]:
+        """Ejecuta la imagen en una computadora nueva.
+
+        Parámetros
+        ----------
+        max_pasos : int | None, opcional
+            Número máximo de ciclos de instrucción. Por defecto, no hay
+            límite.
+
+        Devuelve
+        --------
+        tuple[list[int], int]
+            La salida, que es la pila final del fondo a la cima, y el
+            número de ciclos de instrucción realizados.
+
+        Levanta
+        -------
+        RuntimeError
+            Si la computadora no se detiene en `max_pasos` ciclos.
+        """
+        computadora = self.computadora()
+        pasos = 0
+
+        def contar(_: ComputadoraHombrePequenno) -> None:
+            nonlocal pasos
+            pasos += 1
+
+        computadora.suscribir(Evento.PASO, contar)
+        computadora.ejecutar(max_pasos)
+        if computadora.estado != Estado.DETENIDA:
+            raise RuntimeError(f"La computadora no se detuvo en {pasos} pasos.")
+        return list(computadora.salida), pasos
+
+
+@dataclasses.dataclass(frozen=True)
+class MedicionDePasos:
+    """Pasos de un programa traducido con y sin asignación de registros.
+
+    Atributos
+    ---------
+    salida : list[int]
+        Pila final que calculan ambas traducciones.
+    pasos_sin_asignacion : int
+        Ciclos de instrucción sin asignación de registros.
+    pasos_con_asignacion : int
+        Ciclos de instrucción con la cima de la pila en el acumulador.
+    celdas_sin_asignacion : int
+        Celdas de código sin asignación de registros.
+    celdas_con_asignacion : int
+        Celdas de código con asignación de registros.
+    """
+
+    salida: list[int]
+    pasos_sin_asignacion: int
+    pasos_con_asignacion: int
+    celdas_sin_asignacion: int
+    celdas_con_asignacion: int
+
+    def __str__(self) -> str:
+        return (
+            f"{self.pasos_sin_asignacion} → {self.pasos_con_asignacion} pasos, "
+            f"{self.celdas_sin_asignacion} → {self.celdas_con_asignacion} celdas"
+        )
+
+
+class _Generador:  # pylint: disable=too-many-instance-attributes
+    """Genera el código simbólico de un programa de la máquina de pila."""
+
+    def __init__(self, programa: Programa, asignar_registros: bool) -> None:
+        self.programa = programa
+        self.asignar_registros = asignar_registros
+        self.codigo: list[tuple[Operador, _Simbolo | None]] = []
+        self.etiquetas: dict[object, int] = {}
+        self.internas = 0
+        # Tamaño actual de la pila y si su cima está en el acumulador.
+        self.profundidad = 0
+        self.en_acumulador = False
+        # Si la instrucción actual es alcanzable desde la anterior.
+        self.alcanzable = True
+        self.llegadas: dict[int, int] = {}
+
+    def emitir(self, operador: Operador, simbolo: _Simbolo | None = None) -> None:
+        """Agrega una instrucción al código."""
+        self.codigo.append((operador, simbolo))
+
+    def marcar(self, etiqueta: object) -> None:
+        """Define una etiqueta en la posición actual del código."""
+        self.etiquetas[etiqueta] = len(self.codigo)
+
+    def nueva_etiqueta(self) -> tuple[str, int]:
+        """Devuelve una etiqueta interna sin usar."""
+        self.internas += 1
+        return ("interna", self.internas)
+
+    def vaciar(self) -> None:
+        """Guarda la cima en su celda si está en el acumulador."""
+        if self.en_acumulador:
+            self.emitir(Operador.STA, ("pila", self.profundidad - 1))
+            self.en_acumulador = False
+
+    def cargar_cima(self) -> None:
+        """Lleva la cima al acumulador si no está ahí."""
+        if not self.en_acumulador:
+            self.emitir(Operador.LDA, ("pila", self.profundidad - 1))
+            self.en_acumulador = True
+
+    def apilar_desde(self, simbolo: _Simbolo) -> None:
+        """Apila el valor de una celda, dejándolo en el acumulador."""
+        self.vaciar()
+        self.emitir(Operador.LDA, simbolo)
+        self.profundidad += 1
+        self.en_acumulador = True
+
+    def desapilar_en(self, simbolo: _Simbolo) -> None:
+        """Desapila la cima y la guarda en una celda."""
+        self.cargar_cima()
+        self.emitir(Operador.STA, simbolo)
+        self.profundidad -= 1
+        self.en_acumulador = False
+
+    def elegir(self, salto: Operador, si_salta: bool) -> None:
+        """Apila 1 o 0 según el salto que decide el acumulador."""
+        salta, fin = self.nueva_etiqueta(), self.nueva_etiqueta()
+        self.emitir(salto, ("codigo", salta))
+        self.emitir(Operador.LDA, ("constante", int(not si_salta)))
+        self.emitir(Operador.BRA, ("codigo", fin))
+        self.marcar(salta)
+        self.emitir(Operador.LDA, ("constante", int(si_salta)))
+        self.marcar(fin)
+        self.en_acumulador = True
+
+    def saltar(self, operador: Operador, destino: int) -> None:
+        """Salta a una posición del programa con la pila en memoria."""
+        self.vaciar()
+        self.llegadas[destino] = self.profundidad
+        self.emitir(operador, ("codigo", destino))
+
+    def terminar(self) -> None:
+        """Envía la pila a la salida y detiene la computadora."""
+        if self.en_acumulador and self.profundidad == 1:
+            self.emitir(Operador.OUT)
+        else:
+            self.vaciar()
+            for nivel in range(self.profundidad):
+                self.emitir(Operador.LDA, ("pila", nivel))
+                self.emitir(Operador.OUT)
+        self.emitir(Operador.HLT)
+        self.alcanzable = False
+
+    def reordenar(self, origenes: tuple[int, ...]) -> None:
+        """Reordena los niveles más altos de la pila.
+
+        `origenes[i]` es el nivel, contado desde la base del grupo, que
+        ocupará el nivel i. El valor del último nivel queda en el
+        acumulador.
+        """
+        self.vaciar()
+        base = self.profundidad - len(origenes)
+        self.emitir(Operador.LDA, ("pila", base + origenes[-1]))
+        self.emitir(Operador.STA, ("temporal", 0))
+        for nivel, origen in enumerate(origenes[:-1]):
+            if nivel != origen:
+                self.emitir(Operador.LDA, ("pila", base + origen))
+                self.emitir(Operador.STA, ("pila", base + nivel))
+        self.emitir(Operador.LDA, ("temporal", 0))
+        self.en_acumulador = True
+
+    def generar(self) -> None:
+        """Genera el código de todo el programa."""
+        programa = self.programa
+        profundidades = programa.profundidades()
+        destinos = programa.destinos()
+        for posicion, (codigo, argumento) in enumerate(programa):
+            if posicion in destinos:
+                self.vaciar()
+                self.marcar(posicion)
+            profundidad = profundidades[posicion]
+            if profundidad is None:
+                continue
+            self.profundidad = profundidad
+            self.alcanzable = True
+            self.instruccion(posicion, codigo, argumento)
+            if not self.asignar_registros:
+                self.vaciar()
+        final = len(programa)
+        if final in destinos:
+            self.vaciar()
+            self.marcar(final)
+            if not self.alcanzable:
+                self.profundidad = self.llegadas[final]
+                self.alcanzable = True
+        if self.alcanzable:
+            self.terminar()
+
+    def instruccion(  # pylint: disable=too-many-branches
+        self, posicion: int, codigo: Codigo, argumento: Any
+    ) -> None:
+        """Genera el código de una instrucción."""
+        match codigo:
+            case Codigo.APILAR:
+                self.apilar_desde(("constante", _entero(argumento, posicion)))
+            case Codigo.CARGAR:
+                self.apilar_desde(("variable", argumento))
+            case Codigo.GUARDAR:
+                self.desapilar_en(("variable", argumento))
+            case Codigo.CARGAR_LOCAL:
+                self.apilar_desde(("local", argumento))
+            case Codigo.GUARDAR_LOCAL:
+                self.desapilar_en(("local", argumento))
+            case Codigo.DUPLICAR:
+                self.cargar_cima()
+                self.emitir(Operador.STA, ("pila", self.profundidad - 1))
+                self.profundidad += 1
+            case Codigo.DESCARTAR:
+                self.profundidad -= 1
+                self.en_acumulador = False
+            case Codigo.INTERCAMBIAR:
+                self.reordenar((1, 0))
+            case Codigo.COPIAR_SEGUNDO:
+                self.apilar_desde(("pila", self.profundidad - 2))
+            case Codigo.ROTAR:
+                self.reordenar((1, 2, 0))
+            case Codigo.SUMA:
+                self.cargar_cima()
+                self.emitir(Operador.ADD, ("pila", self.profundidad - 2))
+                self.profundidad -= 1
+            case Codigo.RESTA:
+                self.restar(invertida=False)
+                self.profundidad -= 1
+            case Codigo.INVERTIR_SIGNO:
+                self.vaciar()
+                self.emitir(Operador.LDA, ("constante", 0))
+                self.emitir(Operador.SUB, ("pila", self.profundidad - 1))
+                self.en_acumulador = True
+            case Codigo.NEGACION:
+                self.cargar_cima()
+                self.elegir(Operador.BRZ, True)
+            case _ if codigo in _COMPARACIONES:
+                invertida, salto, si_salta = _COMPARACIONES[codigo]
+                self.restar(invertida)
+                self.profundidad -= 1
+                self.elegir(salto, si_salta)
+            case Codigo.SALTAR:
+                self.saltar(Operador.BRA, argumento)
+                self.alcanzable = False
+            case Codigo.SALTAR_SI_FALSO:
+                self.cargar_cima()
+                self.profundidad -= 1
+                self.en_acumulador = False
+                self.saltar(Operador.BRZ, argumento)
+            case Codigo.SALTAR_SI_VERDADERO:
+                self.cargar_cima()
+                self.profundidad -= 1
+                self.en_acumulador = False
+                siguiente = self.nueva_etiqueta()
+                self.emitir(Operador.BRZ, ("codigo", siguiente))
+                self.saltar(Operador.BRA, argumento)
+                self.marcar(siguiente)
+            case Codigo.REGRESAR:
+                self.terminar()
+            case _:
+                raise ValueError(
+                    f"La instrucción {codigo.mnemonico} en la posición "
+                    f"{posicion} no se puede traducir a la computadora del "
+                    "Hombre Pequeño."
+                )
+
+    def restar(self, invertida: bool) -> None:
+        """Calcula en el acumulador a - b, o b - a si `invertida`."""
+        if invertida:
+            self.cargar_cima()
+            self.emitir(Operador.SUB, ("pila", self.profundidad - 2))
+        else:
+            self.vaciar()
+            self.emitir(Operador.LDA, ("pila", self.profundidad - 2))
+            self.emitir(Operador.SUB, ("pila", self.profundidad - 1))
+            self.en_acumulador = True
+
+
+def _entero(valor: Any, posicion: int) -> int:
+    """Convierte una literal en un entero de la computadora."""
+    if not isinstance(valor, int):
+        raise ValueError(
+            f"Se esperaba una literal entera en la posición {posicion}, se "
+            f"recibió {valor!r}."
+        )
+    return int(valor)
+
+
+def _palabra(operador: Operador, direccion: int, base_direccion: int) -> int:
+    """Codifica una instrucción de la computadora."""
+    if operador in (Operador.INP, Operador.OUT):
+        return 9 * base_direccion + operador - 900
+    return operador * base_direccion + direccion
+
+
+def traducir(  # pylint: disable=too-many-locals
+    programa: Programa | str,
+    variables: Mapping[str, int] | None = None,
+    *,
+    asignar_registros: bool = True,
+    digitos: int = 3,
+    digitos_direccion: int = 2,
+) -> ImagenHombre:
+    """Traduce un programa de la máquina de pila a una imagen de memoria.
+
+    Parámetros
+    ----------
+    programa : Programa | str
+        Programa en código de bytes, o texto en notación posfija. La
+        pila empieza vacía y no puede haber llamadas a subrutinas.
+    variables : Mapping[str, int] | None, opcional
+        Valores iniciales de las variables. Las variables que el
+        programa guarda sin haber recibido un valor empiezan en 0.
+    asignar_registros : bool, opcional
+        Si es True (por defecto), mantiene la cima de la pila en el
+        acumulador dentro de cada bloque básico.
+    digitos : int, opcional
+        Número de dígitos decimales de cada palabra. Por defecto, 3.
+    digitos_direccion : int, opcional
+        Número de dígitos decimales de cada dirección. Por defecto, 2.
+
+    Devuelve
+    --------
+    ImagenHombre
+        Imagen de memoria lista para cargar en la computadora.
+
+    Levanta
+    -------
+    ValueError
+        Si el programa usa una instrucción o una literal que no se puede
+        traducir, desapila más de lo que apila, carga una variable sin
+        valor, o si la imagen o sus valores no caben en la memoria.
+    """
+    if isinstance(programa, str):
+        programa = ensamblar(programa)
+    if programa.alcance_de_pila()[0] < 0:
+        raise ValueError("El programa desapila de la pila vacía.")
+    generador = _Generador(programa, asignar_registros)
+    generador.generar()
+    datos = _datos(programa, generador, variables)
+    # Los datos van después del código, y la pila al final.
+    n_codigo = len(generador.codigo)
+    direcciones = {simbolo: n_codigo + i for i, simbolo in enumerate(datos)}
+    inicio_pila = n_codigo + len(datos)
+    pila = range(inicio_pila, inicio_pila + programa.alcance_de_pila()[1])
+    base_direccion = 10**digitos_direccion
+    if pila.stop > base_direccion:
+        raise ValueError(
+            f"La imagen necesita {pila.stop} celdas, pero las direcciones "
+            f"sólo alcanzan {base_direccion}."
+        )
+    limite = 10**digitos - 1
+    for simbolo, valor in datos.items():
+        if not -limite <= valor <= limite:
+            raise ValueError(f"El valor {valor} de {simbolo} no cabe en una palabra.")
+
+    def direccion(simbolo: _Simbolo | None) -> int:
+        if simbolo is None:
+            return 0
+        if simbolo[0] == "codigo":
+            return generador.etiquetas[simbolo[1]]
+        if simbolo[0] == "pila":
+            return pila.start + int(simbolo[1])
+        return direcciones[simbolo]
+
+    memoria = [
+        _palabra(operador, direccion(simbolo), base_direccion)
+        for operador, simbolo in generador.codigo
+    ]
+    memoria.extend(datos.values())
+    memoria.extend(0 for _ in pila)
+    return ImagenHombre(
+        tuple(memoria),
+        n_codigo,
+        {
+            simbolo[1]: direcciones[simbolo]
+            for simbolo in datos
+            if simbolo[0] == "variable"
+        },
+        pila,
+        digitos,
+        digitos_direccion,
+    )
+
+
+def _datos(
+    programa: Programa, generador: _Generador, variables: Mapping[str, int] | None
+) -> dict[_Simbolo, int]:
+    """Valor inicial de cada celda de datos, en el orden de la memoria."""
+    valores = dict(variables or {})
+    for codigo, nombre in programa:
+        if codigo == Codigo.GUARDAR:
+            valores.setdefault(nombre, 0)
+    for codigo, nombre in programa:
+        if codigo == Codigo.CARGAR and nombre not in valores:
+            raise ValueError(f"La variable {nombre!r} no tiene valor.")
+    datos: dict[_Simbolo, int] = {}
+    for _, simbolo in generador.codigo:
+        if simbolo is not None and simbolo[0] == "constante":
+            datos.setdefault(simbolo, simbolo[1])
+    datos.update(
+        {("variable", nombre): int(valor) for nombre, valor in valores.items()}
+    )
+    datos.update({("local", i): 0 for i in range(programa.numero_de_locales())})
+    datos[("temporal", 0)] = 0
+    return datos
+
+
+def medir_asignacion(
+    programa: Programa | str,
+    variables: Mapping[str, int] | None = None,
+    *,
+    max_pasos: int | None = 100_000,
+    digitos: int = 3,
+    digitos_direccion: int = 2,
+) -> MedicionDePasos:
+    """Compara los pasos con y sin asignación de registros.
+
+    Traduce el programa de las dos maneras, ejecuta ambas imágenes y
+    cuenta sus ciclos de instrucción.
+
+    Parámetros
+    ----------
+    programa : Programa | str
+        Programa en código de bytes, o texto en notación posfija.
+    variables : Mapping[str, int] | None, opcional
+        Valores iniciales de las variables.
+    max_pasos : int | None, opcional
+        Número máximo de ciclos de cada ejecución. Por defecto, 100000.
+    digitos, digitos_direccion : int, opcional
+        Tamaño de las palabras y las direcciones, como en `traducir`.
+
+    Devuelve
+    --------
+    MedicionDePasos
+        Pasos y celdas de código de cada traducción.
+
+    Levanta
+    -------
+    RuntimeError
+        Si las dos traducciones producen salidas distintas, o si alguna
+        no se detiene en `max_pasos` ciclos.
+    """
+    medidas = {"digitos": digitos, "digitos_direccion": digitos_direccion}
+    sin = traducir(programa, variables, asignar_registros=False, **medidas)
+    con = traducir(programa, variables, asignar_registros=True, **medidas)
+    salida_sin, pasos_sin = sin.ejecutar(max_pasos)
+    salida_con, pasos_con = con.ejecutar(max_pasos)
+    if salida_sin != salida_con:
+        raise RuntimeError(
+            f"Las traducciones no coinciden: {salida_sin} y {salida_con}."
+        )
+    return MedicionDePasos(
+        salida_con, pasos_sin, pasos_con, sin.instrucciones, con.instrucciones
+    )
@@ -0,0 +1,109 @@
+"""Máquina de pila vectorial.
+
+Este módulo implementa una variante de la máquina de pila en la que
+cada elemento de la pila puede ser un arreglo de NumPy. Cada operador
+procesa una columna completa en una sola llamada, de modo que un mismo
+programa evalúa millones de filas con unas cuantas operaciones de
+NumPy.
+
+Clases
+------
+MaquinaDePilaVectorial
+    Máquina de pila cuyos operadores trabajan elemento a elemento.
+
+Funciones
+---------
+evaluar_columnas
+    Evalúa una expresión sobre columnas de valores.
+"""
+
+import ast
+from collections.abc import Callable, Mapping
+from typing import Any, Self
+
+import numpy as np
+import numpy.typing as npt
+
+from .bytecode import BINARIOS, UNARIOS, Codigo, Programa, construir_tabla
+from .compilador import compilar
+from .pila import MaquinaDePila
+
+UNARIOS_VECTORIALES: dict[Codigo, Callable[[Any], Any]] = {
+    **UNARIOS,
+    Codigo.NEGACION: np.logical_not,
+}
+"""Operadores unarios elemento a elemento."""
+
+BINARIOS_VECTORIALES: dict[Codigo, Callable[[Any, Any], Any]] = {
+    **BINARIOS,
+    Codigo.Y_LOGICO: np.logical_and,
+    Codigo.O_LOGICO: np.logical_or,
+}
+"""Operadores binarios elemento a elemento."""
+
+TABLA_VECTORIAL = construir_tabla(UNARIOS_VECTORIALES, BINARIOS_VECTORIALES)
+"""Tabla de operadores sobre arreglos de NumPy."""
+
+
+class MaquinaDePilaVectorial(MaquinaDePila):
+    """Máquina de pila cuyos operadores trabajan elemento a elemento.
+
+    Los elementos de la pila pueden ser arreglos de NumPy o escalares,
+    que se difunden (broadcasting) según las reglas de NumPy. Los
+    operadores aritméticos, de comparación y de bits ya trabajan
+    elemento a elemento; los operadores lógicos `y_logico`, `o_logico` y
+    `negacion` se sustituyen por `np.logical_and`, `np.logical_or` y
+    `np.logical_not`, pues `and`, `or` y `not` no admiten arreglos.
+    """
+
+    tabla_operadores = TABLA_VECTORIAL
+
+    def y_logico(self) -> Self:
+        """Desapila b y a, y apila np.logical_and(a, b)."""
+        b, a = self.desapilar(), self.desapilar()
+        self.apilar(np.logical_and(a, b))
+        return self
+
+    def o_logico(self) -> Self:
+        """Desapila b y a, y apila np.logical_or(a, b)."""
+        b, a = self.desapilar(), self.desapilar()
+        self.apilar(np.logical_or(a, b))
+        return self
+
+    def negacion(self) -> Self:
+        """Desapila a y apila np.logical_not(a)."""
+        a = self.desapilar()
+        self.apilar(np.logical_not(a))
+        return self
+
+
+def evaluar_columnas(
+    expresion: ast.Expression | str | Programa,
+    columnas: Mapping[str, npt.ArrayLike],
+) -> npt.NDArray[Any]:
+    """Evalúa una expresión sobre columnas de valores.
+
+    Es la versión vectorial de `compilador.evaluar_muchos`: en vez de
+    ejecutar el programa una vez por fila, lo ejecuta una sola vez con
+    una columna por variable.
+
+    Parámetros
+    ----------
+    expresion : ast.Expression | str | Programa
+        Expresión a evaluar, o un programa ya compilado.
+    columnas : Mapping[str, ArrayLike]
+        Valores de cada variable libre de la expresión, como columnas
+        de la misma longitud (o difundibles entre sí).
+
+    Devuelve
+    --------
+    NDArray
+        El valor de la expresión en cada fila.
+    """
+    if isinstance(expresion, Programa):
+        programa = expresion
+    else:
+        programa = compilar(expresion)
+    variables = {nombre: np.asarray(columna) for nombre, columna in columnas.items()}
+    maquina = MaquinaDePilaVectorial().ejecutar(programa, variables)
+    return np.asarray(maquina.desapilar())
@@ -0,0 +1,427 @@
+"""Verificador estático de programas de la máquina de pila.
+
+Este módulo recorre un programa sin ejecutarlo, como el verificador de
+código de bytes de la JVM: infiere el tipo de cada elemento de la pila
+y rechaza de antemano los programas que desapilan de una pila vacía,
+que combinan tipos incompatibles (como `"a" - 1`) o que cargan
+variables que no existen.
+
+Los tamaños de la pila y las aridades de las subrutinas los calcula
+`Programa` (ver `Programa.profundidades` y `Programa.subrutinas`); este
+módulo sólo agrega los tipos. Con saltos, el recorrido sigue el grafo
+de flujo del programa, y los tipos de los distintos caminos que llegan
+a una instrucción se combinan (si difieren, el resultado es `object`).
+Cada subrutina se verifica por separado, con una pila vacía y sus
+argumentos en las variables locales; una variable local sólo se puede
+cargar si se asignó en todos los caminos.
+
+Los tipos son clases de Python: `bool`, `int`, `float` y `str`. Un
+valor de cualquier otra clase, o cuyo tipo no se puede determinar sin
+ejecutar el programa (como el resultado de `2 ** n`), tiene tipo
+`object`, que es compatible con todo.
+
+Clases
+------
+Verificacion
+    Resultado de verificar un programa.
+
+Funciones
+---------
+tipo_de
+    Devuelve el tipo que el verificador asigna a un valor.
+verificar
+    Verifica un programa de la máquina de pila.
+
+Excepciones
+-----------
+ErrorDeVerificacion
+    El programa no pasa la verificación. Se define en `bytecode`, porque
+    `Programa` también la levanta.
+"""
+
+import dataclasses
+from collections.abc import Mapping, Sequence
+from typing import Any, NamedTuple
+
+from .bytecode import (
+    BINARIOS,
+    UNARIOS,
+    Codigo,
+    ErrorDeVerificacion,
+    Programa,
+    ensamblar,
+)
+
+__all__ = [
+    "TIPOS_BASICOS",
+    "ErrorDeVerificacion",
+    "Verificacion",
+    "tipo_de",
+    "verificar",
+]
+
+TIPOS_BASICOS = frozenset({bool, int, float, str})
+"""Tipos que el verificador distingue."""
+
+_NUMERICOS = frozenset({bool, int, float})
+_ENTEROS = frozenset({bool, int})
+_COMPARACIONES = frozenset(
+    {
+        Codigo.MENOR_QUE,
+        Codigo.MENOR_O_IGUAL_QUE,
+        Codigo.MAYOR_O_IGUAL_QUE,
+        Codigo.MAYOR_QUE,
+    }
+)
+_BITS = frozenset({Codigo.Y_BIT_A_BIT, Codigo.O_BIT_A_BIT, Codigo.XOR})
+
+
+@dataclasses.dataclass(frozen=True)
+class Verificacion:
+    """Resultado de verificar un programa.
+
+    Atributos
+    ---------
+    profundidades : tuple[int | None, ...]
+        Tamaño de la pila antes de cada instrucción, contando la pila
+        inicial (o, dentro de una subrutina, desde que se entró en
+        ella). Es None en las instrucciones inalcanzables.
+    maxima : int
+        Tamaño máximo que alcanza la pila en el programa principal,
+        contando la pila inicial.
+    cimas : tuple[type | None, ...]
+        Tipo de la cima antes de cada instrucción, o None si la pila
+        está vacía o la instrucción es inalcanzable.
+    resultados : tuple[type | None, ...]
+        Tipo del último valor que apila cada instrucción, o None si no
+        apila nada.
+    tipos : tuple[type, ...]
+        Tipos de la pila al terminar, del fondo a la cima.
+    variables : dict[str, type]
+        Tipos de las variables al terminar.
+    """
+
+    profundidades: tuple[int | None, ...]
+    maxima: int
+    cimas: tuple[type | None, ...]
+    resultados: tuple[type | None, ...]
+    tipos: tuple[type, ...]
+    variables: dict[str, type]
+
+
+def tipo_de(valor: Any) -> type:
+    """Devuelve el tipo que el verificador asigna a un valor.
+
+    Parámetros
+    ----------
+    valor : Any
+        Un valor cualquiera.
+
+    Devuelve
+    --------
+    type
+        La clase del valor si es un tipo básico, u `object` si no.
+    """
+    tipo = type(valor)
+    return tipo if tipo in TIPOS_BASICOS else object
+
+
+def _promover(a: type, b: type) -> type:
+    """Tipo del resultado aritmético de dos números."""
+    return float if float in (a, b) else int
+
+
+def _tipo_unario(codigo: Codigo, a: type) -> type | None:
+    """Tipo del resultado de un operador unario, o None si no aplica."""
+    if codigo == Codigo.NEGACION:
+        return bool
+    if a is object:
+        return object
+    if codigo == Codigo.INVERTIR_SIGNO and a in _NUMERICOS:
+        return float if a is float else int
+    if codigo == Codigo.NEGACION_BIT_A_BIT and a in _ENTEROS:
+        return int
+    return None
+
+
+def _tipo_binario(  # pylint: disable=too-many-return-statements,too-many-branches
+    codigo: Codigo, a: type, b: type
+) -> type | None:
+    """Tipo del resultado de un operador binario, o None si no aplica."""
+    if codigo in (Codigo.IGUAL_QUE, Codigo.DIFERENTE_QUE):
+        return bool
+    if codigo in (Codigo.Y_LOGICO, Codigo.O_LOGICO):
+        return a if a is b else object
+    if object in (a, b):
+        return bool if codigo in _COMPARACIONES else object
+    numericos = a in _NUMERICOS and b in _NUMERICOS
+    if codigo in _COMPARACIONES:
+        return bool if numericos or a is b is str else None
+    if codigo in _BITS:
+        if a in _ENTEROS and b in _ENTEROS:
+            return bool if a is b is bool else int
+        return None
+    if codigo in (Codigo.CORRIMIENTO_IZQUIERDA, Codigo.CORRIMIENTO_DERECHA):
+        return int if a in _ENTEROS and b in _ENTEROS else None
+    if codigo == Codigo.SUMA and a is b is str:
+        return str
+    if codigo == Codigo.MULTIPLICACION and str in (a, b):
+        return str if {a, b} in ({str, int}, {str, bool}) else None
+    if codigo == Codigo.MODULO and a is str:
+        return str
+    if not numericos:
+        return None
+    if codigo == Codigo.DIVISION:
+        return float
+    if codigo == Codigo.POTENCIA:
+        # Un exponente entero negativo da un float.
+        return float if float in (a, b) else object
+    return _promover(a, b)
+
+
+class _Estado(NamedTuple):
+    """Tipos de la pila, de las variables y de las locales en un punto."""
+
+    pila: tuple[type, ...]
+    entorno: dict[str, type]
+    locales: tuple[type | None, ...]
+
+
+def _combinar_tipos(a: type | None, b: type | None) -> type | None:
+    """Combina los tipos de dos caminos."""
+    if a is None or b is None:
+        return None
+    return a if a is b else object
+
+
+def _combinar(previo: _Estado, nuevo: _Estado, posicion: int) -> _Estado:
+    """Combina los estados de dos caminos que llegan a una instrucción.
+
+    `Programa.profundidades` ya comprobó que los caminos llegan con el
+    mismo tamaño relativo; sólo pueden diferir si la instrucción es del
+    programa principal y de una subrutina, y la pila inicial no está
+    vacía.
+
+    Levanta
+    -------
+    ErrorDeVerificacion
+        Si los caminos llegan con tamaños de pila distintos.
+    """
+    if len(previo.pila) != len(nuevo.pila):
+        raise ErrorDeVerificacion(
+            f"La pila llega con tamaños {len(previo.pila)} y {len(nuevo.pila)} "
+            f"a la posición {posicion}.",
+            posicion,
+        )
+    pila = tuple(object if a is not b else a for a, b in zip(previo.pila, nuevo.pila))
+    entorno = {
+        nombre: object if tipo is not nuevo.entorno[nombre] else tipo
+        for nombre, tipo in previo.entorno.items()
+        if nombre in nuevo.entorno
+    }
+    locales = tuple(map(_combinar_tipos, previo.locales, nuevo.locales))
+    return _Estado(pila, entorno, locales)
+
+
+def _operar(posicion: int, codigo: Codigo, operandos: list[type]) -> type:
+    """Tipo que apila un operador.
+
+    Levanta
+    -------
+    ErrorDeVerificacion
+        Si los operandos no son compatibles con el operador.
+    """
+    if codigo in UNARIOS:
+        resultado = _tipo_unario(codigo, *operandos)
+    else:
+        assert codigo in BINARIOS
+        resultado = _tipo_binario(codigo, *operandos)
+    if resultado is None:
+        nombres = " y ".join(tipo.__name__ for tipo in operandos)
+        raise ErrorDeVerificacion(
+            f"La instrucción '{codigo.mnemonico}' en la posición {posicion} "
+            f"no admite operandos {nombres}.",
+            posicion,
+        )
+    return resultado
+
+
+@dataclasses.dataclass
+class _Memoria:
+    """Tipos de las variables y las locales mientras se recorre un camino."""
+
+    entorno: dict[str, type]
+    locales: list[type | None]
+    estricto: bool
+
+
+def _apilados(  # pylint: disable=too-many-return-statements,too-many-branches
+    posicion: int,
+    instruccion: tuple[Codigo, Any],
+    operandos: list[type],
+    memoria: _Memoria,
+) -> tuple[type, ...]:
+    """Tipos que apila una instrucción, del fondo a la cima.
+
+    Las instrucciones que guardan valores modifican `memoria`.
+
+    Levanta
+    -------
+    ErrorDeVerificacion
+        Si la instrucción no se puede ejecutar con esos tipos.
+    """
+    codigo, argumento = instruccion
+    match codigo:
+        case Codigo.APILAR:
+            return (tipo_de(argumento),)
+        case Codigo.CARGAR:
+            tipo = memoria.entorno.get(argumento, None if memoria.estricto else object)
+            if tipo is None:
+                raise ErrorDeVerificacion(
+                    f"La variable '{argumento}' en la posición {posicion} no "
+                    "está definida.",
+                    posicion,
+                )
+            return (tipo,)
+        case Codigo.CARGAR_LOCAL:
+            local = memoria.locales[argumento]
+            if local is None:
+                raise ErrorDeVerificacion(
+                    f"La variable local {argumento} en la posición {posicion} "
+                    "puede no estar asignada.",
+                    posicion,
+                )
+            return (local,)
+        case Codigo.GUARDAR:
+            memoria.entorno[argumento] = operandos[0]
+        case Codigo.GUARDAR_LOCAL:
+            memoria.locales[argumento] = operandos[0]
+        case Codigo.DUPLICAR:
+            return (operandos[0], operandos[0])
+        case Codigo.INTERCAMBIAR:
+            return (operandos[1], operandos[0])
+        case Codigo.COPIAR_SEGUNDO:
+            return (operandos[0], operandos[1], operandos[0])
+        case Codigo.ROTAR:
+            return (operandos[1], operandos[2], operandos[0])
+        case Codigo.LLAMAR:
+            return (object,)
+        case _ if codigo in UNARIOS or codigo in BINARIOS:
+            return (_operar(posicion, codigo, operandos),)
+    return ()
+
+
+def verificar(  # pylint: disable=too-many-locals,too-many-branches
+    programa: Programa | str,
+    pila: Sequence[type] = (),
+    variables: Mapping[str, type] | None = None,
+) -> Verificacion:
+    """Verifica un programa de la máquina de pila.
+
+    Parámetros
+    ----------
+    programa : Programa | str
+        Programa en código de bytes, o texto en notación posfija.
+    pila : Sequence[type], opcional
+        Tipos de la pila al empezar, del fondo a la cima. Por defecto,
+        la pila está vacía.
+    variables : Mapping[str, type] | None, opcional
+        Tipos de las variables disponibles. Si es None, se acepta
+        cualquier variable y se le asigna el tipo `object`. Dentro de
+        las subrutinas, las variables desconocidas siempre tienen tipo
+        `object`.
+
+    Devuelve
+    --------
+    Verificacion
+        Profundidades y tipos calculados.
+
+    Levanta
+    -------
+    ErrorDeVerificacion
+        Si una instrucción desapila de una pila vacía, recibe operandos
+        de tipos incompatibles o carga una variable que no existe; o si
+        `Programa.profundidades` rechaza el programa.
+    """
+    if isinstance(programa, str):
+        programa = ensamblar(programa)
+    subrutinas = programa.subrutinas()
+    _verificar_profundidades(programa, len(pila))
+    n_locales = programa.numero_de_locales()
+    estados: list[_Estado | None] = [None] * len(programa)
+    contextos: list[set[bool]] = [set() for _ in programa]
+    resultados: list[type | None] = [None] * len(programa)
+    finales: list[_Estado] = []
+    pendientes = [
+        (0, _Estado(tuple(pila), dict(variables or {}), (None,) * n_locales), False)
+    ]
+    for destino, aridad in subrutinas.items():
+        iniciales = (object,) * aridad + (None,) * (n_locales - aridad)
+        pendientes.append(
+            (destino, _Estado((), dict(variables or {}), iniciales), True)
+        )
+    while pendientes:
+        posicion, estado, en_subrutina = pendientes.pop()
+        if posicion == len(programa):
+            if not en_subrutina:
+                finales.append(estado)
+            continue
+        previo = estados[posicion]
+        if previo is not None:
+            estado = _combinar(previo, estado, posicion)
+            if estado == previo and en_subrutina in contextos[posicion]:
+                continue
+        estados[posicion] = estado
+        contextos[posicion].add(en_subrutina)
+        codigo, argumento = programa.codigos[posicion], programa.argumentos[posicion]
+        requeridos = programa.efecto(posicion)[0]
+        tipos = list(estado.pila)
+        operandos = tipos[len(tipos) - requeridos :]
+        del tipos[len(tipos) - requeridos :]
+        memoria = _Memoria(
+            dict(estado.entorno),
+            list(estado.locales),
+            variables is not None and not en_subrutina,
+        )
+        apilados = _apilados(posicion, (codigo, argumento), operandos, memoria)
+        tipos.extend(apilados)
+        resultados[posicion] = apilados[-1] if apilados else None
+        siguiente = _Estado(tuple(tipos), memoria.entorno, tuple(memoria.locales))
+        if not en_subrutina and codigo == Codigo.REGRESAR:
+            finales.append(siguiente)
+        for sucesor in programa.sucesores(posicion):
+            pendientes.append((sucesor, siguiente, en_subrutina))
+    final = finales[0] if finales else _Estado((), {}, ())
+    for otro in finales[1:]:
+        final = _combinar(final, otro, len(programa))
+    return Verificacion(
+        tuple(None if e is None else len(e.pila) for e in estados),
+        len(pila) + programa.alcance_de_pila()[1],
+        tuple(e.pila[-1] if e is not None and e.pila else None for e in estados),
+        tuple(resultados),
+        final.pila,
+        final.entorno,
+    )
+
+
+def _verificar_profundidades(programa: Programa, inicial: int) -> None:
+    """Verifica que el programa no desapile de una pila vacía.
+
+    Levanta
+    -------
+    ErrorDeVerificacion
+        Si `Programa.profundidades` rechaza el programa, o si una
+        instrucción necesita más elementos de los que hay contando los
+        `inicial` elementos de la pila al empezar.
+    """
+    for posicion, profundidad in enumerate(programa.profundidades()):
+        requeridos = programa.efecto(posicion)[0]
+        # En las subrutinas, Programa.profundidades ya lo comprobó.
+        if profundidad is not None and inicial + profundidad < requeridos:
+            codigo = programa.codigos[posicion]
+            raise ErrorDeVerificacion(
+                f"La instrucción '{codigo.mnemonico}' en la posición {posicion} "
+                f"necesita {requeridos} elementos en la pila y hay "
+                f"{inicial + profundidad}.",
+                posicion,
+            )
@@ -0,0 +1,412 @@
+"""Dibujo de árboles grandes sin Graphviz.
+
+Graphviz acomoda un árbol de miles de nodos en minutos, si es que
+termina. Este módulo acomoda árboles ordenados con el algoritmo de
+Reingold y Tilford, en la versión de tiempo lineal de Walker mejorada
+por Buchheim, Jünger y Leipert: cada padre queda centrado sobre sus
+hijos, los subárboles iguales se dibujan iguales y los subárboles
+vecinos quedan tan cerca como lo permite la separación. Los recorridos
+son iterativos, así que los árboles profundos no agotan la pila de
+Python, y el SVG se escribe por partes en un archivo, sin armarlo
+completo en memoria.
+
+Para árboles que ni así caben en una página, `ArbolPlano.recortar`
+reemplaza los subárboles que pasan de una profundidad o de un número
+de nodos por un nodo de resumen que cuenta los nodos ocultos.
+
+Clases
+------
+ArbolPlano
+    Árbol ordenado con nodos numerados, listo para dibujarse.
+Acomodo
+    Posiciones de los nodos de un árbol acomodado.
+"""
+
+import collections
+import dataclasses
+import html
+import io
+from collections.abc import Iterator
+from typing import NamedTuple, TextIO
+
+ESTILO_DEFECTO = """
+text { font-family: serif; font-size: 14px; text-anchor: middle;
+       dominant-baseline: central; }
+line { stroke: cornflowerblue; }
+.resumen { fill: slategray; font-style: italic; }
+.arista { fill: darkolivegreen; font-size: 11px; font-family: sans-serif; }
+"""
+"""Hoja de estilo CSS de los SVG, con la clase de los nodos de resumen."""
+
+
+class Acomodo(NamedTuple):
+    """Posiciones de los nodos de un árbol acomodado.
+
+    Atributos
+    ---------
+    x : list[float]
+        Abscisa del centro de cada nodo.
+    y : list[float]
+        Ordenada del centro de cada nodo.
+    ancho : float
+        Ancho del dibujo, con los márgenes.
+    alto : float
+        Alto del dibujo, con los márgenes.
+    """
+
+    x: list[float]
+    y: list[float]
+    ancho: float
+    alto: float
+
+
+@dataclasses.dataclass
+class ArbolPlano:  # pylint: disable=too-many-instance-attributes
+    """Árbol ordenado con nodos numerados, listo para dibujarse.
+
+    La raíz es el nodo 0.
+
+    Atributos
+    ---------
+    etiquetas : list[str]
+        Texto de cada nodo.
+    hijos : list[list[int]]
+        Hijos de cada nodo, de izquierda a derecha.
+    clases : list[str]
+        Clase CSS de cada nodo.
+    aristas : list[str]
+        Texto de la arista que llega a cada nodo; vacío si no tiene.
+    estilo : str
+        Hoja de estilo CSS del SVG.
+    ancho_caracter : float
+        Ancho estimado de un carácter de las etiquetas, en píxeles.
+    separacion : float
+        Espacio mínimo entre dos nodos del mismo nivel, en píxeles.
+    altura_nivel : float
+        Distancia vertical entre niveles, en píxeles.
+    """
+
+    etiquetas: list[str]
+    hijos: list[list[int]]
+    clases: list[str]
+    aristas: list[str] = dataclasses.field(default_factory=list)
+    estilo: str = ESTILO_DEFECTO
+    ancho_caracter: float = 8.0
+    separacion: float = 12.0
+    altura_nivel: float = 48.0
+
+    def __post_init__(self) -> None:
+        if not self.aristas:
+            self.aristas = [""] * len(self.etiquetas)
+
+    def __len__(self) -> int:
+        """Devuelve el número de nodos."""
+        return len(self.etiquetas)
+
+    def preorden(self) -> Iterator[int]:
+        """Recorre los nodos en preorden, sin recursión."""
+        pendientes = [0]
+        while pendientes:
+            nodo = pendientes.pop()
+            yield nodo
+            pendientes.extend(reversed(self.hijos[nodo]))
+
+    def tamannos(self) -> list[int]:
+        """Devuelve el número de nodos del subárbol de cada nodo."""
+        tamannos = [1] * len(self)
+        for nodo in reversed(list(self.preorden())):
+            for hijo in self.hijos[nodo]:
+                tamannos[nodo] += tamannos[hijo]
+        return tamannos
+
+    def recortar(  # pylint: disable=too-many-locals
+        self,
+        profundidad_maxima: int | None = None,
+        maximo_de_nodos: int | None = None,
+    ) -> "ArbolPlano":
+        """Devuelve el árbol con los subárboles lejanos resumidos.
+
+        Los nodos se agregan por niveles, empezando por la raíz. Cuando
+        los hijos de un nodo pasan de la profundidad máxima o no caben
+        en el número máximo de nodos, se reemplazan todos por un solo
+        nodo de resumen, de clase "resumen", que dice cuántos nodos
+        oculta. Los nodos de resumen son los únicos que pueden exceder
+        el máximo.
+
+        Parámetros
+        ----------
+        profundidad_maxima : int | None, opcional
+            Profundidad máxima de los nodos que se conservan; la raíz
+            tiene profundidad 0. Por defecto, no hay límite.
+        maximo_de_nodos : int | None, opcional
+            Número máximo de nodos que se conservan. Por defecto, no
+            hay límite.
+
+        Devuelve
+        --------
+        ArbolPlano
+            El árbol recortado, con los mismos estilos.
+        """
+        tamannos = self.tamannos()
+        etiquetas, clases, aristas = [self.etiquetas[0]], [self.clases[0]], [""]
+        hijos_nuevos: list[list[int]] = [[]]
+        # Ternas (nodo original, nodo nuevo, profundidad) por visitar.
+        cola = collections.deque([(0, 0, 0)])
+        conservados = 1
+        while cola:
+            original, copia, profundidad = cola.popleft()
+            hijos = self.hijos[original]
+            if not hijos:
+                continue
+            cabe = (
+                maximo_de_nodos is None or conservados + len(hijos) <= maximo_de_nodos
+            )
+            if cabe and (
+                profundidad_maxima is None or profundidad < profundidad_maxima
+            ):
+                for hijo in hijos:
+                    cola.append((hijo, len(etiquetas), profundidad + 1))
+                    etiquetas.append(self.etiquetas[hijo])
+                    clases.append(self.clases[hijo])
+                    aristas.append(self.aristas[hijo])
+                conservados += len(hijos)
+            else:
+                etiquetas.append(f"⋯ {tamannos[original] - 1} nodos")
+                clases.append("resumen")
+                aristas.append("")
+            hijos_nuevos[copia].extend(range(len(hijos_nuevos), len(etiquetas)))
+            hijos_nuevos.extend([] for _ in range(len(hijos_nuevos), len(etiquetas)))
+        return dataclasses.replace(
+            self,
+            etiquetas=etiquetas,
+            hijos=hijos_nuevos,
+            clases=clases,
+            aristas=aristas,
+        )
+
+    def acomodar(self) -> Acomodo:
+        """Acomoda el árbol con el algoritmo de Reingold y Tilford.
+
+        El ancho de cada nodo se estima con el número de caracteres de
+        su etiqueta y `ancho_caracter`. El tiempo es lineal en el número
+        de nodos.
+
+        Devuelve
+        --------
+        Acomodo
+            Las posiciones de los nodos y el tamaño del dibujo.
+        """
+        return _Acomodador(self).acomodar()
+
+    def escribir_svg(self, salida: TextIO, acomodo: Acomodo | None = None) -> None:
+        """Escribe el SVG del árbol en un archivo de texto, por partes.
+
+        Parámetros
+        ----------
+        salida : TextIO
+            Archivo de texto abierto para escritura.
+        acomodo : Acomodo | None, opcional
+            Las posiciones de los nodos. Por defecto, las de `acomodar`.
+        """
+        if acomodo is None:
+            acomodo = self.acomodar()
+        x, y, ancho, alto = acomodo
+        salida.write(
+            '<svg xmlns="http://www.w3.org/2000/svg" '
+            f'width="{ancho:.0f}pt" height="{alto:.0f}pt" '
+            f'viewBox="0 0 {ancho:.1f} {alto:.1f}">\n'
+            f"<style>{self.estilo}</style>\n<g>\n"
+        )
+        medio = self.altura_nivel / 4  # Las aristas no tocan el texto.
+        for nodo, hijos in enumerate(self.hijos):
+            for hijo in hijos:
+                salida.write(
+                    f'<line x1="{x[nodo]:.1f}" y1="{y[nodo] + medio:.1f}" '
+                    f'x2="{x[hijo]:.1f}" y2="{y[hijo] - medio:.1f}"/>\n'
+                )
+                if self.aristas[hijo]:
+                    salida.write(
+                        f'<text class="arista" x="{(x[nodo] + x[hijo]) / 2:.1f}" '
+                        f'y="{(y[nodo] + y[hijo]) / 2:.1f}">'
+                        f"{html.escape(self.aristas[hijo])}</text>\n"
+                    )
+        for nodo, etiqueta in enumerate(self.etiquetas):
+            salida.write(
+                f'<text class="{html.escape(self.clases[nodo])}" '
+                f'x="{x[nodo]:.1f}" y="{y[nodo]:.1f}">{html.escape(etiqueta)}</text>\n'
+            )
+        salida.write("</g>\n</svg>\n")
+
+    def a_svg(self) -> str:
+        """Devuelve el SVG del árbol, como `escribir_svg`."""
+        salida = io.StringIO()
+        self.escribir_svg(salida)
+        return salida.getvalue()
+
+
+class _Acomodador:  # pylint: disable=too-many-instance-attributes
+    """Estado del algoritmo de Buchheim, Jünger y Leipert.
+
+    Los nombres siguen al artículo: `prelim` es la abscisa preliminar,
+    `mod` el corrimiento pendiente de los descendientes, `hilo` el
+    siguiente nodo del contorno de una hoja, y `cambio` y
+    `corrimiento` reparten los corrimientos entre hermanos.
+    """
+
+    def __init__(self, arbol: ArbolPlano) -> None:
+        n = len(arbol)
+        self.arbol = arbol
+        self.hijos = arbol.hijos
+        self.anchos = [
+            max(len(etiqueta), 1) * arbol.ancho_caracter for etiqueta in arbol.etiquetas
+        ]
+        self.padre = [-1] * n
+        self.numero = [0] * n  # Posición entre los hermanos.
+        for nodo, hijos in enumerate(self.hijos):
+            for i, hijo in enumerate(hijos):
+                self.padre[hijo] = nodo
+                self.numero[hijo] = i
+        self.prelim = [0.0] * n
+        self.mod = [0.0] * n
+        self.cambio = [0.0] * n
+        self.corrimiento = [0.0] * n
+        self.medio = [0.0] * n  # Punto medio entre el primer y el último hijo.
+        self.hilo = [-1] * n
+        self.ancestro = list(range(n))
+
+    def distancia(self, izquierdo: int, derecho: int) -> float:
+        """Separación mínima entre los centros de dos nodos vecinos."""
+        return (
+            self.anchos[izquierdo] + self.anchos[derecho]
+        ) / 2 + self.arbol.separacion
+
+    def siguiente_izquierdo(self, nodo: int) -> int:
+        """Siguiente nodo del contorno izquierdo, o -1."""
+        hijos = self.hijos[nodo]
+        return hijos[0] if hijos else self.hilo[nodo]
+
+    def siguiente_derecho(self, nodo: int) -> int:
+        """Siguiente nodo del contorno derecho, o -1."""
+        hijos = self.hijos[nodo]
+        return hijos[-1] if hijos else self.hilo[nodo]
+
+    def acomodar(self) -> Acomodo:
+        """Calcula las posiciones de todos los nodos."""
+        preorden = list(self.arbol.preorden())
+        # En preorden invertido, cada nodo se procesa después de sus
+        # descendientes, como en el primer recorrido del artículo.
+        for nodo in reversed(preorden):
+            if self.hijos[nodo]:
+                self.primer_recorrido(nodo)
+        self.prelim[0] = self.medio[0]
+        # Segundo recorrido: sumar los corrimientos de los ancestros.
+        arbol = self.arbol
+        x = [0.0] * len(arbol)
+        y = [0.0] * len(arbol)
+        acumulado = [0.0] * len(arbol)
+        for nodo in preorden:
+            x[nodo] = self.prelim[nodo] + acumulado[nodo]
+            y[nodo] = y[self.padre[nodo]] + arbol.altura_nivel if nodo else 0.0
+            for hijo in self.hijos[nodo]:
+                acumulado[hijo] = acumulado[nodo] + self.mod[nodo]
+        return self.normalizar(x, y)
+
+    def normalizar(self, x: list[float], y: list[float]) -> Acomodo:
+        """Recorre las posiciones para que el dibujo empiece en el margen."""
+        arbol = self.arbol
+        margen = arbol.separacion
+        izquierda = min(valor - ancho / 2 for valor, ancho in zip(x, self.anchos))
+        derecha = max(valor + ancho / 2 for valor, ancho in zip(x, self.anchos))
+        x = [valor - izquierda + margen for valor in x]
+        y = [valor + arbol.altura_nivel / 2 for valor in y]
+        alto = max(y) + arbol.altura_nivel / 2
+        return Acomodo(x, y, derecha - izquierda + 2 * margen, alto)
+
+    def primer_recorrido(self, nodo: int) -> None:
+        """Acomoda a los hijos de un nodo, ya acomodados sus subárboles."""
+        hijos = self.hijos[nodo]
+        defecto = hijos[0]
+        for i, hijo in enumerate(hijos):
+            if i == 0:
+                self.prelim[hijo] = self.medio[hijo]
+            else:
+                anterior = hijos[i - 1]
+                self.prelim[hijo] = self.prelim[anterior] + self.distancia(
+                    anterior, hijo
+                )
+                if self.hijos[hijo]:
+                    self.mod[hijo] = self.prelim[hijo] - self.medio[hijo]
+                defecto = self.repartir(hijo, defecto)
+        self.aplicar_corrimientos(nodo)
+        self.medio[nodo] = (self.prelim[hijos[0]] + self.prelim[hijos[-1]]) / 2
+
+    def repartir(  # pylint: disable=too-many-locals
+        self, nodo: int, defecto: int
+    ) -> int:
+        """Separa el subárbol de un nodo de los de sus hermanos izquierdos.
+
+        Es el procedimiento APPORTION del artículo; devuelve el nuevo
+        ancestro por defecto.
+        """
+        hermanos = self.hijos[self.padre[nodo]]
+        dentro_der = fuera_der = nodo
+        dentro_izq, fuera_izq = hermanos[self.numero[nodo] - 1], hermanos[0]
+        suma_dentro_der = self.mod[dentro_der]
+        suma_fuera_der = self.mod[fuera_der]
+        suma_dentro_izq = self.mod[dentro_izq]
+        suma_fuera_izq = self.mod[fuera_izq]
+        while True:
+            siguiente_der = self.siguiente_derecho(dentro_izq)
+            siguiente_izq = self.siguiente_izquierdo(dentro_der)
+            if siguiente_der == -1 or siguiente_izq == -1:
+                break
+            dentro_izq, dentro_der = siguiente_der, siguiente_izq
+            fuera_izq = self.siguiente_izquierdo(fuera_izq)
+            fuera_der = self.siguiente_derecho(fuera_der)
+            self.ancestro[fuera_der] = nodo
+            corrimiento = (
+                self.prelim[dentro_izq]
+                + suma_dentro_izq
+                - self.prelim[dentro_der]
+                - suma_dentro_der
+                + self.distancia(dentro_izq, dentro_der)
+            )
+            if corrimiento > 0:
+                ancestro = self.ancestro[dentro_izq]
+                if self.padre[ancestro] != self.padre[nodo]:
+                    ancestro = defecto
+                self.mover(ancestro, nodo, corrimiento)
+                suma_dentro_der += corrimiento
+                suma_fuera_der += corrimiento
+            suma_dentro_izq += self.mod[dentro_izq]
+            suma_dentro_der += self.mod[dentro_der]
+            suma_fuera_izq += self.mod[fuera_izq]
+            suma_fuera_der += self.mod[fuera_der]
+        siguiente = self.siguiente_derecho(dentro_izq)
+        if siguiente != -1 and self.siguiente_derecho(fuera_der) == -1:
+            self.hilo[fuera_der] = siguiente
+            self.mod[fuera_der] += suma_dentro_izq - suma_fuera_der
+        siguiente = self.siguiente_izquierdo(dentro_der)
+        if siguiente != -1 and self.siguiente_izquierdo(fuera_izq) == -1:
+            self.hilo[fuera_izq] = siguiente
+            self.mod[fuera_izq] += suma_dentro_der - suma_fuera_izq
+            defecto = nodo
+        return defecto
+
+    def mover(self, izquierdo: int, derecho: int, corrimiento: float) -> None:
+        """Corre un subárbol y reparte el corrimiento entre los de en medio."""
+        subarboles = self.numero[derecho] - self.numero[izquierdo]
+        self.cambio[derecho] -= corrimiento / subarboles
+        self.corrimiento[derecho] += corrimiento
+        self.cambio[izquierdo] += corrimiento / subarboles
+        self.prelim[derecho] += corrimiento
+        self.mod[derecho] += corrimiento
+
+    def aplicar_corrimientos(self, nodo: int) -> None:
+        """Aplica a los hijos de un nodo los corrimientos repartidos."""
+        corrimiento = cambio = 0.0
+        for hijo in reversed(self.hijos[nodo]):
+            self.prelim[hijo] += corrimiento
+            self.mod[hijo] += corrimiento
+            cambio += self.cambio[hijo]
+            corrimiento += self.corrimiento[hijo] + cambio
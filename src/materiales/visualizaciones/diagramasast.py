@@ -2,17 +2,28 @@
 
 import ast
 import html
+import io
+from typing import TextIO
 
 import pygraphviz  # type: ignore[import-untyped]
 
-from .utils import dibujar_svg
+from . import arboles, utils
 
 
 class DiagramaAST:
-    """Visualización de un AST"""
+    """Visualización de un AST
 
-    # pylint: disable=too-few-public-methods
+    Los AST de más de `maximo_graphviz` nodos se muestran en Jupyter con
+    el acomodo de `arboles`, que no usa Graphviz, y recortados a
+    `maximo_de_nodos` nodos.
+    """
 
+    maximo_graphviz = 500
+    maximo_de_nodos = 5000
+    estilo_svg = arboles.ESTILO_DEFECTO + (
+        ".nodo { fill: firebrick; font-style: italic; }\n"
+        ".hoja { font-family: monospace; }\n"
+    )
     attrs_arista = {
         "fontcolor": "darkolivegreen",
         "fontsize": "11",
@@ -27,6 +38,7 @@ class DiagramaAST:
         self.raiz = raiz
         self._arbol: pygraphviz.AGraph
         self._cuenta_nodo = 0
+        self._plano = arboles.ArbolPlano([], [], [], estilo=self.estilo_svg)
         self._producir_arbol()
 
     def _producir_arbol(self) -> None:
@@ -37,9 +49,16 @@ class DiagramaAST:
         """Recorrido en profundidad del AST"""
         self._cuenta_nodo += 1
         nombre = str(self._cuenta_nodo)
+        # El nodo número k del grafo es el k - 1 del árbol plano.
+        self._plano.hijos.append([])
+        self._plano.aristas.append("")
         if not isinstance(nodo, ast.AST):
             self._arbol.add_node(nombre, label=repr(nodo), **self.attrs_hoja)
+            self._plano.etiquetas.append(repr(nodo))
+            self._plano.clases.append("hoja")
             return nombre
+        self._plano.etiquetas.append(type(nodo).__name__)
+        self._plano.clases.append("nodo")
         etiqueta = html.escape(type(nodo).__name__)
         self._arbol.add_node(nombre, label=f"<<i>{etiqueta}</i>>", **self.attrs_nodo)
         for campo, valor in ast.iter_fields(nodo):
@@ -49,10 +68,50 @@ class DiagramaAST:
                     self._arbol.add_edge(
                         nombre, hijo, label=f"{campo}[{i}]", **self.attrs_arista
                     )
+                    self._enlazar(nombre, hijo, f"{campo}[{i}]")
             else:
                 hijo = self._visitar(valor)
                 self._arbol.add_edge(nombre, hijo, label=campo, **self.attrs_arista)
+                self._enlazar(nombre, hijo, campo)
         return nombre
 
+    def _enlazar(self, padre: str, hijo: str, etiqueta: str) -> None:
+        """Agrega una arista al árbol plano."""
+        self._plano.hijos[int(padre) - 1].append(int(hijo) - 1)
+        self._plano.aristas[int(hijo) - 1] = etiqueta
+
+    def __len__(self) -> int:
+        """Devuelve el número de nodos del diagrama."""
+        return len(self._plano)
+
+    def escribir_svg(
+        self,
+        salida: TextIO,
+        *,
+        profundidad_maxima: int | None = None,
+        maximo_de_nodos: int | None = None,
+    ) -> None:
+        """Escribe el SVG del diagrama, acomodado sin Graphviz.
+
+        Parámetros
+        ----------
+        salida : TextIO
+            Archivo de texto abierto para escritura.
+        profundidad_maxima : int | None, opcional
+            Profundidad a partir de la cual los subárboles se resumen
+            en un solo nodo. Por defecto, no hay límite.
+        maximo_de_nodos : int | None, opcional
+            Número de nodos a partir del cual los subárboles se resumen
+            en un solo nodo. Por defecto, no hay límite.
+        """
+        plano = self._plano
+        if profundidad_maxima is not None or maximo_de_nodos is not None:
+            plano = plano.recortar(profundidad_maxima, maximo_de_nodos)
+        plano.escribir_svg(salida)
+
     def _repr_svg_(self) -> str:
-        return dibujar_svg(self._arbol)
+        if len(self) <= self.maximo_graphviz:
+            return utils.cache.dibujar(self._arbol)
+        salida = io.StringIO()
+        self.escribir_svg(salida, maximo_de_nodos=self.maximo_de_nodos)
+        return salida.getvalue()
@@ -28,7 +28,9 @@ def _generar_traductor(car_no_imprimible: str) -> dict[int, str]:
     """
     traductor = dict.fromkeys(range(256), car_no_imprimible)
     for car in string.printable:
-        traductor[ord(car)] = car
+        # Los espacios distintos de " " (como "\n") romperían el renglón.
+        if car == " " or not car.isspace():
+            traductor[ord(car)] = car
     return traductor
 
 
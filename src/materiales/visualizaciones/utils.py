@@ -1,17 +1,353 @@
-"""Utilidades para visualizaciones con Graphviz."""
+"""Utilidades para visualizaciones con Graphviz.
 
-from typing import Any
+Dibujar un grafo ejecuta el programa de acomodo de Graphviz (`dot`,
+por defecto), lo que es lento comparado con construir el grafo. Jupyter
+pide el SVG cada vez que vuelve a mostrar una celda, y al construir las
+notas en HTML se dibujan miles de diagramas que no cambian entre una
+construcción y otra. CacheDeSVG guarda los SVG ya dibujados, indexados
+por el texto DOT del grafo y el programa de acomodo, en memoria y
+opcionalmente en disco. La instancia `cache` es la que usan los árboles
+de derivación y los diagramas de AST; si la variable de entorno
+MATERIALES_CACHE_SVG indica un directorio, también guarda ahí los SVG.
+
+Para dibujar muchos grafos, ServicioDeDibujo los acomoda en paralelo y
+devuelve futuros, de modo que una libreta puede pedir los dibujos y
+recogerlos después.
+
+Clases
+------
+CacheDeSVG
+    Caché de SVG dibujados por Graphviz.
+ServicioDeDibujo
+    Dibuja muchos grafos a la vez con Graphviz.
+
+Funciones
+---------
+dibujar_svg
+    Genera SVG desde un grafo Graphviz, retornando texto.
+dibujar_varios
+    Dibuja varios grafos en paralelo y devuelve sus SVG en orden.
+"""
+
+import concurrent.futures
+import functools
+import hashlib
+import os
+import shutil
+import subprocess
+import threading
+from collections.abc import Iterable
+from typing import Any, Self
 
 import pygraphviz  # type: ignore[import-untyped]
 
+from ..cache import CacheDeDosNiveles
 
-def dibujar_svg(arbol: pygraphviz.AGraph) -> str:
+VERSION_SVG = "1"
+"""Versión de los SVG guardados; forma parte de la llave de la caché."""
+
+
+def dibujar_svg(arbol: pygraphviz.AGraph, prog: str = "dot") -> str:
     """Genera SVG desde un grafo Graphviz, retornando texto.
 
     Levanta RuntimeError si el backend regresa None.
     """
-    resultado: Any = arbol.draw(format="svg", prog="dot")
+    resultado: Any = arbol.draw(format="svg", prog=prog)
     if resultado is None:
         raise RuntimeError("Error al generar el SVG.")
     assert isinstance(resultado, bytes)
     return resultado.decode("utf-8")
+
+
+class CacheDeSVG(CacheDeDosNiveles[str]):
+    """Caché de SVG dibujados por Graphviz.
+
+    Guarda los SVG por la llave de su grafo, en memoria y opcionalmente
+    en disco, en archivos `.svg`; ver `materiales.cache.CacheDeDosNiveles`.
+
+    Atributos
+    ---------
+    capacidad : int
+        Número máximo de SVG en memoria.
+    directorio : pathlib.Path | None
+        Directorio de la caché en disco, o None para no usar el disco.
+    limite_disco : int | None
+        Número máximo de bytes en el directorio, o None para no limitarlo.
+    aciertos : int
+        Número de consultas resueltas sin ejecutar Graphviz.
+    fallos : int
+        Número de consultas que ejecutaron Graphviz.
+    """
+
+    def __init__(
+        self,
+        capacidad: int = 256,
+        directorio: str | os.PathLike[str] | None = None,
+        limite_disco: int | None = 256 << 20,
+    ) -> None:
+        super().__init__(
+            functools.partial(str.encode, encoding="utf-8"),
+            functools.partial(bytes.decode, encoding="utf-8"),
+            ".svg",
+            capacidad,
+            directorio=directorio,
+            limite_disco=limite_disco,
+        )
+
+    @staticmethod
+    def llave(fuente: str, prog: str = "dot") -> str:
+        """Devuelve la llave de un grafo: el hash de su texto DOT y el programa.
+
+        Los atributos del grafo, de los nodos y de las aristas son parte
+        del texto DOT, así que dos grafos con la misma llave se dibujan
+        igual.
+        """
+        contenido = f"{VERSION_SVG}\0{prog}\0{fuente}".encode()
+        return hashlib.sha256(contenido).hexdigest()
+
+    def dibujar(self, arbol: pygraphviz.AGraph, prog: str = "dot") -> str:
+        """Devuelve el SVG de un grafo, dibujándolo si hace falta.
+
+        Parámetros
+        ----------
+        arbol : pygraphviz.AGraph
+            El grafo a dibujar.
+        prog : str, opcional
+            El programa de acomodo de Graphviz. Por defecto, "dot".
+
+        Devuelve
+        --------
+        str
+            El SVG, como el que devuelve `dibujar_svg`.
+
+        Levanta
+        -------
+        RuntimeError
+            Si Graphviz no genera el SVG. Los errores no se guardan.
+        """
+        fuente = arbol.string()
+        svg = self.buscar(fuente, prog)
+        if svg is None:
+            svg = dibujar_svg(arbol, prog)
+            self.guardar(fuente, svg, prog)
+        return svg
+
+    def buscar(self, fuente: str, prog: str = "dot") -> str | None:
+        """Busca el SVG de un texto DOT en memoria y en disco.
+
+        Cuenta un acierto si lo encuentra y un fallo si no; en ese caso,
+        quien lo dibuje debe guardarlo con `guardar`.
+
+        Parámetros
+        ----------
+        fuente : str
+            El texto DOT del grafo.
+        prog : str, opcional
+            El programa de acomodo de Graphviz. Por defecto, "dot".
+
+        Retorna
+        -------
+        str | None
+            El SVG guardado, o None si no está en la caché.
+        """
+        return self.consultar(self.llave(fuente, prog))
+
+    def guardar(self, fuente: str, svg: str, prog: str = "dot") -> None:
+        """Guarda el SVG de un texto DOT en memoria y en disco."""
+        self.registrar(self.llave(fuente, prog), svg)
+
+
+cache = CacheDeSVG(directorio=os.environ.get("MATERIALES_CACHE_SVG") or None)
+"""Caché que usan `ArbolDeDerivacion.a_svg` y `DiagramaAST._repr_svg_`."""
+
+
+def _dibujar_con_programa(fuente: str, prog: str) -> str:
+    """Dibuja un texto DOT en un subproceso del programa de Graphviz."""
+    resultado = subprocess.run(
+        [prog, "-Tsvg"], input=fuente.encode("utf-8"), capture_output=True, check=False
+    )
+    if resultado.returncode != 0:
+        error = resultado.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"Error al generar el SVG: {error}")
+    return resultado.stdout.decode("utf-8")
+
+
+def _dibujar_fuente(fuente: str, prog: str) -> str:
+    """Dibuja un texto DOT con pygraphviz, en el proceso que lo llama."""
+    return dibujar_svg(pygraphviz.AGraph(string=fuente), prog)
+
+
+class ServicioDeDibujo:
+    """Dibuja muchos grafos a la vez con Graphviz.
+
+    Los grafos se convierten a texto DOT y se acomodan en paralelo: en
+    varios subprocesos del programa de Graphviz si está instalado, o en
+    un grupo de procesos que usan pygraphviz si no. Los grafos con el
+    mismo texto DOT se dibujan una sola vez, y los resultados se buscan
+    y se guardan en una CacheDeSVG.
+
+    Se puede usar como administrador de contexto, que cierra el
+    servicio al salir::
+
+        with ServicioDeDibujo() as servicio:
+            futuros = [servicio.enviar(arbol) for arbol in arboles]
+            ...
+            svgs = [futuro.result() for futuro in futuros]
+
+    Atributos
+    ---------
+    cache_svg : CacheDeSVG | None
+        Caché donde se buscan y se guardan los SVG, o None para no usar
+        ninguna.
+
+    Métodos
+    -------
+    enviar(grafo, prog="dot")
+        Pide el dibujo de un grafo y devuelve su futuro.
+    dibujar_todos(grafos, prog="dot")
+        Dibuja varios grafos y devuelve sus SVG en orden.
+    cerrar(esperar=True)
+        Libera los subprocesos o procesos del servicio.
+    """
+
+    def __init__(
+        self,
+        trabajadores: int | None = None,
+        *,
+        procesos: bool | None = None,
+        cache_svg: CacheDeSVG | None = cache,
+    ) -> None:
+        """Inicia el servicio.
+
+        Parámetros
+        ----------
+        trabajadores : int | None, opcional
+            Número de dibujos simultáneos. Por defecto, el número de
+            procesadores.
+        procesos : bool | None, opcional
+            True para dibujar en un grupo de procesos con pygraphviz,
+            False para ejecutar el programa de Graphviz en subprocesos.
+            Por defecto, se usan subprocesos si `dot` está instalado.
+        cache_svg : CacheDeSVG | None, opcional
+            Caché de los SVG. Por defecto, la caché del módulo.
+        """
+        if procesos is None:
+            procesos = shutil.which("dot") is None
+        self._ejecutor: concurrent.futures.Executor
+        if procesos:
+            self._ejecutor = concurrent.futures.ProcessPoolExecutor(trabajadores)
+            self._dibujar = _dibujar_fuente
+        else:
+            self._ejecutor = concurrent.futures.ThreadPoolExecutor(trabajadores)
+            self._dibujar = _dibujar_con_programa
+        self.cache_svg = cache_svg
+        self._pendientes: dict[str, concurrent.futures.Future[str]] = {}
+        self._candado = threading.Lock()
+
+    def enviar(
+        self, grafo: pygraphviz.AGraph | str, prog: str = "dot"
+    ) -> concurrent.futures.Future[str]:
+        """Pide el dibujo de un grafo y devuelve su futuro.
+
+        Parámetros
+        ----------
+        grafo : pygraphviz.AGraph | str
+            El grafo, o su texto DOT.
+        prog : str, opcional
+            El programa de acomodo de Graphviz. Por defecto, "dot".
+
+        Retorna
+        -------
+        concurrent.futures.Future[str]
+            El futuro del SVG. Si Graphviz falla, `result()` levanta
+            RuntimeError.
+        """
+        fuente = grafo if isinstance(grafo, str) else grafo.string()
+        llave = CacheDeSVG.llave(fuente, prog)
+        # Buscar y pedir el dibujo con el candado tomado, para que dos
+        # hilos con el mismo texto DOT no lo dibujen dos veces.
+        with self._candado:
+            futuro = self._pendientes.get(llave)
+            if futuro is not None:
+                return futuro
+            svg = None
+            if self.cache_svg is not None:
+                svg = self.cache_svg.buscar(fuente, prog)
+            if svg is not None:
+                futuro = concurrent.futures.Future()
+                futuro.set_result(svg)
+                return futuro
+            futuro = self._pendientes[llave] = self._ejecutor.submit(
+                self._dibujar, fuente, prog
+            )
+        # Fuera del candado: si el dibujo ya terminó, _terminar se llama aquí.
+        futuro.add_done_callback(functools.partial(self._terminar, llave, fuente, prog))
+        return futuro
+
+    def dibujar_todos(
+        self, grafos: Iterable[pygraphviz.AGraph | str], prog: str = "dot"
+    ) -> list[str]:
+        """Dibuja varios grafos y devuelve sus SVG en el mismo orden.
+
+        Levanta RuntimeError si Graphviz falla con alguno de los grafos.
+        """
+        futuros = [self.enviar(grafo, prog) for grafo in grafos]
+        return [futuro.result() for futuro in futuros]
+
+    def cerrar(self, esperar: bool = True) -> None:
+        """Libera los subprocesos o procesos del servicio.
+
+        Si `esperar` es True, espera a que terminen los dibujos pedidos.
+        """
+        self._ejecutor.shutdown(wait=esperar)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.cerrar()
+
+    def _terminar(
+        self,
+        llave: str,
+        fuente: str,
+        prog: str,
+        futuro: concurrent.futures.Future[str],
+    ) -> None:
+        """Guarda en la caché el resultado de un dibujo que terminó."""
+        # Se guarda antes de dejar de estar pendiente, para que `enviar`
+        # siempre lo encuentre en alguno de los dos lugares.
+        if self.cache_svg is not None and not futuro.cancelled():
+            if futuro.exception() is None:
+                self.cache_svg.guardar(fuente, futuro.result(), prog)
+        with self._candado:
+            self._pendientes.pop(llave, None)
+
+
+def dibujar_varios(
+    grafos: Iterable[pygraphviz.AGraph | str],
+    prog: str = "dot",
+    trabajadores: int | None = None,
+) -> list[str]:
+    """Dibuja varios grafos en paralelo y devuelve sus SVG en orden.
+
+    Es un atajo para `ServicioDeDibujo.dibujar_todos` con un servicio
+    que se cierra al terminar.
+
+    Parámetros
+    ----------
+    grafos : Iterable[pygraphviz.AGraph | str]
+        Los grafos, o sus textos DOT.
+    prog : str, opcional
+        El programa de acomodo de Graphviz. Por defecto, "dot".
+    trabajadores : int | None, opcional
+        Número de dibujos simultáneos. Por defecto, el número de
+        procesadores.
+
+    Retorna
+    -------
+    list[str]
+        Los SVG de los grafos.
+    """
+    with ServicioDeDibujo(trabajadores) as servicio:
+        return servicio.dibujar_todos(grafos, prog)
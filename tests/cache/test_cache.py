@@ -0,0 +1,66 @@
+"""Pruebas para materiales.cache."""
+
+import os
+import pathlib
+import tempfile
+import unittest
+
+from materiales.cache import CacheDeDosNiveles
+
+
+def _desde_bytes(contenido: bytes) -> bytes:
+    """Acepta cualquier contenido que no empiece con "x"."""
+    if contenido.startswith(b"x"):
+        raise ValueError("Contenido dañado.")
+    return contenido
+
+
+def _cache(directorio: str | None = None, **opciones: int) -> CacheDeDosNiveles[bytes]:
+    """Una caché de bytes con el sufijo ".bin"."""
+    return CacheDeDosNiveles(
+        bytes, _desde_bytes, ".bin", 2, directorio=directorio, **opciones
+    )
+
+
+class TestCacheDeDosNiveles(unittest.TestCase):
+    """Cobertura de CacheDeDosNiveles."""
+
+    def test_memoria(self) -> None:
+        """Se desecha el valor usado hace más tiempo."""
+        cache = _cache()
+        self.assertIsNone(cache.consultar("a"))
+        cache.registrar("a", b"1")
+        cache.registrar("b", b"2")
+        self.assertEqual(cache.consultar("a"), b"1")
+        cache.registrar("c", b"3")
+        self.assertIsNone(cache.consultar("b"))
+        self.assertEqual((cache.aciertos, cache.fallos), (1, 2))
+        cache.limpiar()
+        self.assertEqual((cache.aciertos, cache.fallos), (0, 0))
+        self.assertIsNone(cache.consultar("a"))
+
+    def test_disco(self) -> None:
+        """Otra caché lee los archivos, salvo los dañados."""
+        with tempfile.TemporaryDirectory() as directorio:
+            _cache(directorio).registrar("a", b"1")
+            _cache(directorio).registrar("b", b"x")
+            nombres = sorted(r.name for r in pathlib.Path(directorio).iterdir())
+            self.assertEqual(nombres, ["a.bin", "b.bin"])
+            otra = _cache(directorio)
+            self.assertEqual(otra.consultar("a"), b"1")
+            self.assertIsNone(otra.consultar("b"))
+            self.assertEqual((otra.aciertos, otra.fallos), (1, 1))
+
+    def test_limite(self) -> None:
+        """Superar el límite borra los archivos usados hace más tiempo."""
+        with tempfile.TemporaryDirectory() as directorio:
+            cache = _cache(directorio, limite_disco=4)
+            cache.registrar("a", b"123")
+            os.utime(pathlib.Path(directorio, "a.bin"), (0, 0))
+            cache.registrar("b", b"456")
+            archivos = [r.name for r in pathlib.Path(directorio).iterdir()]
+            self.assertEqual(archivos, ["b.bin"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Pruebas para materiales.lenguajes.automatas."""
+
+import itertools
+import unittest
+
+import numpy as np
+
+from materiales.lenguajes import automatas, equivalencia
+from materiales.lenguajes.gramaticas import GramaticaLibreContexto
+
+_REGULARES = [
+    '<S> ::= "a" <S> | "b" <S> | ""',
+    '<S> ::= "ab" <S> | "c" <T>\n<T> ::= "d" <T> | ""',
+    '<S> ::= <S> "a" | <T>\n<T> ::= <T> "b" | ""',
+    '<S> ::= "a" <A> | "a" <B>\n<A> ::= "b" <A> | ""\n<B> ::= "bb" <B> | "c"',
+    '<S> ::= "a" <S>',
+    '<S> ::= "x"',
+]
+
+
+class TestLinealidad(unittest.TestCase):
+    """Prueba la detección de gramáticas lineales."""
+
+    def test_linealidad(self) -> None:
+        """Distingue las gramáticas lineales por cada lado."""
+        for texto, esperado in (
+            ('<S> ::= "a" <S> | "b"', "derecha"),
+            ('<S> ::= <S> "a" | "b"', "izquierda"),
+            ('<S> ::= "a" | "b"', "derecha"),
+            ('<S> ::= "a" <S> | <S> "b" | ""', None),
+            ('<S> ::= "a" <S> "b" | ""', None),
+            ('<S> ::= <S> <S> | "a"', None),
+        ):
+            with self.subTest(texto=texto):
+                gramatica = GramaticaLibreContexto.desde_bnf(texto)
+                self.assertEqual(automatas.linealidad(gramatica.reglas), esperado)
+                self.assertEqual(gramatica.es_regular, esperado is not None)
+        with self.assertRaises(ValueError):
+            _ = GramaticaLibreContexto.desde_bnf('<S> ::= "a" <S> "b" | ""').automata
+
+
+class TestAutomataFinito(unittest.TestCase):
+    """Prueba el autómata de una gramática contra sus palabras."""
+
+    def test_lenguaje(self) -> None:
+        """Acepta, cuenta y enumera las mismas palabras que la gramática."""
+        for texto in _REGULARES:
+            gramatica = GramaticaLibreContexto.desde_bnf(texto)
+            automata = gramatica.automata
+            alfabeto = [*automata.alfabeto, "z"]
+            for longitud in range(7):
+                with self.subTest(texto=texto, longitud=longitud):
+                    esperadas = equivalencia.palabras(
+                        gramatica.reglas, gramatica.variable_inicial, longitud
+                    )
+                    self.assertEqual(automata.contar(longitud), len(esperadas))
+                    self.assertEqual(
+                        list(automata.palabras(longitud)), sorted(esperadas)
+                    )
+                    textos = [
+                        "".join(letras)
+                        for letras in itertools.product(alfabeto, repeat=longitud)
+                    ]
+                    aceptados = automata.aceptar_varios(textos)
+                    for texto_i, aceptado in zip(textos, aceptados):
+                        self.assertEqual(bool(aceptado), texto_i in esperadas)
+                        self.assertEqual(gramatica.reconocer(texto_i), bool(aceptado))
+
+    def test_minimo(self) -> None:
+        """El autómata es mínimo y su estado inicial es el 0."""
+        # Múltiplos de 3 en binario, con estados redundantes.
+        gramatica = GramaticaLibreContexto.desde_bnf("""
+            <C0> ::= "0" <C0> | "1" <C1> | ""
+            <C1> ::= "0" <C2> | "1" <D0>
+            <C2> ::= "0" <C1> | "1" <C2>
+            <D0> ::= "0" <C0> | "1" <C1> | ""
+            """)
+        automata = gramatica.automata
+        self.assertEqual(len(automata), 4)  # Tres residuos y el de rechazo.
+        self.assertTrue(automata.aceptacion[0])
+        for numero in range(200):
+            self.assertEqual(automata.aceptar(f"{numero:b}"), numero % 3 == 0)
+        self.assertEqual(len(automata.minimizar()), len(automata))
+
+    def test_varios(self) -> None:
+        """Los textos deben tener la misma longitud."""
+        automata = GramaticaLibreContexto.desde_bnf('<S> ::= "a" <S> | ""').automata
+        self.assertEqual(automata.aceptar_varios([]).shape, (0,))
+        np.testing.assert_array_equal(
+            automata.aceptar_varios(["aa", "ab", "ña"]), [True, False, False]
+        )
+        with self.assertRaises(ValueError):
+            automata.aceptar_varios(["a", "aa"])
+        self.assertEqual(automata.contar(1000), 1)
+
+    def test_contar_grande(self) -> None:
+        """Los conteos grandes no se desbordan."""
+        automata = GramaticaLibreContexto.desde_bnf(_REGULARES[0]).automata
+        self.assertEqual(automata.contar(100), 2**100)
+        self.assertTrue(automata.aceptar("ab" * 50_000))
+
+
+if __name__ == "__main__":
+    unittest.main()
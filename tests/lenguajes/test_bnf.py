@@ -1,8 +1,18 @@
 """Pruebas unitarias para el módulo materiales.lenguajes.bnf."""
 
+import io
+import pathlib
+import tempfile
 import unittest
-
-from materiales.lenguajes.bnf import ParserBNFLibreContexto, Token
+from unittest import mock
+
+from materiales.lenguajes import bnf
+from materiales.lenguajes.bnf import (
+    CacheDeGramaticas,
+    ErroresDeSintaxisBNF,
+    ParserBNFLibreContexto,
+    Token,
+)
 from materiales.lenguajes.estructuras import Terminal, Variable
 
 
@@ -54,6 +64,27 @@ class TestParserBNFLibreContexto(unittest.TestCase):
         with self.assertRaises(SyntaxError):
             list(ParserBNFLibreContexto().tokenizar("S ::= <A> | <B> #"))
 
+    def test_tokenizar_archivo(self) -> None:
+        """Leer por bloques produce los mismos tokens que el texto completo."""
+        entrada = (
+            '<S>    ::=  <A>   |   "x\\"y" # comentario\n'
+            '\t  <A> ::= <S.a> ""\n\n     '
+        )
+        parser = ParserBNFLibreContexto()
+        esperado = list(parser.tokenizar(entrada))
+        self.assertEqual(len(esperado), 13)
+        for tamanno in (1, 2, 3, 5, 1024):
+            with self.subTest(tamanno=tamanno):
+                parser.tamanno_bloque = tamanno
+                tokens = list(parser.tokenizar_archivo(io.StringIO(entrada)))
+                self.assertEqual(tokens, esperado)
+
+        parser.tamanno_bloque = 2
+        with self.assertRaisesRegex(SyntaxError, "línea 2, columna 5"):
+            list(parser.tokenizar_archivo(io.StringIO("<A> ::= <B>\n    <C :")))
+        tokens = list(parser.tokenizar_archivo(io.StringIO("")))
+        self.assertEqual(tokens, [Token("FIN", "", 1, 1)])
+
     def test_diseccionar(self) -> None:
         """Prueba el método diseccionar."""
         entrada = """
@@ -75,6 +106,45 @@ class TestParserBNFLibreContexto(unittest.TestCase):
         with self.assertRaises(SyntaxError):
             ParserBNFLibreContexto().diseccionar("S ::= <A> | <B> #")
 
+    def test_diseccionar_archivo(self) -> None:
+        """Leer por bloques produce la misma gramática."""
+        entrada = '<S> ::= "a" <S> | "\\"" | ""\n<T> ::= <S>\n<S> ::= "b"\n'
+        parser = ParserBNFLibreContexto()
+        esperado = {
+            Variable("S"): (
+                (Terminal("a"), Variable("S")),
+                (Terminal('"'),),
+                (),
+                (Terminal("b"),),
+            ),
+            Variable("T"): ((Variable("S"),),),
+        }
+        self.assertEqual(parser.diseccionar(entrada), esperado)
+        parser.tamanno_bloque = 3
+        self.assertEqual(parser.diseccionar_archivo(io.StringIO(entrada)), esperado)
+
+    def test_todos_los_errores(self) -> None:
+        """Se informan todos los errores en una sola pasada."""
+        entrada = (
+            '<A> ::= "a"\n'
+            '"b" ::= <A>\n'
+            "<B> ::= <A> | \n"
+            "<C> ::= <A> ! <A> ?\n"
+            '<D> ::= "d" ::= "e"\n'
+            "<E>"
+        )
+        with self.assertRaises(ErroresDeSintaxisBNF) as contexto:
+            ParserBNFLibreContexto().diseccionar(entrada)
+        posiciones = [(e.lineno, e.offset) for e in contexto.exception.errores]
+        self.assertEqual(
+            posiciones, [(2, 1), (3, 15), (4, 13), (4, 19), (5, 13), (6, 4)]
+        )
+        self.assertEqual((contexto.exception.lineno, contexto.exception.offset), (2, 1))
+        self.assertIn("6 errores de sintaxis", str(contexto.exception))
+        self.assertIn(
+            "Carácter ilegal '!' en línea 4, columna 13", str(contexto.exception)
+        )
+
     def test_error_no_terminal_en_izquierda(self) -> None:
         """Falla si la izquierda de la producción no es NO_TERMINAL."""
         # Izquierda comienza con un terminal en vez de no terminal
@@ -97,3 +167,54 @@ class TestParserBNFLibreContexto(unittest.TestCase):
         """Falla si la cadena comienza con token inválido (caso adicional)."""
         with self.assertRaises(SyntaxError):
             ParserBNFLibreContexto().diseccionar('<B> ::= | "b"')
+
+
+class TestCacheDeGramaticas(unittest.TestCase):
+    """Prueba la clase CacheDeGramaticas."""
+
+    TEXTO = '<S> ::= "a" <S> | ""'
+
+    def test_memoria(self) -> None:
+        """Repetir un texto no lo vuelve a analizar."""
+        cache = CacheDeGramaticas(capacidad=2)
+        primera = cache.diseccionar(self.TEXTO)
+        self.assertEqual(primera, ParserBNFLibreContexto().diseccionar(self.TEXTO))
+        primera.clear()  # Modificar la copia no altera la caché.
+        self.assertEqual(len(cache.diseccionar(self.TEXTO)), 1)
+        self.assertEqual((cache.aciertos, cache.fallos), (1, 1))
+        cache.diseccionar('<A> ::= "a"')
+        cache.diseccionar('<B> ::= "b"')  # Desecha la menos reciente.
+        cache.diseccionar(self.TEXTO)
+        self.assertEqual((cache.aciertos, cache.fallos), (1, 4))
+        with self.assertRaises(SyntaxError):
+            cache.diseccionar("<S> ::=")
+        cache.limpiar()
+        self.assertEqual((cache.aciertos, cache.fallos), (0, 0))
+
+    def test_disco(self) -> None:
+        """Otra caché con el mismo directorio empieza con las gramáticas."""
+        with tempfile.TemporaryDirectory() as directorio:
+            CacheDeGramaticas(directorio=directorio).diseccionar(self.TEXTO)
+            archivos = list(pathlib.Path(directorio).iterdir())
+            self.assertEqual(
+                [a.name for a in archivos],
+                [f"{CacheDeGramaticas.llave(self.TEXTO)}.pickle"],
+            )
+            cache = CacheDeGramaticas(directorio=directorio)
+            gramatica = cache.diseccionar(self.TEXTO)
+            self.assertEqual(
+                gramatica, ParserBNFLibreContexto().diseccionar(self.TEXTO)
+            )
+            self.assertEqual((cache.aciertos, cache.fallos), (1, 0))
+
+            archivos[0].write_bytes(b"no es pickle")
+            cache = CacheDeGramaticas(directorio=directorio)
+            self.assertEqual(cache.diseccionar(self.TEXTO), gramatica)
+            self.assertEqual((cache.aciertos, cache.fallos), (0, 1))
+
+    def test_version(self) -> None:
+        """La llave depende de la versión del parser."""
+        llave = CacheDeGramaticas.llave(self.TEXTO)
+        self.assertNotEqual(llave, CacheDeGramaticas.llave(self.TEXTO + " "))
+        with mock.patch.object(bnf, "VERSION_PARSER", "otra"):
+            self.assertNotEqual(llave, CacheDeGramaticas.llave(self.TEXTO))
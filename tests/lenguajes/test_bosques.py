@@ -0,0 +1,96 @@
+"""Pruebas para materiales.lenguajes.bosques."""
+
+import math
+import unittest
+
+from materiales.lenguajes import bosques
+from materiales.lenguajes.gramaticas import GramaticaLibreContexto
+
+_CATALAN = [1, 1, 2, 5, 14, 42, 132]
+
+
+class TestBosque(unittest.TestCase):
+    """Prueba la clase Bosque con una gramática ambigua."""
+
+    def setUp(self) -> None:
+        """Sumas sin paréntesis: S -> S + S | x."""
+        self.gramatica = GramaticaLibreContexto.desde_bnf('<S> ::= <S> "+" <S> | "x"')
+
+    def test_contar(self) -> None:
+        """Los árboles de x+...+x son números de Catalan."""
+        for sumandos, esperado in enumerate(_CATALAN, start=1):
+            with self.subTest(sumandos=sumandos):
+                texto = "+".join("x" * sumandos)
+                self.assertEqual(self.gramatica.contar_arboles(texto), esperado)
+        self.assertEqual(self.gramatica.contar_arboles("x+"), 0)
+
+    def test_primeros(self) -> None:
+        """Los primeros árboles son distintos y producen el texto."""
+        texto = "x+x+x+x"
+        arboles = self.gramatica.arboles(texto, 10)
+        self.assertEqual(len(arboles), 5)
+        formas = {arbol.a_graphviz() for arbol in arboles}
+        self.assertEqual(len(formas), 5)
+        for arbol in arboles:
+            self.assertEqual("".join(s.valor for s in arbol.producto()), texto)
+
+    def test_aleatorios(self) -> None:
+        """Los árboles al azar son árboles del texto, de forma reproducible."""
+        bosque = self.gramatica.bosque("+".join("x" * 30))
+        self.assertEqual(bosque.contar(), 1002242216651368)
+        primeras = bosque.aleatorias(3, semilla=1)
+        self.assertEqual(primeras, bosque.aleatorias(3, semilla=1))
+        todas = [bosque.derivacion(i) for i in range(3)]
+        self.assertEqual(len(primeras[0]), len(todas[0]))
+        arboles = self.gramatica.arboles("x+x+x", 4, aleatorios=True, semilla=0)
+        self.assertEqual(len(arboles), 4)
+        with self.assertRaises(IndexError):
+            bosque.derivacion(-1)
+
+    def test_ciclos(self) -> None:
+        """Una gramática con ciclos tiene una infinidad de árboles."""
+        gramatica = GramaticaLibreContexto.desde_bnf("""
+            <A> ::= <B> | "a" <A> | ""
+            <B> ::= <A>
+            """)
+        self.assertEqual(gramatica.contar_arboles("aa"), math.inf)
+        with self.assertRaises(ValueError):
+            gramatica.arboles("a")
+        with self.assertRaises(ValueError):
+            bosques.Bosque(gramatica.analizar("a"))
+
+
+class TestBuscarAmbiguedad(unittest.TestCase):
+    """Prueba la función buscar_ambiguedad."""
+
+    def test_ambiguas(self) -> None:
+        """Encuentra la cadena ambigua más corta."""
+        for texto, longitud, esperado in (
+            ('<S> ::= <S> "+" <S> | "x"', 7, bosques.Ambiguedad("x+x+x", 2)),
+            (
+                '<S> ::= "if" <S> | "if" <S> "else" <S> | "x"',
+                12,
+                bosques.Ambiguedad("ififxelsex", 2),
+            ),
+            ('<S> ::= <S> <S> | "" | "a"', 2, bosques.Ambiguedad("", math.inf)),
+        ):
+            with self.subTest(texto=texto):
+                gramatica = GramaticaLibreContexto.desde_bnf(texto)
+                self.assertEqual(gramatica.buscar_ambiguedad(longitud), esperado)
+
+    def test_no_ambiguas(self) -> None:
+        """Las gramáticas no ambiguas no tienen testigo."""
+        for texto in (
+            '<S> ::= "x" "+" <S> | "x"',
+            '<P> ::= "(" <P> ")" <P> | ""',
+            '<E> ::= <E> "+" <T> | <T>\n<T> ::= "(" <E> ")" | "x"',
+        ):
+            with self.subTest(texto=texto):
+                gramatica = GramaticaLibreContexto.desde_bnf(texto)
+                self.assertIsNone(gramatica.buscar_ambiguedad(8))
+        gramatica = GramaticaLibreContexto.desde_bnf('<S> ::= <S> "+" <S> | "x"')
+        self.assertIsNone(gramatica.buscar_ambiguedad(4))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""Pruebas para materiales.lenguajes.earley."""
+
+# pylint: disable=protected-access
+
+import itertools
+import unittest
+
+from materiales.lenguajes.earley import CadenaRechazada
+from materiales.lenguajes.estructuras import Variable
+from materiales.lenguajes.gramaticas import Derivacion, GramaticaLibreContexto
+
+
+def _texto(derivacion: Derivacion) -> str:
+    """Concatena los terminales de la cadena de una derivación."""
+    return "".join(simbolo.valor for simbolo in derivacion.cadena)
+
+
+class TestParserEarley(unittest.TestCase):
+    """Prueba el analizador de Earley y las derivaciones que produce."""
+
+    def setUp(self) -> None:
+        """Una gramática ambigua, recursiva por la izquierda y con ε."""
+        self.gramatica = GramaticaLibreContexto.desde_bnf(
+            '<S> ::= <S> "+" <S> | "(" <S> ")" | "x" | ""'
+        )
+
+    def test_izquierda_y_derecha(self) -> None:
+        """Cada paso reemplaza la variable del extremo correspondiente."""
+        texto = "(x+)+x+(x+(x))"
+        for derecha in (False, True):
+            with self.subTest(derecha=derecha):
+                if derecha:
+                    derivacion = self.gramatica.derivacion_derecha(texto)
+                else:
+                    derivacion = self.gramatica.derivacion_izquierda(texto)
+                self.assertEqual(_texto(derivacion), texto)
+                for paso in derivacion.historial:
+                    variables = [
+                        i
+                        for i, simbolo in enumerate(paso["cadena"])
+                        if isinstance(simbolo, Variable)
+                    ]
+                    regla = self.gramatica.reglas[paso["n_regla"]]
+                    posicion = [
+                        i for i in variables if paso["cadena"][i] == regla.izquierda
+                    ][paso.get("n_salto", 0)]
+                    extremo = variables[-1] if derecha else variables[0]
+                    self.assertEqual(posicion, extremo)
+                self.assertEqual(derivacion.arbol().producto(), derivacion.cadena)
+
+    def test_lenguaje(self) -> None:
+        """El analizador acepta exactamente las cadenas del lenguaje."""
+        gramatica = GramaticaLibreContexto.desde_bnf("""
+            <A> ::= <A> <A> | <B> | "ab" | ""
+            <B> ::= <A> "c" | <A>
+            """)
+        lenguaje = set(itertools.islice(gramatica.producir_lenguaje(), 3000))
+        for longitud in range(6):
+            for letras in itertools.product("abc", repeat=longitud):
+                texto = "".join(letras)
+                with self.subTest(texto=texto):
+                    aceptada = gramatica.parser_earley.reconocer(texto)
+                    if texto in lenguaje:
+                        self.assertTrue(aceptada)
+                    if aceptada:
+                        derivacion = gramatica.derivacion_izquierda(texto)
+                        self.assertEqual(_texto(derivacion), texto)
+
+    def test_rechazo(self) -> None:
+        """Una cadena fuera del lenguaje indica hasta dónde se analizó."""
+        with self.assertRaises(CadenaRechazada) as contexto:
+            self.gramatica.analizar("(x+x))")
+        self.assertEqual(contexto.exception.posicion, 5)
+        self.assertFalse(self.gramatica.parser_earley.reconocer("y"))
+
+    def test_texto_largo(self) -> None:
+        """Las derivaciones de textos de miles de caracteres son rápidas."""
+        gramatica = GramaticaLibreContexto.desde_bnf('<P> ::= "(" <P> ")" <P> | ""')
+        for texto in ("(()" * 1000 + ")" * 1000, "()" * 2000):
+            with self.subTest(texto=texto[:6]):
+                derivacion = gramatica.derivacion_derecha(texto)
+                self.assertEqual(_texto(derivacion), texto)
+                pares = len(texto) // 2
+                self.assertEqual(len(derivacion.historial), 2 * pares + 1)
+                self.assertEqual(len(derivacion.arbol()), 5 * pares + 2)
+        derivacion = gramatica.derivacion_izquierda("(()())" * 20)
+        self.assertIn(
+            r"\Rightarrow", derivacion._repr_latex_()
+        )  # pylint: disable=protected-access
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+"""Pruebas unitarias para el módulo materiales.lenguajes.ebnf."""
+
+import io
+import itertools
+import re
+import unittest
+
+from materiales.lenguajes.bnf import ErroresDeSintaxisBNF, ParserBNFLibreContexto
+from materiales.lenguajes.ebnf import ParserEBNF
+from materiales.lenguajes.estructuras import Cadena, Terminal, Variable
+from materiales.lenguajes.gramaticas import GramaticaLibreContexto
+
+
+def _lenguaje(texto: str, cantidad: int = 200) -> set[str]:
+    """Las primeras cadenas que produce una gramática en EBNF."""
+    gramatica = GramaticaLibreContexto.desde_ebnf(texto)
+    return set(itertools.islice(gramatica.producir_lenguaje(), cantidad))
+
+
+class TestParserEBNF(unittest.TestCase):
+    """Prueba la clase ParserEBNF."""
+
+    def test_bnf(self) -> None:
+        """Un texto en BNF produce la misma gramática."""
+        texto = """
+        <S> ::= <A> | <B>
+        <A> ::= "a" <A> | "a"
+        <B> ::= "b" <B> | ""
+        """
+        self.assertEqual(
+            ParserEBNF().diseccionar(texto),
+            ParserBNFLibreContexto().diseccionar(texto),
+        )
+
+    def test_sin_variables_nuevas(self) -> None:
+        """Grupos, opcionales y rangos se distribuyen sobre la cadena."""
+        gramatica = ParserEBNF().diseccionar("""
+            <A> ::= "a" ("b" | "c") ["d"]
+            <D> ::= "0".."3"
+            """)
+        self.assertEqual(list(gramatica), [Variable("A"), Variable("D")])
+        self.assertEqual(len(gramatica[Variable("A")]), 4)
+        self.assertEqual(
+            gramatica[Variable("D")], tuple(Cadena([Terminal(c)]) for c in "0123")
+        )
+
+    def test_repeticiones(self) -> None:
+        """Las repeticiones iguales comparten una variable auxiliar."""
+        gramatica = ParserEBNF().diseccionar("""
+            <S> ::= "x"* <T> | { "x" }
+            <T> ::= "x"+ | ("x")*
+            """)
+        auxiliar = Variable('{"x"}')
+        self.assertEqual(list(gramatica), [Variable("S"), Variable("T"), auxiliar])
+        self.assertEqual(
+            gramatica[auxiliar], (Cadena([Terminal("x"), auxiliar]), Cadena([]))
+        )
+        self.assertEqual(
+            gramatica[Variable("T")],
+            (Cadena([Terminal("x"), auxiliar]), Cadena([auxiliar])),
+        )
+
+    def test_repeticion_de_cuerpo_anulable(self) -> None:
+        """Repetir un cuerpo que puede ser vacío no crea ciclos."""
+        for repeticion in ('{["a"]}', '["a"]*', '("a" | "")*'):
+            with self.subTest(repeticion=repeticion):
+                texto = f'<S> ::= {repeticion} "b"'
+                gramatica = ParserEBNF().diseccionar(texto)
+                auxiliar = next(v for v in gramatica if v != Variable("S"))
+                self.assertEqual(
+                    gramatica[auxiliar],
+                    (Cadena([Terminal("a"), auxiliar]), Cadena([])),
+                )
+                gramatica_libre = GramaticaLibreContexto.desde_ebnf(texto)
+                self.assertEqual(gramatica_libre.contar_arboles("b"), 1)
+                self.assertEqual(gramatica_libre.contar_arboles("aab"), 1)
+
+    def test_maximo_de_alternativas(self) -> None:
+        """Lo que no cabe en el máximo usa una variable auxiliar."""
+        parser = ParserEBNF()
+        parser.maximo_de_alternativas = 1
+        gramatica = parser.diseccionar('<A> ::= "a" ["b"] "c"')
+        self.assertEqual(
+            gramatica[Variable("A")],
+            (Cadena([Terminal("a"), Variable('["b"]'), Terminal("c")]),),
+        )
+        self.assertEqual(
+            gramatica[Variable('["b"]')], (Cadena([Terminal("b")]), Cadena([]))
+        )
+
+    def test_lenguaje(self) -> None:
+        """La gramática produce el lenguaje de la expresión."""
+        numero = re.compile(r"-?[0-2]+(\.[0-2]+)?")
+        lenguaje = _lenguaje("""
+            <N> ::= "-"? <D>+ ["." <D> { <D> }]
+            <D> ::= "0".."2"
+            """)
+        self.assertIn("-10.2", lenguaje)
+        for cadena in lenguaje:
+            self.assertRegex(cadena, numero)
+        self.assertEqual(
+            _lenguaje('<P> ::= { "(" <P> ")" }', 30),
+            _lenguaje('<P> ::= "(" <P> ")" <P> | ""', 30),
+        )
+
+    def test_errores(self) -> None:
+        """Errores de sintaxis propios de EBNF."""
+        for texto in (
+            '<A> ::= ("a"',
+            '<A> ::= "a" }',
+            '<A> ::= "ab".."z"',
+            '<A> ::= "z".."a"',
+            '<A> ::= <B>.."z"',
+            '<A> ::= "a"..<B>',
+            "<A> ::= ()",
+            '<A> ::= * "a"',
+            '<A> ::= "a" | | "b"',
+        ):
+            with self.subTest(texto):
+                with self.assertRaises(ErroresDeSintaxisBNF):
+                    ParserEBNF().diseccionar(texto)
+        with self.assertRaises(ErroresDeSintaxisBNF) as contexto:
+            ParserEBNF().diseccionar('<A> ::= ["a"\n<B> ::= "b"\n<C> ::= ~')
+        self.assertEqual(len(contexto.exception.errores), 2)
+
+    def test_tokenizar(self) -> None:
+        """Los nuevos tokens se reconocen, también entre bloques."""
+        texto = '<D> ::= "0".."9"+'
+        parser = ParserEBNF()
+        tokens = list(parser.tokenizar(texto))
+        self.assertEqual(
+            [token.tipo for token in tokens],
+            ["NO_TERMINAL", "PRODUCCION", "TERMINAL", "RANGO"]
+            + ["TERMINAL", "MAS", "FIN"],
+        )
+        parser.tamanno_bloque = 1
+        self.assertEqual(list(parser.tokenizar_archivo(io.StringIO(texto))), tokens)
+        with self.assertRaises(SyntaxError):
+            list(ParserBNFLibreContexto().tokenizar(texto))
+
+
+if __name__ == "__main__":
+    unittest.main()
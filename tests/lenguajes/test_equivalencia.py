@@ -0,0 +1,133 @@
+"""Pruebas para materiales.lenguajes.equivalencia."""
+
+import concurrent.futures
+import unittest
+from unittest import mock
+
+from materiales.lenguajes import bosques, equivalencia
+from materiales.lenguajes.gramaticas import GramaticaLibreContexto
+
+
+def _gramatica(texto: str) -> GramaticaLibreContexto:
+    return GramaticaLibreContexto.desde_bnf(texto)
+
+
+class TestPalabras(unittest.TestCase):
+    """Prueba el cálculo de las palabras de cada longitud."""
+
+    def test_parentesis(self) -> None:
+        """Las palabras de Dyck se cuentan con números de Catalan."""
+        gramatica = _gramatica('<P> ::= "(" <P> ")" <P> | ""')
+        conteos = [
+            len(equivalencia.palabras(gramatica.reglas, gramatica.variable_inicial, n))
+            for n in range(0, 13, 2)
+        ]
+        self.assertEqual(conteos, [1, 1, 2, 5, 14, 42, 132])
+        self.assertFalse(
+            equivalencia.palabras(gramatica.reglas, gramatica.variable_inicial, 5)
+        )
+
+    def test_epsilon_y_ciclos(self) -> None:
+        """Las reglas que producen ε y los ciclos no impiden terminar."""
+        gramatica = _gramatica("""
+            <S> ::= <A> <S> <A> | "b"
+            <A> ::= <A> | "a" | ""
+            """)
+        self.assertEqual(
+            equivalencia.palabras(gramatica.reglas, gramatica.variable_inicial, 3),
+            {"aab", "aba", "baa"},
+        )
+
+    def test_resumen(self) -> None:
+        """El resumen no depende del orden de las reglas."""
+        primera = _gramatica('<S> ::= "a" <S> | "b" <S> | ""')
+        segunda = _gramatica('<S> ::= "b" <S> | "a" <S> | ""')
+        resumenes = [
+            equivalencia.resumir(g.reglas, g.variable_inicial, 6, muestras=3)
+            for g in (primera, segunda)
+        ]
+        self.assertEqual(resumenes[0], resumenes[1])
+        self.assertEqual(resumenes[0].palabras, 64)
+        self.assertEqual(len(resumenes[0].testigos), 3)
+
+    def test_resumenes_de_todas_las_longitudes(self) -> None:
+        """Llenar las tablas una vez da los mismos resúmenes."""
+        gramatica = _gramatica('<P> ::= "(" <P> ")" <P> | ""')
+        reglas, inicial = gramatica.reglas, gramatica.variable_inicial
+        self.assertEqual(
+            equivalencia._resumir_hasta(  # pylint: disable=protected-access
+                reglas, inicial, 8, 2, 5
+            ),
+            [equivalencia.resumir(reglas, inicial, n, 2, 5) for n in range(9)],
+        )
+
+
+class TestComparar(unittest.TestCase):
+    """Prueba la comparación de lenguajes."""
+
+    def test_equivalentes(self) -> None:
+        """Quitar la recursión por la izquierda no cambia el lenguaje."""
+        izquierda = _gramatica("""
+            <E> ::= <E> "+" <T> | <T>
+            <T> ::= "(" <E> ")" | "x"
+            """)
+        derecha = _gramatica("""
+            <E> ::= <T> <R>
+            <R> ::= "+" <T> <R> | ""
+            <T> ::= "(" <E> ")" | "x"
+            """)
+        self.assertIsNone(equivalencia.comparar(izquierda, derecha, 9))
+        self.assertIsNone(
+            equivalencia.comparar(izquierda, derecha, 7, trabajadores=2, procesos=False)
+        )
+
+    def test_contraejemplo(self) -> None:
+        """Devuelve la palabra más corta que sólo genera una gramática."""
+        primera = _gramatica('<S> ::= "a" <S> "b" | ""')
+        segunda = _gramatica('<S> ::= "a" <S> "b" | "ab" | "aabb" | "aaabbb" | "ba"')
+        self.assertEqual(
+            equivalencia.comparar(primera, segunda, 8),
+            equivalencia.Contraejemplo("", True),
+        )
+        tercera = _gramatica('<S> ::= "a" <S> "b" | "" | "aaaabbb"')
+        self.assertEqual(
+            equivalencia.comparar(tercera, primera, 10, procesos=False),
+            equivalencia.Contraejemplo("aaaabbb", True),
+        )
+        self.assertIsNone(equivalencia.comparar(tercera, primera, 6))
+
+    def test_tablas_una_vez(self) -> None:
+        """Tras los resúmenes, las tablas se llenan hasta la primera diferencia."""
+        primera = _gramatica('<S> ::= "a" <S> | ""')
+        segunda = _gramatica('<S> ::= "aa" <S> | ""')
+        with (
+            mock.patch.object(
+                bosques, "cadenas_por_longitud", wraps=bosques.cadenas_por_longitud
+            ) as tablas,
+            mock.patch.object(
+                concurrent.futures,
+                "ThreadPoolExecutor",
+                wraps=concurrent.futures.ThreadPoolExecutor,
+            ) as ejecutor,
+        ):
+            self.assertEqual(
+                equivalencia.comparar(primera, segunda, 7, procesos=False),
+                equivalencia.Contraejemplo("a", True),
+            )
+        ejecutor.assert_called_once_with(2)
+        self.assertEqual(
+            [llamada.args[1] for llamada in tablas.call_args_list], [7, 7, 1, 1]
+        )
+
+    def test_mismo_numero(self) -> None:
+        """Detecta lenguajes distintos con el mismo número de palabras."""
+        primera = _gramatica('<S> ::= "a" | "b"')
+        segunda = _gramatica('<S> ::= "a" | "c"')
+        self.assertEqual(
+            equivalencia.comparar(primera, segunda, 1, procesos=False),
+            equivalencia.Contraejemplo("b", True),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""Pruebas para materiales.lenguajes.formas."""
+
+import random
+import unittest
+
+from materiales.lenguajes.estructuras import Simbolo, Terminal, Variable
+from materiales.lenguajes.formas import (
+    ArbolFenwick,
+    FormaSentencial,
+    SucesionIndexada,
+)
+
+_VARIABLES = [Variable("A"), Variable("B")]
+_SIMBOLOS: list[Simbolo] = [*_VARIABLES, Terminal("a")]
+
+
+class TestArbolFenwick(unittest.TestCase):
+    """Prueba la clase ArbolFenwick contra sumas directas."""
+
+    def test_sumas(self) -> None:
+        """Los prefijos y las búsquedas coinciden con la lista."""
+        azar = random.Random(0)
+        valores = [azar.randrange(4) for _ in range(37)]
+        arbol = ArbolFenwick(valores)
+        for _ in range(100):
+            indice = azar.randrange(len(valores))
+            cantidad = azar.randrange(3)
+            valores[indice] += cantidad
+            arbol.sumar(indice, cantidad)
+        self.assertEqual(len(arbol), len(valores))
+        self.assertEqual(arbol.valores(), valores)
+        for indice in range(len(valores) + 1):
+            self.assertEqual(arbol.prefijo(indice), sum(valores[:indice]))
+        self.assertEqual(arbol.buscar(sum(valores)), len(valores))
+        for cantidad in range(sum(valores)):
+            posicion = arbol.buscar(cantidad)
+            self.assertGreater(sum(valores[: posicion + 1]), cantidad)
+            self.assertLessEqual(sum(valores[:posicion]), cantidad)
+
+
+class _SucesionDeBloquesPequennos(SucesionIndexada[int]):
+    tamanno_minimo = 2
+
+
+class TestSucesionIndexada(unittest.TestCase):
+    """Prueba la clase SucesionIndexada contra una lista."""
+
+    def test_partir_y_repartir(self) -> None:
+        """Los bloques se parten y se reparten sin perder los conteos."""
+        azar = random.Random(2)
+
+        def clave(elemento: int) -> int | None:
+            return elemento % 3 or None
+
+        sucesion = _SucesionDeBloquesPequennos([1], clave)
+        lista = [1]
+        for _ in range(3000):
+            posicion = azar.randrange(len(lista))
+            elementos = [azar.randrange(9) for _ in range(azar.randrange(4))]
+            if len(lista) == 1 and not elementos:
+                continue
+            self.assertEqual(sucesion.reemplazar(posicion, elementos), lista[posicion])
+            lista[posicion : posicion + 1] = elementos
+        self.assertEqual(list(sucesion), lista)
+        for resto in (1, 2):
+            apariciones = [i for i, e in enumerate(lista) if e % 3 == resto]
+            self.assertEqual(sucesion.contar(resto), len(apariciones))
+            self.assertEqual(
+                [sucesion.posicion(resto, n) for n in range(len(apariciones))],
+                apariciones,
+            )
+
+
+class TestFormaSentencial(unittest.TestCase):
+    """Prueba la clase FormaSentencial contra una lista."""
+
+    def test_reemplazar(self) -> None:
+        """Las búsquedas y los reemplazos coinciden con la lista."""
+        azar = random.Random(1)
+        forma = FormaSentencial([Variable("A")])
+        forma.tamanno_minimo = 4
+        lista: list[Simbolo] = [Variable("A")]
+        for _ in range(2000):
+            variable = azar.choice(_VARIABLES)
+            apariciones = [i for i, s in enumerate(lista) if s == variable]
+            self.assertEqual(forma.contar(variable), len(apariciones))
+            if not apariciones:
+                continue
+            n_salto = azar.randrange(len(apariciones))
+            posicion = forma.posicion(variable, n_salto)
+            self.assertEqual(posicion, apariciones[n_salto])
+            derecha = azar.choices(_SIMBOLOS, k=azar.randrange(4))
+            self.assertEqual(forma.reemplazar(posicion, derecha), variable)
+            lista[posicion : posicion + 1] = derecha
+        self.assertEqual(list(forma), lista)
+        self.assertEqual(len(forma), len(lista))
+        self.assertEqual(forma[-1], lista[-1])
+        self.assertEqual(forma[2:5], lista[2:5])
+
+    def test_posicion_inexistente(self) -> None:
+        """Buscar una aparición que no existe levanta IndexError."""
+        forma = FormaSentencial([Variable("A"), Terminal("a")])
+        for variable, n_salto in ((Variable("A"), 1), (Variable("B"), 0)):
+            with self.assertRaises(IndexError):
+                forma.posicion(variable, n_salto)
+        with self.assertRaises(IndexError):
+            forma.reemplazar(2, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,8 +2,10 @@
 
 # pylint: disable=protected-access
 
+import random
 import unittest
 
+from materiales.lenguajes import bnf
 from materiales.lenguajes.estructuras import Cadena, Terminal, UnionCadenas, Variable
 from materiales.lenguajes.gramaticas import Derivacion, GramaticaLibreContexto
 
@@ -47,6 +49,18 @@ class TestGramaticaLibreContexto(unittest.TestCase):
         g = GramaticaLibreContexto.desde_bnf(texto)
         self.assertIn(Variable("S"), g)
 
+    def test_desde_bnf_cache(self) -> None:
+        """Construir la misma gramática otra vez usa la caché."""
+        texto = '<S> ::= "b"<S> | "b"'
+        aciertos = bnf.cache.aciertos
+        g1 = GramaticaLibreContexto.desde_bnf(texto)
+        g2 = GramaticaLibreContexto.desde_bnf(texto)
+        self.assertEqual(bnf.cache.aciertos, aciertos + 1)
+        self.assertEqual(dict(g1), dict(g2))
+        self.assertIsNot(g1._datos, g2._datos)
+        sin_cache = GramaticaLibreContexto.desde_bnf(texto, usar_cache=False)
+        self.assertEqual(dict(sin_cache), dict(g1))
+
     def test_getitem(self) -> None:
         """Acceso a cadenas de una variable."""
         s_cadenas = self.gramatica[Variable("S")]
@@ -156,6 +170,106 @@ class TestDerivacion(unittest.TestCase):
         latex2 = self.derivacion._repr_latex_()
         self.assertTrue(latex2)
 
+    def test_historial_reconstruido(self) -> None:
+        """Las cadenas del historial se reconstruyen desde las copias."""
+        self.derivacion.intervalo_de_puntos = 4
+        cadenas = [self.derivacion.cadena]
+        for _ in range(10):
+            self.derivacion.aplicar_regla(1)
+            cadenas.append(self.derivacion.cadena)
+        historial = self.derivacion.historial
+        self.assertEqual(len(historial), 10)
+        self.assertEqual([paso["cadena"] for paso in historial], cadenas[:-1])
+        self.assertEqual(list(self.derivacion.formas()), cadenas)
+        for paso in (9, 2, 5, 10, 0, 7):
+            self.assertEqual(self.derivacion.forma(paso), cadenas[paso])
+        self.assertEqual(historial[-1]["n_regla"], 0)
+        self.assertEqual(len(historial[3:]), 7)
+        self.assertEqual(len(list(self.derivacion.pasos())), 10)
+
+    def test_regla_no_aplicable(self) -> None:
+        """Una regla que no se puede aplicar no cambia la derivación."""
+        self.derivacion.aplicar_regla(2)
+        with self.assertRaises(IndexError):
+            self.derivacion.aplicar_regla(1)
+        with self.assertRaises(IndexError):
+            self.derivacion.forma(2)
+        self.assertEqual(len(self.derivacion.historial), 1)
+        self.assertEqual(self.derivacion.cadena, Cadena([Terminal("a")]))
+
+
+class TestArbolDeDerivacion(unittest.TestCase):
+    """Cobertura de ArbolDeDerivacion."""
+
+    def setUp(self) -> None:
+        """Deriva una suma con paréntesis: S -> S + S | ( S ) | x | ε."""
+        self.gramatica = GramaticaLibreContexto.desde_bnf(
+            '<S> ::= <S> "+" <S> | "(" <S> ")" | "x" | ""'
+        )
+        self.derivacion = self.gramatica.hacer_derivacion()
+        for n_regla, n_salto in ((1, 0), (1, 1), (2, 0), (3, 2), (4, 1)):
+            self.derivacion.aplicar_regla(n_regla, n_salto)
+
+    def test_estructura(self) -> None:
+        """Los arreglos describen el árbol de la derivación."""
+        arbol = self.derivacion.arbol()
+        self.assertEqual(len(arbol), 12)
+        self.assertEqual(arbol.simbolo(0), Variable("S"))
+        self.assertEqual(arbol.padre(0), -1)
+        self.assertEqual(
+            [arbol.simbolo(hijo) for hijo in arbol.hijos(0)],
+            [Variable("S"), Terminal("+"), Variable("S")],
+        )
+        self.assertEqual(arbol.producto(), self.derivacion.cadena)
+        self.assertEqual(arbol.profundidad(), 3)
+        self.assertEqual(list(arbol.recorrer())[0], 0)
+        for nodo in arbol.recorrer():
+            for hijo in arbol.hijos(nodo):
+                self.assertEqual(arbol.padre(hijo), nodo)
+
+    def test_ocurrencia(self) -> None:
+        """Las hojas sin expandir se encuentran por aparición."""
+        arbol = self.derivacion.arbol()
+        self.assertEqual(arbol.ocurrencia(Variable("S"), 1), -1)
+        self.assertEqual(arbol.ocurrencia(Terminal("x")), -1)  # type: ignore[arg-type]
+        hoja = arbol.ocurrencia(Variable("S"))
+        self.assertEqual(arbol.producto(arbol.padre(hoja)), self.derivacion.cadena[:3])
+        self.derivacion.aplicar_regla(3)
+        self.assertEqual(arbol.reconstruir_arbol().producto(), self.derivacion.cadena)
+        self.assertEqual(arbol.ocurrencia(Variable("S")), -1)
+
+    def test_derivacion_larga(self) -> None:
+        """Las hojas sin expandir siguen el orden de la forma sentencial."""
+        azar = random.Random(0)
+        variable = Variable("S")
+        for _ in range(3000):
+            apariciones = self.derivacion.cadena.count(variable)
+            if not apariciones:
+                break
+            n_regla = azar.choice((1, 1, 2, 3, 4))
+            self.derivacion.aplicar_regla(n_regla, azar.randrange(apariciones))
+        arbol = self.derivacion.arbol()
+        hojas = [hoja for hoja in arbol.hojas() if arbol.simbolo(hoja) == variable]
+        self.assertEqual(
+            [arbol.ocurrencia(variable, n_salto) for n_salto in range(len(hojas))],
+            hojas,
+        )
+        self.assertEqual(
+            [simbolo for simbolo in arbol.producto() if simbolo != Terminal("")],
+            list(self.derivacion.cadena),
+        )
+
+    def test_graphviz_perezoso(self) -> None:
+        """El grafo de Graphviz se construye hasta que se pide."""
+        arbol = self.derivacion.arbol()
+        self.assertIsNone(arbol._arbol)
+        texto = arbol.a_graphviz()
+        self.assertIs(arbol._grafo(), arbol._arbol)
+        self.assertEqual(texto.count("->"), len(arbol) - 1)
+        self.assertIn("var_S1 -> var_S2", texto)
+        self.assertIn("trm_ε1", texto)
+        self.assertEqual(self.derivacion.arbol().a_graphviz(), texto)
+
 
 if __name__ == "__main__":
     unittest.main()
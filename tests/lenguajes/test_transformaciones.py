@@ -0,0 +1,129 @@
+"""Pruebas para materiales.lenguajes.transformaciones."""
+
+import itertools
+import unittest
+
+from materiales.lenguajes import equivalencia, transformaciones
+from materiales.lenguajes.estructuras import Cadena, Terminal, UnionCadenas, Variable
+from materiales.lenguajes.gramaticas import GramaticaLibreContexto
+
+_EXPRESIONES = """
+    <E> ::= <E> "+" <T> | <T>
+    <T> ::= <T> "*" <F> | <F>
+    <F> ::= "(" <E> ")" | "x"
+    """
+
+
+class TestRecursionIzquierda(unittest.TestCase):
+    """Prueba la eliminación de la recursión por la izquierda."""
+
+    def test_directa(self) -> None:
+        """La recursión directa se vuelve recursión por la derecha."""
+        gramatica = GramaticaLibreContexto.desde_bnf(_EXPRESIONES)
+        self.assertEqual(
+            transformaciones.recursivas_por_la_izquierda(gramatica.reglas),
+            [gramatica.variable_inicial, *list(gramatica)[1:2]],
+        )
+        nueva, origenes = gramatica.sin_recursion_izquierda()
+        self.assertEqual(
+            str(nueva).splitlines(),
+            [
+                "<E> → <T> <E'>",
+                "<T> → <F> <T'>",
+                '<F> → "(" <E> ")" | "x"',
+                "<E'> → \"+\" <T> <E'> | ",
+                "<T'> → \"*\" <F> <T'> | ",
+            ],
+        )
+        self.assertEqual(origenes, ((1,), (3,), (4,), (5,), (0,), (), (2,), ()))
+        self.assertFalse(transformaciones.recursivas_por_la_izquierda(nueva.reglas))
+        self.assertIsNone(equivalencia.comparar(gramatica, nueva, 9, procesos=False))
+        # Ahora la enumeración del lenguaje avanza.
+        palabras = list(itertools.islice(nueva.producir_lenguaje(), 5))
+        self.assertIn("x", palabras)
+        self.assertTrue(all(gramatica.reconocer(palabra) for palabra in palabras))
+
+    def test_indirecta(self) -> None:
+        """La recursión a través de otras variables también se elimina."""
+        gramatica = GramaticaLibreContexto.desde_bnf("""
+            <S> ::= <A> "a" | "b"
+            <A> ::= <A> "c" | <S> "d" | <A> | ""
+            """)
+        self.assertEqual(
+            transformaciones.recursivas_por_la_izquierda(gramatica.reglas),
+            list(gramatica),
+        )
+        nueva, origenes = gramatica.sin_recursion_izquierda()
+        self.assertFalse(transformaciones.recursivas_por_la_izquierda(nueva.reglas))
+        # <A> → "b" "d" <A'> viene de <A> → <S> "d" y de <S> → "b".
+        self.assertIn((3, 1), origenes)
+        self.assertIsNone(equivalencia.comparar(gramatica, nueva, 9, procesos=False))
+
+    def test_oculta(self) -> None:
+        """La recursión detrás de variables que producen ε no se elimina."""
+        gramatica = GramaticaLibreContexto.desde_bnf("""
+            <A> ::= <B> <A> "a" | "c"
+            <B> ::= "b" | ""
+            """)
+        self.assertEqual(
+            transformaciones.recursivas_por_la_izquierda(gramatica.reglas),
+            [gramatica.variable_inicial],
+        )
+        with self.assertRaises(ValueError):
+            gramatica.sin_recursion_izquierda()
+
+    def test_sin_reglas(self) -> None:
+        """La variable inicial se conserva aunque se quede sin reglas."""
+        gramatica = GramaticaLibreContexto.desde_bnf('<S> ::= <S> "a"\n<T> ::= "b"')
+        nueva, _ = gramatica.sin_recursion_izquierda()
+        self.assertEqual(nueva.variable_inicial, gramatica.variable_inicial)
+        self.assertFalse(nueva.reconocer("a"))
+
+
+class TestFactorizar(unittest.TestCase):
+    """Prueba la factorización por la izquierda."""
+
+    def test_factorizar(self) -> None:
+        """Las reglas con un prefijo común se juntan."""
+        gramatica = GramaticaLibreContexto.desde_bnf("""
+            <S> ::= "if" <E> "then" <S> | "if" <E> "then" <S> "else" <S> | "x"
+            <E> ::= "a" "b" | "a" "b" | "a" "c" "d" | "a" "c" | "ab"
+            """)
+        nueva, origenes = gramatica.factorizar_izquierda()
+        for variable, cadenas in nueva.items():
+            with self.subTest(variable=variable):
+                primeros = [cadena[0] for cadena in cadenas if cadena]
+                self.assertEqual(len(primeros), len(set(primeros)))
+        self.assertEqual(origenes[0], (0, 1))
+        self.assertEqual(len(nueva.reglas), len(origenes))
+        for regla, origen in zip(nueva.reglas, origenes):
+            for n_regla in origen:
+                original = gramatica.reglas[n_regla]
+                # Las reglas de <S'> provienen de reglas de <S>.
+                self.assertTrue(
+                    regla.izquierda.valor.startswith(original.izquierda.valor)
+                )
+        self.assertIsNone(equivalencia.comparar(gramatica, nueva, 12, procesos=False))
+
+    def test_nombres_nuevos(self) -> None:
+        """Las variables nuevas no chocan con las existentes."""
+        a, a_prima = Variable("A"), Variable("A'")
+        gramatica = GramaticaLibreContexto(
+            {
+                a: UnionCadenas(
+                    [
+                        Cadena([Terminal("a"), Terminal("b")]),
+                        Cadena([Terminal("a"), Terminal("c")]),
+                        Cadena([a_prima]),
+                    ]
+                ),
+                a_prima: UnionCadenas([Cadena([Terminal("d")])]),
+            }
+        )
+        nueva, _ = gramatica.factorizar_izquierda()
+        self.assertIn("A''", {variable.valor for variable in nueva})
+        self.assertIsNone(equivalencia.comparar(gramatica, nueva, 4, procesos=False))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+"""Pruebas unitarias para materiales.maquinas.bytecode."""
+
+import functools
+import operator
+import unittest
+
+from materiales.maquinas.bytecode import (
+    BINARIO_LITERAL,
+    BINARIOS,
+    CON_ARGUMENTO,
+    CONTROL,
+    PILA,
+    TABLA_ESCALAR,
+    UNARIOS,
+    Codigo,
+    Programa,
+    construir_tabla,
+    ensamblar,
+)
+from materiales.maquinas.pila import MaquinaDePila
+
+
+class TestEnsamblador(unittest.TestCase):
+    """Cobertura del ensamblador y de la representación de programas."""
+
+    def test_ensamblar(self) -> None:
+        """Las literales se apilan y los mnemónicos son operadores."""
+        programa = ensamblar("3 4 suma 2.5 multiplicacion True negacion")
+        self.assertEqual(
+            programa.codigos,
+            (
+                Codigo.APILAR,
+                Codigo.APILAR,
+                Codigo.SUMA,
+                Codigo.APILAR,
+                Codigo.MULTIPLICACION,
+                Codigo.APILAR,
+                Codigo.NEGACION,
+            ),
+        )
+        self.assertEqual(programa.argumentos, (3, 4, None, 2.5, None, True, None))
+        self.assertEqual(len(programa), 7)
+
+    def test_str_ida_y_vuelta(self) -> None:
+        """str(programa) se vuelve a ensamblar en el mismo programa."""
+        texto = "1 2 corrimiento_izquierda 'a' 'b' igual_que"
+        programa = ensamblar(texto)
+        self.assertEqual(str(programa), "1 2 corrimiento_izquierda 'a' 'b' igual_que")
+        self.assertEqual(ensamblar(str(programa)), programa)
+
+    def test_argumentos(self) -> None:
+        """Las instrucciones con argumento se escriben mnemonico:argumento."""
+        programa = ensamblar("cargar:x 1 suma guardar:y")
+        self.assertEqual(programa.argumentos, ("x", 1, None, "y"))
+        self.assertEqual(str(programa), "cargar:x 1 suma guardar:y")
+
+    def test_errores(self) -> None:
+        """Palabras desconocidas y argumentos mal puestos son errores."""
+        for texto in ("3 4 sumar", "apilar", "cargar", "suma:x"):
+            with self.subTest(texto):
+                with self.assertRaises(SyntaxError):
+                    ensamblar(texto)
+        with self.assertRaises(ValueError):
+            Programa((Codigo.SUMA,), ())
+
+    def test_tabla_completa(self) -> None:
+        """Cada operador tiene una función y un método en la máquina."""
+        operadores = set(UNARIOS) | set(BINARIOS)
+        self.assertEqual(operadores, set(Codigo) - CON_ARGUMENTO - CONTROL - PILA)
+        for codigo in operadores:
+            self.assertTrue(hasattr(MaquinaDePila, codigo.mnemonico))
+            self.assertIn(TABLA_ESCALAR[codigo][0], (1, 2))
+
+    def test_planear_cache(self) -> None:
+        """El plan se calcula una vez por tabla."""
+        programa = ensamblar("1 invertir_signo")
+        plan = programa.planear(TABLA_ESCALAR)
+        self.assertIs(programa.planear(TABLA_ESCALAR), plan)
+        self.assertEqual(plan[0], (0, 1))
+
+    def test_planear_tablas_temporales(self) -> None:
+        """Una tabla nueva no recibe el plan de otra que ya no existe."""
+        programa = ensamblar("1 invertir_signo")
+        for constante in range(20):
+            unarios = dict(UNARIOS)
+            unarios[Codigo.INVERTIR_SIGNO] = functools.partial(max, constante)
+            tabla = construir_tabla(unarios, BINARIOS)
+            funcion = programa.planear(tabla)[1][1]
+            self.assertEqual(funcion(0), constante)
+            del tabla
+
+    def test_superinstrucciones(self) -> None:
+        """Una literal seguida de un operador binario se funde en el plan."""
+        plan = ensamblar("cargar:x 2 suma 3 invertir_signo").planear(TABLA_ESCALAR)
+        self.assertEqual(len(plan), 4)
+        self.assertEqual(plan[1], (BINARIO_LITERAL, (operator.add, 2)))
+        maq = MaquinaDePila().ejecutar("cargar:x 2 suma 3 resta duplicar", {"x": 5})
+        self.assertEqual(maq.pila, [4, 4])
+
+    def test_alcance_de_pila(self) -> None:
+        """El alcance es la menor y la mayor profundidad relativa."""
+        self.assertEqual(ensamblar("1 2 suma 3 suma").alcance_de_pila(), (0, 2))
+        self.assertEqual(ensamblar("suma 1 guardar:x").alcance_de_pila(), (-2, 0))
+        self.assertEqual(ensamblar("").alcance_de_pila(), (0, 0))
+        self.assertEqual(ensamblar("1 duplicar duplicar").alcance_de_pila(), (0, 3))
+
+
+class TestEjecutar(unittest.TestCase):
+    """El ciclo de ejecución coincide con los métodos de la máquina."""
+
+    def test_igual_que_metodos(self) -> None:
+        """Cada operador da el mismo resultado que su método."""
+        for codigo in set(UNARIOS) | set(BINARIOS):
+            with self.subTest(codigo.mnemonico):
+                argumentos = "6 3" if codigo in BINARIOS else "6"
+                maq_1 = MaquinaDePila().ejecutar(f"{argumentos} {codigo.mnemonico}")
+                maq_2 = MaquinaDePila().ejecutar(argumentos)
+                getattr(maq_2, codigo.mnemonico)()
+                self.assertEqual(maq_1.pila, maq_2.pila)
+
+    def test_programa_compuesto(self) -> None:
+        """Un programa de varias operaciones deja el resultado en la cima."""
+        maq = MaquinaDePila().apilar("fondo")
+        maq.ejecutar(ensamblar("3 4 suma 2 multiplicacion"))
+        self.assertEqual(maq.pila, ["fondo", 14])
+
+    def test_traduccion(self) -> None:
+        """Un programa lineal se traduce a partir de su segunda ejecución."""
+        programa = ensamblar("3 4 suma")
+        self.assertIsNone(programa.traduccion(TABLA_ESCALAR))
+        traduccion = programa.traduccion(TABLA_ESCALAR)
+        self.assertIsNotNone(traduccion)
+        self.assertIs(programa.traduccion(TABLA_ESCALAR), traduccion)
+        tabla = construir_tabla(UNARIOS, {Codigo.SUMA: operator.mul})
+        self.assertIsNone(programa.traduccion(tabla))
+        self.assertEqual(MaquinaDePila().ejecutar(programa).pila, [7])
+        ciclo = ensamblar("inicio: saltar:inicio")
+        for _ in range(3):
+            self.assertIsNone(ciclo.traduccion(TABLA_ESCALAR))
+
+    def test_traduccion_igual_que_plan(self) -> None:
+        """La traducción deja la misma pila y variables que el plan."""
+
+        class Maquina(MaquinaDePila):
+            """Máquina cuya suma no es conmutativa ni es un operador."""
+
+            tabla_operadores = construir_tabla(
+                UNARIOS, {**BINARIOS, Codigo.SUMA: lambda a, b: 10 * a + b}
+            )
+
+        textos = [
+            f"{'6 3' if codigo in BINARIOS else '6'} {codigo.mnemonico}"
+            for codigo in set(UNARIOS) | set(BINARIOS)
+        ] + [
+            "",
+            "1 2 3 rotar intercambiar descartar duplicar copiar_segundo",
+            "cargar:x 2 multiplicacion duplicar guardar:x cargar:x suma",
+            "suma 5 intercambiar resta guardar:y",
+            "descartar descartar",
+            "rotar 1 suma",
+        ]
+        for clase in (MaquinaDePila, Maquina):
+            for texto in textos:
+                with self.subTest(clase=clase.__name__, texto=texto):
+                    programa = ensamblar(texto)
+                    resultados = []
+                    for _ in range(2):
+                        maq = clase().apilar(10).apilar(20).apilar(30)
+                        maq.ejecutar(programa, {"x": 4})
+                        resultados.append((maq.pila, maq.variables))
+                    self.assertIsNotNone(programa.traduccion(clase.tabla_operadores))
+                    self.assertEqual(resultados[0], resultados[1])
+
+    def test_traduccion_sin_elementos(self) -> None:
+        """La traducción no cambia nada si faltan elementos en la pila."""
+        programa = ensamblar("suma suma")
+        for _ in range(2):
+            maq = MaquinaDePila().apilar(1).apilar(2)
+            with self.assertRaises(IndexError):
+                maq.ejecutar(programa, {"x": 1})
+            self.assertEqual((maq.pila, maq.variables), ([1, 2], {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""Pruebas unitarias para materiales.maquinas.compilador."""
+
+import ast
+import itertools
+import unittest
+
+from materiales.maquinas.bytecode import Codigo
+from materiales.maquinas.compilador import CompiladorPila, compilar, evaluar_muchos
+from materiales.maquinas.pila import MaquinaDePila
+
+EXPRESIONES = [
+    "x + y * 2",
+    "-(x - y) ** 2 // 3",
+    "(x + 1) * (x + 1) - (x + 1)",
+    "x << 2 | y & 7 ^ ~x",
+    "1 < x <= y + 1 < 9",
+    "not (x > y) or x == y and +x != 0",
+    "x % 3 == y % 3",
+]
+
+
+class TestCompilador(unittest.TestCase):
+    """El programa compilado evalúa igual que Python."""
+
+    def test_igual_que_eval(self) -> None:
+        """Cada expresión coincide con eval para varias asignaciones."""
+        valores = range(-3, 4)
+        for texto, (x, y) in itertools.product(
+            EXPRESIONES, itertools.product(valores, repeat=2)
+        ):
+            with self.subTest(f"{texto} con x={x}, y={y}"):
+                programa = compilar(ast.parse(texto, mode="eval"))
+                maq = MaquinaDePila().ejecutar(programa, {"x": x, "y": y})
+                self.assertEqual(
+                    maq.desapilar(),
+                    eval(texto, {}, {"x": x, "y": y}),  # pylint: disable=eval-used
+                )
+                self.assertTrue(maq.esta_vacia())
+
+    def test_plegado_de_constantes(self) -> None:
+        """Las subexpresiones constantes se calculan al compilar."""
+        programa = compilar("x * (2 + 3 * 4) - -(1 << 3)")
+        self.assertEqual(str(programa), "cargar:x 14 multiplicacion -8 resta")
+        sin_plegar = CompiladorPila(plegar_constantes=False).compilar("2 + 3")
+        self.assertEqual(str(sin_plegar), "2 3 suma")
+
+    def test_plegado_no_oculta_errores(self) -> None:
+        """Una división entre cero constante falla al ejecutar, no al compilar."""
+        programa = compilar("1 / 0")
+        with self.assertRaises(ZeroDivisionError):
+            MaquinaDePila().ejecutar(programa)
+
+    def test_plegado_acotado(self) -> None:
+        """Los resultados plegados enormes se dejan para la ejecución."""
+        self.assertEqual(str(compilar('"ab" * 3')), "'ababab'")
+        repeticion = compilar('"ab" * 1000000000')
+        self.assertEqual(str(repeticion), "'ab' 1000000000 multiplicacion")
+        potencias = compilar("((((2 ** 64) ** 64) ** 64) ** 64) ** 64")
+        # Sólo se pliega 2 ** 64: (2 ** 64) ** 64 tiene 4097 bits.
+        self.assertEqual([codigo for codigo, _ in potencias].count(Codigo.POTENCIA), 4)
+
+    def test_subexpresiones_comunes(self) -> None:
+        """Una subexpresión repetida se calcula una sola vez."""
+        texto = "(x * y + 1) / (x * y + 1) + x * y"
+        programa = compilar(texto)
+        self.assertEqual(programa.codigos.count(Codigo.MULTIPLICACION), 1)
+        self.assertEqual(programa.codigos.count(Codigo.SUMA), 2)
+        sin_cse = CompiladorPila(eliminar_comunes=False).compilar(texto)
+        self.assertEqual(sin_cse.codigos.count(Codigo.MULTIPLICACION), 3)
+        self.assertNotIn(Codigo.GUARDAR, sin_cse.codigos)
+
+    def test_no_modifica_el_arbol(self) -> None:
+        """El plegado trabaja sobre una copia del árbol."""
+        arbol = ast.parse("1 + 2", mode="eval")
+        antes = ast.dump(arbol)
+        compilar(arbol)
+        self.assertEqual(ast.dump(arbol), antes)
+
+    def test_no_admitidas(self) -> None:
+        """Las construcciones sin instrucción equivalente son errores."""
+        for texto in ("f(x)", "x if y else 1", "x in y", "x @ y"):
+            with self.subTest(texto):
+                with self.assertRaises(ValueError):
+                    compilar(texto)
+
+    def test_evaluar_muchos(self) -> None:
+        """Se evalúa la misma expresión para muchas filas."""
+        filas = [{"x": x, "y": 2 * x} for x in range(100)]
+        resultados = evaluar_muchos("(x + 1) * (x + 1) - y", filas)
+        self.assertEqual(resultados, [(x + 1) ** 2 - 2 * x for x in range(100)])
+        programa = compilar("x + y")
+        self.assertEqual(evaluar_muchos(programa, filas[:3]), [0, 3, 6])
+
+
+if __name__ == "__main__":
+    unittest.main()
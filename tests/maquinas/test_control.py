@@ -0,0 +1,209 @@
+"""Pruebas del control de flujo, las locales y las llamadas de la máquina de pila."""
+
+import math
+import unittest
+
+from materiales.maquinas.bytecode import (
+    LITERAL,
+    SALTO_SI_FALSO,
+    TABLA_ESCALAR,
+    Codigo,
+    Programa,
+    ensamblar,
+)
+from materiales.maquinas.optimizador import optimizar
+from materiales.maquinas.pila import MaquinaDePila
+from materiales.maquinas.pilafija import MaquinaDePilaFija
+from materiales.maquinas.verificador import ErrorDeVerificacion, verificar
+
+FACTORIAL_ITERATIVO = """
+    cargar:n guardar_local:0 1 guardar_local:1
+    bucle: cargar_local:0 1 menor_o_igual_que saltar_si_verdadero:fin
+           cargar_local:1 cargar_local:0 multiplicacion guardar_local:1
+           cargar_local:0 1 resta guardar_local:0 saltar:bucle
+    fin:   cargar_local:1
+"""
+
+FACTORIAL_RECURSIVO = """
+          cargar:n llamar:factorial/1 regresar
+    factorial: cargar_local:0 1 menor_o_igual_que saltar_si_falso:caso
+          1 regresar
+    caso: cargar_local:0 cargar_local:0 1 resta llamar:factorial/1
+          multiplicacion regresar
+"""
+
+# Repite n veces a, b = b, a + b y deja a en la pila.
+FIBONACCI = """
+    0 1 cargar:n
+    bucle: duplicar saltar_si_falso:fin 1 resta
+           rotar rotar intercambiar copiar_segundo suma rotar saltar:bucle
+    fin:   descartar descartar
+"""
+
+
+class TestEnsamblador(unittest.TestCase):
+    """Etiquetas y argumentos de las instrucciones de control."""
+
+    def test_etiquetas(self) -> None:
+        """Las etiquetas se traducen a posiciones."""
+        programa = ensamblar("inicio: 1 saltar:fin 2 fin: llamar:inicio/0")
+        self.assertEqual(programa.argumentos, (1, 3, 2, (0, 0)))
+        self.assertEqual(str(programa), "1 saltar:3 2 llamar:0/0")
+        self.assertEqual(ensamblar(str(programa)), programa)
+        self.assertEqual(ensamblar("cargar_local:2").argumentos, (2,))
+
+    def test_errores(self) -> None:
+        """Etiquetas desconocidas o repetidas y argumentos inválidos."""
+        for texto in (
+            "saltar:nada",
+            "a: a: 1",
+            "cargar_local:x",
+            "llamar:f/x f: 1 regresar",
+            "saltar:",
+            "regresar:1",
+        ):
+            with self.subTest(texto):
+                with self.assertRaises(SyntaxError):
+                    ensamblar(texto)
+        with self.assertRaises(ValueError):
+            ensamblar("saltar:5")
+        with self.assertRaises(ValueError):
+            Programa((Codigo.LLAMAR,), (0,))
+
+    def test_planear(self) -> None:
+        """Los destinos del plan cuentan las superinstrucciones."""
+        programa = ensamblar("1 2 suma saltar_si_falso:fin 3 fin: 4 suma")
+        plan = programa.planear(TABLA_ESCALAR)
+        self.assertEqual(len(plan), 5)
+        self.assertEqual(plan[2], (SALTO_SI_FALSO, 4))
+        # Un salto llega a `suma`, así que la literal 4 no se funde.
+        programa = ensamblar("1 saltar:fin 3 4 fin: suma")
+        self.assertEqual(programa.planear(TABLA_ESCALAR)[3][0], LITERAL)
+
+
+class TestEjecutar(unittest.TestCase):
+    """Los bucles y las llamadas corren dentro del ciclo de ejecución."""
+
+    def test_factorial(self) -> None:
+        """El factorial iterativo y el recursivo coinciden con math."""
+        iterativo = ensamblar(FACTORIAL_ITERATIVO)
+        recursivo = ensamblar(FACTORIAL_RECURSIVO)
+        for n in range(10):
+            with self.subTest(n=n):
+                esperado = [math.factorial(n)]
+                maq = MaquinaDePila().ejecutar(iterativo, {"n": n})
+                self.assertEqual(maq.pila, esperado)
+                maq = MaquinaDePila().ejecutar(recursivo, {"n": n})
+                self.assertEqual(maq.pila, esperado)
+
+    def test_fibonacci(self) -> None:
+        """Un bucle que sólo usa la pila."""
+        programa = ensamblar(FIBONACCI)
+        fib = [0, 1, 1, 2, 3, 5, 8, 13, 21, 34, 55]
+        for n, esperado in enumerate(fib):
+            with self.subTest(n=n):
+                maq = MaquinaDePila().ejecutar(programa, {"n": n})
+                self.assertEqual(maq.pila, [esperado])
+
+    def test_manipulacion_de_pila(self) -> None:
+        """Los métodos y el código de bytes reordenan igual la pila."""
+        for mnemonico, esperado in (
+            ("duplicar", [1, 2, 3, 3]),
+            ("descartar", [1, 2]),
+            ("intercambiar", [1, 3, 2]),
+            ("copiar_segundo", [1, 2, 3, 2]),
+            ("rotar", [2, 3, 1]),
+        ):
+            with self.subTest(mnemonico):
+                maq = MaquinaDePila().ejecutar(f"1 2 3 {mnemonico}")
+                self.assertEqual(maq.pila, esperado)
+                maq = MaquinaDePila().ejecutar("1 2 3")
+                getattr(maq, mnemonico)()
+                self.assertEqual(maq.pila, esperado)
+                fija = MaquinaDePilaFija(4).ejecutar(f"1 2 3 {mnemonico}")
+                self.assertEqual(list(fija.pila), esperado)
+
+    def test_regresar_termina(self) -> None:
+        """REGRESAR en el programa principal termina la ejecución."""
+        maq = MaquinaDePila().ejecutar("1 regresar 2")
+        self.assertEqual(maq.pila, [1])
+
+    def test_limite_de_llamadas(self) -> None:
+        """La recursión infinita se detiene en el límite de llamadas."""
+        maq = MaquinaDePila()
+        maq.limite_de_llamadas = 50
+        with self.assertRaises(RecursionError):
+            maq.ejecutar("f: llamar:f/0 regresar")
+
+    def test_pila_fija_lineal(self) -> None:
+        """La pila fija rechaza los programas con control de flujo."""
+        with self.assertRaises(ValueError):
+            MaquinaDePilaFija(4).ejecutar(FACTORIAL_ITERATIVO, {"n": 3})
+
+
+class TestAnalisis(unittest.TestCase):
+    """Profundidades y tipos sobre el grafo de flujo."""
+
+    def test_profundidades(self) -> None:
+        """Cada instrucción alcanzable tiene una profundidad."""
+        programa = ensamblar("1 saltar_si_falso:fin 2 regresar 9 fin: 3")
+        self.assertEqual(programa.profundidades(), (0, 1, 0, 1, None, 0))
+        self.assertEqual(programa.alcance_de_pila(), (0, 1))
+        recursivo = ensamblar(FACTORIAL_RECURSIVO)
+        self.assertEqual(recursivo.alcance_de_pila(), (0, 1))
+        self.assertEqual(recursivo.numero_de_locales(), 1)
+
+    def test_mal_formados(self) -> None:
+        """Programas sin profundidad bien definida se rechazan antes."""
+        for texto in (
+            "cargar:x saltar_si_falso:fin 1 fin: 2",
+            "bucle: 1 saltar:bucle",
+            "1 llamar:f/1 regresar f: 1 2 regresar",
+            "llamar:f/0 regresar f: suma regresar",
+        ):
+            with self.subTest(texto):
+                with self.assertRaises(ErrorDeVerificacion):
+                    ensamblar(texto).profundidades()
+                with self.assertRaises(ValueError):
+                    MaquinaDePila().apilar(0).apilar(0).ejecutar(texto, {"x": 1})
+                with self.assertRaises(ErrorDeVerificacion):
+                    verificar(texto)
+
+    def test_tipos(self) -> None:
+        """Los tipos de caminos distintos se combinan."""
+        resultado = verificar(FACTORIAL_ITERATIVO, variables={"n": int})
+        self.assertEqual(resultado.tipos, (int,))
+        resultado = verificar("cargar:c saltar_si_falso:b 1 saltar:fin b: 'x' fin:")
+        self.assertEqual(resultado.tipos, (object,))
+        resultado = verificar(FACTORIAL_RECURSIVO, variables={"n": int})
+        self.assertEqual(resultado.tipos, (object,))
+
+    def test_locales_sin_asignar(self) -> None:
+        """Cargar una local que no se asignó en todos los caminos falla."""
+        with self.assertRaises(ErrorDeVerificacion):
+            verificar("cargar_local:0")
+        with self.assertRaises(ErrorDeVerificacion):
+            verificar(
+                "cargar:c saltar_si_falso:fin 1 guardar_local:0 fin: cargar_local:0"
+            )
+        with self.assertRaises(ErrorDeVerificacion) as contexto:
+            verificar("1 llamar:f/0 llamar:f/1 regresar f: 1 regresar")
+        self.assertEqual(contexto.exception.posicion, 2)
+
+    def test_optimizar(self) -> None:
+        """El optimizador respeta los destinos de los saltos."""
+        programa = ensamblar(
+            "2 2 suma saltar:salto 9 salto: invertir_signo invertir_signo "
+            + FACTORIAL_ITERATIVO
+        )
+        optimizado = optimizar(programa).programa
+        self.assertLess(len(optimizado), len(programa))
+        for n in range(6):
+            with self.subTest(n=n):
+                esperado = MaquinaDePila().ejecutar(programa, {"n": n}).pila
+                obtenido = MaquinaDePila().ejecutar(optimizado, {"n": n}).pila
+                self.assertEqual(obtenido, esperado)
+
+
+if __name__ == "__main__":
+    unittest.main()
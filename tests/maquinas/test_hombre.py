@@ -1,5 +1,6 @@
 """Pruebas para la clase ComputadoraHombrePequenno"""
 
+import array
 import itertools
 import unittest
 from collections import deque
@@ -71,14 +72,14 @@ class TestCHP(unittest.TestCase):
         with self.subTest("Overflow positivo"):
             computadora = ComputadoraHombrePequenno()
             computadora.acumulador = 999
-            computadora.memoria[0:2] = [101, 1]
+            computadora.cargar_programa([101, 1])
             with self.assertRaises(OverflowError):
                 computadora.transicion()
 
         with self.subTest("Overflow negativo"):
             computadora = ComputadoraHombrePequenno()
             computadora.acumulador = -999
-            computadora.memoria[0:2] = [101, -1]
+            computadora.cargar_programa([101, -1])
             with self.assertRaises(OverflowError):
                 computadora.transicion()
 
@@ -98,14 +99,14 @@ class TestCHP(unittest.TestCase):
         with self.subTest("Overflow positivo"):
             computadora = ComputadoraHombrePequenno()
             computadora.acumulador = 999
-            computadora.memoria[0:2] = [201, -1]
+            computadora.cargar_programa([201, -1])
             with self.assertRaises(OverflowError):
                 computadora.transicion()
 
         with self.subTest("Overflow negativo"):
             computadora = ComputadoraHombrePequenno()
             computadora.acumulador = -999
-            computadora.memoria[0:2] = [201, 1]
+            computadora.cargar_programa([201, 1])
             with self.assertRaises(OverflowError):
                 computadora.transicion()
 
@@ -189,3 +190,53 @@ class TestCHP(unittest.TestCase):
                 computadora.memoria[0] = 902
                 computadora.transicion()
                 self.assertEqual(list(computadora.salida), [valor])
+
+
+class TestCHPConfigurable(unittest.TestCase):
+    """Pruebas de memoria y palabras de tamaño configurable."""
+
+    def test_memoria_arreglo(self) -> None:
+        """La memoria es un arreglo tipado; cargar_programa acepta listas."""
+        computadora = ComputadoraHombrePequenno(
+            tamanno_memoria=1000, digitos=4, digitos_direccion=3
+        )
+        self.assertIs(type(computadora.memoria), array.array)
+        memoria = computadora.memoria
+        assert isinstance(memoria, array.array)
+        self.assertEqual(memoria.typecode, "i")
+        self.assertEqual(len(computadora.memoria), 1000)
+        computadora.cargar_programa([1, 2])
+        self.assertEqual(list(computadora.memoria[:3]), [1, 2, 0])
+
+    def test_programa_grande(self) -> None:
+        """Las direcciones de tres dígitos llegan más allá de la celda 99."""
+        programa = [0] * 600
+        programa[:4] = [9001, 3500, 5500, 9002]
+        computadora = ComputadoraHombrePequenno(
+            programa=programa,
+            entrada=[9999],
+            tamanno_memoria=1000,
+            digitos=4,
+            digitos_direccion=3,
+        )
+        computadora.ejecutar()
+        self.assertEqual(computadora.memoria[500], 9999)
+        self.assertEqual(list(computadora.salida), [9999])
+        self.assertEqual(computadora.estado, Estado.DETENIDA)
+
+    def test_limites_de_palabra(self) -> None:
+        """El desbordamiento depende del número de dígitos."""
+        computadora = ComputadoraHombrePequenno(digitos=4)
+        computadora.acumulador = 9999
+        computadora.cargar_programa([101, 1])
+        with self.assertRaises(OverflowError):
+            computadora.transicion()
+
+    def test_configuracion_invalida(self) -> None:
+        """Se rechazan configuraciones inconsistentes."""
+        with self.assertRaises(ValueError):
+            ComputadoraHombrePequenno(tamanno_memoria=101)
+        with self.assertRaises(ValueError):
+            ComputadoraHombrePequenno(digitos=3, digitos_direccion=3)
+        with self.assertRaises(ValueError):
+            ComputadoraHombrePequenno(digitos=10, digitos_direccion=3)
@@ -0,0 +1,75 @@
+"""Pruebas de los eventos observables de materiales.maquinas.hombre."""
+
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from materiales.maquinas.hombre import (
+    ComputadoraHombrePequenno,
+    Evento,
+    avisar_detencion,
+)
+
+
+class TestEventos(unittest.TestCase):
+    """Cobertura de suscribir, desuscribir y notificaciones."""
+
+    def setUp(self) -> None:
+        self.eventos: list[tuple[object, ...]] = []
+        # Lee un número, lo guarda en la posición 10 y lo escribe.
+        self.c = ComputadoraHombrePequenno(programa=[901, 310, 902], entrada=[7])
+
+    def registrar(self, evento: Evento) -> None:
+        """Suscribe un observador que anota el evento y sus datos."""
+        self.c.suscribir(
+            evento, lambda _, *datos: self.eventos.append((evento, *datos))
+        )
+
+    def test_sin_impresion(self) -> None:
+        """detener no imprime nada si no hay observadores."""
+        salida = io.StringIO()
+        with redirect_stdout(salida):
+            self.c.ejecutar()
+        self.assertEqual(salida.getvalue(), "")
+
+    def test_avisar_detencion(self) -> None:
+        """El observador por defecto conserva el aviso interactivo."""
+        self.c.suscribir(Evento.DETENER, avisar_detencion)
+        salida = io.StringIO()
+        with redirect_stdout(salida):
+            self.c.ejecutar()
+        self.assertEqual(salida.getvalue(), "La computadora se detuvo.\n")
+
+    def test_notificaciones(self) -> None:
+        """Cada evento llega con sus datos y en orden."""
+        for evento in (Evento.ESCRITURA, Evento.SALIDA, Evento.DETENER):
+            self.registrar(evento)
+        self.c.ejecutar()
+        self.assertEqual(
+            self.eventos,
+            [(Evento.ESCRITURA, 10, 7), (Evento.SALIDA, 7), (Evento.DETENER,)],
+        )
+
+    def test_paso(self) -> None:
+        """El evento PASO ocurre una vez por ciclo de instrucción."""
+        self.registrar(Evento.PASO)
+        self.c.transicion().transicion()
+        self.assertEqual(len(self.eventos), 2)
+
+    def test_detener_con_transicion(self) -> None:
+        """Un HLT ejecutado con transicion notifica DETENER una sola vez."""
+        self.registrar(Evento.DETENER)
+        self.c.transicion().transicion().transicion().transicion()
+        self.assertEqual(self.eventos, [(Evento.DETENER,)])
+
+    def test_desuscribir(self) -> None:
+        """Un observador desuscrito ya no recibe eventos."""
+        self.c.suscribir(Evento.DETENER, avisar_detencion)
+        self.c.desuscribir(Evento.DETENER, avisar_detencion)
+        self.assertFalse(self.c._observadores)  # pylint: disable=protected-access
+        with self.assertRaises(ValueError):
+            self.c.desuscribir(Evento.DETENER, avisar_detencion)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+"""Pruebas de los puertos de entrada y salida de materiales.maquinas.hombre."""
+
+import asyncio
+import unittest
+import warnings
+from unittest import mock
+
+from materiales.maquinas.hombre import ComputadoraHombrePequenno, Estado
+
+# Lee pares de números y escribe su suma, indefinidamente.
+SUMAR_PARES = [901, 310, 901, 110, 902, 600]
+
+
+class TestPuertos(unittest.TestCase):
+    """Cobertura de conectar_entrada, conectar_salida y suspensión."""
+
+    def test_suspender_sin_entrada(self) -> None:
+        """La computadora se suspende cuando la entrada se agota."""
+        c = ComputadoraHombrePequenno(programa=SUMAR_PARES, entrada=[1, 2, 3])
+        c.ejecutar()
+        self.assertEqual(c.estado, Estado.ESPERANDO)
+        self.assertEqual(list(c.salida), [3])
+        self.assertEqual(c.contador, 2)
+        c.entrada.append(4)
+        c.ejecutar()
+        self.assertEqual(list(c.salida), [3, 7])
+
+    def test_fuente_iterador(self) -> None:
+        """INP toma valores de la fuente cuando la entrada está vacía."""
+        c = ComputadoraHombrePequenno(programa=SUMAR_PARES, entrada=[10])
+        c.conectar_entrada(iter([20, 1, 2]))
+        c.ejecutar()
+        self.assertEqual(list(c.salida), [30, 3])
+        self.assertEqual(c.estado, Estado.ESPERANDO)
+
+    def test_sumidero(self) -> None:
+        """OUT envía los valores al sumidero sin guardarlos."""
+        recibidos: list[int] = []
+        c = ComputadoraHombrePequenno(programa=SUMAR_PARES, entrada=[1, 1, 2, 2])
+        c.conectar_salida(recibidos.append)
+        c.ejecutar()
+        self.assertEqual(recibidos, [2, 4])
+        self.assertEqual(list(c.salida), [])
+
+    def test_max_pasos(self) -> None:
+        """ejecutar se detiene tras max_pasos ciclos."""
+        c = ComputadoraHombrePequenno(programa=SUMAR_PARES, entrada=[1, 2])
+        c.ejecutar(max_pasos=2)
+        self.assertEqual(c.contador, 2)
+        self.assertEqual(c.estado, Estado.ACTIVADA)
+
+
+class TestEjecutarAsync(unittest.IsolatedAsyncioTestCase):
+    """Cobertura de ejecutar_async."""
+
+    async def test_colas(self) -> None:
+        """La computadora espera entradas de una cola y escribe en otra."""
+        entrada: asyncio.Queue[int] = asyncio.Queue()
+        salida: asyncio.Queue[int] = asyncio.Queue()
+        c = ComputadoraHombrePequenno(programa=SUMAR_PARES)
+        tarea = asyncio.create_task(c.ejecutar_async(entrada, salida))
+        for valor in (5, 6):
+            await entrada.put(valor)
+        self.assertEqual(await salida.get(), 11)
+        tarea.cancel()
+
+    async def test_sumidero_temporal(self) -> None:
+        """La salida vuelve al sumidero anterior al terminar o cancelar."""
+        recibidos: list[int] = []
+        c = ComputadoraHombrePequenno(programa=SUMAR_PARES, entrada=[1, 2])
+        c.conectar_salida(recibidos.append)
+        salida: asyncio.Queue[int] = asyncio.Queue()
+        await c.ejecutar_async(salida=salida)
+        self.assertEqual(salida.get_nowait(), 3)
+        c.cargar_entrada([3, 4]).ejecutar()
+        self.assertEqual(recibidos, [7])
+        entrada: asyncio.Queue[int] = asyncio.Queue()
+        tarea = asyncio.create_task(c.ejecutar_async(entrada, salida))
+        await asyncio.sleep(0)
+        tarea.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await tarea
+        c.cargar_entrada([5, 6]).ejecutar()
+        self.assertEqual(recibidos, [7, 11])
+
+    async def test_cola_acotada(self) -> None:
+        """OUT espera a que la cola tenga lugar y no pierde valores."""
+        salida: asyncio.Queue[int] = asyncio.Queue(maxsize=1)
+        c = ComputadoraHombrePequenno(programa=SUMAR_PARES, entrada=[1, 2, 3, 4])
+        tarea = asyncio.create_task(c.ejecutar_async(salida=salida))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        # La segunda suma espera en OUT, que se repite al reanudar.
+        self.assertEqual(c.contador, 4)
+        tarea.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await tarea
+        self.assertEqual(salida.get_nowait(), 3)
+        await c.ejecutar_async(salida=salida)
+        self.assertEqual(salida.get_nowait(), 7)
+        self.assertEqual(c.estado, Estado.ESPERANDO)
+
+    async def test_sumidero_asincrono(self) -> None:
+        """Se espera a un sumidero definido con async def."""
+        recibidos: list[int] = []
+
+        async def sumidero(valor: int) -> None:
+            await asyncio.sleep(0)
+            recibidos.append(valor)
+
+        c = ComputadoraHombrePequenno(programa=SUMAR_PARES, entrada=[1, 2, 3, 4])
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", RuntimeWarning)
+            await c.ejecutar_async(salida=sumidero)
+        self.assertEqual(recibidos, [3, 7])
+        self.assertEqual(list(c.salida), [])
+
+    async def test_verificar_una_vez(self) -> None:
+        """El estado se verifica al entrar y no en cada turno."""
+        # pylint: disable=protected-access
+        c = ComputadoraHombrePequenno(programa=[600])  # Ciclo infinito.
+        with mock.patch.object(
+            c, "_verificar_estado", wraps=c._verificar_estado
+        ) as verificar:
+            tarea = asyncio.create_task(c.ejecutar_async(pasos_por_turno=1))
+            for _ in range(10):
+                await asyncio.sleep(0)
+            tarea.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await tarea
+        self.assertEqual(verificar.call_count, 1)
+        self.assertEqual(c.estado, Estado.ACTIVADA)
+
+    async def test_concurrentes(self) -> None:
+        """Varias computadoras se ejecutan en el mismo ciclo de eventos."""
+        programa = [901, 902, 0]
+        computadoras = [
+            ComputadoraHombrePequenno(programa=programa, entrada=[i]) for i in range(5)
+        ]
+        await asyncio.gather(*(c.ejecutar_async() for c in computadoras))
+        for i, c in enumerate(computadoras):
+            self.assertEqual(c.estado, Estado.DETENIDA)
+            self.assertEqual(list(c.salida), [i])
+
+
+if __name__ == "__main__":
+    unittest.main()
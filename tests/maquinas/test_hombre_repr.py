@@ -26,6 +26,25 @@ class TestHombreRepresentaciones(unittest.TestCase):
         self.assertIn("<table>", html)
         self.assertIn("<code>", html)
 
+    def test_paginacion(self) -> None:
+        """Las memorias grandes se muestran por páginas de 100 celdas."""
+        c = ComputadoraHombrePequenno(
+            tamanno_memoria=1000, digitos=4, digitos_direccion=3
+        )
+        c.contador = 250
+        self.assertEqual(c.n_paginas, 10)
+        s = str(c)
+        self.assertIn("Página 3 de 10", s)
+        self.assertIn("25X", s)
+        self.assertNotIn("30X", s)
+        html = c.a_html(pagina=9)
+        self.assertIn("Página 10 de 10", html)
+        self.assertIn("99X", html)
+        self.assertEqual(html.count("<tr>"), 11)
+        with self.assertRaises(IndexError):
+            c.a_texto(pagina=10)
+        self.assertNotIn("Página", str(ComputadoraHombrePequenno()))
+
     def test_verificaciones_estado(self) -> None:
         """Valida errores de estado para acumulador, contador, memoria y E/S."""
         c = ComputadoraHombrePequenno()
@@ -0,0 +1,113 @@
+"""Pruebas unitarias para materiales.maquinas.optimizador."""
+
+import itertools
+import unittest
+
+from materiales.maquinas.compilador import CompiladorPila
+from materiales.maquinas.optimizador import optimizar
+from materiales.maquinas.pila import MaquinaDePila
+
+
+class TestReglas(unittest.TestCase):
+    """Cada regla reescribe su patrón."""
+
+    def assertOptimiza(  # pylint: disable=invalid-name
+        self, texto: str, esperado: str, **tipos: type
+    ) -> None:
+        """Verifica que el programa se reescriba como se espera."""
+        resultado = optimizar(texto, variables=tipos or None)
+        self.assertEqual(str(resultado.programa), esperado)
+
+    def test_plegado(self) -> None:
+        """Las operaciones sobre literales se evalúan al optimizar."""
+        self.assertOptimiza("3 4 suma 2 multiplicacion", "14")
+        self.assertOptimiza("cargar:x 2 3 potencia suma", "cargar:x 8 suma")
+        self.assertOptimiza("5 invertir_signo", "-5")
+        self.assertOptimiza("1 0 division", "1 0 division")
+        self.assertOptimiza("2 100 potencia", "2 100 potencia")
+        self.assertOptimiza(
+            "'ab' 1000000000 multiplicacion", "'ab' 1000000000 multiplicacion"
+        )
+        self.assertOptimiza("2 64 potencia 64 potencia", f"{2**64} 64 potencia")
+
+    def test_pares_muertos(self) -> None:
+        """Los pares que se anulan desaparecen si el tipo lo permite."""
+        self.assertOptimiza(
+            "cargar:x invertir_signo invertir_signo", "cargar:x", x=float
+        )
+        self.assertOptimiza(
+            "cargar:x 1 menor_que negacion negacion", "cargar:x 1 menor_que"
+        )
+        self.assertOptimiza(
+            "cargar:x negacion_bit_a_bit negacion_bit_a_bit", "cargar:x", x=int
+        )
+        # Sin tipos, `not not x` es bool(x) y `--x` puede fallar.
+        self.assertOptimiza("cargar:x negacion negacion", "cargar:x negacion negacion")
+        self.assertOptimiza(
+            "cargar:x invertir_signo invertir_signo",
+            "cargar:x invertir_signo invertir_signo",
+        )
+
+    def test_reduccion_de_fuerza(self) -> None:
+        """Potencias de 2 y multiplicaciones por 2**k se abaratan."""
+        self.assertOptimiza("cargar:x 2 potencia", "cargar:x duplicar multiplicacion")
+        self.assertOptimiza("cargar:x 2.0 potencia", "cargar:x 2.0 potencia")
+        self.assertOptimiza(
+            "cargar:x 8 multiplicacion", "cargar:x 3 corrimiento_izquierda", x=int
+        )
+        self.assertOptimiza(
+            "cargar:x 8 multiplicacion", "cargar:x 8 multiplicacion", x=float
+        )
+        self.assertOptimiza(
+            "cargar:x 6 multiplicacion", "cargar:x 6 multiplicacion", x=int
+        )
+
+    def test_guardar_cargar(self) -> None:
+        """Guardar y cargar la misma variable se vuelve duplicar."""
+        self.assertOptimiza(
+            "1 guardar:t cargar:t cargar:t suma", "1 duplicar duplicar guardar:t suma"
+        )
+
+    def test_informe(self) -> None:
+        """Se informan las instrucciones antes y después."""
+        resultado = optimizar("1 2 suma cargar:x 2 potencia cargar:x 3 suma")
+        self.assertEqual(resultado.antes, 9)
+        self.assertEqual(resultado.despues, 7)
+        self.assertEqual(resultado.despachos, 6)
+        self.assertEqual(
+            resultado.reescrituras,
+            {"plegado de constantes": 1, "reducción de fuerza": 1},
+        )
+        self.assertEqual(str(resultado), "9 → 7 instrucciones (6 despachos)")
+
+
+class TestEquivalencia(unittest.TestCase):
+    """El programa optimizado calcula lo mismo."""
+
+    EXPRESIONES = [
+        "x ** 2 + y * 8 - -(-x)",
+        "(x * 4) ** 2 + (x * 4) // 3",
+        "not not (x < y) or ~~y == 3",
+        "x * 16 + 3 * 4 - 2 ** 3",
+    ]
+
+    def test_equivalencia(self) -> None:
+        """Con y sin optimizar, los resultados coinciden."""
+        sin_plegar = CompiladorPila(plegar_constantes=False)
+        optimizado = CompiladorPila(plegar_constantes=False, optimizar=True)
+        for texto in self.EXPRESIONES:
+            original = sin_plegar.compilar(texto)
+            programa = optimizado.compilar(texto)
+            tipado = optimizar(original, variables={"x": int, "y": int}).programa
+            self.assertLessEqual(len(programa), len(original))
+            self.assertLessEqual(len(tipado), len(programa))
+            for x, y in itertools.product(range(-3, 4), repeat=2):
+                with self.subTest(texto, x=x, y=y):
+                    esperado = MaquinaDePila().ejecutar(original, {"x": x, "y": y})
+                    for variante in (programa, tipado):
+                        obtenido = MaquinaDePila().ejecutar(variante, {"x": x, "y": y})
+                        self.assertEqual(obtenido.pila, esperado.pila)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -79,6 +79,20 @@ class TestMaquinaDePila(unittest.TestCase):
         self.m.vaciar().apilar(0b1000).apilar(3).corrimiento_derecha()
         self.assertEqual(self.m.ver_cima(), 0b0001)
 
+    def test_variables(self) -> None:
+        """cargar apila una variable y guardar la desapila en otra."""
+        self.m.variables["x"] = 5
+        self.m.cargar("x").apilar(2).multiplicacion().guardar("y")
+        self.assertEqual(self.m.variables["y"], 10)
+        self.assertTrue(self.m.esta_vacia())
+        with self.assertRaises(KeyError):
+            self.m.cargar("z")
+
+    def test_ejecutar(self) -> None:
+        """ejecutar corre un programa en notación posfija."""
+        self.m.ejecutar("cargar:x 1 suma guardar:x cargar:x", {"x": 41})
+        self.assertEqual(self.m.pila, [42])
+
     def test_repr_markdown(self) -> None:
         """_repr_markdown_ genera tabla con niveles."""
         # pylint: disable=protected-access
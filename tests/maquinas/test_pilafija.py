@@ -0,0 +1,110 @@
+"""Pruebas unitarias para materiales.maquinas.pilafija."""
+
+import unittest
+
+from materiales.maquinas.bytecode import ensamblar
+from materiales.maquinas.pila import MaquinaDePila
+from materiales.maquinas.pilafija import MaquinaDePilaFija, PilaFija
+from materiales.maquinas.verificador import ErrorDeVerificacion
+
+
+class TestPilaFija(unittest.TestCase):
+    """Cobertura de la pila de capacidad fija."""
+
+    def test_operaciones_de_lista(self) -> None:
+        """append, pop, índices negativos, len, iter y clear."""
+        pila = PilaFija(3)
+        pila.append(1)
+        pila.append(2)
+        self.assertEqual(pila[-1], 2)
+        pila[-1] = 5
+        self.assertEqual(list(pila), [1, 5])
+        self.assertEqual(list(reversed(pila)), [5, 1])
+        self.assertEqual(pila.pop(), 5)
+        self.assertEqual(len(pila), 1)
+        pila.clear()
+        self.assertEqual(len(pila), 0)
+        self.assertEqual(pila.capacidad, 3)
+
+    def test_limites(self) -> None:
+        """Desbordamiento, pila vacía e índices fuera de la pila."""
+        pila = PilaFija(1, "float64")
+        pila.append(0.5)
+        with self.assertRaises(OverflowError):
+            pila.append(1.5)
+        with self.assertRaises(IndexError):
+            _ = pila[1]
+        pila.pop()
+        with self.assertRaises(IndexError):
+            pila.pop()
+        with self.assertRaises(ValueError):
+            PilaFija(1, "complex")
+
+
+class TestMaquinaDePilaFija(unittest.TestCase):
+    """La máquina con pila fija da los mismos resultados."""
+
+    def test_metodos(self) -> None:
+        """Los métodos de MaquinaDePila funcionan sobre la pila fija."""
+        m = MaquinaDePilaFija(4)
+        m.apilar(3).apilar(4).suma().apilar(2).multiplicacion()
+        self.assertEqual(m.ver_cima(), 14)
+        self.assertIn("14", m._repr_markdown_())  # pylint: disable=protected-access
+
+    def test_ejecutar(self) -> None:
+        """ejecutar coincide con la máquina de lista."""
+        programa = ensamblar(
+            "cargar:x 3 suma 2 multiplicacion guardar:y cargar:y cargar:y "
+            "corrimiento_izquierda 5 modulo invertir_signo duplicar suma"
+        )
+        m = MaquinaDePilaFija.para_programa(programa)
+        self.assertEqual(m.pila.capacidad, 2)
+        m.ejecutar(programa, {"x": 4})
+        esperada = MaquinaDePila().ejecutar(programa, {"x": 4})
+        self.assertEqual(list(m.pila), esperada.pila)
+        self.assertEqual(m.variables["y"], 14)
+
+    def test_verificacion_previa(self) -> None:
+        """Los programas que no caben fallan antes de modificar la pila."""
+        m = MaquinaDePilaFija(2)
+        with self.assertRaises(IndexError):
+            m.ejecutar("1 suma")
+        with self.assertRaises(OverflowError):
+            m.ejecutar("1 2 3 suma suma")
+        self.assertEqual(len(m.pila), 0)
+        m.apilar(1).ejecutar("1 suma")
+        self.assertEqual(list(m.pila), [2])
+
+    def test_tipo_bool(self) -> None:
+        """Una pila lógica guarda los valores como 0 y 1."""
+        m = MaquinaDePilaFija(2, "bool").ejecutar("0 1 menor_que negacion")
+        self.assertEqual(list(m.pila), [0])
+
+    def test_tipos_incompatibles(self) -> None:
+        """Los programas con valores de otro tipo fallan antes de empezar."""
+        m = MaquinaDePilaFija(3).apilar(7)
+        for texto in ("1 2 division", "2.5", "cargar:z", str(2**63)):
+            with self.subTest(texto=texto), self.assertRaises(ErrorDeVerificacion):
+                m.ejecutar(texto)
+        with self.assertRaises(ErrorDeVerificacion):
+            m.ejecutar("cargar:x", {"x": 0.5})
+        self.assertEqual(list(m.pila), [7])
+        logica = MaquinaDePilaFija(3, "bool")
+        for texto in ("1 2 suma", "2"):
+            with self.subTest(texto=texto), self.assertRaises(ErrorDeVerificacion):
+                logica.ejecutar(texto)
+        self.assertEqual(len(logica.pila), 0)
+
+    def test_restaurar_pila(self) -> None:
+        """Si la ejecución falla a la mitad, la pila queda como estaba."""
+        m = MaquinaDePilaFija(3).apilar(7).apilar(1)
+        with self.assertRaises(TypeError):
+            m.ejecutar("suma 2 -1 potencia")
+        self.assertEqual(list(m.pila), [7, 1])
+        with self.assertRaises(OverflowError):
+            m.ejecutar("suma 63 corrimiento_izquierda")
+        self.assertEqual(list(m.pila), [7, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
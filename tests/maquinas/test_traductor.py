@@ -0,0 +1,144 @@
+"""Pruebas unitarias para materiales.maquinas.traductor."""
+
+import itertools
+import unittest
+
+from materiales.maquinas.hombre import Operador
+from materiales.maquinas.pila import MaquinaDePila
+from materiales.maquinas.traductor import medir_asignacion, traducir
+
+SUMA_HASTA_N = """
+    0 guardar:s
+    bucle: cargar:n saltar_si_falso:fin
+           cargar:s cargar:n suma guardar:s
+           cargar:n 1 resta guardar:n saltar:bucle
+    fin:   cargar:s
+"""
+
+FIBONACCI = """
+    0 1 cargar:n
+    bucle: duplicar saltar_si_falso:fin 1 resta
+           rotar rotar intercambiar copiar_segundo suma rotar saltar:bucle
+    fin:   descartar descartar
+"""
+
+
+class TestTraducir(unittest.TestCase):
+    """La computadora calcula lo mismo que la máquina de pila."""
+
+    def assertTraduce(  # pylint: disable=invalid-name
+        self, texto: str, **variables: int
+    ) -> None:
+        """Compara la salida de ambas traducciones con la pila final."""
+        esperado = MaquinaDePila().ejecutar(texto, dict(variables)).pila
+        for asignar in (False, True):
+            imagen = traducir(texto, variables, asignar_registros=asignar)
+            salida, _ = imagen.ejecutar(max_pasos=10_000)
+            self.assertEqual(salida, esperado)
+
+    def test_operadores(self) -> None:
+        """Aritmética, comparaciones y negación sobre enteros."""
+        operadores = [
+            "suma",
+            "resta",
+            "menor_que",
+            "menor_o_igual_que",
+            "igual_que",
+            "diferente_que",
+            "mayor_o_igual_que",
+            "mayor_que",
+        ]
+        for operador in operadores:
+            for a, b in itertools.product(range(-2, 3), repeat=2):
+                with self.subTest(operador, a=a, b=b):
+                    self.assertTraduce(
+                        f"cargar:a cargar:b {operador} cargar:a invertir_signo "
+                        "negacion",
+                        a=a,
+                        b=b,
+                    )
+
+    def test_manipulacion_de_pila(self) -> None:
+        """Las instrucciones que reordenan la pila."""
+        for mnemonico in (
+            "duplicar",
+            "descartar",
+            "intercambiar",
+            "copiar_segundo",
+            "rotar",
+        ):
+            with self.subTest(mnemonico):
+                self.assertTraduce(f"1 2 3 {mnemonico} 10 suma")
+
+    def test_bucles(self) -> None:
+        """Los saltos y las variables."""
+        for n in range(6):
+            with self.subTest(n=n):
+                self.assertTraduce(SUMA_HASTA_N, n=n)
+                self.assertTraduce(FIBONACCI, n=n)
+        self.assertTraduce("1 guardar_local:0 cargar_local:0 2 suma")
+        for condicion in (0, 1):
+            self.assertTraduce(
+                f"{condicion} saltar_si_verdadero:fin 5 descartar fin: 7"
+            )
+        self.assertTraduce("1 regresar 2")
+
+    def test_imagen(self) -> None:
+        """La imagen reserva celdas para las variables y la pila."""
+        imagen = traducir("cargar:x 1 suma guardar:y cargar:y", {"x": 41})
+        self.assertEqual(imagen.memoria[-1], 0)
+        self.assertEqual(len(imagen.pila), 2)
+        self.assertEqual(imagen.memoria[imagen.variables["x"]], 41)
+        self.assertEqual(imagen.memoria[imagen.instrucciones - 1], Operador.HLT)
+        computadora = imagen.computadora()
+        computadora.ejecutar()
+        self.assertEqual(computadora.memoria[imagen.variables["y"]], 42)
+
+    def test_errores(self) -> None:
+        """Lo que no se puede traducir se rechaza al traducir."""
+        for texto in (
+            "2 3 multiplicacion",
+            "1.5",
+            "cargar:x",
+            "suma",
+            "1000",
+            "llamar:f/0 regresar f: 1 regresar",
+            " ".join(["1"] * 60),
+        ):
+            with self.subTest(texto):
+                with self.assertRaises(ValueError):
+                    traducir(texto)
+        imagen = traducir(" ".join(["1"] * 60), digitos=4, digitos_direccion=3)
+        self.assertEqual(imagen.ejecutar()[0], [1] * 60)
+        with self.assertRaises(OverflowError):
+            traducir("999 1 suma").ejecutar()
+        with self.assertRaises(RuntimeError):
+            traducir("bucle: saltar:bucle").ejecutar(max_pasos=100)
+
+
+class TestAsignacion(unittest.TestCase):
+    """La cima en el acumulador ahorra cargas y guardados."""
+
+    def test_menos_pasos(self) -> None:
+        """Con asignación de registros se ejecutan menos pasos."""
+        for texto, n in ((SUMA_HASTA_N, 20), (FIBONACCI, 12)):
+            with self.subTest(texto):
+                medicion = medir_asignacion(texto, {"n": n})
+                esperado = MaquinaDePila().ejecutar(texto, {"n": n}).pila
+                self.assertEqual(medicion.salida, esperado)
+                self.assertLess(
+                    medicion.pasos_con_asignacion, medicion.pasos_sin_asignacion
+                )
+                self.assertLess(
+                    medicion.celdas_con_asignacion, medicion.celdas_sin_asignacion
+                )
+
+    def test_informe(self) -> None:
+        """El informe muestra pasos y celdas antes y después."""
+        medicion = medir_asignacion("1 2 suma 3 suma")
+        self.assertEqual(medicion.salida, [6])
+        self.assertEqual(str(medicion), "14 → 8 pasos, 15 → 9 celdas")
+
+
+if __name__ == "__main__":
+    unittest.main()
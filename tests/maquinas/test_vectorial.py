@@ -0,0 +1,56 @@
+"""Pruebas unitarias para materiales.maquinas.vectorial."""
+
+import unittest
+
+import numpy as np
+
+from materiales.maquinas.compilador import evaluar_muchos
+from materiales.maquinas.vectorial import MaquinaDePilaVectorial, evaluar_columnas
+
+EXPRESIONES = [
+    "x + y * 2",
+    "(x - y) ** 2 // 3",
+    "x << 2 | y & 7 ^ ~x",
+    "1 < x <= y + 1 < 9",
+    "not (x > y) or x == y and x != 0",
+]
+
+
+class TestMaquinaDePilaVectorial(unittest.TestCase):
+    """Los operadores trabajan sobre columnas completas."""
+
+    def setUp(self) -> None:
+        generador = np.random.default_rng(2024)
+        self.x = generador.integers(-5, 10, size=1000)
+        self.y = generador.integers(-5, 10, size=1000)
+
+    def test_logicos(self) -> None:
+        """and, or y not se aplican elemento a elemento."""
+        a, b = np.array([True, True, False]), np.array([True, False, False])
+        m = MaquinaDePilaVectorial()
+        m.apilar(a).apilar(b).y_logico()
+        np.testing.assert_array_equal(m.desapilar(), [True, False, False])
+        m.apilar(a).apilar(b).o_logico()
+        np.testing.assert_array_equal(m.desapilar(), [True, True, False])
+        m.apilar(b).negacion()
+        np.testing.assert_array_equal(m.desapilar(), [False, True, True])
+
+    def test_ejecutar(self) -> None:
+        """Un programa procesa la columna con una operación por instrucción."""
+        m = MaquinaDePilaVectorial().ejecutar(
+            "cargar:x 3 mayor_que cargar:x 7 menor_que y_logico", {"x": self.x}
+        )
+        np.testing.assert_array_equal(m.desapilar(), (self.x > 3) & (self.x < 7))
+
+    def test_evaluar_columnas(self) -> None:
+        """El resultado coincide con evaluar fila por fila."""
+        filas = [{"x": int(x), "y": int(y)} for x, y in zip(self.x, self.y)]
+        for texto in EXPRESIONES:
+            with self.subTest(texto):
+                vectorial = evaluar_columnas(texto, {"x": self.x, "y": self.y})
+                escalar = evaluar_muchos(texto, filas)
+                np.testing.assert_array_equal(vectorial, escalar)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+"""Pruebas unitarias para materiales.maquinas.verificador."""
+
+import unittest
+
+from materiales.maquinas.bytecode import BINARIOS, UNARIOS
+from materiales.maquinas.compilador import compilar
+from materiales.maquinas.pila import MaquinaDePila
+from materiales.maquinas.verificador import (
+    ErrorDeVerificacion,
+    tipo_de,
+    verificar,
+)
+
+
+class TestProfundidades(unittest.TestCase):
+    """Cobertura de las profundidades de la pila."""
+
+    def test_profundidades(self) -> None:
+        """Se registra la profundidad antes de cada instrucción."""
+        resultado = verificar("1 2 3 suma multiplicacion guardar:x")
+        self.assertEqual(resultado.profundidades, (0, 1, 2, 3, 2, 1))
+        self.assertEqual(resultado.maxima, 3)
+        self.assertEqual(resultado.tipos, ())
+        self.assertEqual(resultado.variables, {"x": int})
+
+    def test_pila_inicial(self) -> None:
+        """La pila inicial cuenta para las profundidades."""
+        resultado = verificar("suma", [int, float])
+        self.assertEqual(resultado.profundidades, (2,))
+        self.assertEqual(resultado.maxima, 2)
+        self.assertEqual(resultado.tipos, (float,))
+        resultado = verificar("duplicar", [str])
+        self.assertEqual(resultado.tipos, (str, str))
+        self.assertEqual(resultado.cimas, (str,))
+
+    def test_pila_vacia(self) -> None:
+        """Desapilar de una pila vacía se rechaza con su posición."""
+        with self.assertRaises(ErrorDeVerificacion) as contexto:
+            verificar("1 2 suma suma")
+        self.assertEqual(contexto.exception.posicion, 3)
+        with self.assertRaises(ErrorDeVerificacion):
+            verificar("guardar:x")
+        with self.assertRaises(ErrorDeVerificacion):
+            verificar("duplicar")
+
+    def test_coincide_con_alcance(self) -> None:
+        """La profundidad máxima coincide con Programa.alcance_de_pila."""
+        programa = compilar("(x + 1) * (y - 2) ** (x % 3) < 7 or not y")
+        self.assertEqual(verificar(programa).maxima, programa.alcance_de_pila()[1])
+
+
+class TestTipos(unittest.TestCase):
+    """Cobertura de la inferencia de tipos."""
+
+    def test_literales(self) -> None:
+        """Cada literal apila su tipo; las demás, object."""
+        resultado = verificar("1 2.5 True 'a' None")
+        self.assertEqual(resultado.tipos, (int, float, bool, str, object))
+        self.assertIs(tipo_de([1]), object)
+
+    def test_resultados(self) -> None:
+        """Se infiere el tipo que apila cada instrucción."""
+        casos = {
+            "1 2 suma": int,
+            "1 2.0 suma": float,
+            "1 2 division": float,
+            "True False suma": int,
+            "True False y_bit_a_bit": bool,
+            "1 2 menor_que": bool,
+            "1 negacion": bool,
+            "True invertir_signo": int,
+            "'a' 'b' suma": str,
+            "'a' 3 multiplicacion": str,
+            "'%d' 3 modulo": str,
+            "1 'a' igual_que": bool,
+            "1 2 potencia": object,
+            "1 'a' y_logico": object,
+            "cargar:x 1 suma": object,
+        }
+        for texto, tipo in casos.items():
+            with self.subTest(texto):
+                self.assertIs(verificar(texto).resultados[-1], tipo)
+
+    def test_incompatibles(self) -> None:
+        """Los tipos incompatibles se rechazan antes de ejecutar."""
+        for texto in (
+            "'a' 1 resta",
+            "1 'a' suma",
+            "1.5 2 y_bit_a_bit",
+            "'a' negacion_bit_a_bit",
+            "'a' 1 menor_que",
+            "'a' 'b' multiplicacion",
+        ):
+            with self.subTest(texto):
+                with self.assertRaises(ErrorDeVerificacion):
+                    verificar(texto)
+
+    def test_variables(self) -> None:
+        """Con tipos de variables, cargar una desconocida es un error."""
+        resultado = verificar("cargar:x 2 multiplicacion", variables={"x": float})
+        self.assertEqual(resultado.tipos, (float,))
+        with self.assertRaises(ErrorDeVerificacion):
+            verificar("cargar:y", variables={"x": int})
+        resultado = verificar("1 guardar:y cargar:y", variables={})
+        self.assertEqual(resultado.tipos, (int,))
+
+    def test_coincide_con_ejecucion(self) -> None:
+        """Los tipos inferidos coinciden con los valores calculados."""
+        for codigo in set(UNARIOS) | set(BINARIOS):
+            for argumentos in ("7 3", "7 2.0", "True True"):
+                texto = f"{argumentos} {codigo.mnemonico}"
+                with self.subTest(texto):
+                    try:
+                        resultado = verificar(texto).tipos[-1]
+                    except ErrorDeVerificacion:
+                        with self.assertRaises(TypeError):
+                            MaquinaDePila().ejecutar(texto)
+                        continue
+                    valor = MaquinaDePila().ejecutar(texto).ver_cima()
+                    if resultado is not object:
+                        self.assertIs(type(valor), resultado)
+
+
+class TestMaquina(unittest.TestCase):
+    """Integración con MaquinaDePila."""
+
+    def test_verificar_estado(self) -> None:
+        """La máquina verifica con los tipos de su pila y variables."""
+        m = MaquinaDePila().apilar(2.5)
+        m.variables["n"] = 3
+        self.assertEqual(m.verificar("cargar:n suma").tipos, (float,))
+        with self.assertRaises(ErrorDeVerificacion):
+            m.verificar("cargar:z")
+        self.assertEqual(m.verificar("cargar:z", {"z": "a"}).tipos, (float, str))
+
+    def test_ejecutar_falla_antes(self) -> None:
+        """ejecutar rechaza un programa que vaciaría la pila sin tocarla."""
+        m = MaquinaDePila().apilar(1)
+        with self.assertRaises(IndexError):
+            m.ejecutar("2 guardar:x suma suma")
+        self.assertEqual(m.pila, [1])
+        self.assertEqual(m.variables, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,7 @@
 """Pruebas para materiales.notacion."""
 
+# pylint: disable=protected-access
+
 import unittest
 
 from materiales.lenguajes.estructuras import Terminal, Variable
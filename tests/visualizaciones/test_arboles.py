@@ -0,0 +1,144 @@
+"""Pruebas para materiales.visualizaciones.arboles."""
+
+import ast
+import io
+import random
+import unittest
+import xml.etree.ElementTree as ET
+
+from materiales.lenguajes.gramaticas import GramaticaLibreContexto
+from materiales.visualizaciones.arboles import ArbolPlano
+from materiales.visualizaciones.diagramasast import DiagramaAST
+
+
+def _aleatorio(n: int, semilla: int) -> ArbolPlano:
+    """Un árbol aleatorio de n nodos con etiquetas de distinto ancho."""
+    azar = random.Random(semilla)
+    hijos: list[list[int]] = [[] for _ in range(n)]
+    for nodo in range(1, n):
+        hijos[azar.randrange(max(0, nodo - 4), nodo)].append(nodo)
+    etiquetas = ["x" * azar.randrange(1, 6) for _ in range(n)]
+    return ArbolPlano(etiquetas, hijos, ["nodo"] * n)
+
+
+class TestAcomodar(unittest.TestCase):
+    """Propiedades del acomodo de Reingold y Tilford."""
+
+    def test_propiedades(self) -> None:
+        """Los nodos de un nivel no se enciman y los padres quedan centrados."""
+        for semilla in range(30):
+            arbol = _aleatorio(random.Random(semilla).randrange(1, 120), semilla)
+            x, y, ancho, _ = arbol.acomodar()
+            with self.subTest(semilla=semilla):
+                niveles: dict[float, list[int]] = {}
+                for nodo in arbol.preorden():
+                    niveles.setdefault(y[nodo], []).append(nodo)
+                for nodos in niveles.values():
+                    for izquierdo, derecho in zip(nodos, nodos[1:]):
+                        minimo = (
+                            len(arbol.etiquetas[izquierdo])
+                            + len(arbol.etiquetas[derecho])
+                        ) * arbol.ancho_caracter / 2 + arbol.separacion
+                        self.assertGreaterEqual(
+                            x[derecho] - x[izquierdo], minimo - 1e-6
+                        )
+                for nodo, hijos in enumerate(arbol.hijos):
+                    if hijos:
+                        self.assertAlmostEqual(
+                            x[nodo], (x[hijos[0]] + x[hijos[-1]]) / 2
+                        )
+                self.assertTrue(all(0 < valor < ancho for valor in x))
+
+    def test_subarboles_iguales(self) -> None:
+        """Dos subárboles iguales se dibujan iguales."""
+        arbol = ArbolPlano(
+            ["r", "a", "b", "c", "a", "b", "c"],
+            [[1, 4], [2, 3], [], [], [5, 6], [], []],
+            ["nodo"] * 7,
+        )
+        x, _, _, _ = arbol.acomodar()
+        self.assertAlmostEqual(x[2] - x[1], x[5] - x[4])
+        self.assertAlmostEqual(x[3] - x[1], x[6] - x[4])
+
+    def test_profundo(self) -> None:
+        """Una cadena muy larga no agota la pila."""
+        n = 5000
+        arbol = ArbolPlano(["x"] * n, [[i + 1] for i in range(n - 1)] + [[]], ["n"] * n)
+        x, y, _, alto = arbol.acomodar()
+        self.assertEqual(len(set(x)), 1)
+        self.assertGreater(alto, y[-1])
+
+
+class TestRecortar(unittest.TestCase):
+    """Los subárboles lejanos se resumen."""
+
+    def test_profundidad(self) -> None:
+        """Los nodos más profundos que el límite se resumen."""
+        arbol = ArbolPlano(
+            ["r", "a", "b", "c", "d"], [[1, 4], [2], [3], [], []], ["nodo"] * 5
+        )
+        recortado = arbol.recortar(profundidad_maxima=1)
+        self.assertEqual(recortado.etiquetas, ["r", "a", "d", "⋯ 2 nodos"])
+        self.assertEqual(recortado.hijos, [[1, 2], [3], [], []])
+        self.assertEqual(recortado.clases[3], "resumen")
+        completo = arbol.recortar()
+        self.assertEqual(
+            [completo.etiquetas[nodo] for nodo in completo.preorden()],
+            [arbol.etiquetas[nodo] for nodo in arbol.preorden()],
+        )
+
+    def test_maximo_de_nodos(self) -> None:
+        """El recorte conserva los niveles de arriba."""
+        arbol = _aleatorio(2000, 1)
+        recortado = arbol.recortar(maximo_de_nodos=100)
+        conservados = recortado.clases.count("nodo")
+        self.assertLessEqual(conservados, 100)
+        ocultos = sum(
+            int(etiqueta.split()[1])
+            for etiqueta, clase in zip(recortado.etiquetas, recortado.clases)
+            if clase == "resumen"
+        )
+        self.assertEqual(conservados + ocultos, len(arbol))
+
+
+class TestSVG(unittest.TestCase):
+    """El SVG es XML válido y se escribe por partes."""
+
+    def test_escribir(self) -> None:
+        """Cada nodo es un texto y cada arista una línea."""
+        arbol = _aleatorio(50, 2)
+        arbol.aristas[3] = "<campo>"
+        svg = arbol.a_svg()
+        raiz = ET.fromstring(svg)
+        espacio = "{http://www.w3.org/2000/svg}"
+        self.assertEqual(len(list(raiz.iter(f"{espacio}line"))), 49)
+        self.assertEqual(len(list(raiz.iter(f"{espacio}text"))), 51)
+        self.assertIn("&lt;campo&gt;", svg)
+
+    def test_derivacion_grande(self) -> None:
+        """Los árboles de derivación grandes se muestran sin Graphviz."""
+        gramatica = GramaticaLibreContexto.desde_bnf('<S> ::= "a" <S> | ""')
+        derivacion = gramatica.hacer_derivacion()
+        for _ in range(600):
+            derivacion.aplicar_regla(1)
+        arbol = derivacion.arbol()
+        svg = arbol._repr_svg_()  # pylint: disable=protected-access
+        self.assertIn('class="variable"', svg)
+        self.assertIsNone(arbol._arbol)  # pylint: disable=protected-access
+        salida = io.StringIO()
+        arbol.escribir_svg(salida, profundidad_maxima=3)
+        self.assertIn("⋯ 1194 nodos", salida.getvalue())
+
+    def test_ast_grande(self) -> None:
+        """Los AST grandes se muestran sin Graphviz."""
+        expresion = " + ".join(["x"] * 200)
+        diagrama = DiagramaAST(ast.parse(expresion, mode="eval"))
+        self.assertGreater(len(diagrama), diagrama.maximo_graphviz)
+        svg = diagrama._repr_svg_()  # pylint: disable=protected-access
+        self.assertIn('class="arista"', svg)
+        self.assertIn(">BinOp<", svg)
+        ET.fromstring(svg)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,23 @@
 """Pruebas para materiales.visualizaciones.utils."""
 
+import concurrent.futures
+import os
+import pathlib
+import subprocess
+import tempfile
+import time
 import unittest
+from unittest import mock
 from unittest.mock import MagicMock
 
-from materiales.visualizaciones.utils import dibujar_svg
+import pygraphviz  # type: ignore[import-untyped]
+
+from materiales.visualizaciones.utils import (
+    CacheDeSVG,
+    ServicioDeDibujo,
+    dibujar_svg,
+    dibujar_varios,
+)
 
 
 class TestDibujarSvg(unittest.TestCase):
@@ -61,5 +75,142 @@ class TestDibujarSvg(unittest.TestCase):
             self.assertIn("SVG", str(e))
 
 
+def _grafo(fuente: str, svg: str = "<svg/>") -> MagicMock:
+    """Un grafo simulado con un texto DOT y el SVG que dibuja."""
+    grafo = MagicMock()
+    grafo.string.return_value = fuente
+    grafo.draw.return_value = svg.encode("utf-8")
+    return grafo
+
+
+class TestCacheDeSVG(unittest.TestCase):
+    """Cobertura de CacheDeSVG."""
+
+    def test_memoria(self) -> None:
+        """Un grafo con el mismo texto DOT no se vuelve a dibujar."""
+        cache = CacheDeSVG(capacidad=2)
+        primero = _grafo("digraph { a }", "<svg>a</svg>")
+        self.assertEqual(cache.dibujar(primero), "<svg>a</svg>")
+        self.assertEqual(cache.dibujar(_grafo("digraph { a }")), "<svg>a</svg>")
+        primero.draw.assert_called_once_with(format="svg", prog="dot")
+        self.assertEqual((cache.aciertos, cache.fallos), (1, 1))
+        # El programa de acomodo es parte de la llave.
+        self.assertEqual(cache.dibujar(_grafo("digraph { a }"), "neato"), "<svg/>")
+        # Se desecha el usado hace más tiempo.
+        cache.dibujar(_grafo("digraph { b }"))
+        otro = _grafo("digraph { a }")
+        cache.dibujar(otro)
+        otro.draw.assert_called_once()
+        cache.limpiar()
+        self.assertEqual((cache.aciertos, cache.fallos), (0, 0))
+
+    def test_errores(self) -> None:
+        """Los errores de Graphviz no se guardan."""
+        cache = CacheDeSVG()
+        grafo = _grafo("digraph { a }")
+        grafo.draw.return_value = None
+        with self.assertRaises(RuntimeError):
+            cache.dibujar(grafo)
+        self.assertEqual(cache.dibujar(_grafo("digraph { a }")), "<svg/>")
+
+    def test_disco(self) -> None:
+        """Los SVG en disco sobreviven a otra caché y respetan el límite."""
+        with tempfile.TemporaryDirectory() as directorio:
+            cache = CacheDeSVG(directorio=directorio, limite_disco=25)
+            cache.dibujar(_grafo("digraph { a }", "<svg>" + "a" * 10 + "</svg>"))
+            otra = CacheDeSVG(directorio=directorio, limite_disco=25)
+            grafo = _grafo("digraph { a }")
+            self.assertEqual(otra.dibujar(grafo), "<svg>aaaaaaaaaa</svg>")
+            grafo.draw.assert_not_called()
+            self.assertEqual(otra.aciertos, 1)
+            # Escribir otro SVG supera el límite y borra el más antiguo.
+            archivo = next(pathlib.Path(directorio).glob("*.svg"))
+            os.utime(archivo, (0, 0))
+            otra.dibujar(_grafo("digraph { b }", "<svg>" + "b" * 10 + "</svg>"))
+            archivos = list(pathlib.Path(directorio).glob("*.svg"))
+            self.assertEqual(len(archivos), 1)
+            self.assertNotEqual(archivos[0], archivo)
+
+    def test_graphviz(self) -> None:
+        """Grafos reales con el mismo texto DOT se dibujan una vez."""
+        cache = CacheDeSVG()
+        grafos = []
+        for _ in range(3):
+            grafo = pygraphviz.AGraph(directed=True)
+            grafo.add_edge("a", "b")
+            grafos.append(grafo)
+        # Tras el primer acomodo, Graphviz declara atributos por defecto
+        # en el texto DOT de los grafos nuevos, así que los tres se crean
+        # antes de dibujar.
+        fuentes = [grafo.string() for grafo in grafos]
+        self.assertEqual(len(set(fuentes)), 1)
+        svgs = [cache.dibujar(grafo) for grafo in grafos]
+        self.assertIn("<svg", svgs[0])
+        self.assertEqual(svgs, svgs[:1] * 3)
+        self.assertEqual((cache.aciertos, cache.fallos), (2, 1))
+
+
+def _cadena(n: int) -> str:
+    """El texto DOT de una cadena de n nodos."""
+    grafo = pygraphviz.AGraph(directed=True)
+    grafo.add_path([f"n{i}" for i in range(n)])
+    return str(grafo.string())
+
+
+class TestServicioDeDibujo(unittest.TestCase):
+    """Cobertura de ServicioDeDibujo y dibujar_varios."""
+
+    def test_procesos(self) -> None:
+        """Los SVG del grupo de procesos llegan en orden."""
+        fuentes = [_cadena(n) for n in (2, 3, 2, 4)]
+        esperados = [dibujar_svg(pygraphviz.AGraph(string=f)) for f in fuentes]
+        cache = CacheDeSVG()
+        with ServicioDeDibujo(2, procesos=True, cache_svg=cache) as servicio:
+            self.assertEqual(servicio.dibujar_todos(fuentes), esperados)
+            # Los repetidos se dibujan una vez; lo demás sale de la caché.
+            self.assertEqual(cache.fallos, 3)
+            futuro = servicio.enviar(pygraphviz.AGraph(string=fuentes[3]))
+            self.assertEqual(futuro.result(), esperados[3])
+            self.assertEqual(cache.aciertos, 1)
+        self.assertEqual(dibujar_varios(fuentes[:2], trabajadores=1), esperados[:2])
+
+    def test_hilos_mismo_grafo(self) -> None:
+        """Dos hilos que piden el mismo grafo a la vez lo dibujan una vez."""
+        completado = subprocess.CompletedProcess([], 0, b"<svg/>", b"")
+        cache = CacheDeSVG()
+        buscar = cache.buscar
+
+        def buscar_lento(fuente: str, prog: str = "dot") -> str | None:
+            time.sleep(0.05)  # Agranda la ventana entre buscar y pedir.
+            return buscar(fuente, prog)
+
+        with (
+            mock.patch.object(subprocess, "run", return_value=completado) as run,
+            mock.patch.object(cache, "buscar", side_effect=buscar_lento),
+            ServicioDeDibujo(procesos=False, cache_svg=cache) as servicio,
+            concurrent.futures.ThreadPoolExecutor(2) as hilos,
+        ):
+            pedidos = [hilos.submit(servicio.enviar, "digraph { a }") for _ in "ab"]
+            svgs = [pedido.result().result() for pedido in pedidos]
+        self.assertEqual(svgs, ["<svg/>"] * 2)
+        run.assert_called_once()
+
+    def test_subprocesos(self) -> None:
+        """Sin procesos, se ejecuta el programa de Graphviz."""
+        completado = subprocess.CompletedProcess([], 0, b"<svg/>", b"")
+        with mock.patch.object(subprocess, "run", return_value=completado) as run:
+            with ServicioDeDibujo(procesos=False, cache_svg=None) as servicio:
+                futuro = servicio.enviar("digraph { a }", "neato")
+                self.assertEqual(futuro.result(), "<svg/>")
+        self.assertEqual(run.call_args.args[0], ["neato", "-Tsvg"])
+        self.assertEqual(run.call_args.kwargs["input"], b"digraph { a }")
+        fallido = subprocess.CompletedProcess([], 1, b"", b"syntax error")
+        with mock.patch.object(subprocess, "run", return_value=fallido):
+            with ServicioDeDibujo(procesos=False) as servicio:
+                futuro = servicio.enviar("digraph {")
+                with self.assertRaisesRegex(RuntimeError, "syntax error"):
+                    futuro.result()
+
+
 if __name__ == "__main__":
     unittest.main()